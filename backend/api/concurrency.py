@@ -0,0 +1,126 @@
+"""
+Offloading policy for blocking work in async endpoints, and event-loop lag
+monitoring.
+
+Routes are `async def`, so anything blocking they run directly stalls every
+other request. The policy:
+
+- CPU work (pandas, numpy, pydantic validation, serialization) goes to
+  `run_cpu`, a bounded thread pool. A process pool would not help here: the
+  services keep in-process caches (DataLoader, derived indexes, response
+  cache) that worker processes would have to rebuild, and most of the heavy
+  lifting happens in numpy/pandas code that releases the GIL.
+- Blocking I/O (synchronous HTTP SDKs such as Mistral and ElevenLabs, file
+  globbing and reads) goes to `run_io`, a separate, larger pool, so slow
+  network calls cannot starve CPU work of threads.
+- Waiting uses `asyncio.sleep`, never `time.sleep`.
+
+Both pools run the work in a copy of the caller's context, so context
+variables (the request's stage timings) follow the work onto the thread, and
+under the request's profiler when it is being profiled.
+
+`LoopLagMonitor` measures how late the event loop wakes up from a periodic
+sleep; any lag beyond a few milliseconds means something blocked the loop.
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from backend.api.profiling import current_profile
+
+T = TypeVar("T")
+
+CPU_WORKERS = int(os.getenv("API_CPU_WORKERS", str(min(8, os.cpu_count() or 2))))
+IO_WORKERS = int(os.getenv("API_IO_WORKERS", "32"))
+
+_cpu_executor = ThreadPoolExecutor(max_workers=CPU_WORKERS, thread_name_prefix="api-cpu")
+_io_executor = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="api-io")
+
+
+def _in_pool(
+    executor: ThreadPoolExecutor, fn: Callable[..., T], args: tuple, kwargs: dict
+) -> "asyncio.Future[T]":
+    """Submit work to a pool, in a copy of the caller's context."""
+    work = functools.partial(fn, *args, **kwargs)
+    profile = current_profile()
+    if profile is not None:
+        work = functools.partial(profile.run, work)
+    context = contextvars.copy_context()
+    return asyncio.get_running_loop().run_in_executor(executor, context.run, work)
+
+
+async def run_cpu(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run CPU-bound work (pandas, serialization) off the event loop."""
+    return await _in_pool(_cpu_executor, fn, args, kwargs)
+
+
+async def run_io(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run blocking I/O (synchronous HTTP clients, file access) off the event loop."""
+    return await _in_pool(_io_executor, fn, args, kwargs)
+
+
+class LoopLagMonitor:
+    """Measures event-loop lag: how late a periodic sleep wakes up."""
+
+    def __init__(self, interval: float = 0.05, warn_threshold: float = 0.1):
+        """
+        Initialize the monitor.
+
+        Args:
+            interval: Seconds between measurements
+            warn_threshold: Lag in seconds above which a warning is printed
+        """
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.samples = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - start - self.interval)
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            self.samples += 1
+            if lag > self.warn_threshold:
+                print(f"WARNING: event loop blocked for {lag * 1000:.0f} ms")
+
+    def start(self) -> None:
+        """Start monitoring on the running loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop monitoring."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def reset(self) -> None:
+        """Reset the recorded maximum."""
+        self.max_lag = 0.0
+        self.samples = 0
+
+    def stats(self) -> dict:
+        """Current lag statistics in milliseconds."""
+        return {
+            "last_lag_ms": round(self.last_lag * 1000, 2),
+            "max_lag_ms": round(self.max_lag * 1000, 2),
+            "samples": self.samples,
+        }
+
+
+# Global instance, started with the application
+loop_lag_monitor = LoopLagMonitor()
@@ -0,0 +1,80 @@
+"""
+Fast JSON encoding and compression for large responses.
+
+FastAPI validates a returned value against the route's response_model, then
+encodes it with the standard json module. For list endpoints built from our
+own services the data is already well-formed, so the fast mode skips that
+second validation and encodes with orjson. orjson and brotli are optional:
+without them, encoding falls back to json and compression to gzip.
+
+The fast mode is opt-in through the API_FAST_RESPONSES environment variable.
+"""
+
+import gzip
+import json
+import os
+from typing import Any, List, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 1024
+
+
+def fast_responses_enabled() -> bool:
+    """Check whether list endpoints may skip response model validation."""
+    return os.getenv("API_FAST_RESPONSES", "0").lower() in ("1", "true", "yes")
+
+
+def _default(value: Any) -> Any:
+    """Encode numpy scalars and pydantic models for the json fallback."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(data: Any) -> bytes:
+    """Encode data as compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(
+            data, default=_default, option=orjson.OPT_SERIALIZE_NUMPY
+        )
+    return json.dumps(
+        data, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+def supported_encodings() -> List[str]:
+    """Content encodings this module can produce, preferred first."""
+    return (["br"] if brotli is not None else []) + ["gzip"]
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the preferred supported encoding accepted by the client, if any."""
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        accepted.add(name.strip().lower())
+    for encoding in supported_encodings():
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a body with gzip or brotli."""
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
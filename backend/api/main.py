@@ -1,19 +1,50 @@
 """FastAPI application main file."""
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+
+from backend.config import load_config
+
+# Before the imports below: some modules read their settings at import time
+load_config()
+
+from backend.api.concurrency import loop_lag_monitor  # noqa: E402
+from backend.api.metrics import ServerTimingMiddleware  # noqa: E402
+from backend.api.profiling import ProfilingMiddleware  # noqa: E402
+from backend.api.snapshots import SnapshotMiddleware  # noqa: E402
+from backend.api.tenants import TenantMiddleware  # noqa: E402
+from backend.api.warmup import warmup  # noqa: E402
+from backend.controllers.admin_controller import router as admin_router  # noqa: E402
+from backend.controllers.agent_controller import router as agent_router  # noqa: E402
+from backend.controllers.order_parser_controller import (  # noqa: E402
+    router as order_parser_router,
+)
+from backend.controllers.parser_controller import router as parser_router  # noqa: E402
+from backend.controllers.product_controller import router as product_router  # noqa: E402
+from backend.controllers.root_controller import router as root_router  # noqa: E402
+from backend.controllers.supplier_controller import (  # noqa: E402
+    router as supplier_router,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Watch the event loop for blocking calls and warm the caches while the app runs."""
+    loop_lag_monitor.start()
+    warmup.start(app)
+    yield
+    await warmup.stop()
+    await loop_lag_monitor.stop()
 
-from backend.controllers.agent_controller import router as agent_router
-from backend.controllers.order_parser_controller import router as order_parser_router
-from backend.controllers.parser_controller import router as parser_router
-from backend.controllers.product_controller import router as product_router
-from backend.controllers.root_controller import router as root_router
-from backend.controllers.supplier_controller import router as supplier_router
 
 app = FastAPI(
     title="Supplier Optimization API",
     description="API for finding cheaper suppliers and discovering innovative products",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Enable CORS for frontend
@@ -25,6 +56,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Serve each request from a single data snapshot
+app.add_middleware(SnapshotMiddleware)
+
+# Compress large responses not already compressed by the response cache
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+
+# Profile requests on demand (see /api/admin/profiling)
+app.add_middleware(ProfilingMiddleware)
+
+# Serve each request from its tenant's data (X-Tenant-ID or /tenants/<id>/...)
+app.add_middleware(TenantMiddleware)
+
+# Time request stages (outermost, so compression is included in the total)
+app.add_middleware(ServerTimingMiddleware)
+
 # Include routers
 app.include_router(root_router)
 app.include_router(supplier_router)
@@ -32,3 +78,4 @@ app.include_router(product_router)
 app.include_router(parser_router)
 app.include_router(order_parser_router)
 app.include_router(agent_router)
+app.include_router(admin_router)
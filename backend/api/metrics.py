@@ -0,0 +1,239 @@
+"""
+Request timing middleware and stage latency metrics.
+
+`ServerTimingMiddleware` collects the stage spans of each request (see
+backend.services.timing), returns them in a `Server-Timing` header, e.g.
+
+    Server-Timing: data.csv_load;dur=41.2, inventory.enrich;dur=63.0, total;dur=70.4
+
+and records them, with the whole request as stage "total", in a histogram
+per (method, route, stage). Routes are path templates
+("/api/products/{product_id}/suppliers"), so the number of series stays
+bounded; requests matching no route are recorded as route "unmatched".
+Startup warmup requests (scope flagged "warmup") get the header but are
+not recorded.
+
+Each histogram keeps cumulative bucket counts (a Prometheus histogram) and
+the counts of the last few minutes in time slices, from which recent
+quantiles are estimated (a Prometheus summary). `/api/metrics` renders both
+in the Prometheus text format.
+"""
+
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.services.timing import collect_timings
+
+# Upper bounds (seconds) of the histogram buckets, +Inf implied
+BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+# Rolling window of the recent quantiles: WINDOW_SLICES slices of this many seconds
+SLICE_SECONDS = 30.0
+WINDOW_SLICES = 10
+QUANTILES = (0.5, 0.95, 0.99)
+
+_INVALID_TOKEN_CHARS = re.compile(r"[^A-Za-z0-9!#$%&'*+.^_`|~-]")
+
+
+class StageHistogram:
+    """Latency histogram of one (method, route, stage): cumulative and rolling."""
+
+    def __init__(self):
+        self.counts = np.zeros(len(BUCKETS) + 1, dtype=np.int64)
+        self.sum = 0.0
+        # Per time slice: bucket counts and sum; slice_ids says which slice a row holds
+        self._recent = np.zeros((WINDOW_SLICES, len(BUCKETS) + 1), dtype=np.int64)
+        self._recent_sum = np.zeros(WINDOW_SLICES)
+        self._slice_ids = np.full(WINDOW_SLICES, -1, dtype=np.int64)
+
+    @property
+    def count(self) -> int:
+        return int(self.counts.sum())
+
+    def observe(self, seconds: float, now: float) -> None:
+        """Record a duration observed at time now (monotonic seconds)."""
+        bucket = int(np.searchsorted(BUCKETS, seconds, side="left"))
+        self.counts[bucket] += 1
+        self.sum += seconds
+
+        slice_id = int(now // SLICE_SECONDS)
+        row = slice_id % WINDOW_SLICES
+        if self._slice_ids[row] != slice_id:
+            self._slice_ids[row] = slice_id
+            self._recent[row] = 0
+            self._recent_sum[row] = 0.0
+        self._recent[row, bucket] += 1
+        self._recent_sum[row] += seconds
+
+    def recent(self, now: float) -> Tuple[np.ndarray, float]:
+        """Bucket counts and sum over the rolling window ending at now."""
+        current = int(now // SLICE_SECONDS)
+        live = self._slice_ids > current - WINDOW_SLICES
+        return self._recent[live].sum(axis=0), float(self._recent_sum[live].sum())
+
+    @staticmethod
+    def quantile(counts: np.ndarray, q: float) -> float:
+        """
+        Estimate a quantile from bucket counts.
+
+        Interpolates linearly inside the bucket holding the quantile, as
+        Prometheus' histogram_quantile does; values in the +Inf bucket are
+        reported as the largest finite bound. NaN without observations.
+        """
+        total = counts.sum()
+        if total == 0:
+            return float("nan")
+        cumulative = np.cumsum(counts)
+        rank = q * total
+        bucket = int(np.searchsorted(cumulative, rank, side="left"))
+        if bucket >= len(BUCKETS):
+            return BUCKETS[-1]
+        lower = BUCKETS[bucket - 1] if bucket > 0 else 0.0
+        below = cumulative[bucket - 1] if bucket > 0 else 0
+        inside = counts[bucket]
+        return lower + (BUCKETS[bucket] - lower) * (rank - below) / inside
+
+
+class StageMetrics:
+    """Stage histograms of every (method, route, stage)."""
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, str, str], StageHistogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        stages: Dict[str, float],
+        now: Optional[float] = None,
+    ) -> None:
+        """Record the stage durations (seconds) of one request."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            for stage, seconds in stages.items():
+                key = (method, route, stage)
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = StageHistogram()
+                histogram.observe(seconds, now)
+
+    def get(self, method: str, route: str, stage: str) -> Optional[StageHistogram]:
+        """Histogram of a (method, route, stage), None if never observed."""
+        return self._histograms.get((method, route, stage))
+
+    def clear(self) -> None:
+        """Drop all histograms."""
+        with self._lock:
+            self._histograms.clear()
+
+    def render(self, now: Optional[float] = None) -> str:
+        """All histograms in the Prometheus text exposition format."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            items = sorted(self._histograms.items())
+            snapshot = [
+                (key, histogram.counts.copy(), histogram.sum, *histogram.recent(now))
+                for key, histogram in items
+            ]
+
+        histogram = "http_request_stage_seconds"
+        summary = "http_request_stage_recent_seconds"
+        lines: List[str] = [
+            f"# HELP {histogram} Duration of request stages "
+            '(stage="total": whole request).',
+            f"# TYPE {histogram} histogram",
+        ]
+        for (method, route, stage), counts, total, _, _ in snapshot:
+            labels = _labels(method=method, route=route, stage=stage)
+            cumulative = np.cumsum(counts)
+            for bound, count in zip(BUCKETS, cumulative):
+                lines.append(f'{histogram}_bucket{{{labels},le="{bound:g}"}} {count}')
+            lines.append(f'{histogram}_bucket{{{labels},le="+Inf"}} {cumulative[-1]}')
+            lines.append(f"{histogram}_sum{{{labels}}} {total:.6f}")
+            lines.append(f"{histogram}_count{{{labels}}} {cumulative[-1]}")
+
+        window = int(SLICE_SECONDS * WINDOW_SLICES)
+        lines += [
+            f"# HELP {summary} Quantiles of request stage durations "
+            f"over the last {window} seconds.",
+            f"# TYPE {summary} summary",
+        ]
+        for (method, route, stage), _, _, recent, recent_sum in snapshot:
+            labels = _labels(method=method, route=route, stage=stage)
+            for q in QUANTILES:
+                value = StageHistogram.quantile(recent, q)
+                lines.append(f'{summary}{{{labels},quantile="{q:g}"}} {value:.6f}')
+            lines.append(f"{summary}_sum{{{labels}}} {recent_sum:.6f}")
+            lines.append(f"{summary}_count{{{labels}}} {int(recent.sum())}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(**labels: str) -> str:
+    """Prometheus label set, values escaped."""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels.items()
+    )
+    return ",".join(f'{name}="{value}"' for name, value in escaped)
+
+
+def server_timing_header(stages: Dict[str, float]) -> str:
+    """Server-Timing header value of stage durations (seconds), in milliseconds."""
+    return ", ".join(
+        f"{_INVALID_TOKEN_CHARS.sub('_', name)};dur={seconds * 1000:.1f}"
+        for name, seconds in stages.items()
+    )
+
+
+def route_of(scope: Scope) -> str:
+    """Path template of the route that handled a request, "unmatched" if none."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class ServerTimingMiddleware:
+    """Times each request's stages: Server-Timing header and stage metrics."""
+
+    def __init__(self, app: ASGIApp, metrics: Optional[StageMetrics] = None):
+        """
+        Wrap an ASGI app.
+
+        Args:
+            app: Application to time
+            metrics: Metrics recording the timings (default: global stage_metrics)
+        """
+        self.app = app
+        self.metrics = metrics or stage_metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+
+        with collect_timings() as timings:
+
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    stages = timings.snapshot()
+                    stages["total"] = time.perf_counter() - start
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", server_timing_header(stages))
+                    if not scope.get("warmup"):
+                        self.metrics.observe(scope["method"], route_of(scope), stages)
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
+
+
+# Global instance, fed by the middleware
+stage_metrics = StageMetrics()
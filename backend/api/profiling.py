@@ -0,0 +1,395 @@
+"""
+On-demand profiling of live requests.
+
+An admin arms a profiling session for one route (method + path template,
+e.g. "GET /api/suppliers/roi") and a number of requests. The next matching
+requests are profiled, one at a time (matching requests arriving while one
+is being profiled are served normally), until the count is reached. Modes:
+
+- "cprofile": deterministic cProfile of the request's work on the pool
+  threads (run_cpu / run_io), with a single profiler per request enabled
+  for one call at a time: Python 3.12+ allows only one active profiler per
+  process, and there it records every thread while enabled, so work of
+  other requests running at the same time may be included. The profiled
+  request's pool calls are serialized, and its code on the event loop is
+  not profiled (use "sample" for that). Returns the top functions by
+  cumulative time.
+- "sample": a sampler thread records the Python stacks of those threads
+  every few milliseconds. Returns collapsed stacks ("a;b;c 12" lines), the
+  input format of flamegraph.pl and speedscope.
+- "tracemalloc": snapshots around the request. Returns the top allocation
+  sites by memory still held after the request, and the peak traced memory.
+  tracemalloc sees every thread, so concurrent requests are included.
+
+The event loop thread is shared: its samples may include other requests
+served meanwhile.
+
+While no session is armed, the middleware does one attribute check per
+request and run_cpu / run_io one context variable lookup per call.
+"""
+
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from starlette.routing import compile_path
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+T = TypeVar("T")
+
+MODES = ("cprofile", "sample", "tracemalloc")
+# Frames kept per allocation traceback in tracemalloc mode
+TRACEMALLOC_FRAMES = 10
+
+
+def collapse_stack(frame) -> str:
+    """Collapsed form of a stack: "module:function" frames, root first, ";"-joined."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        module = frame.f_globals.get("__name__", "?")
+        name = getattr(code, "co_qualname", code.co_name)
+        names.append(f"{module}:{name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def _idle(stack: str) -> bool:
+    """True for the event loop waiting on its selector (nothing to profile)."""
+    return stack.endswith("Selector.select")
+
+
+class RequestProfile:
+    """Profiling of one request across the threads running its work."""
+
+    def __init__(self, mode: str, sample_interval: float, top: int):
+        """
+        Prepare the profile.
+
+        Args:
+            mode: One of MODES
+            sample_interval: Seconds between stack samples ("sample" mode)
+            top: Number of functions / allocation sites reported
+        """
+        self.mode = mode
+        self.sample_interval = sample_interval
+        self.top = top
+        self.samples: Counter = Counter()
+        self._profile = cProfile.Profile() if mode == "cprofile" else None
+        self._profiled_calls = 0
+        self._profile_lock = threading.Lock()
+        self._profile_error: Optional[str] = None
+        self._threads: Counter = Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._started_tracing = False
+        self._before: Optional[tracemalloc.Snapshot] = None
+        self._start = 0.0
+
+    def _enter_thread(self) -> None:
+        with self._lock:
+            self._threads[threading.get_ident()] += 1
+
+    def _exit_thread(self) -> None:
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads[ident] -= 1
+            if self._threads[ident] <= 0:
+                del self._threads[ident]
+
+    def run(self, fn: Callable[[], T]) -> T:
+        """Run work of the request on a pool thread, profiled."""
+        if self.mode == "cprofile":
+            with self._profile_lock:
+                try:
+                    self._profile.enable()
+                except ValueError as e:
+                    # Another profiling tool is active (Python 3.12+): run unprofiled
+                    self._profile_error = str(e)
+                    return fn()
+                try:
+                    return fn()
+                finally:
+                    self._profile.disable()
+                    self._profiled_calls += 1
+        if self.mode == "sample":
+            self._enter_thread()
+            try:
+                return fn()
+            finally:
+                self._exit_thread()
+        return fn()
+
+    def _sample(self) -> None:
+        """Sampler thread: record the stacks of the request's threads."""
+        while not self._stop.wait(self.sample_interval):
+            frames = sys._current_frames()
+            with self._lock:
+                idents = list(self._threads)
+            for ident in idents:
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                stack = collapse_stack(frame)
+                if not _idle(stack):
+                    self.samples[stack] += 1
+
+    def start(self) -> None:
+        """Start profiling (on the event loop thread, as the request begins)."""
+        self._start = time.perf_counter()
+        # cprofile: enabled around each pool call of the request (see run)
+        if self.mode == "sample":
+            self._enter_thread()
+            self._sampler = threading.Thread(
+                target=self._sample, name="request-sampler", daemon=True
+            )
+            self._sampler.start()
+        elif self.mode == "tracemalloc":
+            self._started_tracing = not tracemalloc.is_tracing()
+            if self._started_tracing:
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+            tracemalloc.reset_peak()
+            self._before = tracemalloc.take_snapshot()
+
+    def stop(self) -> Dict[str, Any]:
+        """Stop profiling and build the mode's report."""
+        duration = time.perf_counter() - self._start
+        report: Dict[str, Any] = {"duration_ms": round(duration * 1000, 3)}
+        if self.mode == "cprofile":
+            report["functions"] = self._top_functions()
+            if self._profile_error is not None:
+                report["error"] = self._profile_error
+        elif self.mode == "sample":
+            self._stop.set()
+            self._sampler.join()
+            self._exit_thread()
+            report["sample_count"] = sum(self.samples.values())
+            report["collapsed"] = self.collapsed()
+        else:
+            after = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if self._started_tracing:
+                tracemalloc.stop()
+            report["peak_kb"] = round(peak / 1024, 1)
+            report["allocations"] = self._top_allocations(self._before, after)
+        return report
+
+    def collapsed(self) -> str:
+        """Sampled stacks in the collapsed format, one "stack count" per line."""
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.samples.items()))
+
+    def _top_functions(self) -> List[Dict[str, Any]]:
+        """Functions with the most cumulative time in the request's pool calls."""
+        if not self._profiled_calls:
+            return []
+        stats = pstats.Stats(self._profile, stream=io.StringIO())
+        rows = []
+        for (filename, line, name), (_, calls, tottime, cumtime, _) in stats.stats.items():
+            rows.append(
+                {
+                    "function": f"{filename}:{line}({name})",
+                    "calls": calls,
+                    "tottime_ms": round(tottime * 1000, 3),
+                    "cumtime_ms": round(cumtime * 1000, 3),
+                }
+            )
+        rows.sort(key=lambda row: row["cumtime_ms"], reverse=True)
+        return rows[: self.top]
+
+    def _top_allocations(
+        self, before: tracemalloc.Snapshot, after: tracemalloc.Snapshot
+    ) -> List[Dict[str, Any]]:
+        """Allocation sites holding the most new memory after the request."""
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        differences = after.filter_traces(ignore).compare_to(
+            before.filter_traces(ignore), "lineno"
+        )
+        return [
+            {
+                "site": str(difference.traceback[0]),
+                "size_kb": round(difference.size / 1024, 1),
+                "size_diff_kb": round(difference.size_diff / 1024, 1),
+                "count_diff": difference.count_diff,
+            }
+            for difference in differences[: self.top]
+            if difference.size_diff > 0
+        ]
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "request_profile", default=None
+)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    """Profile of the current request, None if it is not profiled."""
+    return _current.get()
+
+
+class ProfilingSession:
+    """Profiling armed for the next requests to one route."""
+
+    def __init__(
+        self,
+        method: str,
+        route: str,
+        mode: str,
+        requests: int,
+        sample_interval: float = 0.005,
+        top: int = 30,
+    ):
+        """
+        Arm a session.
+
+        Args:
+            method: HTTP method of the route
+            route: Path template of the route (e.g. "/api/products/{product_id}/suppliers")
+            mode: One of MODES
+            requests: Number of requests to profile
+            sample_interval: Seconds between stack samples ("sample" mode)
+            top: Number of functions / allocation sites reported per request
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode {mode!r}, expected one of {MODES}")
+        self.session_id = uuid.uuid4().hex[:12]
+        self.method = method.upper()
+        self.route = route
+        self.mode = mode
+        self.requests = requests
+        self.sample_interval = sample_interval
+        self.top = top
+        self._path_regex, _, _ = compile_path(route)
+        self.created_at = datetime.now().isoformat(timespec="seconds")
+        self.results: List[Dict[str, Any]] = []
+        self.in_flight = 0
+        self._busy = threading.Lock()
+
+    @property
+    def done(self) -> bool:
+        return len(self.results) + self.in_flight >= self.requests
+
+    def matches(self, scope: Scope) -> bool:
+        """True if a request is for the session's route."""
+        return scope["method"] == self.method and bool(
+            self._path_regex.match(scope["path"])
+        )
+
+    def try_begin(self) -> Optional[RequestProfile]:
+        """Profile for a matching request, None if busy or done."""
+        if self.done or not self._busy.acquire(blocking=False):
+            return None
+        if self.done:
+            self._busy.release()
+            return None
+        self.in_flight += 1
+        return RequestProfile(self.mode, self.sample_interval, self.top)
+
+    def finish(self, profile: RequestProfile, path: str, status: Optional[int]) -> None:
+        """Record the report of a profiled request."""
+        try:
+            report = profile.stop()
+            report.update(path=path, status=status)
+            self.results.append(report)
+        finally:
+            self.in_flight -= 1
+            self._busy.release()
+
+    def collapsed(self) -> str:
+        """Collapsed stacks summed over the profiled requests ("sample" mode)."""
+        total: Counter = Counter()
+        for result in self.results:
+            for line in result.get("collapsed", "").splitlines():
+                stack, _, count = line.rpartition(" ")
+                total[stack] += int(count)
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(total.items()))
+
+    def status(self) -> Dict[str, Any]:
+        """Settings, progress and reports of the session."""
+        return {
+            "session_id": self.session_id,
+            "method": self.method,
+            "route": self.route,
+            "mode": self.mode,
+            "requests": self.requests,
+            "profiled": len(self.results),
+            "done": self.done,
+            "created_at": self.created_at,
+            "results": self.results,
+        }
+
+
+class Profiler:
+    """Holds the armed profiling session (at most one)."""
+
+    def __init__(self):
+        self.session: Optional[ProfilingSession] = None
+        # Last session, kept for reading results after it completes
+        self.last: Optional[ProfilingSession] = None
+
+    def arm(self, session: ProfilingSession) -> ProfilingSession:
+        """Arm a session, replacing the current one."""
+        self.session = self.last = session
+        return session
+
+    def disarm(self) -> None:
+        """Stop profiling new requests."""
+        self.session = None
+
+
+class ProfilingMiddleware:
+    """Profiles the requests matching the armed session."""
+
+    def __init__(self, app: ASGIApp, profiler: Optional[Profiler] = None):
+        """
+        Wrap an ASGI app.
+
+        Args:
+            app: Application to profile
+            profiler: Profiler holding the session (default: global profiler)
+        """
+        self.app = app
+        self.profiler = profiler or request_profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        session = self.profiler.session
+        if session is None or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if not session.matches(scope):
+            await self.app(scope, receive, send)
+            return
+        profile = session.try_begin()
+        if profile is None:
+            await self.app(scope, receive, send)
+            return
+
+        status: Dict[str, int] = {}
+
+        async def send_with_status(message) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        token = _current.set(profile)
+        profile.start()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _current.reset(token)
+            session.finish(profile, scope["path"], status.get("code"))
+            if session.done and self.profiler.session is session:
+                self.profiler.disarm()
+
+
+# Global instance, armed through the admin endpoints
+request_profiler = Profiler()
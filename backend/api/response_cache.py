@@ -0,0 +1,201 @@
+"""
+Response cache for the read-only dashboard endpoints.
+
+Serialized responses are cached per (data directory, path, query
+parameters, data version); the data directory is the request's tenant.
+The data version comes from the DataLoader, which bumps it whenever a data
+file changes, so parses and updates invalidate the cache without explicit
+calls. Each response carries a strong ETag (hash of the body): a client
+sending it back in If-None-Match gets a 304 without a body.
+
+Entries also expire after a TTL, because some payloads depend on the current
+date (stockout dates, 30-day spend). The ETag only changes if the recomputed
+body actually differs.
+
+Compressed variants of a body are computed once per entry, on first request
+with a matching Accept-Encoding.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from backend.api import fast_json
+from backend.services.data_loader import DataLoader, get_data_loader
+from backend.services.timing import span
+
+# Maximum number of cached responses (least recently used are evicted)
+DEFAULT_MAX_ENTRIES = 256
+# Seconds before an entry is recomputed even if the data did not change
+DEFAULT_TTL = 300.0
+
+
+class CachedResponse:
+    """Serialized response body and its ETag."""
+
+    def __init__(self, body: bytes, version: int, created_at: float):
+        self.body = body
+        self.etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        self.version = version
+        self.created_at = created_at
+        self._encoded: Dict[str, bytes] = {}
+
+    def encoded(self, encoding: str) -> bytes:
+        """Get the body compressed with an encoding (computed once)."""
+        if encoding not in self._encoded:
+            with span("response.compress"):
+                self._encoded[encoding] = fast_json.compress(self.body, encoding)
+        return self._encoded[encoding]
+
+
+class ResponseCache:
+    """LRU cache of serialized JSON responses keyed on the data version."""
+
+    def __init__(
+        self,
+        data_loader: Optional[DataLoader] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            data_loader: Loader providing the data version (default: global loader)
+            max_entries: Maximum number of cached responses
+            ttl: Seconds before an entry is recomputed
+        """
+        self.data_loader = data_loader or get_data_loader()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, request: Request) -> Tuple:
+        return (
+            str(self.data_loader.data_dir),
+            request.url.path,
+            tuple(sorted(request.query_params.multi_items())),
+        )
+
+    @staticmethod
+    def serialize(data: Any, model: Optional[Type[BaseModel]] = None) -> bytes:
+        """
+        Serialize a response.
+
+        Args:
+            data: Response model, or plain data produced by our services
+            model: Model validating plain data, unless fast responses are enabled
+        """
+        if isinstance(data, BaseModel):
+            with span("response.serialize"):
+                return data.model_dump_json().encode()
+        if model is not None and not fast_json.fast_responses_enabled():
+            with span("response.validate"):
+                data = model.model_validate(data)
+            with span("response.serialize"):
+                return data.model_dump_json().encode()
+        with span("response.serialize"):
+            return fast_json.dumps(data)
+
+    def get(
+        self,
+        request: Request,
+        build: Callable[[], Any],
+        model: Optional[Type[BaseModel]] = None,
+    ) -> CachedResponse:
+        """
+        Get the cached response for a request, building it on a miss.
+
+        Args:
+            request: Incoming request (path and query parameters form the key)
+            build: Function computing the response (model or plain data)
+            model: Response model validating plain data (see serialize)
+
+        Returns:
+            CachedResponse for the current data version
+        """
+        version = self.data_loader.refresh_if_changed()
+        key = self._key(request)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if (
+                entry is not None
+                and entry.version == version
+                and now - entry.created_at < self.ttl
+            ):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        entry = CachedResponse(self.serialize(build(), model), version, now)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def respond(
+        self,
+        request: Request,
+        build: Callable[[], Any],
+        model: Optional[Type[BaseModel]] = None,
+    ) -> Response:
+        """
+        Serve a request from the cache.
+
+        Args:
+            request: Incoming request
+            build: Function computing the response (model or plain data) on a miss
+            model: Response model validating plain data (see serialize)
+
+        Returns:
+            304 if the client's If-None-Match matches, the JSON body otherwise,
+            compressed when the client accepts it
+        """
+        entry = self.get(request, build, model)
+        headers = {
+            "ETag": entry.etag,
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+        if_none_match = request.headers.get("if-none-match", "")
+        if entry.etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
+
+        body = entry.body
+        if len(body) >= fast_json.MIN_COMPRESS_SIZE:
+            encoding = fast_json.choose_encoding(
+                request.headers.get("accept-encoding", "")
+            )
+            if encoding is not None:
+                body = entry.encoded(encoding)
+                headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Global instance
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get or create the global response cache."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
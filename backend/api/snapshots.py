@@ -0,0 +1,28 @@
+"""
+Per-request data snapshot pinning.
+
+Every request is served from a single data snapshot: the first one each
+loader serves during the request (see backend.services.data_loader). A
+snapshot swapped in while the request runs is only seen by later requests,
+so one response never mixes two versions of the data. Pins are taken on
+first access, on whichever thread reads the data first, so the event loop
+never waits for a snapshot build.
+"""
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from backend.services.data_loader import pin_snapshots
+
+
+class SnapshotMiddleware:
+    """Pins the data snapshots of each request."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with pin_snapshots():
+            await self.app(scope, receive, send)
@@ -0,0 +1,84 @@
+"""
+Per-request tenant selection.
+
+A request is for a tenant when it carries an X-Tenant-ID header, or when
+its path starts with /tenants/<id>/ (the prefix is stripped, so
+/tenants/<id>/api/suppliers/roi is routed as /api/suppliers/roi). Its data
+is then served from the tenant's loader (see backend.services.tenants):
+services, indexes and the response cache read through get_data_loader(),
+which follows the loader set here. Requests without a tenant are served
+from the default data directory.
+
+Supplier calls, call campaigns and the price refresh queue still write to
+and plan for the default data directory only: their endpoints depend on
+require_default_tenant, which rejects tenant requests with a 400.
+"""
+
+from typing import Optional
+
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from backend.services.data_loader import (
+    current_data_loader,
+    default_data_loader,
+    use_data_loader,
+)
+from backend.services.tenants import TenantRegistry, get_tenant_registry
+
+TENANT_HEADER = b"x-tenant-id"
+TENANT_PREFIX = "/tenants/"
+
+
+def tenant_of(scope: Scope) -> Optional[str]:
+    """
+    Tenant id of a request, from the header or the path prefix.
+
+    A path prefix is removed from the scope's path.
+    """
+    path = scope["path"]
+    if path.startswith(TENANT_PREFIX):
+        tenant_id, _, rest = path[len(TENANT_PREFIX):].partition("/")
+        scope["path"] = "/" + rest
+        scope["raw_path"] = scope["path"].encode()
+        return tenant_id
+    for name, value in scope.get("headers", []):
+        if name == TENANT_HEADER:
+            return value.decode("latin-1").strip()
+    return None
+
+
+async def require_default_tenant() -> None:
+    """Dependency of the endpoints not available for tenant data (400 for tenant requests)."""
+    if current_data_loader() is not default_data_loader():
+        raise HTTPException(
+            status_code=400,
+            detail="Not available for tenant data: calls, campaigns and their "
+            "updates only use the default data directory",
+        )
+
+
+class TenantMiddleware:
+    """Serves each request from its tenant's data."""
+
+    def __init__(self, app: ASGIApp, registry: Optional[TenantRegistry] = None):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        tenant_id = tenant_of(scope)
+        if tenant_id is None:
+            await self.app(scope, receive, send)
+            return
+        registry = self.registry or get_tenant_registry()
+        try:
+            data_loader = registry.get(tenant_id)
+        except ValueError as e:
+            await JSONResponse({"detail": str(e)}, status_code=404)(scope, receive, send)
+            return
+        with use_data_loader(data_loader):
+            await self.app(scope, receive, send)
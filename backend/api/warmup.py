@@ -0,0 +1,220 @@
+"""
+Startup warmup and readiness.
+
+The first request after a deploy would otherwise pay for the CSV parsing,
+model construction and index builds of the DataLoader, plus the first
+computation of the dashboard responses. At startup, the app lifespan runs
+`Warmup` as a background task:
+
+1. data steps, on the CPU pool: load the tables and their models, then
+   build the derived values (dictionaries, encoded tables, indexes) the
+   services use;
+2. the dashboard's default requests (WARM_REQUESTS), sent through the
+   app, which fills the response cache. Their scope is flagged "warmup",
+   so they are left out of the request metrics.
+
+`/ready` answers 503 until warmup finished, then 200, with the state and
+build time of each step, so a load balancer routes traffic only to warm
+instances. A failed step is reported but does not hold readiness back: the
+value is then built by the first request needing it, as without warmup.
+
+API_WARMUP=0 disables warmup (the app is then ready immediately).
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from starlette.types import ASGIApp
+
+from backend.api.concurrency import run_cpu
+from backend.services.data_loader import ENCODED_COLUMNS, DataLoader, get_data_loader
+
+# Dashboard requests precomputed at startup: (path, query string), as the frontend sends them
+WARM_REQUESTS: List[Tuple[str, str]] = [
+    ("/api/suppliers/roi", ""),
+    ("/api/suppliers/cheaper-alternatives", "min_savings_percent=5"),
+    ("/api/products/innovative", "min_suppliers=1&sort_by=suppliers"),
+    ("/api/products/in-store", ""),
+    ("/api/products/orders", ""),
+]
+
+
+def warmup_enabled() -> bool:
+    """Whether the app warms up at startup (API_WARMUP, default on)."""
+    return os.getenv("API_WARMUP", "1").lower() not in ("0", "false", "no")
+
+
+def data_steps(data_loader: DataLoader) -> List[Tuple[str, Callable[[], Any]]]:
+    """Warmup steps building the data and derived values, in dependency order."""
+    from backend.services.basket_optimizer_service import BasketOptimizerService
+    from backend.services.price_refresh_service import get_price_refresh_service
+    from backend.services.product_identity import get_product_identity
+    from backend.services.supplier_analysis_service import SupplierAnalysisService
+
+    def load_tables() -> None:
+        data_loader.load_in_store_products()
+        data_loader.load_available_products()
+        data_loader.load_fournisseurs()
+
+    def load_models() -> None:
+        data_loader.load_in_store_products_models()
+        data_loader.load_available_products_models()
+        data_loader.load_fournisseurs_models()
+
+    steps: List[Tuple[str, Callable[[], Any]]] = [
+        ("tables", load_tables),
+        ("models", load_models),
+        ("vocabularies", data_loader.get_vocabularies),
+    ]
+    steps += [
+        (f"encoded:{file_name}", lambda file_name=file_name: data_loader.load_encoded(file_name))
+        for file_name in ENCODED_COLUMNS
+    ]
+    steps += [
+        ("product_identity", lambda: get_product_identity(data_loader)),
+        ("alternatives_index", lambda: SupplierAnalysisService().get_alternatives_index()),
+        ("offer_index", lambda: BasketOptimizerService().get_offer_index()),
+        ("refresh_index", lambda: get_price_refresh_service().get_index()),
+    ]
+    return steps
+
+
+async def call_route(app: ASGIApp, path: str, query_string: str = "") -> int:
+    """
+    Send a warmup GET request to the app, in process.
+
+    Returns:
+        The response status code
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "server": ("warmup", 80),
+        "client": None,
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query_string.encode(),
+        "headers": [(b"host", b"warmup")],
+        "warmup": True,
+    }
+    status: Dict[str, int] = {}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message) -> None:
+        if message["type"] == "http.response.start":
+            status["code"] = message["status"]
+
+    await app(scope, receive, send)
+    return status.get("code", 500)
+
+
+class Warmup:
+    """Warms the data and response caches in the background, and reports readiness."""
+
+    def __init__(
+        self,
+        data_loader: Optional[DataLoader] = None,
+        requests: Optional[List[Tuple[str, str]]] = None,
+    ):
+        """
+        Initialize the warmup.
+
+        Args:
+            data_loader: Loader to warm (default: global loader, the one the services use)
+            requests: (path, query string) requests to precompute (default: WARM_REQUESTS)
+        """
+        self.data_loader = data_loader or get_data_loader()
+        self.requests = WARM_REQUESTS if requests is None else requests
+        self.state = "cold"
+        self.steps: List[Dict[str, Any]] = []
+        self.started_at: Optional[str] = None
+        self.duration_ms: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state in ("warm", "disabled")
+
+    def start(self, app: Optional[ASGIApp] = None) -> None:
+        """
+        Start warming in the background (call from the running event loop).
+
+        Args:
+            app: Application serving the warm requests (None: data only)
+        """
+        if not warmup_enabled():
+            self.state = "disabled"
+            return
+        self.state = "warming"
+        self._task = asyncio.get_running_loop().create_task(self.run(app))
+
+    async def stop(self) -> None:
+        """Cancel an unfinished warmup."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _step(self, name: str, work) -> None:
+        """Run one step, recording its duration and error."""
+        start = time.perf_counter()
+        step: Dict[str, Any] = {"name": name, "ok": True}
+        try:
+            await work()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            step.update(ok=False, error=f"{type(e).__name__}: {e}")
+        step["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        self.steps.append(step)
+
+    async def run(self, app: Optional[ASGIApp] = None) -> None:
+        """Run every step, data first, then the warm requests."""
+        self.state = "warming"
+        self.steps = []
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        start = time.perf_counter()
+
+        for name, build in data_steps(self.data_loader):
+            await self._step(name, lambda build=build: run_cpu(build))
+
+        if app is not None:
+            for path, query_string in self.requests:
+
+                async def request(path=path, query_string=query_string) -> None:
+                    status = await call_route(app, path, query_string)
+                    if status >= 400:
+                        raise RuntimeError(f"status {status}")
+
+                name = f"GET {path}" + (f"?{query_string}" if query_string else "")
+                await self._step(name, request)
+
+        self.duration_ms = round((time.perf_counter() - start) * 1000, 1)
+        self.state = "warm"
+
+    def status(self) -> Dict[str, Any]:
+        """Readiness report: state, data version and each step's build time."""
+        return {
+            "ready": self.ready,
+            "state": self.state,
+            "data_version": self.data_loader.data_version,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "steps": self.steps,
+        }
+
+
+# Global instance, started by the app lifespan
+warmup = Warmup()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark the basket optimizer on a synthetic catalog.
+
+Usage:
+    python -m backend.benchmarks.bench_basket_optimizer [--lines N] [--suppliers S] [--offers O]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from backend.services.basket_optimizer_service import BasketOptimizerService
+from backend.services.data_loader import DataLoader
+from backend.services.models import BasketLine, BasketOptimizationRequest
+
+
+def make_catalog(data_dir: Path, products: int, suppliers: int, offers: int, seed: int = 0) -> None:
+    """Write fournisseur.csv and available_product.csv with `offers` offers per product."""
+    rng = np.random.default_rng(seed)
+    pd.DataFrame(
+        {
+            "id": [f"supp_{i}" for i in range(suppliers)],
+            "name": [f"Supplier {i}" for i in range(suppliers)],
+            "phone_number": [f"+33 1 00 00 {i:02d} 00" for i in range(suppliers)],
+        }
+    ).to_csv(data_dir / "fournisseur.csv", index=False)
+
+    rows = []
+    supplier_level = rng.uniform(0.8, 1.2, size=suppliers)
+    for product in range(products):
+        base = rng.uniform(1, 100)
+        for supplier in rng.choice(suppliers, size=offers, replace=False):
+            rows.append(
+                {
+                    "id": f"prod_{product}",
+                    "name": f"Product {product}",
+                    "fournisseur": f"supp_{supplier}",
+                    "price": round(base * supplier_level[supplier] * rng.uniform(0.9, 1.1), 2),
+                    "delivery_time": int(rng.integers(1, 15)),
+                    "last_information_update": "2025-11-01 10:00:00",
+                }
+            )
+    pd.DataFrame(rows).to_csv(data_dir / "available_product.csv", index=False)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the basket optimizer")
+    parser.add_argument("--lines", type=int, default=1000)
+    parser.add_argument("--suppliers", type=int, default=20)
+    parser.add_argument("--offers", type=int, default=10, help="Offers per product")
+    args = parser.parse_args()
+
+    data_dir = Path(tempfile.mkdtemp())
+    make_catalog(data_dir, args.lines, args.suppliers, args.offers)
+    service = BasketOptimizerService()
+    service.data_loader = DataLoader(data_dir)
+    service.get_offer_index()
+
+    rng = np.random.default_rng(1)
+    lines = [
+        BasketLine(
+            product_id=f"prod_{i}",
+            quantity=int(rng.integers(1, 100)),
+            max_delivery_time=int(rng.integers(7, 15)),
+        )
+        for i in range(args.lines)
+    ]
+
+    print(f"{args.lines} lines, {args.suppliers} suppliers, {args.offers} offers per product\n")
+    scenarios = [
+        ("unconstrained", BasketOptimizationRequest(lines=lines)),
+        ("max 10 suppliers", BasketOptimizationRequest(lines=lines, max_suppliers=10)),
+        (
+            "max 10 + min 5000",
+            BasketOptimizationRequest(
+                lines=lines, max_suppliers=10, default_min_order_amount=5000.0
+            ),
+        ),
+    ]
+    for label, request in scenarios:
+        start = time.perf_counter()
+        result = service.optimize(request)
+        elapsed = time.perf_counter() - start
+        gap = (result.total_cost / result.lower_bound - 1) * 100 if result.feasible else float("nan")
+        print(
+            f"{label:<20} {elapsed * 1000:8.1f} ms  suppliers={len(result.suppliers):<3} "
+            f"unassigned={len(result.unassigned):<4} gap={gap:.2f}% optimal={result.optimal}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark the demand forecast on a synthetic order history.
+
+Measures a full build and an incremental update with a day of new orders.
+
+Usage:
+    python -m backend.benchmarks.bench_demand_forecast [--skus N] [--orders M] [--weeks W]
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from backend.services.demand_forecast_service import DemandForecastService
+
+
+def make_orders(skus: int, orders: int, weeks: int, now: datetime, seed: int = 0) -> pd.DataFrame:
+    """Generate random orders spread over the last `weeks` weeks."""
+    rng = np.random.default_rng(seed)
+    offsets = rng.integers(0, weeks * 7 * 24 * 3600, size=orders)
+    dates = pd.Timestamp(now) - pd.to_timedelta(offsets, unit="s")
+    return pd.DataFrame(
+        {
+            "order_id": [f"order_{i}" for i in range(orders)],
+            "product_name": [f"Product {i}" for i in rng.integers(0, skus, size=orders)],
+            "quantity": rng.integers(1, 500, size=orders),
+            "order_date": dates.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+    )
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the demand forecast")
+    parser.add_argument("--skus", type=int, default=100_000)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--weeks", type=int, default=52)
+    args = parser.parse_args()
+
+    now = datetime(2025, 11, 12, 12, 0, 0)
+    orders = make_orders(args.skus, args.orders, args.weeks, now)
+    new_orders = make_orders(args.skus, args.orders // 365, 1, now + timedelta(days=1), seed=1)
+    new_orders["order_id"] = "new_" + new_orders["order_id"]
+
+    service = DemandForecastService()
+
+    print(f"{args.orders} orders, {args.skus} SKUs, {args.weeks} weeks\n")
+
+    start = time.perf_counter()
+    forecast = service.build(orders, now)
+    print(f"{'full build':<22} {time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    forecast.weekly_rates
+    print(f"{'rates lookup table':<22} {time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    updated = service._update(forecast, new_orders, now + timedelta(days=1))
+    print(f"{'incremental update':<22} {time.perf_counter() - start:.3f}s")
+
+    rebuilt = service.build(pd.concat([orders, new_orders], ignore_index=True), now + timedelta(days=1))
+    order = rebuilt.product_names.get_indexer(updated.product_names)
+    assert np.allclose(updated.levels[:, -1], rebuilt.levels[order, -1])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark dictionary-encoded IDs and names against plain string columns.
+
+Builds a synthetic catalog, then compares the object-dtype frames with the
+frames encoded through shared Vocabulary dictionaries (as
+DataLoader.load_encoded returns them): memory footprint, the in-store /
+offer join on product ID, and a per-supplier groupby.
+
+Usage:
+    python -m backend.benchmarks.bench_encoding [--offers N] [--suppliers S] [--repeat R]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from backend.services.data_loader import Vocabulary
+
+
+def make_catalog(offers: int, suppliers: int, seed: int = 0):
+    """Generate offers and in-store products with string IDs and names."""
+    rng = np.random.default_rng(seed)
+    products = offers // suppliers
+    product = np.repeat(np.arange(products), suppliers)
+    available = pd.DataFrame(
+        {
+            "id": [f"prod_{p}" for p in product],
+            "name": [f"Product {p}" for p in product],
+            "fournisseur": [f"supp_{s}" for s in np.tile(np.arange(suppliers), products)],
+            "price": rng.uniform(1, 100, len(product)).round(2),
+        }
+    )
+    stocked = range(0, products, 2)
+    in_store = pd.DataFrame(
+        {
+            "id": [f"prod_{p}" for p in stocked],
+            "name": [f"Product {p}" for p in stocked],
+            "fournisseur_id": "supp_0",
+            "price": rng.uniform(1, 100, len(stocked)).round(2),
+        }
+    )
+    return available, in_store
+
+
+def encode(available: pd.DataFrame, in_store: pd.DataFrame):
+    """Encode both frames with one dictionary per domain."""
+    products = Vocabulary(pd.concat([available["id"], in_store["id"]]))
+    names = Vocabulary(pd.concat([available["name"], in_store["name"]]))
+    suppliers = Vocabulary(pd.concat([available["fournisseur"], in_store["fournisseur_id"]]))
+    available = available.astype(
+        {"id": products.dtype, "name": names.dtype, "fournisseur": suppliers.dtype}
+    )
+    in_store = in_store.astype(
+        {"id": products.dtype, "name": names.dtype, "fournisseur_id": suppliers.dtype}
+    )
+    return available, in_store
+
+
+def best(fn, repeat: int) -> float:
+    """Best wall time of fn over repeat runs."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark dictionary encoding")
+    parser.add_argument("--offers", type=int, default=1_000_000)
+    parser.add_argument("--suppliers", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    available, in_store = make_catalog(args.offers, args.suppliers)
+    print(f"{args.offers} offers, {len(in_store)} in-store products\n")
+
+    start = time.perf_counter()
+    enc_available, enc_in_store = encode(available, in_store)
+    print(f"{'encoding':<26} {time.perf_counter() - start:.3f}s\n")
+
+    # Joins and groupbys run on the int32 codes, as the services do
+    codes_available = pd.DataFrame(
+        {
+            "id": enc_available["id"].cat.codes,
+            "fournisseur": enc_available["fournisseur"].cat.codes,
+            "price": enc_available["price"],
+        }
+    )
+    codes_in_store = pd.DataFrame(
+        {"id": enc_in_store["id"].cat.codes, "price": enc_in_store["price"]}
+    )
+
+    rows = [
+        (
+            "memory (MB)",
+            (available.memory_usage(deep=True).sum() + in_store.memory_usage(deep=True).sum())
+            / 1e6,
+            (
+                enc_available.memory_usage(deep=True).sum()
+                + enc_in_store.memory_usage(deep=True).sum()
+            )
+            / 1e6,
+        ),
+        (
+            "join on product ID (s)",
+            best(lambda: in_store.merge(available, on="id"), args.repeat),
+            best(lambda: codes_in_store.merge(codes_available, on="id"), args.repeat),
+        ),
+        (
+            "groupby supplier (s)",
+            best(lambda: available.groupby("fournisseur")["price"].mean(), args.repeat),
+            best(lambda: codes_available.groupby("fournisseur")["price"].mean(), args.repeat),
+        ),
+    ]
+    print(f"{'':<26} {'strings':>10} {'encoded':>10}")
+    for label, before, after in rows:
+        print(f"{label:<26} {before:>10.3f} {after:>10.3f}")
+
+    merged = codes_in_store.merge(codes_available, on="id")
+    expected = in_store.merge(available, on="id")
+    assert len(merged) == len(expected)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark the price refresh queue on a synthetic catalog.
+
+Measures the index build (once per data version), a queue read with
+top-k selection, and the full sort it replaces.
+
+Usage:
+    python -m backend.benchmarks.bench_price_refresh [--offers N] [--suppliers S] [--k K]
+"""
+
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from backend.services.price_refresh_service import RefreshIndex
+
+
+def make_catalog(offers: int, suppliers: int, seed: int = 0):
+    """Generate offers, in-store products, suppliers and weekly rates."""
+    rng = np.random.default_rng(seed)
+    products = offers // suppliers
+    product = np.repeat(np.arange(products), suppliers)
+    dates = pd.Timestamp("2025-11-12") - pd.to_timedelta(
+        rng.integers(0, 180 * 24 * 3600, size=len(product)), unit="s"
+    )
+    available = pd.DataFrame(
+        {
+            "id": [f"prod_{p}" for p in product],
+            "name": [f"Product {p}" for p in product],
+            "fournisseur": [f"supp_{s}" for s in np.tile(np.arange(suppliers), products)],
+            "price": rng.uniform(1, 100, len(product)).round(2),
+            "delivery_time": rng.integers(1, 15, len(product)),
+            "last_information_update": dates.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+    )
+    in_store = pd.DataFrame(
+        {
+            "id": [f"prod_{p}" for p in range(0, products, 2)],
+            "name": [f"Product {p}" for p in range(0, products, 2)],
+            "price": rng.uniform(1, 100, len(range(0, products, 2))).round(2),
+            "fournisseur_id": "supp_0",
+            "stock": 10,
+        }
+    )
+    fournisseurs = pd.DataFrame(
+        {"id": [f"supp_{s}" for s in range(suppliers)], "name": [f"Supplier {s}" for s in range(suppliers)]}
+    )
+    rates = {f"Product {p}": float(r) for p, r in enumerate(rng.exponential(20, products))}
+    return available, in_store, fournisseurs, rates
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the price refresh queue")
+    parser.add_argument("--offers", type=int, default=1_000_000)
+    parser.add_argument("--suppliers", type=int, default=10)
+    parser.add_argument("--k", type=int, default=200)
+    args = parser.parse_args()
+
+    now = datetime(2025, 11, 12, 12, 0, 0)
+    catalog = make_catalog(args.offers, args.suppliers)
+    print(f"{args.offers} offers, {args.suppliers} suppliers, top {args.k}\n")
+
+    start = time.perf_counter()
+    index = RefreshIndex(*catalog)
+    print(f"{'index build':<22} {time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    rows, _, _ = index.top(args.k, now)
+    print(f"{'top-k queue read':<22} {time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    priority = index.staleness_days(now) * index.impact
+    order = np.lexsort((np.arange(len(index)), -priority))[: args.k]
+    print(f"{'full sort':<22} {time.perf_counter() - start:.3f}s")
+    assert rows.tolist() == order.tolist()
+
+
+if __name__ == "__main__":
+    main()
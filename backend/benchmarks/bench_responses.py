@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark response encoding: latency and payload size.
+
+Part 1 serves a synthetic in-store product list through three encodings:
+- default: returned model validated against response_model, standard encoder;
+- validated: model validated once, serialized by pydantic-core;
+- fast: pre-validated data encoded with the fast encoder.
+
+Part 2 measures the real endpoints on the current data, cold and warm,
+with and without compression.
+
+Usage:
+    python -m backend.benchmarks.bench_responses [--products N] [--repeat R]
+"""
+
+import argparse
+import time
+
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from backend.api import fast_json
+from backend.api.response_cache import ResponseCache
+from backend.services.models import InventoryProductsResponse
+
+
+def make_products(count: int) -> list:
+    """Generate enriched in-store products."""
+    return [
+        {
+            "id": f"prod_{i:08d}",
+            "sku": f"PROD{i:04d}",
+            "name": f"Product {i}",
+            "category": "General",
+            "supplier": f"Supplier {i % 50}",
+            "supplier_id": f"supp_{i % 50}",
+            "type": "in-house",
+            "currentPrice": 12.5 + i % 100,
+            "currentPriceSupplier": f"Supplier {i % 50}",
+            "bestPrice": 10.25 + i % 100,
+            "bestPriceSupplier": f"Supplier {(i + 1) % 50}",
+            "bestPriceSupplierId": f"supp_{(i + 1) % 50}",
+            "sellPrice": 17.5 + i % 100,
+            "currentMargin": 28.6,
+            "bestMargin": 41.4,
+            "currentDeliveryTime": 5,
+            "currentDeliverySupplier": f"Supplier {i % 50}",
+            "bestDeliveryTime": 2,
+            "bestDeliverySupplier": f"Supplier {(i + 2) % 50}",
+            "bestDeliverySupplierId": f"supp_{(i + 2) % 50}",
+            "marginImprovementPossible": True,
+            "deliveryImprovementPossible": True,
+            "dualImprovementSameSupplier": False,
+            "stock": i % 400,
+            "weeklyUse": 1 + i % 60,
+            "stockoutDate": "2026-01-15",
+            "status": "healthy",
+        }
+        for i in range(count)
+    ]
+
+
+def timed(client: TestClient, path: str, repeat: int, headers=None):
+    """Best latency over `repeat` requests, and the last response."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(path, headers=headers or {})
+        best = min(best, time.perf_counter() - start)
+    return best, response
+
+
+def bench_encodings(products: int, repeat: int) -> None:
+    """Part 1: encodings of a synthetic payload."""
+    data = make_products(products)
+    app = FastAPI()
+
+    @app.get("/default", response_model=InventoryProductsResponse)
+    def default():
+        return InventoryProductsResponse(products=data, total_count=len(data))
+
+    @app.get("/validated")
+    def validated():
+        body = ResponseCache.serialize(
+            {"products": data, "total_count": len(data)}, InventoryProductsResponse
+        )
+        return Response(content=body, media_type="application/json")
+
+    @app.get("/fast")
+    def fast():
+        body = fast_json.dumps({"products": data, "total_count": len(data)})
+        return Response(content=body, media_type="application/json")
+
+    client = TestClient(app)
+    print(f"{products} in-store products (orjson: {fast_json.orjson is not None})\n")
+    for path in ["/default", "/validated", "/fast"]:
+        latency, response = timed(
+            client, path, repeat, headers={"Accept-Encoding": "identity"}
+        )
+        print(f"{path:<12} {latency * 1000:8.1f} ms  {len(response.content) / 1e6:6.2f} MB")
+
+    body = fast_json.dumps({"products": data, "total_count": len(data)})
+    for encoding in fast_json.supported_encodings():
+        start = time.perf_counter()
+        compressed = fast_json.compress(body, encoding)
+        print(
+            f"{encoding:<12} {(time.perf_counter() - start) * 1000:8.1f} ms  "
+            f"{len(compressed) / 1e6:6.2f} MB (compression)"
+        )
+
+
+def bench_endpoints(repeat: int) -> None:
+    """Part 2: real endpoints on the current data."""
+    from backend.api.main import app
+
+    client = TestClient(app)
+    paths = [
+        "/api/products/in-store",
+        "/api/products/innovative",
+        "/api/products/orders",
+        "/api/suppliers/roi",
+        "/api/suppliers/cheaper-alternatives",
+    ]
+    print(f"\n{'endpoint':<38} {'cold':>8} {'warm':>8} {'raw':>9} {'gzip':>9}")
+    for path in paths:
+        start = time.perf_counter()
+        raw = client.get(path, headers={"Accept-Encoding": "identity"})
+        cold = time.perf_counter() - start
+        warm, _ = timed(client, path, repeat, headers={"Accept-Encoding": "identity"})
+        _, compressed = timed(client, path, 1, headers={"Accept-Encoding": "gzip"})
+        compressed_size = int(
+            compressed.headers.get("content-length", len(compressed.content))
+        )
+        print(
+            f"{path:<38} {cold * 1000:6.1f}ms {warm * 1000:6.1f}ms "
+            f"{len(raw.content):>8}B {compressed_size:>8}B"
+        )
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark response encoding")
+    parser.add_argument("--products", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    bench_encodings(args.products, args.repeat)
+    bench_endpoints(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
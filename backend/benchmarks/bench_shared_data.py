@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark the memory of API workers reading the files against workers
+mapping the tables a publisher wrote to shared memory.
+
+Starts N worker processes per mode. Each takes a data snapshot, as a worker
+serving requests does, then copies a table out, and reports the private
+memory (Private_Clean + Private_Dirty of /proc/self/smaps_rollup, Linux
+only) each step added, plus the time to its first snapshot. With shared
+data, the snapshot's tables live once in the publisher's segment; the
+first copy decodes the distinct strings of the table, kept for the
+version. Models and derived values (not measured) are per worker in both
+modes.
+
+Usage:
+    python -m backend.benchmarks.bench_shared_data [--scale medium] [--workers 4]
+        [--data-dir DIR]
+"""
+
+import argparse
+import ctypes
+import gc
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from backend.benchmarks.bench_suite import SCALES, prepare_dataset
+from backend.services.data_loader import DataLoader
+from backend.services.shared_data import SharedDataPublisher, SharedDataReader
+
+SHARED_NAME = "bench-shared-data"
+
+
+def private_bytes() -> int:
+    """Private (unshared) resident memory of this process, freed memory returned first."""
+    gc.collect()
+    ctypes.CDLL("libc.so.6").malloc_trim(0)
+    total = 0
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith(("Private_Clean:", "Private_Dirty:")):
+                total += int(line.split()[1]) * 1024
+    return total
+
+
+def worker(data_dir: Path, shared: Optional[str], results, done) -> None:
+    """Take a snapshot and copy a table out, report the memory added, then wait."""
+    loader = DataLoader(data_dir, shared=SharedDataReader(shared) if shared else None)
+    before = private_bytes()
+    start = time.perf_counter()
+    loader.current_snapshot()
+    snapshot_ms = (time.perf_counter() - start) * 1000
+    after_snapshot = private_bytes()
+    # A request copies a table out; the copy is released after the response
+    loader.load_available_products()
+    results.put(
+        {
+            "snapshot": after_snapshot - before,
+            "first_copy": private_bytes() - after_snapshot,
+            "snapshot_ms": snapshot_ms,
+        }
+    )
+    done.wait()
+
+
+def run_workers(data_dir: Path, workers: int, shared: Optional[str]) -> List[Dict]:
+    """Start the workers and collect their reports."""
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    done = context.Event()
+    processes = [
+        context.Process(target=worker, args=(data_dir, shared, results, done))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    reports = [results.get(timeout=300) for _ in processes]
+    done.set()
+    for process in processes:
+        process.join()
+    return reports
+
+
+def print_reports(mode: str, reports: List[Dict]) -> None:
+    """Print the median of each measure over the workers."""
+
+    def median(key: str) -> float:
+        values = sorted(report[key] for report in reports)
+        return values[len(values) // 2]
+
+    print(
+        f"{mode:<8} {len(reports):>7} {median('snapshot') / 1e6:>12.1f} "
+        f"{median('first_copy') / 1e6:>14.1f} {median('snapshot_ms'):>12.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker memory with and without shared data")
+    parser.add_argument("--scale", default="medium", choices=list(SCALES))
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=Path(tempfile.gettempdir()) / "bench_suite_data",
+    )
+    args = parser.parse_args()
+
+    data_dir = prepare_dataset(args.data_dir, args.scale)
+    publisher = SharedDataPublisher(SHARED_NAME, data_dir)
+    try:
+        start = time.perf_counter()
+        publisher.refresh()
+        publish_ms = (time.perf_counter() - start) * 1000
+        print(
+            f"Published {args.scale} dataset: {publisher.size / 1e6:.1f} MB "
+            f"in {publish_ms:.0f} ms (medians per worker below)\n"
+        )
+        print(
+            f"{'mode':<8} {'workers':>7} {'snapshot MB':>12} {'first copy MB':>14} "
+            f"{'snapshot ms':>12}"
+        )
+        print_reports("files", run_workers(data_dir, args.workers, None))
+        print_reports("shared", run_workers(data_dir, args.workers, SHARED_NAME))
+    finally:
+        publisher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite over the service hot paths, at several dataset scales.
+
+Datasets come from the seeded synthetic generator (data/generate_fake_data.py)
+and are cached in --data-dir, so reruns time the same data. Every case is
+timed `repeat` times; derived caches are dropped before each run (with the
+CSV files already parsed), so the timings cover the computation, not a cache
+hit. The DataLoader cases time the CSV and model loading itself.
+
+Results are written as a JSON baseline. `compare` diffs two result files and
+exits with status 1 if a case got slower than the threshold.
+
+Usage:
+    python -m backend.benchmarks.bench_suite run [--scales small,medium] [--repeat R]
+        [--output results.json] [--data-dir DIR]
+    python -m backend.benchmarks.bench_suite compare BASELINE CURRENT [--threshold 0.2]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.controllers import agent_controller
+from backend.services import data_loader as data_loader_module
+from backend.services.data_loader import DataLoader
+from backend.services.inventory_service import InventoryService
+from backend.services.order_updater_service import OrderUpdater
+from backend.services.product_discovery_service import ProductDiscoveryService
+from backend.services.product_updater_service import ProductUpdater
+from backend.services.supplier_analysis_service import SupplierAnalysisService
+
+GENERATOR = Path(__file__).resolve().parents[2] / "data" / "generate_fake_data.py"
+
+# Generator parameters per scale, plus the number of call transcripts
+SCALES: Dict[str, dict] = {
+    "small": dict(
+        n_suppliers=50, n_offers=2_000, n_in_store=500, n_orders=2_000, transcripts=20
+    ),
+    "medium": dict(
+        n_suppliers=500, n_offers=50_000, n_in_store=5_000, n_orders=50_000, transcripts=200
+    ),
+    "large": dict(
+        n_suppliers=5_000,
+        n_offers=500_000,
+        n_in_store=50_000,
+        n_orders=500_000,
+        transcripts=1_000,
+    ),
+}
+
+SEED = 42
+# Dates of the datasets, fixed so cached datasets stay comparable
+NOW = datetime(2025, 11, 12, 12, 0, 0)
+# Parser updates applied per OrderUpdater / ProductUpdater run
+UPDATES_PER_RUN = 20
+# Slowdowns smaller than this (seconds) are noise, never regressions
+MIN_REGRESSION_SECONDS = 0.001
+
+
+def load_generator():
+    """Import the fake data generator script as a module."""
+    spec = importlib.util.spec_from_file_location("generate_fake_data", GENERATOR)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def write_transcripts(
+    directory: Path, fournisseurs: pd.DataFrame, count: int, seed: int = SEED
+):
+    """Write synthetic call transcripts, as saved after agent calls."""
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    agents = ["products", "delivery", "availability"]
+    for i in range(count):
+        timestamp = NOW - timedelta(minutes=int(rng.integers(0, 30 * 24 * 60)))
+        messages = [
+            {"role": "user" if j % 2 else "agent", "text": f"Message {j} of call {i}."}
+            for j in range(int(rng.integers(4, 20)))
+        ]
+        transcript = {
+            "conversation_id": f"conv_{i:08d}",
+            "supplier_name": str(fournisseurs["name"].iloc[i % len(fournisseurs)]),
+            "agent_id": "agent_bench",
+            "agent_name": agents[i % len(agents)],
+            "timestamp": timestamp.isoformat(),
+            "messages": messages,
+            "total_messages": len(messages),
+        }
+        with open(directory / f"{i:08d}.json", "w", encoding="utf-8") as f:
+            json.dump(transcript, f)
+
+
+def prepare_dataset(data_dir: Path, scale: str) -> Path:
+    """Generate the dataset of a scale, unless already cached."""
+    params = dict(SCALES[scale])
+    transcripts = params.pop("transcripts")
+    directory = data_dir / f"{scale}-seed{SEED}"
+    if (directory / "orders.csv").exists():
+        return directory
+
+    print(f"Generating {scale} dataset in {directory}...")
+    load_generator().generate(directory, seed=SEED, now=NOW, **params)
+    fournisseurs = pd.read_csv(directory / "fournisseur.csv")
+    write_transcripts(directory / "transcripts", fournisseurs, transcripts)
+    return directory
+
+
+@contextmanager
+def use_dataset(directory: Path) -> Iterator[DataLoader]:
+    """Point the global data loader and the transcript folder at a dataset."""
+    previous_loader = data_loader_module._data_loader
+    previous_transcripts = agent_controller.load_transcripts_from_folder
+    loader = DataLoader(directory)
+    data_loader_module._data_loader = loader
+    agent_controller.load_transcripts_from_folder = partial(
+        previous_transcripts, transcripts_dir=directory / "transcripts"
+    )
+    try:
+        yield loader
+    finally:
+        data_loader_module._data_loader = previous_loader
+        agent_controller.load_transcripts_from_folder = previous_transcripts
+
+
+def measure(
+    run: Callable[[], object],
+    repeat: int,
+    setup: Optional[Callable[[], object]] = None,
+) -> dict:
+    """Best and median wall time of run over repeat runs, setup excluded."""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return {"best": min(times), "median": statistics.median(times)}
+
+
+def parser_updates(
+    keys: pd.DataFrame, changes: Callable[[int], dict]
+) -> Dict[str, dict]:
+    """Parser-style updates {"[product, supplier name]": changes} for rows of keys."""
+    return {
+        f"[{row.product_name}, {row.supplier_name}]": changes(i)
+        for i, row in enumerate(keys.itertuples(index=False))
+    }
+
+
+def build_cases(
+    directory: Path, loader: DataLoader
+) -> List[Tuple[str, Callable, Optional[Callable]]]:
+    """Cases of a dataset, as (name, run, setup)."""
+
+    def load_all(target: DataLoader):
+        target.load_in_store_products_models()
+        target.load_available_products_models()
+        target.load_fournisseurs_models()
+        target.load_orders()
+
+    def fresh_derived():
+        # Files are parsed again (untimed), caches derived from them are rebuilt
+        loader.rebuild(prebuild=False)
+        load_all(loader)
+
+    cold_loader: List[DataLoader] = []
+
+    def new_loader():
+        cold_loader[:] = [DataLoader(directory)]
+
+    inventory = InventoryService(directory)
+    suppliers = SupplierAnalysisService(directory)
+    discovery = ProductDiscoveryService(directory)
+
+    fournisseurs = loader.load_fournisseurs()
+    supplier_names = dict(zip(fournisseurs["id"], fournisseurs["name"]))
+    mapping = dict(zip(fournisseurs["name"], fournisseurs["id"]))
+    orders = loader.load_orders()
+    offers = loader.load_available_products()
+    product_id = str(loader.load_in_store_products()["id"].iloc[0])
+
+    pending = orders[orders["time_of_arrival"].isna()].drop_duplicates(
+        ["product_name", "fournisseur_id"]
+    )
+    order_updates = parser_updates(
+        pd.DataFrame(
+            {
+                "product_name": pending["product_name"],
+                "supplier_name": pending["fournisseur_id"].map(supplier_names),
+            }
+        ).head(UPDATES_PER_RUN),
+        lambda i: {"delay_days": 1 + i % 5},
+    )
+    product_updates = parser_updates(
+        pd.DataFrame(
+            {
+                "product_name": offers["name"],
+                "supplier_name": offers["fournisseur"].map(supplier_names),
+            }
+        ).drop_duplicates().head(UPDATES_PER_RUN),
+        lambda i: {"price": 10.0 + i, "delivery_time": 1 + i % 14},
+    )
+
+    order_updater = OrderUpdater(str(directory / "orders.csv"))
+    product_updaters: List[ProductUpdater] = []
+
+    def reset_order_updater():
+        order_updater.df = orders.copy()
+
+    def reset_product_updater():
+        product_updaters[:] = [ProductUpdater(str(directory / "available_product.csv"))]
+        product_updaters[0].df = offers.copy()
+
+    return [
+        (
+            "data_loader.cold",
+            lambda: load_all(cold_loader[0]),
+            new_loader,
+        ),
+        ("data_loader.warm", lambda: load_all(loader), None),
+        (
+            "inventory.in_store_products_enriched",
+            inventory.get_in_store_products_enriched,
+            fresh_derived,
+        ),
+        ("inventory.active_orders", inventory.get_active_orders, fresh_derived),
+        (
+            "inventory.product_suppliers",
+            lambda: inventory.get_product_suppliers(product_id),
+            fresh_derived,
+        ),
+        (
+            "supplier.cheaper_alternatives",
+            suppliers.find_cheaper_alternatives,
+            fresh_derived,
+        ),
+        ("supplier.roi", suppliers.get_supplier_roi, fresh_derived),
+        (
+            "discovery.innovative_products",
+            discovery.find_innovative_products,
+            fresh_derived,
+        ),
+        (
+            "order_updater.apply_updates",
+            lambda: order_updater.apply_updates(order_updates, mapping),
+            reset_order_updater,
+        ),
+        (
+            "product_updater.apply_updates",
+            lambda: product_updaters[0].apply_updates(product_updates, mapping),
+            reset_product_updater,
+        ),
+        (
+            "activity.recap",
+            lambda: asyncio.run(agent_controller.get_activity_recap(limit=10)),
+            None,
+        ),
+        (
+            "activity.summary",
+            lambda: asyncio.run(agent_controller.get_activity_summary(limit=10)),
+            None,
+        ),
+    ]
+
+
+def run_suite(scales: List[str], repeat: int, data_dir: Path) -> dict:
+    """
+    Run every case at every scale.
+
+    Returns:
+        Results: {"results": {scale: {case: {"best", "median"}}}, ...metadata}
+    """
+    results: Dict[str, Dict[str, dict]] = {}
+    for scale in scales:
+        directory = prepare_dataset(data_dir, scale)
+        print(f"\n{scale}: {SCALES[scale]}")
+        with use_dataset(directory) as loader:
+            for name, run, setup in build_cases(directory, loader):
+                timing = measure(run, repeat, setup)
+                results.setdefault(scale, {})[name] = timing
+                print(
+                    f"  {name:<40} best {timing['best'] * 1000:9.2f} ms"
+                    f"  median {timing['median'] * 1000:9.2f} ms"
+                )
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "scales": {scale: SCALES[scale] for scale in scales},
+        "results": results,
+    }
+
+
+def compare(
+    baseline: dict, current: dict, threshold: float = 0.2
+) -> List[Tuple[str, str, float, float, float]]:
+    """
+    Find the cases that got slower than the threshold.
+
+    Best times are compared: they are the least noisy. Cases only present
+    in one of the files are skipped.
+
+    Args:
+        baseline: Results of run_suite used as reference
+        current: Results of run_suite to check
+        threshold: Tolerated slowdown (0.2: 20%)
+
+    Returns:
+        (scale, case, baseline seconds, current seconds, ratio) of the regressions
+    """
+    regressions = []
+    for scale, cases in current["results"].items():
+        for name, timing in cases.items():
+            reference = baseline["results"].get(scale, {}).get(name)
+            if reference is None:
+                continue
+            before, after = reference["best"], timing["best"]
+            ratio = after / before if before > 0 else float("inf")
+            if ratio > 1 + threshold and after - before > MIN_REGRESSION_SECONDS:
+                regressions.append((scale, name, before, after, ratio))
+    return regressions
+
+
+def main():
+    """Parse the command line and run or compare."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark suite of the service hot paths"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the suite and write the results")
+    run_parser.add_argument("--scales", default="small,medium")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--output", type=Path, default=Path("bench_results.json"))
+    run_parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=Path(tempfile.gettempdir()) / "bench_suite_data",
+    )
+
+    compare_parser = commands.add_parser(
+        "compare", help="Flag regressions against a baseline"
+    )
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        scales = [scale.strip() for scale in args.scales.split(",") if scale.strip()]
+        unknown = [scale for scale in scales if scale not in SCALES]
+        if unknown:
+            parser.error(f"Unknown scales {unknown}, expected some of {list(SCALES)}")
+        results = run_suite(scales, args.repeat, args.data_dir)
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.output}")
+        return
+
+    baseline = json.loads(args.baseline.read_text())
+    current = json.loads(args.current.read_text())
+    regressions = compare(baseline, current, args.threshold)
+    flagged = {(scale, name) for scale, name, *_ in regressions}
+    print(f"{'scale':<8} {'case':<40} {'baseline':>10} {'current':>10} {'change':>8}")
+    for scale, cases in current["results"].items():
+        for name, timing in cases.items():
+            reference = baseline["results"].get(scale, {}).get(name)
+            if reference is None:
+                print(
+                    f"{scale:<8} {name:<40} {'-':>10} "
+                    f"{timing['best'] * 1000:8.2f}ms     new"
+                )
+                continue
+            change = timing["best"] / reference["best"] - 1 if reference["best"] else 0.0
+            flag = "  REGRESSION" if (scale, name) in flagged else ""
+            print(
+                f"{scale:<8} {name:<40} {reference['best'] * 1000:8.2f}ms "
+                f"{timing['best'] * 1000:8.2f}ms {change:+7.1%}{flag}"
+            )
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+        sys.exit(1)
+    print(f"\nNo regression beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
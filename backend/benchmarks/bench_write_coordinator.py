@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent writers on a CSV table.
+
+Compares two strategies with the same number of writer threads/processes, each
+applying single-row updates:
+- naive: every writer loads the CSV, modifies its copy and saves it (the
+  pre-coordinator behaviour, lost updates expected);
+- coordinated: writers submit mutations to the write coordinator.
+
+Usage:
+    python -m backend.benchmarks.bench_write_coordinator [--rows N] [--writers W] [--updates U]
+"""
+
+import argparse
+import multiprocessing
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from backend.services.write_coordinator import TableWriteCoordinator
+
+
+def make_table(path: Path, rows: int) -> None:
+    """Write a table with one counter per row."""
+    pd.DataFrame(
+        {
+            "id": [f"prod_{i}" for i in range(rows)],
+            "fournisseur": [f"supp_{i % 50}" for i in range(rows)],
+            "counter": np.zeros(rows, dtype=int),
+        }
+    ).to_csv(path, index=False)
+
+
+def naive_writer(path: Path, writer: int, updates: int, rows: int, errors: list) -> None:
+    for i in range(updates):
+        try:
+            df = pd.read_csv(path)
+            df.loc[(writer * updates + i) % rows, "counter"] += 1
+            df.to_csv(path, index=False)
+        except Exception as e:
+            # Torn reads of a file being rewritten by another writer
+            errors.append(e)
+
+
+def coordinated_writer(
+    coordinator: TableWriteCoordinator, writer: int, updates: int, rows: int
+) -> None:
+    futures = []
+    for i in range(updates):
+        row = (writer * updates + i) % rows
+
+        def mutation(df, row=row):
+            df.loc[row, "counter"] += 1
+
+        futures.append(coordinator.submit(mutation))
+    for future in futures:
+        future.result()
+
+
+def process_writer(path: str, writer: int, updates: int, rows: int) -> None:
+    coordinator = TableWriteCoordinator(path, backup=False)
+    coordinated_writer(coordinator, writer, updates, rows)
+
+
+def run_threads(target, args_list) -> float:
+    threads = [threading.Thread(target=target, args=args) for args in args_list]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def report(name: str, path: Path, expected: int, elapsed: float) -> None:
+    total = int(pd.read_csv(path)["counter"].sum())
+    print(
+        f"{name:<28} {expected / elapsed:>10.1f} updates/s   "
+        f"applied {total}/{expected} ({expected - total} lost)"
+    )
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark concurrent CSV writers")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--updates", type=int, default=25)
+    parser.add_argument("--backup", action="store_true", help="Record delta backups")
+    args = parser.parse_args()
+
+    expected = args.writers * args.updates
+    temp_dir = Path(tempfile.mkdtemp())
+    print(f"{args.writers} writers x {args.updates} updates on {args.rows} rows\n")
+
+    path = temp_dir / "naive.csv"
+    make_table(path, args.rows)
+    errors = []
+    elapsed = run_threads(
+        naive_writer,
+        [(path, w, args.updates, args.rows, errors) for w in range(args.writers)],
+    )
+    try:
+        report("naive (threads)", path, expected, elapsed)
+    except Exception as e:
+        print(f"{'naive (threads)':<28} table corrupted: {e}")
+    print(f"{'':<28} {len(errors)} failed read(s)/write(s)")
+
+    path = temp_dir / "coordinated.csv"
+    make_table(path, args.rows)
+    coordinator = TableWriteCoordinator(path, backup=args.backup)
+    elapsed = run_threads(
+        coordinated_writer,
+        [(coordinator, w, args.updates, args.rows) for w in range(args.writers)],
+    )
+    report("coordinated (threads)", path, expected, elapsed)
+    print(
+        f"{'':<28} {coordinator.writes} write(s), "
+        f"{coordinator.mutations / max(1, coordinator.writes):.1f} mutations/write"
+    )
+
+    path = temp_dir / "processes.csv"
+    make_table(path, args.rows)
+    processes = [
+        multiprocessing.Process(
+            target=process_writer, args=(str(path), w, args.updates, args.rows)
+        )
+        for w in range(args.writers)
+    ]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    report("coordinated (processes)", path, expected, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,851 @@
+#!/usr/bin/env python3
+"""
+Offline load test of the FastAPI app.
+
+Virtual users replay a weighted mix of /api/products/*, /api/suppliers/*
+and /api/agent/* traffic against backend.api.main:app, either in-process
+(httpx over ASGI, no network) or against a running server (--target). Each
+user loops until the deadline: pick a scenario, run it, think. Agent calls
+POST /api/agent/start and poll the task status until the call and its
+parsing are done, as the UI does.
+
+Mistral, ElevenLabs and Twilio are replaced by local fakes with configurable
+latency and error rate, so the whole call pipeline (outbound call, Twilio
+status polling, transcript fetch, Mistral parsing, CSV updates, cache
+reloads) runs without network access or API keys. The pipeline's own fixed
+waits (5 s Twilio poll interval, 3 s transcript delay) are kept, so a call
+takes at least 8 s end to end.
+
+The app serves a copy of the dataset in a temporary sandbox: calls write
+transcripts and CSV updates under ./data, which is the sandbox during the
+run. Datasets come from the benchmark suite's cached synthetic data
+(--scale) or from a directory (--data). To load a separate server process,
+start it with `serve` (same fakes and sandbox) and point `run --target` at
+it with the same dataset options, so requests use IDs it knows.
+
+The report gives, per endpoint: request count, throughput, error rate and
+p50/p95/p99 latency. In-process latencies include the client, which shares
+the event loop with the app.
+
+Usage:
+    python -m backend.benchmarks.load_test run [--profile mixed] [--users 20]
+        [--duration 30] [--think-time 0.5] [--scale small | --data DIR]
+        [--target http://localhost:8000] [--output report.json]
+        [--mistral-latency 1.5] [--elevenlabs-latency 0.3] [--twilio-latency 0.2]
+        [--call-duration 0] [--fake-error-rate 0.0]
+    python -m backend.benchmarks.load_test serve [--port 8000]
+        [--scale small | --data DIR]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+import numpy as np
+import pandas as pd
+
+from backend.benchmarks.bench_suite import SCALES, prepare_dataset
+from backend.services import data_loader as data_loader_module
+from backend.services.data_loader import DataLoader
+
+# Environment of the fakes: every variable the call pipeline reads
+FAKE_ENV = {
+    "ELEVENLABS_API_KEY": "fake-elevenlabs-key",
+    "MISTRAL_API_KEY": "fake-mistral-key",
+    "AGENT_DELIVERY_ID": "agent_fake_delivery",
+    "AGENT_AVAILABILITY_ID": "agent_fake_availability",
+    "AGENT_PRODUCTS_ID": "agent_fake_products",
+    "TWILIO_PHONE_NUMBER_ID": "phnum_fake",
+    "TWILIO_ACCOUNT_SID": "AC_fake",
+    "TWILIO_AUTH_TOKEN": "fake-twilio-token",
+    "MY_PHONE_NUMBER": "+33100000000",
+}
+
+# Supplier answer in fake transcripts, parsed back by the fake Mistral
+ANSWER = "{product} costs {price:.2f} euros, delivery in {days} days."
+ANSWER_PATTERN = re.compile(
+    r"^\w+: (?P<product>.+) costs (?P<price>[\d.]+) euros, "
+    r"delivery in (?P<days>\d+) days\.$",
+    re.MULTILINE,
+)
+
+
+class FakeServiceError(Exception):
+    """Failure injected by a fake service."""
+
+
+class FakeServices:
+    """
+    Local stand-ins for Mistral, ElevenLabs and Twilio.
+
+    Every fake API call sleeps for its service latency (+/- jitter) and fails
+    with probability error_rate. Calls "ring" for call_duration seconds:
+    Twilio reports them in-progress until then.
+    """
+
+    def __init__(
+        self,
+        mistral_latency: float = 1.5,
+        elevenlabs_latency: float = 0.3,
+        twilio_latency: float = 0.2,
+        call_duration: float = 0.0,
+        error_rate: float = 0.0,
+        jitter: float = 0.25,
+        seed: int = 0,
+    ):
+        """
+        Configure the fakes.
+
+        Args:
+            mistral_latency: Seconds per Mistral chat completion
+            elevenlabs_latency: Seconds per ElevenLabs API call
+            twilio_latency: Seconds per Twilio API call
+            call_duration: Seconds a call stays in progress
+            error_rate: Probability that a fake API call raises
+            jitter: Relative latency spread (0.25: +/-25%)
+            seed: Seed of the latency, error and price draws
+        """
+        self.latencies = {
+            "mistral": mistral_latency,
+            "elevenlabs": elevenlabs_latency,
+            "twilio": twilio_latency,
+        }
+        self.call_duration = call_duration
+        self.error_rate = error_rate
+        self.jitter = jitter
+        self.api_calls: Dict[str, int] = {name: 0 for name in self.latencies}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        # conversation_id -> (start time, dynamic variables) of placed calls
+        self._calls: Dict[str, Tuple[float, dict]] = {}
+        self._call_sids: Dict[str, str] = {}
+        self._active_calls = 0
+        self._idle = threading.Condition(self._lock)
+
+    def api_call(self, service: str) -> None:
+        """Simulate one API round trip: wait, maybe fail."""
+        with self._lock:
+            self.api_calls[service] += 1
+            spread = self._rng.uniform(-self.jitter, self.jitter)
+            failed = self._rng.random() < self.error_rate
+        time.sleep(max(0.0, self.latencies[service] * (1 + spread)))
+        if failed:
+            raise FakeServiceError(f"Injected {service} failure")
+
+    # ElevenLabs
+
+    def outbound_call(self, agent_id, agent_phone_number_id, to_number, **options):
+        """conversational_ai.twilio.outbound_call"""
+        self.api_call("elevenlabs")
+        variables = options.get("conversation_initiation_client_data", {}).get(
+            "dynamic_variables", {}
+        )
+        conversation_id = f"conv_fake_{uuid.uuid4().hex[:16]}"
+        call_sid = f"CA{uuid.uuid4().hex}"
+        with self._lock:
+            self._calls[conversation_id] = (time.monotonic(), dict(variables))
+            self._call_sids[call_sid] = conversation_id
+        return SimpleNamespace(
+            success=True, call_sid=call_sid, conversation_id=conversation_id
+        )
+
+    def get_conversation(self, conversation_id):
+        """conversational_ai.conversations.get"""
+        self.api_call("elevenlabs")
+        with self._lock:
+            _, variables = self._calls[conversation_id]
+            price = round(self._rng.uniform(2.0, 80.0), 2)
+            days = self._rng.randint(1, 14)
+        product = variables.get("product_name", "Inconnu")
+        transcript = [
+            SimpleNamespace(
+                role="agent", message=f"Hello, I'm calling about {product}."
+            ),
+            SimpleNamespace(
+                role="user",
+                message=ANSWER.format(product=product, price=price, days=days),
+            ),
+            SimpleNamespace(role="agent", message="Thank you. Goodbye."),
+        ]
+        return SimpleNamespace(conversation_id=conversation_id, transcript=transcript)
+
+    def update_agent(self, agent_id, conversation_config):
+        """conversational_ai.agents.update"""
+        self.api_call("elevenlabs")
+
+    def elevenlabs_client(self, api_key=None, **kwargs):
+        """Fake elevenlabs.ElevenLabs(api_key=...)."""
+        return SimpleNamespace(
+            conversational_ai=SimpleNamespace(
+                twilio=SimpleNamespace(outbound_call=self.outbound_call),
+                conversations=SimpleNamespace(get=self.get_conversation),
+                agents=SimpleNamespace(update=self.update_agent),
+            )
+        )
+
+    # Twilio
+
+    def fetch_call(self, call_sid):
+        """client.calls(call_sid).fetch()"""
+        self.api_call("twilio")
+        with self._lock:
+            started, _ = self._calls[self._call_sids[call_sid]]
+        in_progress = time.monotonic() - started < self.call_duration
+        return SimpleNamespace(
+            sid=call_sid, status="in-progress" if in_progress else "completed"
+        )
+
+    def twilio_client(self, account_sid=None, auth_token=None, **kwargs):
+        """Fake twilio.rest.Client(account_sid, auth_token)."""
+        return SimpleNamespace(
+            calls=lambda call_sid: SimpleNamespace(
+                fetch=partial(self.fetch_call, call_sid)
+            )
+        )
+
+    # Mistral
+
+    def complete(self, model, messages, **kwargs):
+        """chat.complete: extract the supplier answers of the prompt's transcript."""
+        self.api_call("mistral")
+        prompt = messages[-1]["content"]
+        delivery = '"delay_days"' in prompt
+        updates = {}
+        for match in ANSWER_PATTERN.finditer(prompt):
+            if delivery:
+                updates[match["product"]] = {"delay_days": int(match["days"]) - 7}
+            else:
+                updates[match["product"]] = {
+                    "price": float(match["price"]),
+                    "delivery_time": int(match["days"]),
+                }
+        content = json.dumps(updates, ensure_ascii=False)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))]
+        )
+
+    def mistral_client(self, api_key=None, **kwargs):
+        """Fake mistralai.Mistral(api_key=...)."""
+        return SimpleNamespace(chat=SimpleNamespace(complete=self.complete))
+
+    # Installation
+
+    def track_call(self, run: Callable[..., None], *args, **kwargs) -> None:
+        """Run a background call pipeline, counting it as active."""
+        with self._lock:
+            self._active_calls += 1
+        try:
+            run(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active_calls -= 1
+                self._idle.notify_all()
+
+    def wait_for_calls(self, timeout: float) -> bool:
+        """Wait for the background call pipelines to finish, True if they did."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._active_calls == 0, timeout)
+
+    @contextmanager
+    def installed(self) -> Iterator["FakeServices"]:
+        """Swap the SDK clients and the call environment for the fakes."""
+        import elevenlabs.client
+        import mistralai
+        import twilio.rest
+
+        from backend.controllers import update_agent
+        from backend.services import elevenlabs_agent_service
+
+        # The services import the SDK clients when creating them, from these modules
+        patches = [
+            (elevenlabs.client, "ElevenLabs", self.elevenlabs_client),
+            (
+                elevenlabs_agent_service,
+                "call_agent_background",
+                partial(self.track_call, elevenlabs_agent_service.call_agent_background),
+            ),
+            (update_agent.agent_config_cache, "_client", None),
+            (mistralai, "Mistral", self.mistral_client),
+            (twilio.rest, "Client", self.twilio_client),
+        ]
+        previous_attributes = [
+            (target, name, getattr(target, name)) for target, name, _ in patches
+        ]
+        previous_env = {name: os.environ.get(name) for name in FAKE_ENV}
+        for target, name, value in patches:
+            setattr(target, name, value)
+        os.environ.update(FAKE_ENV)
+        update_agent.agent_config_cache.invalidate()
+        try:
+            yield self
+        finally:
+            for target, name, value in previous_attributes:
+                setattr(target, name, value)
+            for name, value in previous_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+            update_agent.agent_config_cache.invalidate()
+
+
+@contextmanager
+def sandbox(source: Path) -> Iterator[Path]:
+    """
+    Serve a copy of a dataset as ./data of a temporary directory.
+
+    Sets the global data loader on the copy; must be entered before
+    backend.api.main is imported, as controllers bind their services to the
+    global loader at import time.
+    """
+    previous_cwd = os.getcwd()
+    previous_loader = data_loader_module._data_loader
+    with tempfile.TemporaryDirectory(prefix="load_test_") as root:
+        data_dir = Path(root) / "data"
+        shutil.copytree(source, data_dir)
+        (data_dir / "transcripts").mkdir(exist_ok=True)
+        os.chdir(root)
+        data_loader_module._data_loader = DataLoader(data_dir)
+        try:
+            yield data_dir
+        finally:
+            data_loader_module._data_loader = previous_loader
+            os.chdir(previous_cwd)
+
+
+class TrafficPools:
+    """Request parameters drawn from the served dataset."""
+
+    def __init__(self, data_dir: Path, max_items: int = 10_000, seed: int = 0):
+        """
+        Read the IDs and names the requests use.
+
+        Args:
+            data_dir: Dataset served by the app
+            max_items: Maximum number of offers and orders kept for calls
+            seed: Seed of the sampling
+        """
+        fournisseurs = pd.read_csv(data_dir / "fournisseur.csv", dtype=str)
+        supplier_names = dict(zip(fournisseurs["id"], fournisseurs["name"]))
+        in_store = pd.read_csv(
+            data_dir / "in_store_product.csv", usecols=["id"], dtype=str
+        )
+        offers = pd.read_csv(
+            data_dir / "available_product.csv", usecols=["name", "fournisseur"], dtype=str
+        )
+        orders = pd.read_csv(
+            data_dir / "orders.csv",
+            usecols=["product_name", "fournisseur_id", "time_of_arrival"],
+            dtype=str,
+        )
+        pending = orders[orders["time_of_arrival"].isna()]
+        if pending.empty:
+            pending = orders
+
+        self.product_ids: List[str] = in_store["id"].tolist()
+        self.supplier_ids: List[str] = fournisseurs["id"].tolist()
+        self.search_terms: List[str] = sorted(
+            {name.split()[0].lower() for name in offers["name"].unique()[:max_items]}
+        )
+        self.offers: List[Tuple[str, str]] = list(
+            zip(
+                offers["name"],
+                offers["fournisseur"].map(supplier_names).fillna("Inconnu"),
+            )
+        )
+        self.pending_orders: List[Tuple[str, str]] = list(
+            zip(
+                pending["product_name"],
+                pending["fournisseur_id"].map(supplier_names).fillna("Inconnu"),
+            )
+        )
+        rng = random.Random(seed)
+        for items in (self.offers, self.pending_orders):
+            if len(items) > max_items:
+                items[:] = rng.sample(items, max_items)
+
+
+class LoadStats:
+    """Latencies and errors of the requests, per endpoint label."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.statuses: Dict[str, Dict[str, int]] = {}
+
+    def record(self, label: str, seconds: float, status: str, ok: bool) -> None:
+        """Record one request (status: HTTP status code or exception name)."""
+        self.latencies.setdefault(label, []).append(seconds)
+        self.errors[label] = self.errors.get(label, 0) + (not ok)
+        counts = self.statuses.setdefault(label, {})
+        counts[status] = counts.get(status, 0) + 1
+
+    @staticmethod
+    def summarize(latencies: List[float], errors: int, elapsed: float) -> dict:
+        """Count, throughput, error rate and latency percentiles (ms)."""
+        values = np.asarray(latencies) * 1000
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        return {
+            "count": len(values),
+            "throughput": len(values) / elapsed if elapsed > 0 else 0.0,
+            "errors": errors,
+            "error_rate": errors / len(values),
+            "mean_ms": float(values.mean()),
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+            "max_ms": float(values.max()),
+        }
+
+    def report(self, elapsed: float) -> Dict[str, dict]:
+        """Summary per endpoint label, plus "total" over all requests."""
+        report = {
+            label: dict(
+                self.summarize(values, self.errors[label], elapsed),
+                statuses=self.statuses[label],
+            )
+            for label, values in sorted(self.latencies.items())
+        }
+        # Whole calls (label "call ...") are not requests
+        labels = [label for label in self.latencies if not label.startswith("call ")]
+        if labels:
+            report["total"] = self.summarize(
+                [value for label in labels for value in self.latencies[label]],
+                sum(self.errors[label] for label in labels),
+                elapsed,
+            )
+        return report
+
+
+class Session:
+    """HTTP client of the virtual users, recording every request."""
+
+    def __init__(self, client: httpx.AsyncClient, stats: LoadStats):
+        self.client = client
+        self.stats = stats
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict] = None,
+        json_body: Optional[dict] = None,
+        label: Optional[str] = None,
+    ) -> Optional[httpx.Response]:
+        """
+        Send a request, None if it failed at the transport level.
+
+        Requests are reported under label, "METHOD path" by default.
+        """
+        label = label or f"{method} {path}"
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(
+                method, path, params=params, json=json_body
+            )
+        except httpx.HTTPError as e:
+            self.stats.record(label, time.perf_counter() - start, type(e).__name__, False)
+            return None
+        self.stats.record(
+            label,
+            time.perf_counter() - start,
+            str(response.status_code),
+            response.status_code < 400,
+        )
+        return response
+
+
+# Scenarios: one user action, possibly several requests
+
+Scenario = Callable[
+    [Session, TrafficPools, random.Random, argparse.Namespace], Awaitable[None]
+]
+
+
+async def in_store_page(session, pools, rng, options):
+    sort = rng.choice(["name", "-bestMargin", "stock", "-weeklyUse"])
+    params = {"limit": 50, "sort": sort}
+    if rng.random() < 0.3:
+        params["status"] = rng.choice(["critical", "low", "critical,low"])
+    if rng.random() < 0.2 and pools.search_terms:
+        params["search"] = rng.choice(pools.search_terms)
+    await session.request(
+        "GET", "/api/products/in-store", params, label="GET /api/products/in-store (page)"
+    )
+
+
+async def in_store_full(session, pools, rng, options):
+    await session.request("GET", "/api/products/in-store")
+
+
+async def innovative(session, pools, rng, options):
+    params = {"sort_by": rng.choice(["suppliers", "price", "delivery_time"])}
+    await session.request("GET", "/api/products/innovative", params)
+
+
+async def active_orders(session, pools, rng, options):
+    await session.request("GET", "/api/products/orders")
+
+
+async def product_suppliers(session, pools, rng, options):
+    product_id = rng.choice(pools.product_ids)
+    await session.request(
+        "GET",
+        f"/api/products/{product_id}/suppliers",
+        label="GET /api/products/{id}/suppliers",
+    )
+
+
+async def cheaper_alternatives(session, pools, rng, options):
+    params = {"limit": 50, "min_savings_percent": rng.choice([5, 10, 20])}
+    if rng.random() < 0.3:
+        params["supplier_id"] = rng.choice(pools.supplier_ids)
+    await session.request("GET", "/api/suppliers/cheaper-alternatives", params)
+
+
+async def supplier_roi(session, pools, rng, options):
+    await session.request("GET", "/api/suppliers/roi")
+
+
+async def refresh_queue(session, pools, rng, options):
+    await session.request("GET", "/api/suppliers/refresh-queue", {"limit": 50})
+
+
+async def optimize_basket(session, pools, rng, options):
+    count = min(len(pools.product_ids), rng.randint(3, 15))
+    product_ids = rng.sample(pools.product_ids, count)
+    body = {
+        "lines": [{"product_id": p, "quantity": rng.randint(1, 50)} for p in product_ids],
+        "max_suppliers": rng.choice([None, 2, 3]),
+    }
+    await session.request("POST", "/api/suppliers/optimize-basket", json_body=body)
+
+
+async def activity(session, pools, rng, options):
+    await session.request("GET", "/api/agent/activity/summary")
+    await session.request("GET", "/api/agent/activity/recap")
+
+
+async def agent_tasks(session, pools, rng, options):
+    await session.request("GET", "/api/agent/tasks")
+    await session.request("GET", "/api/agent/campaigns")
+
+
+async def agent_call(session, pools, rng, options):
+    """Start a call and poll its status until it is done (or the timeout)."""
+    if rng.random() < 0.3 and pools.pending_orders:
+        agent_name = "delivery"
+        product_name, supplier_name = rng.choice(pools.pending_orders)
+    else:
+        agent_name = rng.choice(["products", "products", "availability"])
+        product_name, supplier_name = rng.choice(pools.offers)
+
+    start = time.perf_counter()
+    response = await session.request(
+        "POST",
+        "/api/agent/start",
+        json_body={
+            "agent_name": agent_name,
+            "supplier_name": supplier_name,
+            "product_name": product_name,
+        },
+    )
+    if response is None or response.status_code >= 400:
+        return
+    task_id = response.json()["task_id"]
+
+    status = "timeout"
+    deadline = start + options.call_timeout
+    while time.perf_counter() < deadline:
+        await asyncio.sleep(options.poll_interval)
+        response = await session.request(
+            "GET", f"/api/agent/status/{task_id}", label="GET /api/agent/status/{id}"
+        )
+        if response is None or response.status_code >= 400:
+            continue
+        task = response.json()
+        # Parsing runs after the call completes and sets parse_result
+        if task["status"] == "failed" or (
+            task["status"] == "completed"
+            and (task["parse_result"] is not None or agent_name == "availability")
+        ):
+            status = task["status"]
+            break
+    session.stats.record(
+        f"call {agent_name} (end to end)",
+        time.perf_counter() - start,
+        status,
+        status == "completed",
+    )
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "in_store_page": in_store_page,
+    "in_store_full": in_store_full,
+    "innovative": innovative,
+    "active_orders": active_orders,
+    "product_suppliers": product_suppliers,
+    "cheaper_alternatives": cheaper_alternatives,
+    "supplier_roi": supplier_roi,
+    "refresh_queue": refresh_queue,
+    "optimize_basket": optimize_basket,
+    "activity": activity,
+    "agent_tasks": agent_tasks,
+    "agent_call": agent_call,
+}
+
+# Scenario weights per traffic profile
+PROFILES: Dict[str, Dict[str, float]] = {
+    # Operators browsing the dashboards
+    "dashboard": {
+        "in_store_page": 25,
+        "in_store_full": 5,
+        "innovative": 10,
+        "active_orders": 10,
+        "product_suppliers": 15,
+        "cheaper_alternatives": 15,
+        "supplier_roi": 5,
+        "refresh_queue": 5,
+        "activity": 10,
+    },
+    # Dashboards while agents call suppliers and write back the results
+    "mixed": {
+        "in_store_page": 20,
+        "in_store_full": 3,
+        "innovative": 8,
+        "active_orders": 8,
+        "product_suppliers": 12,
+        "cheaper_alternatives": 12,
+        "supplier_roi": 4,
+        "refresh_queue": 4,
+        "optimize_basket": 4,
+        "activity": 10,
+        "agent_tasks": 5,
+        "agent_call": 10,
+    },
+    # Call-heavy: the write path under concurrent reads
+    "calls": {
+        "agent_call": 60,
+        "agent_tasks": 10,
+        "activity": 15,
+        "in_store_page": 10,
+        "cheaper_alternatives": 5,
+    },
+}
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    pools: TrafficPools,
+    options: argparse.Namespace,
+) -> Tuple[LoadStats, float]:
+    """
+    Run the virtual users until the duration is over.
+
+    Returns:
+        Stats of the requests and elapsed wall time (seconds)
+    """
+    stats = LoadStats()
+    session = Session(client, stats)
+    profile = PROFILES[options.profile]
+    names, weights = list(profile), list(profile.values())
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + options.duration
+
+    async def user(index: int) -> None:
+        rng = random.Random(options.seed * 1_000_003 + index)
+        while loop.time() < deadline:
+            scenario = SCENARIOS[rng.choices(names, weights)[0]]
+            await scenario(session, pools, rng, options)
+            if options.think_time > 0:
+                await asyncio.sleep(rng.expovariate(1 / options.think_time))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user(i) for i in range(options.users)))
+    return stats, time.perf_counter() - start
+
+
+async def run_in_process(pools: TrafficPools, options: argparse.Namespace) -> dict:
+    """Drive the app in-process; the app must be importable on the sandbox."""
+    from backend.api.concurrency import loop_lag_monitor
+    from backend.api.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://load-test", timeout=options.timeout
+        ) as client:
+            stats, elapsed = await drive(client, pools, options)
+        max_lag = loop_lag_monitor.max_lag
+    return {
+        "elapsed": elapsed,
+        "max_loop_lag_ms": max_lag * 1000,
+        "endpoints": stats.report(elapsed),
+    }
+
+
+async def run_remote(pools: TrafficPools, options: argparse.Namespace) -> dict:
+    """Drive a running server."""
+    limits = httpx.Limits(
+        max_connections=options.users, max_keepalive_connections=options.users
+    )
+    async with httpx.AsyncClient(
+        base_url=options.target, timeout=options.timeout, limits=limits
+    ) as client:
+        stats, elapsed = await drive(client, pools, options)
+    return {"elapsed": elapsed, "endpoints": stats.report(elapsed)}
+
+
+def make_fakes(options: argparse.Namespace) -> FakeServices:
+    """Fakes configured from the command line."""
+    return FakeServices(
+        mistral_latency=options.mistral_latency,
+        elevenlabs_latency=options.elevenlabs_latency,
+        twilio_latency=options.twilio_latency,
+        call_duration=options.call_duration,
+        error_rate=options.fake_error_rate,
+        jitter=options.jitter,
+        seed=options.seed,
+    )
+
+
+def source_dataset(options: argparse.Namespace) -> Path:
+    """Dataset to serve: --data, or the cached synthetic dataset of --scale."""
+    if options.data is not None:
+        return options.data
+    return prepare_dataset(options.data_cache, options.scale)
+
+
+def run_load_test(options: argparse.Namespace) -> dict:
+    """
+    Run a load test as configured by the command line options.
+
+    Returns:
+        Report: {"elapsed", "endpoints": {label: summary}, ...settings}
+    """
+    source = source_dataset(options)
+    pools = TrafficPools(source, seed=options.seed)
+    settings = {
+        "profile": options.profile,
+        "users": options.users,
+        "duration": options.duration,
+        "think_time": options.think_time,
+        "dataset": str(source),
+        "target": options.target or "in-process",
+    }
+    if options.target:
+        return dict(settings, **asyncio.run(run_remote(pools, options)))
+
+    fakes = make_fakes(options)
+    with sandbox(source), fakes.installed():
+        report = asyncio.run(run_in_process(pools, options))
+        # Let calls still running finish before the sandbox is removed
+        drained = fakes.wait_for_calls(options.call_timeout)
+    return dict(
+        settings,
+        **report,
+        fake_api_calls=dict(fakes.api_calls),
+        calls_drained=drained,
+    )
+
+
+def print_report(report: dict) -> None:
+    """Print the per-endpoint table of a report."""
+    print(
+        f"\n{report['profile']} profile, {report['users']} users, "
+        f"{report['elapsed']:.1f}s against {report['target']}"
+    )
+    print(
+        f"{'endpoint':<44} {'count':>7} {'req/s':>8} {'errors':>7} "
+        f"{'p50':>9} {'p95':>9} {'p99':>9}"
+    )
+    for label, row in report["endpoints"].items():
+        print(
+            f"{label:<44} {row['count']:>7} {row['throughput']:>8.1f} "
+            f"{row['error_rate']:>7.1%} {row['p50_ms']:>7.1f}ms "
+            f"{row['p95_ms']:>7.1f}ms {row['p99_ms']:>7.1f}ms"
+        )
+    if "max_loop_lag_ms" in report:
+        print(f"\nMax event-loop lag: {report['max_loop_lag_ms']:.1f} ms")
+    if "fake_api_calls" in report:
+        print(f"Fake API calls: {report['fake_api_calls']}")
+
+
+def add_dataset_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options selecting the served dataset and configuring the fakes."""
+    parser.add_argument("--scale", default="small", choices=list(SCALES))
+    parser.add_argument(
+        "--data", type=Path, default=None, help="Dataset directory to copy"
+    )
+    parser.add_argument(
+        "--data-cache",
+        type=Path,
+        default=Path(tempfile.gettempdir()) / "bench_suite_data",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mistral-latency", type=float, default=1.5)
+    parser.add_argument("--elevenlabs-latency", type=float, default=0.3)
+    parser.add_argument("--twilio-latency", type=float, default=0.2)
+    parser.add_argument("--call-duration", type=float, default=0.0)
+    parser.add_argument("--fake-error-rate", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.25)
+
+
+def main():
+    """Parse the command line and run the load test or serve the app."""
+    parser = argparse.ArgumentParser(description="Offline load test of the FastAPI app")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Drive traffic and report latencies")
+    add_dataset_arguments(run_parser)
+    run_parser.add_argument("--profile", default="mixed", choices=list(PROFILES))
+    run_parser.add_argument("--users", type=int, default=20)
+    run_parser.add_argument("--duration", type=float, default=30.0)
+    run_parser.add_argument("--think-time", type=float, default=0.5)
+    run_parser.add_argument(
+        "--target", default=None, help="Server URL (default: in-process)"
+    )
+    run_parser.add_argument("--timeout", type=float, default=60.0)
+    run_parser.add_argument("--call-timeout", type=float, default=60.0)
+    run_parser.add_argument("--poll-interval", type=float, default=1.0)
+    run_parser.add_argument("--output", type=Path, default=None)
+
+    serve_parser = commands.add_parser("serve", help="Serve the app with the fakes")
+    add_dataset_arguments(serve_parser)
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        import uvicorn
+
+        with sandbox(source_dataset(args)) as data_dir, make_fakes(args).installed():
+            from backend.api.main import app
+
+            print(f"Serving {data_dir} with fake Mistral, ElevenLabs and Twilio")
+            uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+        return
+
+    report = run_load_test(args)
+    print_report(report)
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
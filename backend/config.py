@@ -0,0 +1,35 @@
+"""
+Configuration loading.
+
+Settings are environment variables. Values missing from the environment are
+read from the `.env` file of the backend directory (then of the project
+root), once, by `load_config()`. Entry points (the API app, scripts) call it
+before reading settings; services creating SDK clients call it too, so they
+also work when used on their own. Variables already set in the environment
+always win over the files.
+"""
+
+import threading
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent
+ENV_FILES = (BACKEND_DIR / ".env", BACKEND_DIR.parent / ".env")
+
+_loaded = False
+_lock = threading.Lock()
+
+
+def load_config() -> None:
+    """Load the .env files into the environment (first call only)."""
+    global _loaded
+    if _loaded:
+        return
+    with _lock:
+        if _loaded:
+            return
+        from dotenv import load_dotenv
+
+        for env_file in ENV_FILES:
+            if env_file.is_file():
+                load_dotenv(dotenv_path=env_file, override=False)
+        _loaded = True
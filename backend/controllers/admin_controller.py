@@ -0,0 +1,100 @@
+"""Controller for admin diagnostics: on-demand request profiling, loaded tenants."""
+
+import os
+import secrets
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field
+
+from backend.api.profiling import ProfilingSession, request_profiler
+from backend.services.tenants import get_tenant_registry
+
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    """
+    Allow the request only with the admin token.
+
+    The token is the ADMIN_TOKEN environment variable; without it the admin
+    endpoints are disabled.
+    """
+    expected = os.getenv("ADMIN_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+router = APIRouter(
+    prefix="/api/admin", tags=["admin"], dependencies=[Depends(require_admin)]
+)
+
+
+class ProfilingRequest(BaseModel):
+    """Request model for arming a profiling session."""
+
+    route: str = Field(description='Path template, e.g. "/api/suppliers/roi"')
+    method: str = "GET"
+    mode: Literal["cprofile", "sample", "tracemalloc"] = "sample"
+    requests: int = Field(default=1, ge=1, le=100, description="Requests to profile")
+    sample_interval_ms: float = Field(default=5.0, ge=0.5, le=1000)
+    top: int = Field(default=30, ge=1, le=500, description="Functions or sites per report")
+
+
+def _session() -> ProfilingSession:
+    session = request_profiler.session or request_profiler.last
+    if session is None:
+        raise HTTPException(status_code=404, detail="No profiling session")
+    return session
+
+
+@router.post("/profiling")
+async def start_profiling(request: ProfilingRequest):
+    """
+    Profile the next requests to a route.
+
+    Replaces the armed session, if any. Reports are added to the session
+    status as requests complete.
+    """
+    session = request_profiler.arm(
+        ProfilingSession(
+            method=request.method,
+            route=request.route,
+            mode=request.mode,
+            requests=request.requests,
+            sample_interval=request.sample_interval_ms / 1000,
+            top=request.top,
+        )
+    )
+    return session.status()
+
+
+@router.get("/profiling")
+async def get_profiling():
+    """Status and reports of the current (or last) profiling session."""
+    return _session().status()
+
+
+@router.get("/profiling/collapsed", response_class=PlainTextResponse)
+async def get_collapsed_stacks():
+    """Collapsed stacks of a "sample" session, for flamegraph.pl or speedscope."""
+    session = _session()
+    if session.mode != "sample":
+        raise HTTPException(
+            status_code=400, detail="Collapsed stacks require a 'sample' session"
+        )
+    return PlainTextResponse(session.collapsed())
+
+
+@router.delete("/profiling")
+async def stop_profiling():
+    """Stop profiling new requests; reports stay readable."""
+    request_profiler.disarm()
+    return {"armed": False}
+
+
+@router.get("/tenants")
+async def get_tenants():
+    """Loaded tenants, least recently used first, with their estimated memory."""
+    return get_tenant_registry().status()
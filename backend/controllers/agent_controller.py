@@ -1,26 +1,29 @@
 """Controller for ElevenLabs agent service endpoints."""
 
+import asyncio
 import json
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from dotenv import load_dotenv
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
+from backend.api.concurrency import run_io
+from backend.api.tenants import require_default_tenant
 from backend.controllers.update_agent import update_agent
+from backend.services.call_campaign_service import get_call_campaign_service
 from backend.services.conversation_manager import conversation_manager
-from backend.services.data_loader import get_data_loader
+from backend.services.data_loader import default_data_loader
 from backend.services.elevenlabs_agent_service import start_agent_async
+from backend.services.models import CallCampaignRequest, CallCampaignResponse
+from backend.services.timing import timed
 from backend.services.transcript_parser_service import TranscriptParserService
 
 # Default transcripts directory
 TRANSCRIPTS_DIR = Path("./data/transcripts")
 
-load_dotenv()
-
 router = APIRouter(prefix="/api/agent", tags=["agent"])
 
 
@@ -67,6 +70,7 @@ class TaskStatusResponse(BaseModel):
     conversation_id: Optional[str]
     error: Optional[str]
     total_messages: int
+    parse_result: Optional[Dict[str, int]] = None
 
 
 class ActivitySummaryResponse(BaseModel):
@@ -117,7 +121,11 @@ class TranscriptResponse(BaseModel):
     formatted_text: str
 
 
-@router.post("/start", response_model=TaskStartResponse)
+@router.post(
+    "/start",
+    response_model=TaskStartResponse,
+    dependencies=[Depends(require_default_tenant)],
+)
 async def start_conversation(request: StartConversationRequest):
     """
     Launch the agent discussion pipeline asynchronously in the background.
@@ -140,13 +148,12 @@ async def start_conversation(request: StartConversationRequest):
     use_twilio = request.use_twilio if request.use_twilio is not None else True
     to_number = request.to_number or os.getenv("MY_PHONE_NUMBER")
 
-    # Update agent configuration
-    update_agent(agent_name, product_name, supplier_name)
-
-    # Give ElevenLabs API time to propagate the configuration update
-    import time
+    # Push the agent configuration if it changed (synchronous ElevenLabs API call)
+    updated = await run_io(update_agent, agent_name, product_name, supplier_name)
 
-    time.sleep(1)  # Wait 2 seconds for the configuration to propagate
+    # Give ElevenLabs API time to propagate a configuration update
+    if updated:
+        await asyncio.sleep(1)
 
     if not api_key:
         raise HTTPException(
@@ -168,6 +175,7 @@ async def start_conversation(request: StartConversationRequest):
                 agent_name=agent_name,
                 api_key=api_key,
                 supplier_name=supplier_name,
+                product_name=product_name,
             )
 
             return TaskStartResponse(
@@ -181,7 +189,10 @@ async def start_conversation(request: StartConversationRequest):
             # Start the agent conversation asynchronously (local microphone)
             print("Starting local conversation...")
             task_id = start_agent_async(
-                agent_name=agent_name, api_key=api_key, supplier_name=supplier_name
+                agent_name=agent_name,
+                api_key=api_key,
+                supplier_name=supplier_name,
+                product_name=product_name,
             )
 
             return TaskStartResponse(
@@ -231,7 +242,82 @@ async def list_all_tasks():
     return [TaskStatusResponse(**task.to_dict()) for task in tasks]
 
 
-@router.post("/parse/{task_id}")
+@router.post(
+    "/campaigns",
+    response_model=CallCampaignResponse,
+    dependencies=[Depends(require_default_tenant)],
+)
+async def start_campaign(request: CallCampaignRequest):
+    """
+    Start a batch of supplier calls in the background.
+
+    Targets are deduped and grouped so each supplier gets one call per agent
+    covering several products. Targets can also be computed from the data
+    (source="late_orders" or "stale_offers"), or taken from the price refresh
+    queue within its daily call budget (source="refresh_queue").
+
+    Args:
+        request: CallCampaignRequest with targets, source and limits
+
+    Returns:
+        CallCampaignResponse; poll /campaigns/{campaign_id} for progress
+    """
+    api_key = os.getenv("ELEVENLABS_API_KEY")
+    if not api_key:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing ELEVENLABS_API_KEY environment variable.",
+        )
+
+    # Push the configuration of the agents involved before the first call
+    agent_names = {target.agent_name for target in request.targets}
+    if request.source == "late_orders":
+        agent_names.add("delivery")
+    elif request.source in ("stale_offers", "refresh_queue"):
+        agent_names.add("products")
+    updated = False
+    for agent_name in sorted(agent_names):
+        updated |= await run_io(update_agent, agent_name, "", "")
+    if updated:
+        await asyncio.sleep(1)
+
+    try:
+        return await run_io(
+            get_call_campaign_service().start_campaign, request, api_key
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+@router.get("/campaigns", response_model=List[CallCampaignResponse])
+async def list_campaigns():
+    """
+    List all call campaigns, most recent first.
+
+    Returns:
+        List of CallCampaignResponse
+    """
+    return get_call_campaign_service().list_campaigns()
+
+
+@router.get("/campaigns/{campaign_id}", response_model=CallCampaignResponse)
+async def get_campaign(campaign_id: str):
+    """
+    Get the progress and aggregated parse results of a call campaign.
+
+    Args:
+        campaign_id: The campaign ID returned from /campaigns
+
+    Returns:
+        CallCampaignResponse with per-call status
+    """
+    campaign = get_call_campaign_service().get_campaign(campaign_id)
+    if campaign is None:
+        raise HTTPException(status_code=404, detail=f"Campaign {campaign_id} not found")
+    return campaign
+
+
+@router.post("/parse/{task_id}", dependencies=[Depends(require_default_tenant)])
 async def parse_completed_conversation(task_id: str):
     """
     Parse a completed conversation transcript and update CSV.
@@ -262,21 +348,7 @@ async def parse_completed_conversation(task_id: str):
         )
 
     # Load the transcript from file
-    # Search for transcript by conversation_id since we now use date format for filenames
-    transcripts_dir = Path("./data/transcripts")
-    transcript_data = None
-
-    if transcripts_dir.exists():
-        for transcript_file in transcripts_dir.glob("*.json"):
-            try:
-                with open(transcript_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    if data.get("conversation_id") == task.conversation_id:
-                        transcript_data = data
-                        break
-            except Exception as e:
-                print(f"Error reading transcript file {transcript_file}: {e}")
-                continue
+    transcript_data = await run_io(find_transcript, task.conversation_id)
 
     if transcript_data is None:
         raise HTTPException(
@@ -286,14 +358,17 @@ async def parse_completed_conversation(task_id: str):
 
     # Parse the conversation
     mistral_api_key = os.getenv("MISTRAL_API_KEY")
-    parser = TranscriptParserService(api_key=mistral_api_key, data_dir="./data")
+    data_loader = default_data_loader()
+    parser = await run_io(
+        TranscriptParserService, api_key=mistral_api_key, data_dir=data_loader.data_dir
+    )
 
     try:
-        result = parser.parse_and_update_csv(
-            transcript_data, task.supplier_name, save=True
+        # Mistral call and CSV update: blocking, runs on the I/O pool
+        result = await run_io(
+            parser.parse_and_update_csv, transcript_data, task.supplier_name, save=True
         )
         # Refresh data cache after updating CSV
-        data_loader = get_data_loader()
         data_loader.reload_all()
         return {"status": "success", "result": result, "task_id": task_id}
     except Exception as e:
@@ -302,6 +377,34 @@ async def parse_completed_conversation(task_id: str):
         ) from e
 
 
+def find_transcript(
+    conversation_id: str, transcripts_dir: Path = TRANSCRIPTS_DIR
+) -> Optional[dict]:
+    """
+    Find a transcript by conversation_id.
+
+    Transcript files are named by date, so every file has to be searched.
+
+    Returns:
+        Transcript dictionary, or None if not found
+    """
+    if not transcripts_dir.exists():
+        return None
+
+    for transcript_file in transcripts_dir.glob("*.json"):
+        try:
+            with open(transcript_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+                if data.get("conversation_id") == conversation_id:
+                    return data
+        except Exception as e:
+            print(f"Error reading transcript file {transcript_file}: {e}")
+            continue
+
+    return None
+
+
+@timed("agent.load_transcripts")
 def load_transcripts_from_folder(transcripts_dir: Path = TRANSCRIPTS_DIR) -> List[dict]:
     """
     Load all transcript files from the transcripts directory.
@@ -474,7 +577,7 @@ async def get_activity_summary(limit: int = 10):
         ActivitySummaryResponse with counts and time saved
     """
     # Get all activities (from both tasks and transcripts)
-    all_activities = get_all_activities()
+    all_activities = await run_io(get_all_activities)
 
     # Sort by created_at descending (most recent first) - same as recap
     def get_created_at(activity: dict) -> datetime:
@@ -548,7 +651,7 @@ async def get_activity_recap(limit: int = 10):
         ActivityRecapResponse with list of recent activities
     """
     # Get all activities (from both tasks and transcripts)
-    all_activities = get_all_activities()
+    all_activities = await run_io(get_all_activities)
 
     # Sort by created_at descending (most recent first)
     def get_created_at(activity: dict) -> datetime:
@@ -581,22 +684,7 @@ async def get_transcript_by_conversation_id(conversation_id: str):
     Returns:
         TranscriptResponse with transcript data
     """
-    # Search for transcript by conversation_id in all transcript files
-    # since we now use date format for filenames
-    transcripts_dir = Path("./data/transcripts")
-    transcript_data = None
-
-    if transcripts_dir.exists():
-        for transcript_file in transcripts_dir.glob("*.json"):
-            try:
-                with open(transcript_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    if data.get("conversation_id") == conversation_id:
-                        transcript_data = data
-                        break
-            except Exception as e:
-                print(f"Error reading transcript file {transcript_file}: {e}")
-                continue
+    transcript_data = await run_io(find_transcript, conversation_id)
 
     if transcript_data is None:
         raise HTTPException(
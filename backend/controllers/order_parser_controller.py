@@ -5,6 +5,7 @@ from typing import Any, Dict
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from backend.api.concurrency import run_io
 from backend.services.order_delivery_parser_service import OrderDeliveryParser
 
 router = APIRouter(prefix="/order-parser", tags=["order-parser"])
@@ -57,9 +58,12 @@ async def parse_delivery_updates(request: OrderConversationRequest):
     ```
     """
     try:
-        parser = OrderDeliveryParser()
-        updates = parser.parse_conversation(
-            transcript=request.transcript, supplier_name=request.supplier_name
+        # Synchronous Mistral call: runs on the I/O pool
+        parser = await run_io(OrderDeliveryParser)
+        updates = await run_io(
+            parser.parse_conversation,
+            transcript=request.transcript,
+            supplier_name=request.supplier_name,
         )
 
         count = len(updates)
@@ -5,6 +5,7 @@ from typing import Dict
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from backend.api.concurrency import run_io
 from backend.services.transcript_parser_service import TranscriptParserService
 
 router = APIRouter(prefix="/parser", tags=["parser"])
@@ -57,8 +58,10 @@ async def parse_conversation(request: ConversationRequest):
     ```
     """
     try:
-        parser = TranscriptParserService()
-        updates = parser.parse_conversation(
+        # Synchronous Mistral call: runs on the I/O pool
+        parser = await run_io(TranscriptParserService)
+        updates = await run_io(
+            parser.parse_conversation,
             transcript=request.transcript,
             supplier_name=request.supplier_name or "Inconnu",
         )
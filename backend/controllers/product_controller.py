@@ -1,7 +1,11 @@
 """Product controller for innovative products endpoints."""
 
-from fastapi import APIRouter
+from typing import List, Optional
 
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from backend.api.concurrency import run_cpu
+from backend.api.response_cache import get_response_cache
 from backend.services.inventory_service import InventoryService
 from backend.services.models import (
     InnovativeProductsResponse,
@@ -16,10 +20,13 @@ router = APIRouter(prefix="/api/products", tags=["products"])
 # Initialize services
 product_service = ProductDiscoveryService()
 inventory_service = InventoryService()
+response_cache = get_response_cache()
 
 
 @router.get("/innovative", response_model=InnovativeProductsResponse)
-async def get_innovative_products(min_suppliers: int = 1, sort_by: str = "suppliers"):
+async def get_innovative_products(
+    request: Request, min_suppliers: int = 1, sort_by: str = "suppliers"
+):
     """
     Get list of innovative products not currently in store.
 
@@ -33,37 +40,95 @@ async def get_innovative_products(min_suppliers: int = 1, sort_by: str = "suppli
     if sort_by not in ["price", "suppliers", "delivery_time"]:
         sort_by = "suppliers"
 
-    products = product_service.find_innovative_products(
-        min_suppliers=min_suppliers, sort_by=sort_by
-    )
+    def build():
+        products = product_service.find_innovative_products(
+            min_suppliers=min_suppliers, sort_by=sort_by
+        )
+        return InnovativeProductsResponse(
+            products=products, total_count=len(products), min_suppliers=min_suppliers
+        )
 
-    return InnovativeProductsResponse(
-        products=products, total_count=len(products), min_suppliers=min_suppliers
-    )
+    return await run_cpu(response_cache.respond, request, build)
 
 
 @router.get("/in-store", response_model=InventoryProductsResponse)
-async def get_in_store_products():
+async def get_in_store_products(
+    request: Request,
+    status: Optional[str] = None,
+    product_type: Optional[str] = Query(default=None, alias="type"),
+    supplier: Optional[str] = None,
+    margin_improvement_possible: Optional[bool] = None,
+    search: Optional[str] = None,
+    sort: Optional[str] = None,
+    limit: Optional[int] = Query(default=None, ge=1, le=5000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+):
     """
-    Get all in-store products with enriched inventory information.
+    Get in-store and external products with enriched inventory information.
+
+    Without parameters, every product is returned in catalog order.
+
+    Args:
+        status: Comma-separated statuses to keep ("healthy", "low", "critical")
+        type: Comma-separated types to keep ("in-house", "external")
+        supplier: Supplier ID or name to keep
+        margin_improvement_possible: Keep products with this flag
+        search: Text to find in the product name or SKU
+        sort: Field to sort on, "-" prefix for descending (e.g. "-bestMargin")
+        limit: Page size (default: all)
+        cursor: next_cursor of the previous page
+        fields: Comma-separated fields to return per product ("id" is always
+                included); projected products skip response validation
 
     Returns:
-        List of in-store products with supplier info, prices, margins, and stock status
+        Page of products with supplier info, prices, margins, and stock status
     """
-    products = inventory_service.get_in_store_products_enriched()
-    return InventoryProductsResponse(products=products, total_count=len(products))
+
+    def split(value: Optional[str]) -> Optional[List[str]]:
+        return [v.strip() for v in value.split(",") if v.strip()] if value else None
+
+    projection = split(fields)
+
+    def build():
+        try:
+            return inventory_service.query_in_store_products(
+                status=split(status),
+                product_type=split(product_type),
+                supplier=supplier,
+                margin_improvement_possible=margin_improvement_possible,
+                search=search,
+                sort=sort,
+                limit=limit,
+                cursor=cursor,
+                fields=projection,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return await run_cpu(
+        response_cache.respond,
+        request,
+        build,
+        model=None if projection else InventoryProductsResponse,
+    )
 
 
 @router.get("/orders", response_model=PurchaseOrdersResponse)
-async def get_active_orders():
+async def get_active_orders(request: Request):
     """
     Get all active purchase orders.
 
     Returns:
         List of active purchase orders with status and delivery information
     """
-    orders = inventory_service.get_active_orders()
-    return PurchaseOrdersResponse(orders=orders, total_count=len(orders))
+    def build():
+        orders = inventory_service.get_active_orders()
+        return {"orders": orders, "total_count": len(orders)}
+
+    return await run_cpu(
+        response_cache.respond, request, build, model=PurchaseOrdersResponse
+    )
 
 
 @router.get("/{product_id}/suppliers", response_model=SupplierOptionsResponse)
@@ -77,7 +142,7 @@ async def get_product_suppliers(product_id: str):
     Returns:
         List of suppliers offering this product with prices and ratings
     """
-    result = inventory_service.get_product_suppliers(product_id)
+    result = await run_cpu(inventory_service.get_product_suppliers, product_id)
     return SupplierOptionsResponse(
         suppliers=result["suppliers"],
         current_supplier_id=result["current_supplier_id"],
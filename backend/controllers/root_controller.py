@@ -1,6 +1,11 @@
 """Root controller for API information."""
 
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from backend.api.concurrency import loop_lag_monitor
+from backend.api.metrics import stage_metrics
+from backend.api.warmup import warmup
 
 router = APIRouter()
 
@@ -16,3 +21,27 @@ async def root():
             "innovative_products": "/api/products/innovative",
         },
     }
+
+
+@router.get("/api/health/loop")
+async def event_loop_health():
+    """Event loop lag statistics (a high max lag means a blocking call)."""
+    return loop_lag_monitor.stats()
+
+
+@router.get("/ready")
+async def readiness():
+    """
+    Readiness probe: 200 once the startup warmup finished, 503 before.
+
+    The body reports the warmup state and each cache's build time.
+    """
+    return JSONResponse(warmup.status(), status_code=200 if warmup.ready else 503)
+
+
+@router.get("/api/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Request stage latency histograms, in the Prometheus text format."""
+    return PlainTextResponse(
+        stage_metrics.render(), media_type="text/plain; version=0.0.4"
+    )
@@ -2,20 +2,40 @@
 
 from typing import Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 
-from backend.services.models import CheaperAlternativesResponse, SupplierROIResponse
+from backend.api.concurrency import run_cpu
+from backend.api.response_cache import get_response_cache
+from backend.api.tenants import require_default_tenant
+from backend.services.basket_optimizer_service import BasketOptimizerService
+from backend.services.models import (
+    BasketOptimizationRequest,
+    BasketOptimizationResponse,
+    CheaperAlternativesResponse,
+    PriceRefreshQueueResponse,
+    SupplierROIResponse,
+)
+from backend.services.price_refresh_service import get_price_refresh_service
 from backend.services.supplier_analysis_service import SupplierAnalysisService
 
 router = APIRouter(prefix="/api/suppliers", tags=["suppliers"])
 
 # Initialize service
 supplier_service = SupplierAnalysisService()
+basket_optimizer = BasketOptimizerService()
+response_cache = get_response_cache()
 
 
 @router.get("/cheaper-alternatives", response_model=CheaperAlternativesResponse)
 async def get_cheaper_alternatives(
-    min_savings_percent: float = 5.0, product_id: Optional[str] = None
+    request: Request,
+    min_savings_percent: float = 5.0,
+    product_id: Optional[str] = None,
+    supplier_id: Optional[str] = None,
+    min_savings_amount: Optional[float] = None,
+    max_delivery_time: Optional[int] = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: Optional[str] = None,
 ):
     """
     Get cheaper supplier alternatives for in-store products.
@@ -23,23 +43,35 @@ async def get_cheaper_alternatives(
     Args:
         min_savings_percent: Minimum savings percentage to flag (default: 5.0)
         product_id: Optional product ID to filter by
+        supplier_id: Optional alternative supplier ID to filter by
+        min_savings_amount: Optional minimum savings per unit
+        max_delivery_time: Optional maximum delivery time in days
+        limit: Page size (default: 50)
+        cursor: next_cursor of the previous page
 
     Returns:
-        List of cheaper alternatives with supplier information
+        Page of cheaper alternatives with supplier information, sorted by
+        savings percentage
     """
-    alternatives = supplier_service.find_cheaper_alternatives(
-        min_savings_percent=min_savings_percent, product_id=product_id
-    )
+    def build():
+        try:
+            return supplier_service.find_cheaper_alternatives(
+                min_savings_percent=min_savings_percent,
+                product_id=product_id,
+                supplier_id=supplier_id,
+                min_savings_amount=min_savings_amount,
+                max_delivery_time=max_delivery_time,
+                limit=limit,
+                cursor=cursor,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
-    return CheaperAlternativesResponse(
-        alternatives=alternatives,
-        total_count=len(alternatives),
-        min_savings_percent=min_savings_percent,
-    )
+    return await run_cpu(response_cache.respond, request, build)
 
 
 @router.get("/roi", response_model=SupplierROIResponse)
-async def get_supplier_roi():
+async def get_supplier_roi(request: Request):
     """
     Get supplier ROI and performance metrics.
 
@@ -50,4 +82,67 @@ async def get_supplier_roi():
         - Status and trends
         - Active issues
     """
-    return supplier_service.get_supplier_roi()
+    return await run_cpu(
+        response_cache.respond, request, supplier_service.get_supplier_roi
+    )
+
+
+@router.post("/optimize-basket", response_model=BasketOptimizationResponse)
+async def optimize_basket(request: BasketOptimizationRequest):
+    """
+    Choose suppliers for a reorder basket at minimum total cost.
+
+    Args:
+        request: BasketOptimizationRequest with the lines to order (product_id,
+                 quantity, optional max_delivery_time), max_suppliers and
+                 minimum order amounts per supplier
+
+    Returns:
+        BasketOptimizationResponse with the chosen offer per line, the order
+        total per supplier and the lines no supplier can fulfil
+
+    Example request:
+    ```json
+    {
+        "lines": [
+            {"product_id": "prod_123", "quantity": 50, "max_delivery_time": 5},
+            {"product_id": "prod_456", "quantity": 20}
+        ],
+        "max_suppliers": 2,
+        "min_order_amounts": {"supp_789": 200.0}
+    }
+    ```
+    """
+    return await run_cpu(basket_optimizer.optimize, request)
+
+
+@router.get(
+    "/refresh-queue",
+    response_model=PriceRefreshQueueResponse,
+    dependencies=[Depends(require_default_tenant)],
+)
+async def get_refresh_queue(
+    limit: int = Query(default=50, ge=1, le=1000),
+    max_products_per_call: int = Query(default=10, ge=1, le=50),
+):
+    """
+    Get the offers whose price most needs a refresh call.
+
+    Offers are ranked by staleness (days since last_information_update) times
+    spend impact (weekly consumption times the gap to the price currently
+    paid). Not cached: the ranking moves with time and with calls handed out.
+
+    Args:
+        limit: Number of offers to return (default: 50)
+        max_products_per_call: Maximum number of offers discussed in one call
+
+    Returns:
+        PriceRefreshQueueResponse with the ranked offers, the remaining daily
+        call budget and the calls that would be made next. Start them with
+        POST /api/agent/campaigns and source="refresh_queue".
+    """
+    return await run_cpu(
+        get_price_refresh_service().get_queue,
+        limit=limit,
+        max_products_per_call=max_products_per_call,
+    )
@@ -1,14 +1,29 @@
-from elevenlabs import ElevenLabs
+"""
+ElevenLabs agent configuration.
+
+The agent prompt is a template using ElevenLabs dynamic variables
+({{product_name}}, {{supplier_name}}), filled per call through the
+conversation initiation data. The configuration itself is then the same for
+every call: it is pushed once, and only again when its hash changes. Calls no
+longer pay an update round trip plus a propagation delay, and concurrent
+calls for different products no longer overwrite each other's prompt.
+"""
+
+import hashlib
+import json
 import os
-from dotenv import load_dotenv
+import threading
+from typing import Dict, Optional
+
+from backend.config import load_config
 
 SYSTEM_PROMPT_AVAILABILITY = """
 ## ROLE & CONTEXT
 You are **Alexis**, a professional, efficient, and experienced pharmacy buyer working at City Pharma.  
-You are speaking directly to a supplier representative named **{supplier_name}**.  
+You are speaking directly to a supplier representative named **{{supplier_name}}**.  
 Your single purpose is to verify the **availability, stock level, and delivery timeline** for the product:
 
-➡️ **{product_name}**
+➡️ **{{product_name}}**
 
 ## TONE & STYLE
 - Professional, concise, efficient.  
@@ -36,7 +51,7 @@ Examples of correct format:
 ## BUSINESS QUESTION PRIORITIES (IN ORDER)
 Move through these one by one depending on what the supplier answers:
 
-1. “Do you have {product_name} in stock right now?”
+1. “Do you have {{product_name}} in stock right now?”
 2. “What quantities are available?”
 3. “What formats, dosages, or variants do you have?”
 4. “Are they compliant with pharmacy standards?”
@@ -54,7 +69,7 @@ If something is unclear, request clarification in < 8 words:
 Be friendly but direct.  
 Start **immediately** with the purpose of the call:
 
-“Hello, Alexis from City Pharma. I’m checking availability for {product_name}.  
+“Hello, Alexis from City Pharma. I’m checking availability for {{product_name}}.  
 Do you have it in stock today?”
 
 ## BEHAVIORAL RULES
@@ -91,31 +106,115 @@ If the supplier says any farewell phrase:
 """
 
 
-load_dotenv()
+AVAILABILITY_FIRST_MESSAGE = (
+    "Hey there, I'm the assistant of the pharmacy. "
+    "I'm checking availability for the product {{product_name}}."
+)
+AVAILABILITY_VOICE_ID = "Xb7hH8MSUJpSbSDYk0k2"
 
-def update_agent(agent_name, product_name, supplier_name):
+# Agents whose configuration is managed here, with the env var holding their ID
+MANAGED_AGENTS = {"availability": "AGENT_AVAILABILITY_ID"}
+
+
+def agent_config(agent_name: str) -> Optional[dict]:
+    """Get the conversation_config template of an agent, None if not managed here."""
     if agent_name == "availability":
-        print("\n\n\n\n\nAVAILABILITY AGENT UPDATE\n\n\n\n\n")
-        client = ElevenLabs(api_key=os.getenv("ELEVENLABS_API_KEY"))
-        agent_id = os.getenv("AGENT_AVAILABILITY_ID")
-        first_message = f"Hey there, I'm the assistant of the pharmacy. I'm checking availability for the product {product_name}."
-        client.conversational_ai.agents.update(
-            agent_id=agent_id,
-            conversation_config={
-                "agent": {
-                    "prompt": {
-                        "prompt": SYSTEM_PROMPT_AVAILABILITY.format(
-                                    product_name=product_name,
-                                    supplier_name=supplier_name
-                                )
-                    },
-                    "first_message": first_message,
-                    "language": "en"
-                },
-                "tts": {
-                    "voice_id": "Xb7hH8MSUJpSbSDYk0k2"
-                }
-            }
-        )
-    else:
-        print("\n\n\n\n\n???\n\n\n\n\n")
\ No newline at end of file
+        return {
+            "agent": {
+                "prompt": {"prompt": SYSTEM_PROMPT_AVAILABILITY},
+                "first_message": AVAILABILITY_FIRST_MESSAGE,
+                "language": "en",
+            },
+            "tts": {"voice_id": AVAILABILITY_VOICE_ID},
+        }
+    return None
+
+
+def dynamic_variables(product_name: str, supplier_name: str) -> Dict[str, str]:
+    """Per-call values of the prompt's dynamic variables."""
+    return {"product_name": product_name, "supplier_name": supplier_name}
+
+
+def config_hash(config: dict) -> str:
+    """Stable hash of an agent configuration."""
+    return hashlib.sha256(
+        json.dumps(config, sort_keys=True, ensure_ascii=False).encode()
+    ).hexdigest()
+
+
+class AgentConfigCache:
+    """Remembers the configuration hash pushed to each agent, to skip no-op updates."""
+
+    def __init__(self, client=None):
+        """
+        Initialize the cache.
+
+        Args:
+            client: ElevenLabs client (default: created from ELEVENLABS_API_KEY on first use)
+        """
+        self._client = client
+        self._pushed: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.updates = 0
+
+    @property
+    def client(self):
+        if self._client is None:
+            # Imported here: the SDK is slow to import and only needed once pushing
+            from elevenlabs.client import ElevenLabs
+
+            self._client = ElevenLabs(api_key=os.getenv("ELEVENLABS_API_KEY"))
+        return self._client
+
+    def ensure(self, agent_name: str) -> bool:
+        """
+        Push an agent's configuration if it changed since the last push.
+
+        Args:
+            agent_name: Name of the agent (e.g. "availability")
+
+        Returns:
+            True if the configuration was pushed (callers should let it
+            propagate), False if it was already up to date or not managed here
+        """
+        load_config()
+        config = agent_config(agent_name)
+        agent_id = os.getenv(MANAGED_AGENTS.get(agent_name, ""), "")
+        if config is None or not agent_id:
+            return False
+
+        digest = config_hash(config)
+        with self._lock:
+            if self._pushed.get(agent_id) == digest:
+                return False
+            self.client.conversational_ai.agents.update(
+                agent_id=agent_id, conversation_config=config
+            )
+            self._pushed[agent_id] = digest
+            self.updates += 1
+            return True
+
+    def invalidate(self, agent_name: Optional[str] = None) -> None:
+        """Forget pushed hashes (e.g. after the agent was edited elsewhere)."""
+        with self._lock:
+            if agent_name is None:
+                self._pushed.clear()
+            else:
+                self._pushed.pop(os.getenv(MANAGED_AGENTS.get(agent_name, ""), ""), None)
+
+
+# Global instance
+agent_config_cache = AgentConfigCache()
+
+
+def update_agent(agent_name, product_name, supplier_name):
+    """
+    Make sure an agent is ready to call about a product.
+
+    The product and supplier are passed per call as dynamic variables (see
+    dynamic_variables), so only a changed configuration template is pushed.
+
+    Returns:
+        True if the configuration was pushed and needs time to propagate
+    """
+    return agent_config_cache.ensure(agent_name)
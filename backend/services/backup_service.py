@@ -0,0 +1,495 @@
+"""
+Delta backups for the CSV files rewritten by the updater services.
+
+Instead of copying the whole CSV on every save, each save records only the rows
+that changed (with their previous and new values, and the position of added
+rows). A full copy of the table is kept once as the base; any past version can
+be rebuilt from the base plus the deltas, rows in their original order. Old
+deltas are folded into the base according to the retention policy.
+
+The manifest records the hash of the last saved content. A file changed
+outside the manager (a save without backup, another process) is detected on
+the next save, and the change is recorded as its own version before the new
+one, so the chain of deltas always leads to the file's content.
+
+Usage:
+    python -m backend.services.backup_service list <csv_path>
+    python -m backend.services.backup_service restore <csv_path> <version> [--output PATH]
+    python -m backend.services.backup_service prune <csv_path> [--max-versions N] [--max-age-days D]
+"""
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import shutil
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# Columns identifying a row in each known table
+DEFAULT_KEY_COLUMNS: Dict[str, List[str]] = {
+    "available_product.csv": ["id", "fournisseur"],
+    "orders.csv": ["order_id"],
+    "in_store_product.csv": ["id"],
+    "fournisseur.csv": ["id"],
+}
+
+DEFAULT_MAX_VERSIONS = 50
+DEFAULT_MAX_AGE_DAYS = 30
+
+# Helper column used to tell apart rows sharing the same key
+_OCCURRENCE = "__occurrence"
+
+
+def _read_text_frame(source: Union[str, Path, io.StringIO]) -> pd.DataFrame:
+    """Read a CSV with every cell kept as its exact text (empty cells as "")."""
+    return pd.read_csv(source, dtype=str, keep_default_na=False)
+
+
+def _digest(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def _write_atomic(path: Path, content: str) -> None:
+    """Write a file through a temporary file so readers never see a partial write."""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+class DeltaBackupManager:
+    """Saves a CSV file while keeping a base snapshot and per-save deltas."""
+
+    def __init__(
+        self,
+        csv_path: Union[str, Path],
+        key_columns: Optional[List[str]] = None,
+        backup_dir: Optional[Union[str, Path]] = None,
+        max_versions: Optional[int] = DEFAULT_MAX_VERSIONS,
+        max_age_days: Optional[float] = DEFAULT_MAX_AGE_DAYS,
+    ):
+        """
+        Initialize the backup manager.
+
+        Args:
+            csv_path: Path to the CSV file being protected
+            key_columns: Columns identifying a row. Defaults to the known key of the
+                table (by file name), or every column if the table is unknown.
+            backup_dir: Where base and deltas are stored. Defaults to
+                <csv dir>/.backups/<csv name>/
+            max_versions: Maximum number of deltas to keep (None: unlimited)
+            max_age_days: Maximum age of a delta in days (None: unlimited)
+        """
+        self.csv_path = Path(csv_path)
+        self.key_columns = key_columns or DEFAULT_KEY_COLUMNS.get(self.csv_path.name)
+        if backup_dir is None:
+            backup_dir = self.csv_path.parent / ".backups" / self.csv_path.name
+        self.backup_dir = Path(backup_dir)
+        self.max_versions = max_versions
+        self.max_age_days = max_age_days
+
+    # ------------------------------------------------------------------
+    # Manifest and storage helpers
+    # ------------------------------------------------------------------
+
+    @property
+    def _manifest_path(self) -> Path:
+        return self.backup_dir / "manifest.json"
+
+    @property
+    def _base_path(self) -> Path:
+        return self.backup_dir / "base.csv"
+
+    def _load_manifest(self) -> Optional[dict]:
+        if not self._manifest_path.exists():
+            return None
+        with open(self._manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest: dict) -> None:
+        tmp_path = self._manifest_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self._manifest_path)
+
+    def _delta_path(self, version: int) -> Path:
+        return self.backup_dir / f"delta_{version:06d}.json.gz"
+
+    def _write_delta(self, version: int, delta: dict) -> None:
+        with gzip.open(self._delta_path(version), "wt", encoding="utf-8") as f:
+            json.dump(delta, f)
+
+    def _read_delta(self, version: int) -> dict:
+        with gzip.open(self._delta_path(version), "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _keys_for(self, columns: List[str]) -> List[str]:
+        if self.key_columns and all(c in columns for c in self.key_columns):
+            return list(self.key_columns)
+        return list(columns)
+
+    def _indexed(self, df: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+        """Index a text frame by its key columns plus an occurrence counter."""
+        df = df.copy()
+        df[_OCCURRENCE] = df.groupby(keys, sort=False).cumcount().astype(str)
+        return df.set_index(keys + [_OCCURRENCE], drop=False)
+
+    # ------------------------------------------------------------------
+    # Diff / patch
+    # ------------------------------------------------------------------
+
+    def _diff(self, previous: pd.DataFrame, current: pd.DataFrame) -> dict:
+        """Compute the delta turning `previous` into `current` (both text frames)."""
+        columns = list(current.columns)
+        if list(previous.columns) != columns:
+            # Schema change: store the full table, a delta cannot describe it
+            return {"columns": columns, "full": current.to_dict("records")}
+
+        keys = self._keys_for(columns)
+        prev = self._indexed(previous, keys)
+        cur = self._indexed(current, keys)
+
+        removed_index = prev.index.difference(cur.index, sort=False)
+        added_index = cur.index.difference(prev.index, sort=False)
+        common_index = prev.index.intersection(cur.index, sort=False)
+        if not prev.index[prev.index.isin(common_index)].equals(
+            cur.index[cur.index.isin(common_index)]
+        ):
+            # Rows reordered: positions of added rows cannot describe it
+            return {"columns": columns, "full": current.to_dict("records")}
+
+        rows = []
+        if len(common_index):
+            prev_common = prev.loc[common_index, columns]
+            cur_common = cur.loc[common_index, columns]
+            changed_cells = prev_common.ne(cur_common)
+            changed_rows = changed_cells.any(axis=1)
+            for key in changed_rows[changed_rows].index:
+                changed_cols = [c for c in columns if changed_cells.at[key, c]]
+                rows.append(
+                    {
+                        "key": list(key),
+                        "before": {c: prev_common.at[key, c] for c in changed_cols},
+                        "after": {c: cur_common.at[key, c] for c in changed_cols},
+                    }
+                )
+        for key in removed_index:
+            rows.append(
+                {"key": list(key), "before": prev.loc[key, columns].to_dict(), "after": None}
+            )
+        positions = cur.index.get_indexer(added_index)
+        for key, position in zip(added_index, positions):
+            rows.append(
+                {
+                    "key": list(key),
+                    "before": None,
+                    "after": cur.loc[key, columns].to_dict(),
+                    "position": int(position),
+                }
+            )
+
+        return {"columns": columns, "keys": keys, "rows": rows}
+
+    def _apply(self, table: pd.DataFrame, delta: dict) -> pd.DataFrame:
+        """Apply a forward delta to a text frame."""
+        if "full" in delta:
+            return pd.DataFrame(delta["full"], columns=delta["columns"])
+        if not delta["rows"]:
+            return table
+
+        columns = delta["columns"]
+        keys = delta["keys"]
+        indexed = self._indexed(table, keys)
+
+        removed = [tuple(r["key"]) for r in delta["rows"] if r["after"] is None]
+        if removed:
+            indexed = indexed.drop(index=removed)
+
+        for row in delta["rows"]:
+            if row["before"] is not None and row["after"] is not None:
+                key = tuple(row["key"])
+                for column, value in row["after"].items():
+                    indexed.at[key, column] = value
+
+        added = [r for r in delta["rows"] if r["before"] is None]
+        result = indexed[columns].reset_index(drop=True)
+        if not added:
+            return result
+        if all("position" in r for r in added):
+            added.sort(key=lambda r: r["position"])
+            positions = np.array([r["position"] for r in added])
+        else:
+            # Delta recorded before positions were kept: rows appended at the end
+            positions = len(result) + np.arange(len(added))
+        frame = pd.concat(
+            [result, pd.DataFrame([r["after"] for r in added], columns=columns)],
+            ignore_index=True,
+        )
+        is_added = np.zeros(len(frame), dtype=bool)
+        is_added[positions] = True
+        order = np.empty(len(frame), dtype=np.int64)
+        order[~is_added] = np.arange(len(result))
+        order[is_added] = len(result) + np.arange(len(added))
+        return frame.iloc[order].reset_index(drop=True)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def save(self, df: pd.DataFrame) -> Optional[int]:
+        """
+        Write `df` to the CSV file and record the delta against the previous content.
+
+        Args:
+            df: DataFrame to save
+
+        Returns:
+            The version number of the saved content, or None if nothing changed
+        """
+        buffer = io.StringIO()
+        df.to_csv(buffer, index=False)
+        content = buffer.getvalue()
+
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self._load_manifest()
+        previous = None
+
+        if self.csv_path.exists():
+            on_disk = self.csv_path.read_bytes()
+            previous = _read_text_frame(io.StringIO(on_disk.decode("utf-8")))
+            if manifest is None:
+                # First save: the current file becomes the base (only full copy kept)
+                shutil.copy2(self.csv_path, self._base_path)
+                manifest = self._new_manifest()
+            elif manifest.get("latest_sha256") != _digest(on_disk):
+                # Changed since the last save through the manager: record the
+                # change, so that the latest version is the file's content
+                drift = self._diff(self.rebuild(), previous)
+                if "full" in drift or drift["rows"]:
+                    self._record(manifest, drift, external=True)
+
+        _write_atomic(self.csv_path, content)
+
+        if previous is None:
+            # Nothing existed before: the saved content is the base itself
+            with open(self._base_path, "w", encoding="utf-8", newline="") as f:
+                f.write(content)
+            manifest = self._new_manifest()
+            manifest["latest_sha256"] = _digest(content.encode("utf-8"))
+            self._write_manifest(manifest)
+            return 0
+
+        buffer.seek(0)
+        delta = self._diff(previous, _read_text_frame(buffer))
+        manifest["latest_sha256"] = _digest(content.encode("utf-8"))
+        if "full" not in delta and not delta["rows"]:
+            self._write_manifest(manifest)
+            return None
+
+        version = self._record(manifest, delta)
+        self._write_manifest(manifest)
+
+        self.prune()
+        return version
+
+    def _record(self, manifest: dict, delta: dict, external: bool = False) -> int:
+        """Store a delta as the next version and add it to the manifest (not written)."""
+        version = self.latest_version(manifest) + 1
+        delta["version"] = version
+        delta["created_at"] = datetime.now().isoformat()
+        self._write_delta(version, delta)
+        entry = {
+            "version": version,
+            "created_at": delta["created_at"],
+            "changed_rows": len(delta.get("rows", [])),
+        }
+        if external:
+            entry["external"] = True
+        manifest["versions"].append(entry)
+        return version
+
+    def _new_manifest(self) -> dict:
+        return {
+            "csv_name": self.csv_path.name,
+            "base_version": 0,
+            "base_created_at": datetime.now().isoformat(),
+            "versions": [],
+        }
+
+    def latest_version(self, manifest: Optional[dict] = None) -> int:
+        """Return the most recent recorded version (-1 if no backup exists)."""
+        manifest = manifest if manifest is not None else self._load_manifest()
+        if manifest is None:
+            return -1
+        if manifest["versions"]:
+            return manifest["versions"][-1]["version"]
+        return manifest["base_version"]
+
+    def list_versions(self) -> List[dict]:
+        """
+        List the versions that can be restored.
+
+        Returns:
+            List of dictionaries with 'version', 'created_at' and 'changed_rows'
+        """
+        manifest = self._load_manifest()
+        if manifest is None:
+            return []
+        base = {
+            "version": manifest["base_version"],
+            "created_at": manifest["base_created_at"],
+            "changed_rows": None,
+        }
+        return [base] + manifest["versions"]
+
+    def rebuild(self, version: Optional[int] = None) -> pd.DataFrame:
+        """
+        Rebuild a past version of the table from the base and the deltas.
+
+        Args:
+            version: Version to rebuild (default: latest)
+
+        Returns:
+            The table as a DataFrame of text cells
+        """
+        manifest = self._load_manifest()
+        if manifest is None:
+            raise ValueError(f"No backups found for {self.csv_path}")
+
+        if version is None:
+            version = self.latest_version(manifest)
+        if version < manifest["base_version"] or version > self.latest_version(manifest):
+            raise ValueError(
+                f"Version {version} not available "
+                f"(available: {manifest['base_version']}-{self.latest_version(manifest)})"
+            )
+
+        table = _read_text_frame(self._base_path)
+        for entry in manifest["versions"]:
+            if entry["version"] > version:
+                break
+            table = self._apply(table, self._read_delta(entry["version"]))
+        return table
+
+    def restore(
+        self, version: int, output_path: Optional[Union[str, Path]] = None
+    ) -> Path:
+        """
+        Restore a past version.
+
+        Args:
+            version: Version to restore
+            output_path: Where to write it. If None, the CSV itself is overwritten
+                (recorded as a new version, so the restore can be undone).
+
+        Returns:
+            Path of the written file
+        """
+        table = self.rebuild(version)
+        if output_path is None:
+            self.save(table)
+            return self.csv_path
+
+        output_path = Path(output_path)
+        table.to_csv(output_path, index=False)
+        return output_path
+
+    def prune(
+        self,
+        max_versions: Optional[int] = None,
+        max_age_days: Optional[float] = None,
+    ) -> int:
+        """
+        Fold deltas outside the retention policy into the base.
+
+        Args:
+            max_versions: Override of the maximum number of deltas kept
+            max_age_days: Override of the maximum age of deltas in days
+
+        Returns:
+            Number of deltas folded into the base
+        """
+        max_versions = max_versions if max_versions is not None else self.max_versions
+        max_age_days = max_age_days if max_age_days is not None else self.max_age_days
+
+        manifest = self._load_manifest()
+        if manifest is None or not manifest["versions"]:
+            return 0
+
+        versions = manifest["versions"]
+        expired = 0
+        if max_versions is not None and len(versions) > max_versions:
+            expired = len(versions) - max_versions
+        if max_age_days is not None:
+            cutoff = datetime.now() - timedelta(days=max_age_days)
+            while (
+                expired < len(versions)
+                and datetime.fromisoformat(versions[expired]["created_at"]) < cutoff
+            ):
+                expired += 1
+        if expired == 0:
+            return 0
+
+        base = _read_text_frame(self._base_path)
+        for entry in versions[:expired]:
+            base = self._apply(base, self._read_delta(entry["version"]))
+        base.to_csv(self._base_path, index=False)
+
+        manifest["base_version"] = versions[expired - 1]["version"]
+        manifest["base_created_at"] = versions[expired - 1]["created_at"]
+        manifest["versions"] = versions[expired:]
+        self._write_manifest(manifest)
+
+        for entry in versions[:expired]:
+            self._delta_path(entry["version"]).unlink(missing_ok=True)
+        return expired
+
+
+def main():
+    """Command line entry point for listing, restoring and pruning backups."""
+    parser = argparse.ArgumentParser(description="Manage delta backups of data CSVs")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = subparsers.add_parser("list", help="List restorable versions")
+    list_parser.add_argument("csv_path", type=str)
+
+    restore_parser = subparsers.add_parser("restore", help="Restore a past version")
+    restore_parser.add_argument("csv_path", type=str)
+    restore_parser.add_argument("version", type=int)
+    restore_parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Write the restored table here instead of overwriting the CSV",
+    )
+
+    prune_parser = subparsers.add_parser("prune", help="Apply the retention policy")
+    prune_parser.add_argument("csv_path", type=str)
+    prune_parser.add_argument("--max-versions", type=int, default=DEFAULT_MAX_VERSIONS)
+    prune_parser.add_argument("--max-age-days", type=float, default=DEFAULT_MAX_AGE_DAYS)
+
+    args = parser.parse_args()
+    manager = DeltaBackupManager(args.csv_path)
+
+    if args.command == "list":
+        for entry in manager.list_versions():
+            changed = entry["changed_rows"]
+            label = "base" if changed is None else f"{changed} changed row(s)"
+            print(f"{entry['version']:>6}  {entry['created_at']}  {label}")
+    elif args.command == "restore":
+        path = manager.restore(args.version, output_path=args.output)
+        print(f"Version {args.version} restored to {path}")
+    elif args.command == "prune":
+        folded = manager.prune(args.max_versions, args.max_age_days)
+        print(f"{folded} delta(s) folded into the base")
+
+
+if __name__ == "__main__":
+    main()
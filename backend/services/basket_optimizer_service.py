@@ -0,0 +1,386 @@
+"""Service for choosing suppliers for a whole reorder basket."""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.services.data_loader import get_data_loader
+from backend.services.models import (
+    AvailableProduct,
+    BasketAssignment,
+    BasketOptimizationRequest,
+    BasketOptimizationResponse,
+    BasketSupplierTotal,
+    UnassignedBasketLine,
+)
+from backend.services.timing import timed
+
+# Search nodes explored before returning the best basket found so far
+DEFAULT_MAX_NODES = 20_000
+
+
+class OfferIndex:
+    """Catalog offers grouped by product, stored as arrays."""
+
+    def __init__(self, available_products: List[AvailableProduct]):
+        """
+        Build the index.
+
+        Args:
+            available_products: All offers of the catalog
+        """
+        df = pd.DataFrame(
+            {
+                "id": [p.id for p in available_products],
+                "name": [p.name for p in available_products],
+                "fournisseur": [p.fournisseur for p in available_products],
+                "price": [p.price for p in available_products],
+                "delivery_time": [p.delivery_time for p in available_products],
+            }
+        )
+        product_codes, product_ids = pd.factorize(df["id"])
+        supplier_codes, supplier_ids = pd.factorize(df["fournisseur"])
+        order = np.argsort(product_codes, kind="stable")
+        bounds = np.searchsorted(product_codes[order], np.arange(len(product_ids) + 1))
+
+        self.supplier_ids: List[str] = list(supplier_ids)
+        self.supplier = supplier_codes[order]
+        self.price = df["price"].to_numpy(dtype=np.float64)[order]
+        self.delivery_time = df["delivery_time"].to_numpy(dtype=np.int64)[order]
+        self.names = df["name"].to_numpy()[order]
+        self._slices: Dict[str, Tuple[int, int]] = {
+            product_id: (int(bounds[i]), int(bounds[i + 1]))
+            for i, product_id in enumerate(product_ids)
+        }
+
+    def offers(self, product_id: str) -> Optional[Tuple[int, int]]:
+        """Get the (start, end) range of a product's offers, None if unknown."""
+        return self._slices.get(product_id)
+
+
+class BasketSolver:
+    """
+    Chooses one supplier per basket line to minimize the total cost.
+
+    Constraints: at most `max_suppliers` suppliers, and each supplier used
+    must receive at least its minimum order amount. Lines can only go to
+    offers meeting their delivery deadline (applied when building `costs`).
+
+    The search is a depth-first branch and bound over supplier sets: each
+    supplier is either included or excluded, and a branch is pruned when the
+    cheapest offers of the included and still undecided suppliers cannot beat
+    the best basket found. For a given supplier set, lines go to their
+    cheapest supplier, then under-minimum suppliers pull the lines that cost
+    least to move. A greedy elimination provides the first incumbent.
+    """
+
+    def __init__(
+        self,
+        costs: np.ndarray,
+        min_amounts: np.ndarray,
+        max_suppliers: Optional[int] = None,
+        max_nodes: int = DEFAULT_MAX_NODES,
+    ):
+        """
+        Initialize the solver.
+
+        Args:
+            costs: Line cost per line (rows) and supplier (columns), inf if unavailable
+            min_amounts: Minimum order amount per supplier
+            max_suppliers: Maximum number of suppliers (None: unlimited)
+            max_nodes: Search nodes explored before giving up on proving optimality
+        """
+        self.costs = costs
+        self.min_amounts = min_amounts
+        self.n_lines, self.n_suppliers = costs.shape
+        self.max_suppliers = max_suppliers or self.n_suppliers
+        self.max_nodes = max_nodes
+        self._rows = np.arange(self.n_lines)
+
+        self.best_cost = np.inf
+        self.best_assignment: Optional[np.ndarray] = None
+        self.lower_bound = float(costs.min(axis=1).sum()) if self.n_lines else 0.0
+        self.optimal = False
+        self.nodes = 0
+
+    def assign(self, suppliers: np.ndarray) -> Optional[Tuple[float, np.ndarray]]:
+        """
+        Assign lines within a supplier set.
+
+        Args:
+            suppliers: Column indices of the allowed suppliers
+
+        Returns:
+            (total cost, supplier column per line), or None if infeasible
+        """
+        sub = self.costs[:, suppliers]
+        choice = sub.argmin(axis=1)
+        line_cost = sub[self._rows, choice]
+        if not np.isfinite(line_cost).all():
+            return None
+        assignment = suppliers[choice]
+        totals = np.bincount(assignment, weights=line_cost, minlength=self.n_suppliers)
+
+        under = [s for s in suppliers if 0 < totals[s] < self.min_amounts[s]]
+        for supplier in under:
+            if totals[supplier] == 0:
+                # Emptied by an earlier move: no longer part of the order
+                continue
+            # Move the lines that cost least to move, without breaking other minimums
+            delta = self.costs[:, supplier] - line_cost
+            candidates = np.flatnonzero(np.isfinite(delta) & (assignment != supplier))
+            for line in candidates[np.argsort(delta[candidates], kind="stable")]:
+                if totals[supplier] >= self.min_amounts[supplier]:
+                    break
+                donor = assignment[line]
+                remaining = totals[donor] - line_cost[line]
+                if 0 < remaining < self.min_amounts[donor]:
+                    continue
+                totals[donor] = remaining
+                line_cost[line] = self.costs[line, supplier]
+                totals[supplier] += line_cost[line]
+                assignment[line] = supplier
+            if totals[supplier] < self.min_amounts[supplier]:
+                return None
+
+        if np.count_nonzero(totals) > self.max_suppliers:
+            return None
+        return float(line_cost.sum()), assignment
+
+    def _offer(self, suppliers: np.ndarray) -> None:
+        result = self.assign(suppliers)
+        if result is not None and result[0] < self.best_cost:
+            self.best_cost, self.best_assignment = result
+
+    def _greedy(self, suppliers: np.ndarray) -> None:
+        """Drop suppliers one at a time until the set is feasible."""
+        suppliers = list(suppliers)
+        while len(suppliers) > 1:
+            best_drop = None
+            for supplier in suppliers:
+                rest = np.array([s for s in suppliers if s != supplier])
+                relaxed = self.costs[:, rest].min(axis=1).sum()
+                if not np.isfinite(relaxed):
+                    # Some line would lose its last supplier
+                    continue
+                trial = self.assign(rest)
+                if trial is not None and trial[0] < self.best_cost:
+                    self.best_cost, self.best_assignment = trial
+                # Prefer feasible sets, then the cheapest
+                key = (trial is None, trial[0] if trial is not None else relaxed)
+                if best_drop is None or key < best_drop[0]:
+                    best_drop = (key, supplier)
+            if best_drop is None or not best_drop[0][0]:
+                return
+            suppliers.remove(best_drop[1])
+
+    def solve(self) -> "BasketSolver":
+        """Run the search; results are in best_cost, best_assignment and optimal."""
+        if self.n_lines == 0:
+            self.best_cost, self.best_assignment = 0.0, np.zeros(0, dtype=np.int64)
+            self.optimal = True
+            return self
+
+        cheapest = self.costs.argmin(axis=1)
+        used = np.unique(cheapest)
+        self._offer(used)
+        if self.best_cost <= self.lower_bound:
+            self.optimal = True
+            return self
+        self._greedy(used)
+
+        # Explore suppliers carrying most of the unconstrained spend first
+        spend = np.bincount(
+            cheapest,
+            weights=self.costs[self._rows, cheapest],
+            minlength=self.n_suppliers,
+        )
+        coverage = np.isfinite(self.costs).sum(axis=0)
+        order = np.lexsort((-coverage, -spend))
+        ordered = self.costs[:, order]
+        # suffix[:, i] = cheapest offer among suppliers order[i:]
+        suffix = np.empty((self.n_lines, self.n_suppliers + 1))
+        suffix[:, -1] = np.inf
+        suffix[:, :-1] = np.minimum.accumulate(ordered[:, ::-1], axis=1)[:, ::-1]
+
+        stack = [(0, (), np.full(self.n_lines, np.inf))]
+        while stack:
+            if self.nodes >= self.max_nodes:
+                self.optimal = self.best_cost <= self.lower_bound + 1e-9
+                return self
+            depth, chosen, current = stack.pop()
+            self.nodes += 1
+            bound = np.minimum(current, suffix[:, depth]).sum()
+            if not bound < self.best_cost - 1e-9:
+                continue
+            if depth == self.n_suppliers or len(chosen) == self.max_suppliers:
+                continue
+            supplier = order[depth]
+            # Exclude first so the include branch is explored next
+            stack.append((depth + 1, chosen, current))
+            included = chosen + (supplier,)
+            with_supplier = np.minimum(current, self.costs[:, supplier])
+            if np.isfinite(with_supplier).all():
+                self._offer(np.array(included))
+            stack.append((depth + 1, included, with_supplier))
+
+        self.optimal = bool(
+            not self.min_amounts.any() or self.best_cost <= self.lower_bound + 1e-9
+        )
+        return self
+
+
+class BasketOptimizerService:
+    """Service to pick suppliers for a reorder basket at minimum total cost."""
+
+    def __init__(self, data_dir: Optional[Path] = None):
+        """
+        Initialize the basket optimizer service.
+
+        Args:
+            data_dir: Path to the data directory.
+        """
+        self.data_loader = get_data_loader(data_dir)
+
+    def get_offer_index(self) -> OfferIndex:
+        """Get the offer index of the current data version."""
+        return self.data_loader.get_derived(
+            "offer_index",
+            lambda: OfferIndex(self.data_loader.load_available_products_models()),
+        )
+
+    @timed("basket.optimize")
+    def optimize(
+        self,
+        request: BasketOptimizationRequest,
+        max_nodes: int = DEFAULT_MAX_NODES,
+    ) -> BasketOptimizationResponse:
+        """
+        Choose suppliers for every line of a basket.
+
+        Args:
+            request: Lines to order and supplier constraints
+            max_nodes: Search budget before returning the best basket found
+
+        Returns:
+            BasketOptimizationResponse with the chosen offers
+        """
+        index = self.get_offer_index()
+        fournisseurs = {f.id: f for f in self.data_loader.load_fournisseurs_models()}
+
+        unassigned = []
+        lines = []
+        rows, offers = [], []
+        for line in request.lines:
+            bounds = index.offers(line.product_id)
+            if bounds is None:
+                unassigned.append(
+                    UnassignedBasketLine(product_id=line.product_id, reason="No offer")
+                )
+                continue
+            start, end = bounds
+            candidates = np.arange(start, end)
+            if line.max_delivery_time is not None:
+                candidates = candidates[
+                    index.delivery_time[candidates] <= line.max_delivery_time
+                ]
+            if len(candidates) == 0:
+                unassigned.append(
+                    UnassignedBasketLine(
+                        product_id=line.product_id,
+                        reason=f"No offer delivering within {line.max_delivery_time} days",
+                    )
+                )
+                continue
+            rows.append(np.full(len(candidates), len(lines)))
+            offers.append(candidates)
+            lines.append(line)
+
+        rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+        offers = np.concatenate(offers) if offers else np.zeros(0, dtype=np.int64)
+        columns, supplier_codes = np.unique(index.supplier[offers], return_inverse=True)
+        quantities = np.array([line.quantity for line in lines], dtype=np.float64)
+        line_costs = index.price[offers] * quantities[rows]
+
+        # Keep the cheapest offer of each (line, supplier) pair
+        cells = rows * len(columns) + supplier_codes
+        by_cost = np.lexsort((line_costs, cells))
+        _, first = np.unique(cells[by_cost], return_index=True)
+        keep = by_cost[first]
+        costs = np.full((len(lines), len(columns)), np.inf)
+        cell_offer = np.full((len(lines), len(columns)), -1, dtype=np.int64)
+        costs[rows[keep], supplier_codes[keep]] = line_costs[keep]
+        cell_offer[rows[keep], supplier_codes[keep]] = offers[keep]
+
+        supplier_ids = [index.supplier_ids[c] for c in columns]
+        min_amounts = np.array(
+            [
+                request.min_order_amounts.get(s, request.default_min_order_amount)
+                for s in supplier_ids
+            ],
+            dtype=np.float64,
+        )
+        solver = BasketSolver(
+            costs, min_amounts, request.max_suppliers, max_nodes=max_nodes
+        ).solve()
+
+        if solver.best_assignment is None:
+            return BasketOptimizationResponse(
+                assignments=[],
+                suppliers=[],
+                unassigned=unassigned,
+                total_cost=0.0,
+                lower_bound=round(solver.lower_bound, 2),
+                optimal=False,
+                feasible=False,
+            )
+
+        assignments = []
+        totals: Dict[int, List[float]] = {}
+        for row, line in enumerate(lines):
+            column = int(solver.best_assignment[row])
+            offer = int(cell_offer[row, column])
+            supplier_id = supplier_ids[column]
+            supplier = fournisseurs.get(supplier_id)
+            line_cost = float(costs[row, column])
+            assignments.append(
+                BasketAssignment(
+                    product_id=line.product_id,
+                    product_name=str(index.names[offer]),
+                    quantity=line.quantity,
+                    supplier_id=supplier_id,
+                    supplier_name=supplier.name if supplier else "Unknown",
+                    unit_price=float(index.price[offer]),
+                    line_cost=round(line_cost, 2),
+                    delivery_time=int(index.delivery_time[offer]),
+                )
+            )
+            entry = totals.setdefault(column, [0, 0.0])
+            entry[0] += 1
+            entry[1] += line_cost
+
+        suppliers = [
+            BasketSupplierTotal(
+                supplier_id=supplier_ids[column],
+                supplier_name=fournisseurs[supplier_ids[column]].name
+                if supplier_ids[column] in fournisseurs
+                else "Unknown",
+                line_count=count,
+                total=round(total, 2),
+                min_order_amount=float(min_amounts[column]),
+            )
+            for column, (count, total) in totals.items()
+        ]
+        suppliers.sort(key=lambda s: s.total, reverse=True)
+
+        return BasketOptimizationResponse(
+            assignments=assignments,
+            suppliers=suppliers,
+            unassigned=unassigned,
+            total_cost=round(solver.best_cost, 2),
+            lower_bound=round(solver.lower_bound, 2),
+            optimal=solver.optimal,
+            feasible=True,
+        )
@@ -0,0 +1,316 @@
+"""
+Service for batch supplier call campaigns.
+
+A campaign takes a list of (supplier, product, agent) targets, dedupes them
+and groups them so each supplier gets one call per agent covering several
+products, then runs the calls in the background under a concurrency limit:
+per campaign, and across all campaigns so two campaigns cannot saturate the
+telephony line together. Each call is a regular conversation task, so the
+existing status endpoints keep working; the campaign aggregates their
+progress and parse results.
+"""
+
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from backend.services.conversation_manager import (
+    ConversationManager,
+    ConversationStatus,
+    conversation_manager,
+)
+from backend.services.data_loader import get_data_loader
+from backend.services.elevenlabs_agent_service import call_agent_background
+from backend.services.inventory_service import InventoryService
+from backend.services.models import (
+    CallCampaignRequest,
+    CallCampaignResponse,
+    CampaignCall,
+    CampaignTarget,
+)
+from backend.services.price_refresh_service import get_price_refresh_service
+
+# Calls running at the same time across all campaigns
+MAX_CONCURRENT_CALLS = int(os.getenv("AGENT_MAX_CONCURRENT_CALLS", "3"))
+
+# Runs one call and its parsing: (task_id, agent_name, api_key, supplier_name, product_name)
+CallRunner = Callable[[str, str, Optional[str], str, str], None]
+
+# One grouped call: (supplier_name, agent_name, product_names)
+GroupedCall = Tuple[str, str, List[str]]
+
+
+def group_targets(
+    targets: List[CampaignTarget], max_products_per_call: int
+) -> List[GroupedCall]:
+    """
+    Dedupe targets and group them into one call per supplier and agent.
+
+    Suppliers are matched case-insensitively, products keep their first
+    spelling and order. A supplier with more products than
+    max_products_per_call gets several calls.
+
+    Args:
+        targets: Targets in priority order
+        max_products_per_call: Maximum number of products discussed in one call
+
+    Returns:
+        (supplier_name, agent_name, product_names) per call, in target order
+    """
+    groups: Dict[tuple, dict] = {}
+    for target in targets:
+        key = (target.supplier_name.strip().lower(), target.agent_name)
+        group = groups.setdefault(
+            key, {"supplier_name": target.supplier_name.strip(), "products": {}}
+        )
+        if target.product_name and target.product_name.strip():
+            product = target.product_name.strip()
+            group["products"].setdefault(product.lower(), product)
+
+    calls = []
+    for (_, agent_name), group in groups.items():
+        products = list(group["products"].values())
+        chunks = [
+            products[i : i + max_products_per_call]
+            for i in range(0, len(products), max_products_per_call)
+        ] or [[]]
+        for chunk in chunks:
+            calls.append((group["supplier_name"], agent_name, chunk))
+    return calls
+
+
+class CallCampaign:
+    """State of one campaign: its calls and how many have finished."""
+
+    def __init__(self, campaign_id: str, total_targets: int):
+        self.campaign_id = campaign_id
+        self.total_targets = total_targets
+        self.created_at = datetime.now()
+        self.completed_at: Optional[datetime] = None
+        # (task_id, grouped call) per call, in scheduling order
+        self.calls: List[Tuple[str, GroupedCall]] = []
+        self.finished = 0
+        self._lock = threading.Lock()
+
+    def call_finished(self) -> None:
+        """Count a finished call (its parsing included)."""
+        with self._lock:
+            self.finished += 1
+            if self.finished == len(self.calls):
+                self.completed_at = datetime.now()
+
+
+class CallCampaignService:
+    """Service for starting and tracking supplier call campaigns."""
+
+    def __init__(
+        self,
+        data_dir: Optional[Path] = None,
+        call_runner: Optional[CallRunner] = None,
+        manager: Optional[ConversationManager] = None,
+        max_concurrent_calls: int = MAX_CONCURRENT_CALLS,
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            data_dir: Path to data directory
+            call_runner: Function running one call (default: call_agent_background)
+            manager: Conversation task manager (default: global manager)
+            max_concurrent_calls: Calls running at the same time across campaigns
+        """
+        self.data_loader = get_data_loader(data_dir)
+        self.data_dir = data_dir
+        self.call_runner = call_runner or call_agent_background
+        self.manager = manager or conversation_manager
+        self._slots = threading.BoundedSemaphore(max_concurrent_calls)
+        self._campaigns: Dict[str, CallCampaign] = {}
+
+    def targets_from_late_orders(self) -> List[CampaignTarget]:
+        """Delivery follow-ups for every undelivered order past its ETA."""
+        orders = InventoryService(self.data_dir).get_active_orders()
+        return [
+            CampaignTarget(
+                supplier_name=order["supplier_name"],
+                product_name=order["product_name"],
+                agent_name="delivery",
+            )
+            for order in orders
+            if order["status"] == "delayed"
+        ]
+
+    def targets_from_stale_offers(
+        self, stale_after_days: int, now: Optional[datetime] = None
+    ) -> List[CampaignTarget]:
+        """
+        Price checks for every offer not updated for stale_after_days, oldest first.
+
+        Args:
+            stale_after_days: Age in days making an offer stale
+            now: Reference time (default: now)
+        """
+        now = now or datetime.now()
+        offers = self.data_loader.load_available_products()
+        suppliers = self.data_loader.load_fournisseurs()
+        updated = pd.to_datetime(offers["last_information_update"], errors="coerce")
+        stale = offers[
+            updated.isna() | (updated < now - timedelta(days=stale_after_days))
+        ].assign(updated=updated)
+        stale = stale.sort_values("updated", na_position="first", kind="stable")
+        names = dict(zip(suppliers["id"], suppliers["name"]))
+        return [
+            CampaignTarget(
+                supplier_name=names[supplier_id],
+                product_name=product_name,
+                agent_name="products",
+            )
+            for supplier_id, product_name in zip(stale["fournisseur"], stale["name"])
+            if supplier_id in names
+        ]
+
+    def _run_call(
+        self,
+        campaign: CallCampaign,
+        task_id: str,
+        call: GroupedCall,
+        api_key: Optional[str],
+    ) -> None:
+        """Run one call when a global slot is free."""
+        supplier_name, agent_name, product_names = call
+        try:
+            with self._slots:
+                self.call_runner(
+                    task_id,
+                    agent_name,
+                    api_key,
+                    supplier_name,
+                    ", ".join(product_names) or "Inconnu",
+                )
+        except Exception as e:
+            self.manager.update_task_status(
+                task_id, ConversationStatus.FAILED, error=str(e)
+            )
+        finally:
+            campaign.call_finished()
+
+    def start_campaign(
+        self, request: CallCampaignRequest, api_key: Optional[str] = None
+    ) -> CallCampaignResponse:
+        """
+        Group the targets of a campaign and start its calls in the background.
+
+        Args:
+            request: Targets, optional data source and limits
+            api_key: ElevenLabs API key
+
+        Returns:
+            CallCampaignResponse with the scheduled calls
+
+        Raises:
+            ValueError: If the campaign has no targets
+        """
+        targets = list(request.targets)
+        if request.source == "late_orders":
+            targets += self.targets_from_late_orders()
+        elif request.source == "stale_offers":
+            targets += self.targets_from_stale_offers(request.stale_after_days)
+        elif request.source == "refresh_queue":
+            targets += get_price_refresh_service().take_calls(
+                request.max_products_per_call
+            )
+        if not targets:
+            raise ValueError("Campaign has no targets")
+
+        campaign = CallCampaign(str(uuid.uuid4()), len(targets))
+        for call in group_targets(targets, request.max_products_per_call):
+            supplier_name, agent_name, _ = call
+            task = self.manager.create_task(agent_name, supplier_name)
+            campaign.calls.append((task.task_id, call))
+        self._campaigns[campaign.campaign_id] = campaign
+
+        executor = ThreadPoolExecutor(
+            max_workers=request.max_concurrent_calls,
+            thread_name_prefix=f"campaign-{campaign.campaign_id[:8]}",
+        )
+        for task_id, call in campaign.calls:
+            executor.submit(self._run_call, campaign, task_id, call, api_key)
+        executor.shutdown(wait=False)
+
+        return self.get_campaign(campaign.campaign_id)
+
+    def get_campaign(self, campaign_id: str) -> Optional[CallCampaignResponse]:
+        """
+        Get the progress and aggregated results of a campaign.
+
+        Args:
+            campaign_id: ID returned when the campaign was started
+
+        Returns:
+            CallCampaignResponse, or None if the campaign is unknown
+        """
+        campaign = self._campaigns.get(campaign_id)
+        if campaign is None:
+            return None
+
+        calls = []
+        counts = {status: 0 for status in ConversationStatus}
+        results: Dict[str, int] = {}
+        for task_id, (supplier_name, agent_name, product_names) in campaign.calls:
+            task = self.manager.get_task(task_id)
+            counts[task.status] += 1
+            for key, value in (task.parse_result or {}).items():
+                results[key] = results.get(key, 0) + value
+            calls.append(
+                CampaignCall(
+                    supplier_name=supplier_name,
+                    agent_name=agent_name,
+                    product_names=product_names,
+                    task_id=task_id,
+                    status=task.status.value,
+                    conversation_id=task.conversation_id,
+                    error=task.error,
+                    parse_result=task.parse_result,
+                )
+            )
+
+        return CallCampaignResponse(
+            campaign_id=campaign.campaign_id,
+            status="completed" if campaign.completed_at else "running",
+            created_at=campaign.created_at.isoformat(),
+            completed_at=campaign.completed_at.isoformat()
+            if campaign.completed_at
+            else None,
+            total_targets=campaign.total_targets,
+            total_calls=len(calls),
+            pending=counts[ConversationStatus.PENDING],
+            running=counts[ConversationStatus.RUNNING],
+            completed=counts[ConversationStatus.COMPLETED],
+            failed=counts[ConversationStatus.FAILED],
+            calls=calls,
+            results=results,
+        )
+
+    def list_campaigns(self) -> List[CallCampaignResponse]:
+        """Get all campaigns, most recent first."""
+        return [
+            self.get_campaign(campaign_id)
+            for campaign_id in reversed(list(self._campaigns))
+        ]
+
+
+# Global instance
+_call_campaign_service: Optional[CallCampaignService] = None
+
+
+def get_call_campaign_service() -> CallCampaignService:
+    """Get or create the global call campaign service."""
+    global _call_campaign_service
+    if _call_campaign_service is None:
+        _call_campaign_service = CallCampaignService()
+    return _call_campaign_service
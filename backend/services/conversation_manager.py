@@ -34,6 +34,7 @@ class ConversationTask:
         self.conversation_id: Optional[str] = None
         self.error: Optional[str] = None
         self.total_messages: int = 0
+        self.parse_result: Optional[Dict[str, int]] = None
 
     def to_dict(self) -> dict:
         """Convert task to dictionary."""
@@ -50,6 +51,7 @@ class ConversationTask:
             "conversation_id": self.conversation_id,
             "error": self.error,
             "total_messages": self.total_messages,
+            "parse_result": self.parse_result,
         }
 
 
@@ -97,6 +99,12 @@ class ConversationManager:
             if total_messages:
                 task.total_messages = total_messages
 
+    def set_parse_result(self, task_id: str, parse_result: Dict[str, int]):
+        """Record the outcome of the automatic parsing of a task's conversation."""
+        task = self._tasks.get(task_id)
+        if task:
+            task.parse_result = parse_result
+
     def list_tasks(self) -> list[ConversationTask]:
         """List all tasks."""
         return list(self._tasks.values())
@@ -1,113 +1,658 @@
-"""Data loader service for loading and caching CSV data."""
+"""
+Data loader service for loading and caching CSV data.
 
+The data is served from immutable snapshots (`DataSnapshot`): the tables of
+one version of the data files, read together, plus the models and derived
+values built from them. When a data file changes, a new snapshot is built in
+a background thread, with the models and derived values the current one
+had, then swapped in atomically; until then requests keep being served from
+the current snapshot, so no request waits for a rebuild (only the very first
+snapshot is built on demand).
+
+Inside `pin_snapshots()` (the API pins one per request), each loader serves
+the snapshot it served first in that context, even if a newer one is
+swapped in meanwhile, so a request never mixes two versions of the data.
+Contexts copied from it (run_cpu / run_io work) share the pins.
+
+Snapshot versions are unique in the process, across loaders, so caches
+keyed on the data version never confuse two data directories.
+
+`get_data_loader()` returns a loader that follows the context: inside
+`use_data_loader(loader)` (the API sets the tenant's loader per request,
+see backend.services.tenants) it serves that loader's data, elsewhere the
+default data directory's. Services keep it from their construction and
+serve whichever tenant the request is for.
+
+With SHARED_DATA set, the default loader maps the tables a publisher
+process wrote to shared memory instead of reading the files (see
+backend.services.shared_data), so API workers share one copy of them.
+"""
+
+import errno
+import itertools
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 from backend.services.models import AvailableProduct, Fournisseur, InStoreProduct
+from backend.services.timing import span
+
+
+# Files whose changes make cached data (and anything derived from it) stale
+WATCHED_FILES = [
+    "in_store_product.csv",
+    "available_product.csv",
+    "fournisseur.csv",
+    "orders.csv",
+    "price_history",
+]
+
+# ID and name columns per file, with the domain whose dictionary encodes them.
+# Tables share one dictionary per domain, so their codes can be joined directly.
+ENCODED_COLUMNS = {
+    "in_store_product.csv": {
+        "id": "product_id",
+        "name": "product_name",
+        "fournisseur_id": "supplier_id",
+    },
+    "available_product.csv": {
+        "id": "product_id",
+        "name": "product_name",
+        "fournisseur": "supplier_id",
+    },
+    "fournisseur.csv": {"id": "supplier_id", "name": "supplier_name"},
+    "orders.csv": {"product_name": "product_name", "fournisseur_id": "supplier_id"},
+}
+
+
+def clean_delivery_time(df: pd.DataFrame) -> pd.DataFrame:
+    """Fill missing delivery times with 7 days and bound them to 1-14 days (in place)."""
+    if "delivery_time" in df.columns:
+        delivery_time = pd.to_numeric(df["delivery_time"], errors="coerce")
+        df["delivery_time"] = delivery_time.fillna(7.0).clip(lower=1, upper=14).astype(int)
+    return df
+
+
+class Vocabulary:
+    """
+    Sorted dictionary of the distinct strings of a domain (IDs or names).
+
+    Codes are positions in the sorted strings, so comparing codes compares
+    the strings: sorts and range filters can run on the codes too.
+    """
+
+    def __init__(self, values: Iterable[str]):
+        """
+        Build the dictionary.
+
+        Args:
+            values: Strings of the domain, duplicates allowed
+        """
+        uniques = pd.unique(pd.Series(list(values), dtype=object).dropna().astype(str))
+        self.strings = np.sort(np.asarray(uniques, dtype=object))
+        self.dtype = pd.CategoricalDtype(self.strings)
+        self._index = pd.Index(self.strings)
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def encode(self, values: Iterable[str]) -> np.ndarray:
+        """Int32 codes of strings, -1 for strings not in the dictionary."""
+        if isinstance(values, pd.Series) and values.dtype == self.dtype:
+            return values.cat.codes.to_numpy(dtype=np.int32)
+        return self._index.get_indexer(pd.Index(list(values), dtype=object)).astype(np.int32)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Strings of codes (codes must be valid)."""
+        return self.strings[np.asarray(codes)]
+
+    def position(self, value: str) -> float:
+        """Code of a string, or x.5 between the codes around it if unknown."""
+        pos = int(np.searchsorted(self.strings, value, side="left"))
+        if pos < len(self.strings) and self.strings[pos] == value:
+            return float(pos)
+        return pos - 0.5
+
+
+# Snapshot versions, unique across loaders
+_versions = itertools.count()
+
+# Data directory of the default loader
+DEFAULT_DATA_DIR = Path(__file__).parent.parent.parent / "data"
+
+# CSV tables of a snapshot, read together
+TABLE_FILES = [
+    "in_store_product.csv",
+    "available_product.csv",
+    "fournisseur.csv",
+    "orders.csv",
+]
+
+Signature = Tuple[Any, ...]
+
+
+def files_signature(data_dir: Path) -> Signature:
+    """Modification time and size of the watched files (None if missing)."""
+    signature = []
+    for name in WATCHED_FILES:
+        try:
+            stat = (data_dir / name).stat()
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def read_tables(data_dir: Path) -> Dict[str, Optional[pd.DataFrame]]:
+    """Read the tables of TABLE_FILES (None if missing)."""
+    tables: Dict[str, Optional[pd.DataFrame]] = {}
+    for file_name in TABLE_FILES:
+        path = data_dir / file_name
+        with span("data.csv_load"):
+            tables[file_name] = pd.read_csv(path) if path.is_file() else None
+    return tables
+
+
+class DataSnapshot:
+    """
+    One version of the data: its tables, and the models and values derived from them.
+
+    Tables are read when the snapshot is created and never change. Models
+    and derived values are built once, on first use or before the snapshot
+    is published, and shared by every request served from the snapshot.
+    """
+
+    def __init__(self, data_dir: Path, version: int, source: Optional[Any] = None):
+        """
+        Read the tables.
+
+        Args:
+            data_dir: Path to the data directory
+            version: Data version of the snapshot
+            source: Shared data to map the tables from (SharedDataReader),
+                instead of reading the files
+        """
+        self.data_dir = data_dir
+        self.version = version
+        self.tables: Dict[str, Any]
+        if source is not None:
+            self.signature, self.tables = source.read(data_dir)
+        else:
+            # Taken before reading: a file changed while reading triggers another snapshot
+            self.signature = files_signature(data_dir)
+            self.tables = read_tables(data_dir)
+        self.models: Dict[str, list] = {}
+        self.derived: Dict[str, Any] = {}
+        self.lock = threading.RLock()
+        # Size estimated as values are added, objects reachable twice counted once
+        self._seen = {id(self)}
+        self._size = estimate_size(self.tables, self._seen)
+
+    def table(self, file_name: str) -> pd.DataFrame:
+        """The table of a file (shared: do not modify)."""
+        table = self.tables[file_name]
+        if table is None:
+            path = self.data_dir / file_name
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), str(path))
+        if not isinstance(table, pd.DataFrame):
+            return table.to_frame()  # Mapped from shared memory: copied out
+        return table
+
+    def frame(self, file_name: str) -> pd.DataFrame:
+        """A private copy of the table of a file."""
+        table = self.tables[file_name]
+        if isinstance(table, pd.DataFrame):
+            return table.copy()
+        return self.table(file_name)
+
+    def add_model(self, name: str, models: list) -> None:
+        """Store the models of a table and count their size."""
+        with self.lock:
+            self.models[name] = models
+            self._size += estimate_size(models, self._seen)
+
+    def add_derived(self, name: str, value: Any) -> None:
+        """Store a derived value and count its size."""
+        with self.lock:
+            self.derived[name] = value
+            self._size += estimate_size(value, self._seen)
+
+    def memory_usage(self) -> int:
+        """Estimated bytes held by the tables, models and derived values."""
+        return self._size
+
+
+def estimate_size(value: Any, seen: Optional[set] = None) -> int:
+    """
+    Approximate bytes held by a value and what it references.
+
+    Objects reachable several times are counted once; loaders, functions and
+    classes are not followed.
+    """
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        return int(np.sum(value.memory_usage(deep=True)))
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return value.nbytes + sum(estimate_size(item, seen) for item in value.flat)
+        return value.nbytes
+    size = sys.getsizeof(value)
+    if isinstance(value, (str, bytes, int, float, bool, type(None), DataLoader)) or callable(value):
+        return size
+    if isinstance(value, dict):
+        return size + sum(
+            estimate_size(key, seen) + estimate_size(item, seen) for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(estimate_size(item, seen) for item in value)
+    if hasattr(value, "__dict__"):
+        return size + estimate_size(vars(value), seen)
+    return size
+
+
+# Snapshot pinned per loader in the current context (see pin_snapshots)
+_pins: ContextVar[Optional[Dict["DataLoader", DataSnapshot]]] = ContextVar(
+    "data_snapshot_pins", default=None
+)
+
+
+@contextmanager
+def pin_snapshots() -> Iterator[None]:
+    """Serve each loader's first-used snapshot for the rest of this context."""
+    token = _pins.set({})
+    try:
+        yield
+    finally:
+        _pins.reset(token)
+
+
+# Loader followed by get_data_loader() in the current context (see use_data_loader)
+_current: ContextVar[Optional["DataLoader"]] = ContextVar("data_loader", default=None)
+
+
+@contextmanager
+def use_data_loader(data_loader: "DataLoader") -> Iterator[None]:
+    """Make get_data_loader() serve a loader's data for the rest of this context."""
+    token = _current.set(data_loader)
+    try:
+        yield
+    finally:
+        _current.reset(token)
 
 
 class DataLoader:
-    """Loads and caches CSV data files."""
+    """Loads and caches CSV data files, as versioned snapshots."""
 
-    def __init__(self, data_dir: Optional[Path] = None):
+    def __init__(self, data_dir: Optional[Path] = None, shared: Optional[Any] = None):
         """
         Initialize the data loader.
 
         Args:
             data_dir: Path to the data directory. If None, uses ../data relative to this file.
+            shared: Shared data publishing this directory (SharedDataReader):
+                tables are mapped from it instead of read from the files
         """
-        if data_dir is None:
-            # Default to ../data relative to this file
-            backend_dir = Path(__file__).parent.parent
-            data_dir = backend_dir.parent / "data"
+        self.data_dir = Path(data_dir) if data_dir is not None else DEFAULT_DATA_DIR
+        self.shared = shared
+        self._snapshot: Optional[DataSnapshot] = None
+        # Last builder of each derived value, rerun on new snapshots
+        self._builders: Dict[str, Callable[[], Any]] = {}
+        self._build_lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+        self._rebuild_pending = False
+        self._idle = threading.Event()
+        self._idle.set()
+        self.swaps = 0
+
+    def current_snapshot(self) -> DataSnapshot:
+        """The latest published snapshot (the first one is built on demand)."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._build_lock:
+                if self._snapshot is None:
+                    self._snapshot = DataSnapshot(self.data_dir, next(_versions), self.shared)
+                snapshot = self._snapshot
+        return snapshot
+
+    def snapshot(self) -> DataSnapshot:
+        """The snapshot serving this context: the pinned one, else the latest."""
+        pins = _pins.get()
+        if pins is None:
+            return self.current_snapshot()
+        snapshot = pins.get(self)
+        if snapshot is None:
+            snapshot = pins.setdefault(self, self.current_snapshot())
+        return snapshot
 
-        self.data_dir = Path(data_dir)
-        self._in_store_products: Optional[pd.DataFrame] = None
-        self._available_products: Optional[pd.DataFrame] = None
-        self._fournisseurs: Optional[pd.DataFrame] = None
-        self._in_store_products_models: Optional[List[InStoreProduct]] = None
-        self._available_products_models: Optional[List[AvailableProduct]] = None
-        self._fournisseurs_models: Optional[List[Fournisseur]] = None
+    @contextmanager
+    def _serving(self, snapshot: DataSnapshot) -> Iterator[None]:
+        """Serve a given snapshot in this context (builds of its derived values)."""
+        token = _pins.set({**(_pins.get() or {}), self: snapshot})
+        current_token = _current.set(self)
+        try:
+            yield
+        finally:
+            _current.reset(current_token)
+            _pins.reset(token)
+
+    @property
+    def data_version(self) -> int:
+        """Version of the data served in this context; increases on every swap."""
+        return self.snapshot().version
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the data was read (a snapshot exists)."""
+        return self._snapshot is not None
+
+    def memory_usage(self) -> int:
+        """Estimated bytes held by the current snapshot (0 before the first one)."""
+        snapshot = self._snapshot
+        return 0 if snapshot is None else snapshot.memory_usage()
 
     def load_in_store_products(self) -> pd.DataFrame:
         """Load in-store products CSV as DataFrame."""
-        if self._in_store_products is None:
-            file_path = self.data_dir / "in_store_product.csv"
-            self._in_store_products = pd.read_csv(file_path)
-        return self._in_store_products.copy()
+        return self.snapshot().frame("in_store_product.csv")
 
     def load_available_products(self) -> pd.DataFrame:
         """Load available products CSV as DataFrame."""
-        if self._available_products is None:
-            file_path = self.data_dir / "available_product.csv"
-            self._available_products = pd.read_csv(file_path)
-        return self._available_products.copy()
+        return self.snapshot().frame("available_product.csv")
 
     def load_fournisseurs(self) -> pd.DataFrame:
         """Load fournisseurs (suppliers) CSV as DataFrame."""
-        if self._fournisseurs is None:
-            file_path = self.data_dir / "fournisseur.csv"
-            self._fournisseurs = pd.read_csv(file_path)
-        return self._fournisseurs.copy()
+        return self.snapshot().frame("fournisseur.csv")
+
+    def load_orders(self) -> pd.DataFrame:
+        """Load orders CSV as DataFrame."""
+        return self.snapshot().frame("orders.csv")
+
+    def _models(self, name: str, build: Callable[[DataSnapshot], list]) -> list:
+        """Models of the served snapshot, built once per snapshot."""
+        snapshot = self.snapshot()
+        with snapshot.lock:
+            if name not in snapshot.models:
+                with self._serving(snapshot), span("data.model_build"):
+                    snapshot.add_model(name, build(snapshot))
+            return snapshot.models[name]
 
     def load_in_store_products_models(self) -> List[InStoreProduct]:
         """Load in-store products as Pydantic models."""
-        if self._in_store_products_models is None:
-            df = self.load_in_store_products()
-            self._in_store_products_models = [
-                InStoreProduct(**row) for row in df.to_dict("records")
-            ]
-        return self._in_store_products_models
+
+        def build(snapshot: DataSnapshot) -> List[InStoreProduct]:
+            df = snapshot.table("in_store_product.csv")
+            return [InStoreProduct(**row) for row in df.to_dict("records")]
+
+        return self._models("in_store_product", build)
 
     def load_available_products_models(self) -> List[AvailableProduct]:
         """Load available products as Pydantic models."""
-        if self._available_products_models is None:
-            df = self.load_available_products()
-            # Clean delivery_time: fill NaN with default 7 days, ensure it's int and within valid range
-            if "delivery_time" in df.columns:
-                df["delivery_time"] = pd.to_numeric(df["delivery_time"], errors="coerce")
-                df["delivery_time"] = df["delivery_time"].fillna(7.0)
-                df["delivery_time"] = df["delivery_time"].clip(lower=1, upper=14)
-                df["delivery_time"] = df["delivery_time"].astype(int)
-            
-            self._available_products_models = [
-                AvailableProduct(**row) for row in df.to_dict("records")
-            ]
-        return self._available_products_models
+
+        def build(snapshot: DataSnapshot) -> List[AvailableProduct]:
+            df = clean_delivery_time(snapshot.frame("available_product.csv"))
+            return [AvailableProduct(**row) for row in df.to_dict("records")]
+
+        return self._models("available_product", build)
 
     def load_fournisseurs_models(self) -> List[Fournisseur]:
         """Load fournisseurs as Pydantic models."""
-        if self._fournisseurs_models is None:
-            df = self.load_fournisseurs()
-            self._fournisseurs_models = [
-                Fournisseur(**row) for row in df.to_dict("records")
+
+        def build(snapshot: DataSnapshot) -> List[Fournisseur]:
+            df = snapshot.table("fournisseur.csv")
+            return [Fournisseur(**row) for row in df.to_dict("records")]
+
+        return self._models("fournisseur", build)
+
+    def _load_file(self, file_name: str) -> pd.DataFrame:
+        """Load a data file by name."""
+        loaders = {
+            "in_store_product.csv": self.load_in_store_products,
+            "available_product.csv": self.load_available_products,
+            "fournisseur.csv": self.load_fournisseurs,
+            "orders.csv": self.load_orders,
+        }
+        return loaders[file_name]()
+
+    def get_vocabularies(self) -> Dict[str, Vocabulary]:
+        """Get the dictionary of every domain (see ENCODED_COLUMNS) for the current data."""
+
+        def build() -> Dict[str, Vocabulary]:
+            values: Dict[str, List[pd.Series]] = {}
+            for file_name, columns in ENCODED_COLUMNS.items():
+                df = self._load_file(file_name)
+                for column, domain in columns.items():
+                    values.setdefault(domain, []).append(df[column])
+            return {
+                domain: Vocabulary(pd.concat(series, ignore_index=True))
+                for domain, series in values.items()
+            }
+
+        return self.get_derived("vocabularies", build)
+
+    def load_encoded(self, file_name: str) -> pd.DataFrame:
+        """
+        Load a data file with its ID and name columns dictionary-encoded.
+
+        Those columns are categoricals sharing their domain's dictionary, so
+        `.cat.codes` of different tables can be joined and grouped as
+        integers; strings are only needed to decode results. Delivery times
+        are cleaned as for the models.
+
+        Args:
+            file_name: One of the files of ENCODED_COLUMNS
+
+        Returns:
+            DataFrame with categorical ID and name columns
+        """
+
+        def build() -> pd.DataFrame:
+            vocabularies = self.get_vocabularies()
+            df = self._load_file(file_name)
+            for column, domain in ENCODED_COLUMNS[file_name].items():
+                df[column] = df[column].astype(vocabularies[domain].dtype)
+            if file_name == "available_product.csv":
+                clean_delivery_time(df)
+            return df
+
+        return self.get_derived(f"encoded:{file_name}", build).copy()
+
+    def get_derived(self, name: str, builder: Callable[[], Any]) -> Any:
+        """
+        Get a value derived from the data, built once per snapshot.
+
+        The builder reads the data through this loader: it sees the snapshot
+        the value is built for. It is kept to build the value again on the
+        next snapshot before that one is published. Builds are timed as stage
+        "data.derive.<name>".
+
+        Args:
+            name: Cache key of the derived value
+            builder: Function building the value from the current data
+
+        Returns:
+            The cached or newly built value
+        """
+        self._builders[name] = builder
+        snapshot = self.snapshot()
+        with snapshot.lock:
+            if name not in snapshot.derived:
+                with self._serving(snapshot), span(f"data.derive.{name}"):
+                    snapshot.add_derived(name, builder())
+            return snapshot.derived[name]
+
+    def _files_signature(self) -> Signature:
+        """Modification time and size of the watched files, or the shared version mapped."""
+        if self.shared is not None:
+            return self.shared.signature(self.data_dir)
+        return files_signature(self.data_dir)
+
+    def rebuild(self, prebuild: bool = True) -> DataSnapshot:
+        """
+        Build a snapshot of the files on disk and publish it.
+
+        Args:
+            prebuild: Build the models and derived values the current snapshot
+                has before publishing, so requests find them ready
+
+        Returns:
+            The published snapshot
+        """
+        if self.shared is not None:
+            # Written by this process: map the version publishing the write
+            self.shared.wait_for_files(self.data_dir)
+        with self._build_lock:
+            previous = self._snapshot
+            snapshot = DataSnapshot(self.data_dir, next(_versions), self.shared)
+            if prebuild and previous is not None:
+                self._prebuild(snapshot, previous)
+            self._snapshot = snapshot
+            self.swaps += 1
+            return snapshot
+
+    def _prebuild(self, snapshot: DataSnapshot, previous: DataSnapshot) -> None:
+        """Build on a snapshot the models and derived values another one has."""
+        loaders = {
+            "in_store_product": self.load_in_store_products_models,
+            "available_product": self.load_available_products_models,
+            "fournisseur": self.load_fournisseurs_models,
+        }
+        with self._serving(snapshot):
+            # Derived values were cached in dependency order
+            builds = [(name, loaders[name]) for name in list(previous.models)] + [
+                (name, lambda name=name: self.get_derived(name, self._builders[name]))
+                for name in list(previous.derived)
+                if name in self._builders
             ]
-        return self._fournisseurs_models
+            for name, build in builds:
+                try:
+                    build()
+                except Exception as e:
+                    # Left for the first request needing it, which reports the error
+                    print(f"⚠ Could not prebuild {name} for data version {snapshot.version}: {e}")
 
-    def load_orders(self) -> pd.DataFrame:
-        """Load orders CSV as DataFrame."""
-        file_path = self.data_dir / "orders.csv"
-        return pd.read_csv(file_path)
+    def _rebuild_in_background(self) -> None:
+        """Rebuild in a background thread, unless one is already running."""
+        with self._rebuild_lock:
+            self._rebuild_pending = True
+            if not self._idle.is_set():
+                return  # The running rebuild starts over once done
+            self._idle.clear()
+        threading.Thread(target=self._rebuild_worker, name="data-rebuild", daemon=True).start()
+
+    def _rebuild_worker(self) -> None:
+        while True:
+            with self._rebuild_lock:
+                if not self._rebuild_pending:
+                    self._idle.set()
+                    return
+                self._rebuild_pending = False
+            try:
+                self.rebuild()
+            except Exception as e:
+                print(f"⚠ Data rebuild failed, serving the previous snapshot: {e}")
+
+    def wait_for_rebuild(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a background rebuild to be published; False on timeout."""
+        return self._idle.wait(timeout)
+
+    def refresh_if_changed(self, wait: bool = False) -> int:
+        """
+        Rebuild the data if a watched file changed on disk since the current snapshot.
+
+        Catches writes that did not call reload_all (write coordinator, other
+        processes such as the CLI script). The rebuild runs in the background;
+        the current snapshot is served until it is published.
+
+        Args:
+            wait: Wait for the new snapshot (scripts and tests)
+
+        Returns:
+            The data version served in this context
+        """
+        if self._files_signature() != self.current_snapshot().signature:
+            self._rebuild_in_background()
+            if wait:
+                self.wait_for_rebuild()
+        return self.data_version
+
+    def reload_all(self, wait: bool = False):
+        """
+        Reload all data from CSV files, in the background.
+
+        Args:
+            wait: Wait for the new snapshot to be published
+        """
+        self._rebuild_in_background()
+        if wait:
+            self.wait_for_rebuild()
+
+
+class ContextDataLoader:
+    """
+    Serves the data of the loader of the current context (see use_data_loader).
 
-    def reload_all(self):
-        """Reload all data from CSV files."""
-        self._in_store_products = None
-        self._available_products = None
-        self._fournisseurs = None
-        self._in_store_products_models = None
-        self._available_products_models = None
-        self._fournisseurs_models = None
+    Has the interface of DataLoader: every attribute is looked up on the
+    loader set for the context, or on the default loader outside one.
+    """
 
+    def __getattr__(self, name: str) -> Any:
+        return getattr(current_data_loader(), name)
 
-# Global instance
+    def __repr__(self) -> str:
+        return f"ContextDataLoader({current_data_loader().data_dir})"
+
+
+# Loader of the default data directory (other directories: see get_data_loader)
 _data_loader: Optional[DataLoader] = None
+_loaders_lock = threading.Lock()
+_context_loader = ContextDataLoader()
 
 
-def get_data_loader(data_dir: Optional[Path] = None) -> DataLoader:
-    """Get or create the global data loader instance."""
+def default_data_loader() -> DataLoader:
+    """Get or create the loader of the default data directory."""
     global _data_loader
     if _data_loader is None:
-        _data_loader = DataLoader(data_dir)
+        with _loaders_lock:
+            if _data_loader is None:
+                from backend.services.shared_data import get_shared_data_reader
+
+                _data_loader = DataLoader(shared=get_shared_data_reader())
     return _data_loader
+
+
+def current_data_loader() -> DataLoader:
+    """Loader of the current context: the one set by use_data_loader, else the default."""
+    return _current.get() or default_data_loader()
+
+
+def get_data_loader(data_dir: Optional[Path] = None) -> DataLoader:
+    """
+    Get the data loader of a data directory.
+
+    Args:
+        data_dir: Data directory. If None, the loader following the context
+            (the current tenant's in a request, the default one elsewhere).
+
+    Returns:
+        A loader shared by every caller asking for the same directory. Other
+        directories than the default one are held by the tenant registry,
+        within its memory budget.
+    """
+    if data_dir is None:
+        return _context_loader
+    path = Path(data_dir).resolve()
+    default = default_data_loader()
+    if default.data_dir.resolve() == path:
+        return default
+    from backend.services.tenants import get_tenant_registry
+
+    return get_tenant_registry().get_directory(path)
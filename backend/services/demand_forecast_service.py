@@ -0,0 +1,328 @@
+"""Service for forecasting product consumption from the order history."""
+
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.services.data_loader import get_data_loader
+from backend.services.product_identity import normalize_name, normalize_names
+from backend.services.timing import timed
+
+# Weeks are counted from this Monday
+_WEEK_ORIGIN = np.datetime64("1970-01-05", "s")
+_SECONDS_PER_WEEK = 7 * 24 * 3600
+
+
+def _week_numbers(dates: pd.Series) -> np.ndarray:
+    """Convert order dates to week numbers (int64)."""
+    seconds = pd.to_datetime(dates).to_numpy().astype("datetime64[s]")
+    return ((seconds - _WEEK_ORIGIN).astype(np.int64)) // _SECONDS_PER_WEEK
+
+
+def exponential_smoothing(
+    counts: np.ndarray,
+    alpha: float,
+    first_week: np.ndarray,
+    start: int = 0,
+    levels: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Exponentially smooth weekly quantities of all products at once.
+
+    Each row is a product, each column a week. A product's level starts at its
+    first ordered week and is updated as level = alpha * x + (1 - alpha) * level.
+    The loop runs over weeks; every step is vectorized over all products.
+
+    Args:
+        counts: Quantity ordered per product (rows) and week (columns)
+        alpha: Smoothing factor in (0, 1]
+        first_week: Column of the first order of each product
+        start: First column to (re)compute; earlier columns of `levels` are kept
+        levels: Previously computed levels (same shape as counts) to resume from
+
+    Returns:
+        Smoothed level per product and week
+    """
+    n_products, n_weeks = counts.shape
+    if levels is None or levels.shape != counts.shape:
+        levels = np.zeros(counts.shape, dtype=np.float64)
+        start = 0
+
+    level = levels[:, start - 1].copy() if start > 0 else np.zeros(n_products)
+    for week in range(start, n_weeks):
+        x = counts[:, week]
+        level = np.where(
+            week == first_week,
+            x,
+            np.where(week > first_week, alpha * x + (1 - alpha) * level, 0.0),
+        )
+        levels[:, week] = level
+    return levels
+
+
+class DemandForecast:
+    """Weekly consumption rates of products, computed from the order history."""
+
+    def __init__(
+        self,
+        product_names: pd.Index,
+        counts: np.ndarray,
+        levels: np.ndarray,
+        first_week: np.ndarray,
+        week0: int,
+        order_ids: np.ndarray,
+        current_week: int,
+    ):
+        self.product_names = product_names
+        self.counts = counts
+        self.levels = levels
+        self.first_week = first_week
+        self.week0 = week0
+        self.order_ids = order_ids
+        self.current_week = current_week
+        self._rates: Optional[Dict[str, float]] = None
+
+    @property
+    def weekly_rates(self) -> Dict[str, float]:
+        """
+        Forecast weekly consumption per normalized product name.
+
+        The smoothed level at the last completed week: the running week is
+        partial, so counting it would make the forecast swing with the day of
+        the week. Products first ordered in the running week have no rate yet.
+        """
+        if self._rates is None:
+            column = self.current_week - 1 - self.week0
+            if self.levels.shape[1] == 0 or column < 0:
+                self._rates = {}
+            else:
+                ordered = self.first_week <= column
+                rates = self.levels[ordered, column]
+                self._rates = dict(zip(self.product_names[ordered], rates.tolist()))
+        return self._rates
+
+    def weekly_rate(self, product_name: str) -> Optional[float]:
+        """Forecast weekly consumption of a product, None if it has no completed week."""
+        return self.weekly_rates.get(normalize_name(product_name))
+
+
+class DemandForecastService:
+    """Forecasts per-product consumption with exponential smoothing of weekly orders."""
+
+    def __init__(self, data_dir: Optional[Path] = None, alpha: float = 0.3):
+        """
+        Initialize the demand forecast service.
+
+        Args:
+            data_dir: Path to the data directory.
+            alpha: Smoothing factor (higher reacts faster to recent weeks)
+        """
+        self.data_loader = get_data_loader(data_dir)
+        self.alpha = alpha
+        # Forecast and its (data version, week) key, per data directory: the
+        # service follows the context's loader, so tenants must not share it
+        self._forecasts: Dict[Path, Tuple[Tuple[int, int], DemandForecast]] = {}
+        self._lock = threading.Lock()
+
+    def get_forecast(self, now: Optional[datetime] = None) -> DemandForecast:
+        """
+        Get the forecast for the current data version and week.
+
+        The forecast is cached per data directory, data version and week (it
+        only changes when a week completes). When the new orders only add
+        rows after the previously seen ones, the forecast is updated
+        incrementally from the first affected week.
+
+        Args:
+            now: Reference time (default: now)
+
+        Returns:
+            DemandForecast for all ordered products
+        """
+        with self._lock:
+            data_dir = self.data_loader.data_dir
+            key = (self.data_loader.data_version, self._reference_week(now))
+            cached_key, previous = self._forecasts.get(data_dir, (None, None))
+            if previous is not None and cached_key == key:
+                return previous
+
+            orders = self.data_loader.load_orders()
+            known = 0 if previous is None else len(previous.order_ids)
+            forecast = None
+            if (
+                previous is not None
+                and len(orders) >= known
+                and np.array_equal(
+                    orders["order_id"].to_numpy()[:known], previous.order_ids
+                )
+            ):
+                forecast = self._update(previous, orders.iloc[known:], now)
+            if forecast is None:
+                forecast = self.build(orders, now)
+            self._forecasts[data_dir] = (key, forecast)
+            return forecast
+
+    def add_orders(
+        self, new_orders: pd.DataFrame, now: Optional[datetime] = None
+    ) -> DemandForecast:
+        """
+        Incrementally update the cached forecast with newly placed orders.
+
+        Args:
+            new_orders: Orders not yet seen (orders.csv columns)
+            now: Reference time (default: now)
+
+        Returns:
+            The updated DemandForecast
+        """
+        with self._lock:
+            data_dir = self.data_loader.data_dir
+            key, previous = self._forecasts.get(data_dir, (None, None))
+            forecast = None
+            if previous is not None:
+                forecast = self._update(previous, new_orders, now)
+            if forecast is None:
+                orders = pd.concat(
+                    [self.data_loader.load_orders(), new_orders], ignore_index=True
+                ).drop_duplicates("order_id", keep="last")
+                forecast = self.build(orders, now)
+            self._forecasts[data_dir] = (key, forecast)
+            return forecast
+
+    @staticmethod
+    def _reference_week(now: Optional[datetime]) -> int:
+        """Week number of the running week."""
+        now = np.datetime64(now or datetime.now(), "s")
+        return int((now - _WEEK_ORIGIN).astype(np.int64) // _SECONDS_PER_WEEK)
+
+    @timed("forecast.build")
+    def build(self, orders: pd.DataFrame, now: Optional[datetime] = None) -> DemandForecast:
+        """
+        Build the forecast from scratch.
+
+        Args:
+            orders: All orders (orders.csv columns)
+            now: Reference time (default: now)
+
+        Returns:
+            DemandForecast for all ordered products
+        """
+        current_week = self._reference_week(now)
+        empty = DemandForecast(
+            product_names=pd.Index([]),
+            counts=np.zeros((0, 0)),
+            levels=np.zeros((0, 0)),
+            first_week=np.zeros(0, dtype=np.int64),
+            week0=current_week,
+            order_ids=orders["order_id"].to_numpy() if len(orders) else np.array([]),
+            current_week=current_week,
+        )
+        if len(orders) == 0:
+            return empty
+
+        weeks = _week_numbers(orders["order_date"])
+        week0 = int(weeks.min())
+        codes, product_names = pd.factorize(
+            normalize_names(orders["product_name"]), sort=False
+        )
+        n_products = len(product_names)
+        n_weeks = max(current_week, int(weeks.max())) - week0 + 1
+
+        counts = np.zeros(n_products * n_weeks, dtype=np.float64)
+        np.add.at(
+            counts,
+            codes * n_weeks + (weeks - week0),
+            orders["quantity"].to_numpy(dtype=np.float64),
+        )
+        counts = counts.reshape(n_products, n_weeks)
+
+        first_week = np.full(n_products, n_weeks, dtype=np.int64)
+        np.minimum.at(first_week, codes, weeks - week0)
+
+        levels = exponential_smoothing(counts, self.alpha, first_week)
+        return DemandForecast(
+            product_names=pd.Index(product_names),
+            counts=counts,
+            levels=levels,
+            first_week=first_week,
+            week0=week0,
+            order_ids=orders["order_id"].to_numpy(),
+            current_week=current_week,
+        )
+
+    def _update(
+        self,
+        forecast: DemandForecast,
+        new_orders: pd.DataFrame,
+        now: Optional[datetime] = None,
+    ) -> Optional[DemandForecast]:
+        """
+        Fold new orders into an existing forecast, recomputing only affected weeks.
+
+        Returns None when the forecast must be rebuilt instead (empty history,
+        or orders older than its first week).
+        """
+        current_week = self._reference_week(now)
+        if forecast.levels.shape[1] == 0:
+            return None
+        if len(new_orders) and _week_numbers(new_orders["order_date"]).min() < forecast.week0:
+            return None
+
+        counts = forecast.counts.copy()
+        levels = forecast.levels
+        first_week = forecast.first_week.copy()
+        week0 = forecast.week0
+        product_names = forecast.product_names
+
+        start = forecast.current_week - week0
+
+        n_weeks = max(current_week, forecast.current_week) - week0 + 1
+        if len(new_orders):
+            weeks = _week_numbers(new_orders["order_date"]) - week0
+            n_weeks = max(n_weeks, int(weeks.max()) + 1)
+            names = normalize_names(new_orders["product_name"])
+            new_names = pd.Index(pd.unique(names)).difference(product_names, sort=False)
+            product_names = product_names.append(new_names)
+            codes = product_names.get_indexer(names)
+        n_products = len(product_names)
+
+        if counts.shape != (n_products, n_weeks):
+            grown = np.zeros((n_products, n_weeks))
+            grown[: counts.shape[0], : counts.shape[1]] = counts
+            counts = grown
+            grown_levels = np.zeros((n_products, n_weeks))
+            grown_levels[: levels.shape[0], : levels.shape[1]] = levels
+            levels = grown_levels
+            first_week = np.concatenate(
+                [first_week, np.full(n_products - len(first_week), n_weeks, dtype=np.int64)]
+            )
+        else:
+            levels = levels.copy()
+
+        if len(new_orders):
+            np.add.at(
+                counts,
+                (codes, weeks),
+                new_orders["quantity"].to_numpy(dtype=np.float64),
+            )
+            np.minimum.at(first_week, codes, weeks)
+            start = min(start, int(weeks.min()))
+
+        levels = exponential_smoothing(
+            counts, self.alpha, first_week, start=start, levels=levels
+        )
+        return DemandForecast(
+            product_names=product_names,
+            counts=counts,
+            levels=levels,
+            first_week=first_week,
+            week0=week0,
+            order_ids=np.concatenate(
+                [forecast.order_ids, new_orders["order_id"].to_numpy()]
+            ),
+            current_week=current_week,
+        )
@@ -2,22 +2,21 @@ import json
 import os
 import threading
 from datetime import datetime
+from typing import Dict, Optional
 
 import pandas as pd
-from dotenv import load_dotenv
-from elevenlabs.client import ElevenLabs
 
+from backend.config import load_config
+from backend.controllers.update_agent import dynamic_variables as agent_dynamic_variables
 from backend.services.conversation_manager import (
     ConversationStatus,
     conversation_manager,
 )
+from backend.services.data_loader import default_data_loader
 from backend.services.order_delivery_parser_service import OrderDeliveryParser
 from backend.services.order_updater_service import OrderUpdater
 from backend.services.transcript_parser_service import TranscriptParserService
 
-# Load environment variables
-load_dotenv()
-
 # Store messages globally
 messages = []
 conversation_instance = None  # Store conversation instance globally
@@ -103,6 +102,7 @@ def make_outbound_call(
     supplier_name: str = "Inconnu",
     wait_for_completion: bool = False,
     auto_save_transcript: bool = True,
+    dynamic_variables: Optional[Dict[str, str]] = None,
 ):
     """
     Make an outbound call using ElevenLabs Conversational AI via Twilio.
@@ -115,10 +115,12 @@ def make_outbound_call(
         supplier_name: Name of the supplier for the transcript
         wait_for_completion: If True, wait for the call to complete before returning
         auto_save_transcript: If True, automatically save transcript when call completes
+        dynamic_variables: Per-call values of the agent prompt's dynamic variables
 
     Returns:
         dict: Call information including conversation_id
     """
+    load_config()
     if api_key is None:
         api_key = os.environ.get("ELEVENLABS_API_KEY")
 
@@ -127,7 +129,9 @@ def make_outbound_call(
             "ELEVENLABS_API_KEY must be set in .env or passed as parameter"
         )
 
-    # Initialize ElevenLabs client
+    # Initialize ElevenLabs client (SDK imported here: slow to import)
+    from elevenlabs.client import ElevenLabs
+
     client = ElevenLabs(api_key=api_key)
 
     print("Making outbound call...")
@@ -136,10 +140,16 @@ def make_outbound_call(
     print(f"  To Number: {to_number}")
 
     # Make the outbound call
+    call_options = {}
+    if dynamic_variables:
+        call_options["conversation_initiation_client_data"] = {
+            "dynamic_variables": dynamic_variables
+        }
     result = client.conversational_ai.twilio.outbound_call(
         agent_id=agent_id,
         agent_phone_number_id=agent_phone_number_id,
         to_number=to_number,
+        **call_options,
     )
 
     print("\n✓ Call initiated successfully!")
@@ -439,6 +449,7 @@ def call_agent(
     api_key: str = None,
     supplier_name: str = "Inconnu",
     enable_signal_handler: bool = True,
+    product_name: str = "Inconnu",
 ):
     """
     Call an ElevenLabs conversational agent via Twilio outbound call.
@@ -448,11 +459,13 @@ def call_agent(
         api_key: Your ElevenLabs API key (or set ELEVENLABS_API_KEY env var)
         supplier_name: Name of the supplier
         enable_signal_handler: Whether to enable Ctrl+C handler (only works in main thread)
+        product_name: Product the call is about (passed as a dynamic variable)
 
     Returns:
         dict: Conversation transcript with messages
     """
     # Initialize client
+    load_config()
     if api_key is None:
         api_key = os.environ.get("ELEVENLABS_API_KEY")
 
@@ -481,6 +494,7 @@ def call_agent(
         supplier_name=supplier_name,
         wait_for_completion=True,
         auto_save_transcript=True,
+        dynamic_variables=agent_dynamic_variables(product_name, supplier_name),
     )
     result["agent_name"] = agent_name
 
@@ -575,7 +589,11 @@ def save_transcript_on_exit(supplier_name: str = "Inconnu"):
 
 
 def call_agent_background(
-    task_id: str, agent_name: str, api_key: str, supplier_name: str
+    task_id: str,
+    agent_name: str,
+    api_key: str,
+    supplier_name: str,
+    product_name: str = "Inconnu",
 ):
     """
     Execute call_agent in a background thread and update task status.
@@ -585,6 +603,7 @@ def call_agent_background(
         agent_name: Name of the agent to call
         api_key: ElevenLabs API key
         supplier_name: Name of the supplier
+        product_name: Product the call is about
     """
     try:
         # Update status to running
@@ -597,6 +616,7 @@ def call_agent_background(
             api_key=api_key,
             supplier_name=supplier_name,
             enable_signal_handler=False,
+            product_name=product_name,
         )
 
         # Save the transcript to file only if it hasn't been saved already
@@ -643,6 +663,9 @@ def call_agent_background(
                     "total_messages": result.get("total_messages", 0),
                 }
 
+                # Calls are only started for the default data directory
+                data_dir = default_data_loader().data_dir
+
                 # Route to appropriate parser based on agent type
                 if agent_name == "delivery":
                     # Format transcript as text string for delivery parser
@@ -661,18 +684,16 @@ def call_agent_background(
 
                     if parsed_updates:
                         # Load supplier mapping
-                        supplier_df = pd.read_csv("./data/fournisseur.csv")
+                        supplier_df = pd.read_csv(data_dir / "fournisseur.csv")
                         supplier_mapping = dict(
                             zip(supplier_df["name"], supplier_df["id"])
                         )
 
                         # Apply updates to orders.csv
-                        updater = OrderUpdater(csv_path="./data/orders.csv")
-                        updater.load_csv()
-                        successes, failures = updater.apply_updates(
+                        updater = OrderUpdater(csv_path=str(data_dir / "orders.csv"))
+                        successes, failures = updater.apply_and_save(
                             parsed_updates, supplier_mapping
                         )
-                        updater.save_csv()
 
                         print(
                             f"✓ Automatically parsed delivery conversation and updated orders.csv. Found {len(parsed_updates)} order update(s)."
@@ -681,16 +702,27 @@ def call_agent_background(
                             print(f"✓ {len(successes)} update(s) applied successfully")
                         if failures:
                             print(f"⚠ {len(failures)} update(s) failed: {failures}")
+                        conversation_manager.set_parse_result(
+                            task_id,
+                            {
+                                "order_updates": len(parsed_updates),
+                                "order_updates_applied": len(successes),
+                                "order_updates_failed": len(failures),
+                            },
+                        )
                     else:
                         print(
                             "✓ Delivery conversation parsed but no order updates found."
                         )
+                        conversation_manager.set_parse_result(
+                            task_id, {"order_updates": 0}
+                        )
 
                 elif agent_name == "products":
                     # Use TranscriptParserService for product conversations
 
                     parser = TranscriptParserService(
-                        api_key=mistral_api_key, data_dir="./data"
+                        api_key=mistral_api_key, data_dir=data_dir
                     )
                     parsed_result = parser.parse_and_update_csv(
                         transcript_data,
@@ -701,6 +733,9 @@ def call_agent_background(
                     print(
                         f"✓ Automatically parsed product conversation and updated CSV. Found {len(parsed_result)} product(s) to update."
                     )
+                    conversation_manager.set_parse_result(
+                        task_id, {"products_updated": len(parsed_result)}
+                    )
 
                 elif agent_name == "availability":
                     # Skip parsing for availability conversations
@@ -737,7 +772,10 @@ def call_agent_background(
 
 
 def start_agent_async(
-    agent_name: str, api_key: str = None, supplier_name: str = "Inconnu"
+    agent_name: str,
+    api_key: str = None,
+    supplier_name: str = "Inconnu",
+    product_name: str = "Inconnu",
 ) -> str:
     """
     Start an agent conversation asynchronously in a background thread.
@@ -746,6 +784,7 @@ def start_agent_async(
         agent_name: Name of the agent to call
         api_key: ElevenLabs API key (or set ELEVENLABS_API_KEY env var)
         supplier_name: Name of the supplier
+        product_name: Product the call is about
 
     Returns:
         str: Task ID to track the conversation status
@@ -759,7 +798,7 @@ def start_agent_async(
     # Start the conversation in a background thread
     thread = threading.Thread(
         target=call_agent_background,
-        args=(task.task_id, agent_name, api_key, supplier_name),
+        args=(task.task_id, agent_name, api_key, supplier_name, product_name),
         daemon=True,
     )
     thread.start()
@@ -1,12 +1,248 @@
 """Service for inventory and order management."""
 
-from datetime import datetime, timedelta
+import base64
+import json
+import threading
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 from backend.services.data_loader import get_data_loader
+from backend.services.demand_forecast_service import DemandForecastService
+from backend.services.models import InventoryProduct
+from backend.services.product_identity import get_product_identity
+from backend.services.timing import timed
+
+# Fields of the enriched products that can be sorted on (strings first)
+STRING_SORT_FIELDS = ["name", "sku", "supplier", "type", "status", "stockoutDate"]
+SORTABLE_FIELDS = STRING_SORT_FIELDS + [
+    "currentPrice",
+    "bestPrice",
+    "sellPrice",
+    "currentMargin",
+    "bestMargin",
+    "currentDeliveryTime",
+    "bestDeliveryTime",
+    "stock",
+    "weeklyUse",
+]
+
+
+def encode_cursor(sort: str, value: float, product_id: str) -> str:
+    """Encode the sort key of the last returned product as an opaque cursor."""
+    return base64.urlsafe_b64encode(json.dumps([sort, value, product_id]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, object, str]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        sort, value, product_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(sort), value, str(product_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+class InventoryTable:
+    """
+    Enriched products in columnar form, for filtering, sorting and paging.
+
+    Every sortable field is turned into a float key once (string fields into
+    their rank among the sorted distinct values), and each sort order is
+    computed on first use. A query is then boolean masks over the columns and
+    a pass over a precomputed order; only the returned page touches the
+    product dictionaries.
+    """
+
+    def __init__(self, records: List[dict]):
+        """
+        Build the table.
+
+        Args:
+            records: Enriched products, in default order
+        """
+        self.records = records
+        # Day the date-dependent fields (stockout dates, weekly use) are for
+        self.day: Optional[date] = None
+        df = pd.DataFrame(records, columns=list(InventoryProduct.model_fields))
+        self._df = df
+        self.ids = df["id"].to_numpy(dtype=object)
+        self.status = df["status"].to_numpy(dtype=object)
+        self.type = df["type"].to_numpy(dtype=object)
+        self.supplier_id = df["supplier_id"].to_numpy(dtype=object)
+        self.supplier_lower = df["supplier"].str.lower().to_numpy(dtype=object)
+        self.margin_improvement = df["marginImprovementPossible"].to_numpy(dtype=bool)
+        self.search_text = (df["name"] + " " + df["sku"]).str.lower()
+        id_codes, id_uniques = pd.factorize(df["id"], sort=True)
+        self._id_rank = id_codes.astype(np.float64)
+        self._id_uniques = np.asarray(id_uniques, dtype=object)
+        # field -> (float key per row, sorted distinct values for string fields)
+        self._keys: Dict[str, Tuple[np.ndarray, Optional[np.ndarray]]] = {}
+        # (field, descending) -> row order
+        self._orders: Dict[Tuple[str, bool], np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _key(self, field: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Float sort key of a field; missing numbers sort as +inf."""
+        with self._lock:
+            if field not in self._keys:
+                if field == "":
+                    self._keys[field] = (np.arange(len(self), dtype=np.float64), None)
+                elif field in STRING_SORT_FIELDS:
+                    values = self._df[field].fillna("").astype(str).str.lower()
+                    codes, uniques = pd.factorize(values, sort=True)
+                    self._keys[field] = (
+                        codes.astype(np.float64),
+                        np.asarray(uniques, dtype=object),
+                    )
+                else:
+                    values = pd.to_numeric(self._df[field], errors="coerce")
+                    self._keys[field] = (
+                        values.fillna(np.inf).to_numpy(dtype=np.float64),
+                        None,
+                    )
+            return self._keys[field]
+
+    def _order(self, field: str, descending: bool) -> np.ndarray:
+        """Rows sorted by a field, ties broken by product ID."""
+        key, _ = self._key(field)
+        with self._lock:
+            if (field, descending) not in self._orders:
+                self._orders[(field, descending)] = np.lexsort(
+                    (self._id_rank, -key if descending else key)
+                )
+            return self._orders[(field, descending)]
+
+    @staticmethod
+    def _position(uniques: np.ndarray, value: str) -> float:
+        """Rank of a value among sorted distinct values, x.5 if it falls between two."""
+        pos = int(np.searchsorted(uniques, value, side="left"))
+        if pos < len(uniques) and uniques[pos] == value:
+            return float(pos)
+        return pos - 0.5
+
+    def _cursor_position(self, field: str, value: object) -> float:
+        """Position of a cursor value on a field's float key."""
+        _, uniques = self._key(field)
+        if uniques is None:
+            return np.inf if value is None else float(value)
+        return self._position(uniques, str(value))
+
+    def _cursor_value(self, field: str, row: int) -> object:
+        """Value stored in the cursor for a row (the raw key, or the lowercased string)."""
+        key, uniques = self._key(field)
+        if uniques is None:
+            return None if np.isinf(key[row]) else float(key[row])
+        return uniques[int(key[row])]
+
+    def query(
+        self,
+        status: Optional[List[str]] = None,
+        product_type: Optional[List[str]] = None,
+        supplier: Optional[str] = None,
+        margin_improvement_possible: Optional[bool] = None,
+        search: Optional[str] = None,
+        sort: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> dict:
+        """
+        Filter, sort and page the products.
+
+        Args:
+            status: Keep these statuses ("healthy", "low", "critical")
+            product_type: Keep these types ("in-house", "external")
+            supplier: Keep products of this supplier (ID or name, case-insensitive)
+            margin_improvement_possible: Keep products with this flag
+            search: Keep products whose name or SKU contains this text
+            sort: Sort field, "-" prefix for descending (default: catalog order)
+            limit: Page size (None: all)
+            cursor: next_cursor of the previous page
+            fields: Fields to return per product (default: all)
+
+        Returns:
+            Dict with the page of products, the number of matches over all
+            pages and the cursor of the next page (None on the last)
+
+        Raises:
+            ValueError: On an unknown sort or projected field, or a cursor
+                that is malformed or was made for another sort
+        """
+        descending = bool(sort) and sort.startswith("-")
+        field = (sort or "").lstrip("-")
+        if field and field not in SORTABLE_FIELDS:
+            raise ValueError(
+                f"Unknown sort field: {field}. Use one of: {', '.join(SORTABLE_FIELDS)}"
+            )
+        if fields:
+            unknown = [f for f in fields if f not in InventoryProduct.model_fields]
+            if unknown:
+                raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+        mask = np.ones(len(self), dtype=bool)
+        if status:
+            mask &= np.isin(self.status, status)
+        if product_type:
+            mask &= np.isin(self.type, product_type)
+        if supplier:
+            mask &= (self.supplier_id == supplier) | (
+                self.supplier_lower == supplier.strip().lower()
+            )
+        if margin_improvement_possible is not None:
+            mask &= self.margin_improvement == margin_improvement_possible
+        if search and search.strip():
+            mask &= self.search_text.str.contains(
+                search.strip().lower(), regex=False
+            ).to_numpy()
+        total_count = int(mask.sum())
+
+        if cursor:
+            cursor_sort, value, product_id = decode_cursor(cursor)
+            if cursor_sort != (sort or ""):
+                raise ValueError("Cursor was made for another sort")
+            key, _ = self._key(field)
+            position = self._cursor_position(field, value)
+            id_position = self._position(self._id_uniques, product_id)
+            id_rank = self._id_rank
+            if descending:
+                after = (key < position) | ((key == position) & (id_rank > id_position))
+            else:
+                after = (key > position) | ((key == position) & (id_rank > id_position))
+            mask &= after
+
+        order = self._order(field, descending)
+        rows = order[mask[order]]
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            last = int(rows[-1])
+            next_cursor = encode_cursor(
+                sort or "", self._cursor_value(field, last), self.ids[last]
+            )
+
+        if fields:
+            projected = ["id"] + [f for f in fields if f != "id"]
+            products = [
+                {f: self.records[row][f] for f in projected} for row in rows.tolist()
+            ]
+        else:
+            products = [self.records[row] for row in rows.tolist()]
+        return {
+            "products": products,
+            "total_count": total_count,
+            "next_cursor": next_cursor,
+        }
 
 
 class InventoryService:
@@ -20,7 +256,9 @@ class InventoryService:
             data_dir: Path to the data directory.
         """
         self.data_loader = get_data_loader(data_dir)
+        self.demand_forecast = DemandForecastService(data_dir)
 
+    @timed("inventory.enrich")
     def get_in_store_products_enriched(self) -> List[dict]:
         """
         Get in-store products enriched with supplier info, best prices, and margins.
@@ -31,6 +269,7 @@ class InventoryService:
         in_store_products = self.data_loader.load_in_store_products_models()
         available_products = self.data_loader.load_available_products_models()
         fournisseurs = self.data_loader.load_fournisseurs_models()
+        forecast = self.demand_forecast.get_forecast()
 
         # Create lookups
         fournisseurs_dict = {f.id: f for f in fournisseurs}
@@ -40,8 +279,9 @@ class InventoryService:
                 available_by_product_id[avail.id] = []
             available_by_product_id[avail.id].append(avail)
 
-        # Get set of in-store product names for comparison (normalized: lowercase, stripped)
-        in_store_product_names = {p.name.strip().lower() for p in in_store_products}
+        # Get set of in-store canonical product keys for comparison
+        identity = get_product_identity(self.data_loader)
+        in_store_keys = set(identity.keys(p.name for p in in_store_products).tolist())
 
         enriched_products = []
 
@@ -120,8 +360,13 @@ class InventoryService:
             # Products in in_store_products are "in-house"
             product_type = "in-house"
 
-            # Estimate weekly use based on stock (simplified: assume 4 weeks supply)
-            weekly_use = max(1, product.stock // 4) if product.stock > 0 else 10
+            # Weekly use forecast from the order history; products never
+            # ordered fall back to assuming a 4 weeks supply
+            forecast_rate = forecast.weekly_rate(product.name)
+            if forecast_rate is not None:
+                weekly_use = max(1, round(forecast_rate))
+            else:
+                weekly_use = max(1, product.stock // 4) if product.stock > 0 else 10
 
             # Estimate stockout date (simplified calculation)
             days_until_stockout = (
@@ -178,18 +423,19 @@ class InventoryService:
             )
 
         # Process available products that are NOT in store (these are "external"/new products)
-        # Group available products by name to find unique products (normalized: lowercase, stripped)
-        available_by_name = {}
-        for avail in available_products:
-            normalized_name = avail.name.strip().lower()
-            if normalized_name not in available_by_name:
-                available_by_name[normalized_name] = []
-            available_by_name[normalized_name].append(avail)
+        # Group available products by canonical key to find unique products
+        available_by_key = {}
+        for avail, key in zip(
+            available_products, identity.keys(a.name for a in available_products).tolist()
+        ):
+            if key not in available_by_key:
+                available_by_key[key] = []
+            available_by_key[key].append(avail)
 
         # Find products available from suppliers but not in store
         external_count = 0
-        for normalized_name, product_entries in available_by_name.items():
-            if normalized_name not in in_store_product_names:
+        for key, product_entries in available_by_key.items():
+            if key not in in_store_keys:
                 external_count += 1
                 # Get the original name from the first entry
                 product_name = product_entries[0].name
@@ -269,6 +515,45 @@ class InventoryService:
 
         return enriched_products
 
+    def get_inventory_table(self) -> InventoryTable:
+        """
+        Get the enriched products as a table, rebuilt when the data or the day changes.
+
+        Stockout dates and weekly use depend on the current date. The table is
+        a derived value of the data, tagged with its day; once the day changes,
+        a reload is started, whose snapshot has the new day's table prebuilt.
+        Until it is published, requests keep the previous day's table rather
+        than each building one.
+        """
+
+        def build() -> InventoryTable:
+            table = InventoryTable(self.get_in_store_products_enriched())
+            table.day = datetime.now().date()
+            return table
+
+        table = self.data_loader.get_derived("inventory_table", build)
+        # Not while a reload runs: it would start over once done
+        if table.day != datetime.now().date() and self.data_loader.wait_for_rebuild(0):
+            self.data_loader.reload_all()
+        return table
+
+    @timed("inventory.query")
+    def query_in_store_products(self, **filters) -> dict:
+        """
+        Filter, sort and page the enriched products.
+
+        Args:
+            **filters: Arguments of InventoryTable.query
+
+        Returns:
+            Dict with products, total_count and next_cursor
+
+        Raises:
+            ValueError: On an invalid sort, field or cursor
+        """
+        return self.get_inventory_table().query(**filters)
+
+    @timed("inventory.active_orders")
     def get_active_orders(self) -> List[dict]:
         """
         Get active purchase orders.
@@ -337,6 +622,7 @@ class InventoryService:
 
         return active_orders
 
+    @timed("inventory.product_suppliers")
     def get_product_suppliers(self, product_id: str) -> dict:
         """
         Get all available suppliers for a product.
@@ -1,6 +1,6 @@
 """Pydantic models for data structures."""
 
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -78,8 +78,11 @@ class CheaperAlternativesResponse(BaseModel):
     """Response model for cheaper alternatives endpoint."""
 
     alternatives: List[CheaperAlternative]
-    total_count: int
+    total_count: int = Field(description="Number of matching alternatives, all pages")
     min_savings_percent: float
+    next_cursor: Optional[str] = Field(
+        default=None, description="Cursor of the next page, None on the last page"
+    )
 
 
 class InnovativeProductsResponse(BaseModel):
@@ -162,6 +165,12 @@ class SupplierROI(BaseModel):
     monthly_spend: float = Field(ge=0, description="Monthly spending in euros")
     status: str = Field(description="Status: excellent, good, fair, warning")
     trend: str = Field(description="Trend: up, stable, down")
+    price_trend_percent: Optional[float] = Field(
+        None, description="Average offer price change per 30 days (%), from price history"
+    )
+    price_volatility: Optional[float] = Field(
+        None, description="Std of log price returns between updates, from price history"
+    )
     issues: List[str] = Field(default_factory=list, description="List of active issues")
     phone_number: str
     performance_breakdown: Optional[PerformanceBreakdown] = Field(
@@ -216,7 +225,10 @@ class InventoryProductsResponse(BaseModel):
     """Response model for in-store products endpoint."""
 
     products: List[InventoryProduct]
-    total_count: int
+    total_count: int = Field(description="Number of matching products, all pages")
+    next_cursor: Optional[str] = Field(
+        default=None, description="Cursor of the next page, None on the last page"
+    )
 
 
 class ActivePurchaseOrder(BaseModel):
@@ -255,3 +267,164 @@ class SupplierOptionsResponse(BaseModel):
 
     suppliers: List[SupplierOption]
     current_supplier_id: Optional[str]
+
+
+class BasketLine(BaseModel):
+    """Product to reorder in a basket."""
+
+    product_id: str
+    quantity: int = Field(ge=1, description="Quantity to order")
+    max_delivery_time: Optional[int] = Field(
+        default=None, ge=1, description="Delivery deadline in days"
+    )
+
+
+class BasketOptimizationRequest(BaseModel):
+    """Request model for the basket optimizer."""
+
+    lines: List[BasketLine]
+    max_suppliers: Optional[int] = Field(
+        default=None, ge=1, description="Maximum number of suppliers in the order"
+    )
+    min_order_amounts: Dict[str, float] = Field(
+        default_factory=dict, description="Minimum order amount per supplier ID"
+    )
+    default_min_order_amount: float = Field(
+        default=0.0, ge=0, description="Minimum order amount for other suppliers"
+    )
+
+
+class BasketAssignment(BaseModel):
+    """Supplier chosen for a basket line."""
+
+    product_id: str
+    product_name: str
+    quantity: int
+    supplier_id: str
+    supplier_name: str
+    unit_price: float
+    line_cost: float
+    delivery_time: int
+
+
+class BasketSupplierTotal(BaseModel):
+    """Order placed with one supplier."""
+
+    supplier_id: str
+    supplier_name: str
+    line_count: int
+    total: float
+    min_order_amount: float
+
+
+class UnassignedBasketLine(BaseModel):
+    """Basket line that no supplier can fulfil."""
+
+    product_id: str
+    reason: str
+
+
+class BasketOptimizationResponse(BaseModel):
+    """Response model for the basket optimizer."""
+
+    assignments: List[BasketAssignment]
+    suppliers: List[BasketSupplierTotal]
+    unassigned: List[UnassignedBasketLine]
+    total_cost: float
+    lower_bound: float = Field(
+        description="Cost of the cheapest offers ignoring supplier constraints"
+    )
+    optimal: bool = Field(description="True if the basket is proven optimal")
+    feasible: bool = Field(description="False if no supplier choice meets the constraints")
+
+
+class CampaignTarget(BaseModel):
+    """Supplier (and optionally product) to call in a campaign."""
+
+    supplier_name: str
+    product_name: Optional[str] = None
+    agent_name: Literal["delivery", "products", "availability"] = "products"
+
+
+class CallCampaignRequest(BaseModel):
+    """Request model for starting a call campaign."""
+
+    targets: List[CampaignTarget] = Field(default_factory=list)
+    source: Optional[Literal["late_orders", "stale_offers", "refresh_queue"]] = Field(
+        default=None, description="Add targets computed from the current data"
+    )
+    stale_after_days: int = Field(
+        default=30, ge=0, description="Offer age making it stale (stale_offers source)"
+    )
+    max_concurrent_calls: int = Field(default=2, ge=1, le=10)
+    max_products_per_call: int = Field(default=10, ge=1, le=50)
+
+
+class CampaignCall(BaseModel):
+    """One grouped call of a campaign."""
+
+    supplier_name: str
+    agent_name: str
+    product_names: List[str]
+    task_id: str
+    status: str
+    conversation_id: Optional[str] = None
+    error: Optional[str] = None
+    parse_result: Optional[Dict[str, int]] = None
+
+
+class CallCampaignResponse(BaseModel):
+    """Progress and aggregated results of a call campaign."""
+
+    campaign_id: str
+    status: str
+    created_at: str
+    completed_at: Optional[str] = None
+    total_targets: int = Field(description="Targets received, before deduplication")
+    total_calls: int
+    pending: int
+    running: int
+    completed: int
+    failed: int
+    calls: List[CampaignCall]
+    results: Dict[str, int] = Field(
+        description="Parse results summed over the finished calls"
+    )
+
+
+class RefreshQueueItem(BaseModel):
+    """Offer ranked by the price refresh scheduler."""
+
+    product_id: str
+    product_name: str
+    supplier_id: str
+    supplier_name: str
+    price: float
+    current_price: Optional[float] = Field(
+        default=None, description="Price currently paid, None if not sold in store"
+    )
+    weekly_units: float
+    last_information_update: str
+    staleness_days: float
+    impact: float = Field(description="Weekly spend at stake (EUR)")
+    priority: float = Field(description="staleness_days x impact")
+
+
+class PlannedRefreshCall(BaseModel):
+    """Supplier call the scheduler would make next."""
+
+    supplier_id: str
+    supplier_name: str
+    product_names: List[str]
+    priority: float = Field(description="Sum of the priorities of the offers covered")
+
+
+class PriceRefreshQueueResponse(BaseModel):
+    """Response model for the price refresh queue."""
+
+    items: List[RefreshQueueItem]
+    total_offers: int
+    pending_offers: int = Field(description="Offers handed out for a call, not yet refreshed")
+    daily_call_budget: int
+    calls_remaining: int
+    planned_calls: List[PlannedRefreshCall]
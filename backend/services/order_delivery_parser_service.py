@@ -4,17 +4,8 @@ import os
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 
-from mistralai import Mistral
-from dotenv import load_dotenv
-from pathlib import Path
-
-# Load .env from backend directory
-env_path = Path(__file__).parent.parent / '.env'
-load_dotenv(dotenv_path=env_path)
-
-print(f"DEBUG - API Key loaded: {os.getenv('MISTRAL_API_KEY')}")
-print(f"DEBUG - API Key length: {len(os.getenv('MISTRAL_API_KEY') or '')}")
-print(f"DEBUG - .env path: {env_path}")
+from backend.config import load_config
+from backend.services.timing import span
 
 
 class OrderDeliveryParser:
@@ -32,11 +23,15 @@ class OrderDeliveryParser:
         Args:
             api_key: Mistral API key. If not provided, will use MISTRAL_API_KEY env variable.
         """
+        load_config()
         self.api_key = api_key or os.getenv("MISTRAL_API_KEY")
         if not self.api_key:
             raise ValueError(
                 "API key must be provided either as parameter or MISTRAL_API_KEY environment variable"
             )
+        # Imported here: the SDK is slow to import and only needed once parsing
+        from mistralai import Mistral
+
         self.client = Mistral(api_key=self.api_key)
 
     def parse_conversation(
@@ -68,10 +63,11 @@ class OrderDeliveryParser:
         prompt = self._build_prompt(transcript, supplier_name)
 
         try:
-            response = self.client.chat.complete(
-                model="mistral-large-latest",
-                messages=[{"role": "user", "content": prompt}],
-            )
+            with span("parser.mistral"):
+                response = self.client.chat.complete(
+                    model="mistral-large-latest",
+                    messages=[{"role": "user", "content": prompt}],
+                )
             # Extract the response text
             response_text = response.choices[0].message.content
 
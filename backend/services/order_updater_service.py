@@ -8,6 +8,9 @@ from typing import Any, Dict, List, Tuple
 
 import pandas as pd
 
+from backend.services.product_identity import normalize_name, normalize_names
+from backend.services.write_coordinator import changes_mutation, get_write_coordinator
+
 
 class OrderUpdater:
     """
@@ -28,35 +31,69 @@ class OrderUpdater:
 
         self.csv_path = csv_path
         self.df = None
+        # Contenu du fichier au chargement, pour ne sauvegarder que les changements
+        self._loaded = None
 
     def load_csv(self) -> pd.DataFrame:
         """Charge le CSV des commandes."""
         self.df = pd.read_csv(self.csv_path)
+        self._loaded = self.df.copy()
         return self.df
 
     def save_csv(self, backup: bool = True) -> None:
         """
         Sauvegarde le CSV mis à jour.
 
+        Seuls les changements faits sur self.df depuis le chargement (cellules
+        modifiées, lignes ajoutées ou supprimées) sont réappliqués au contenu
+        actuel du fichier via le coordinateur d'écriture : les modifications
+        sauvegardées entre-temps par d'autres écrivains sont conservées.
+
         Args:
-            backup: Si True, crée une copie de sauvegarde avant d'écraser
+            backup: Si True, enregistre un delta (lignes modifiées et anciennes
+                    valeurs) permettant de restaurer la version précédente
         """
         if self.df is None:
             raise ValueError("No data to save. Call load_csv() first.")
 
-        if backup:
-            backup_path = (
-                f"{self.csv_path}.backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            )
-            # Copy current file to backup
-            import shutil
+        changes = changes_mutation(self._loaded, self.df, ["order_id"])
+
+        def mutation(df: pd.DataFrame) -> pd.DataFrame:
+            self.df = changes(df)
+            return self.df
+
+        get_write_coordinator(self.csv_path).mutate(mutation, backup=backup)
+        self._loaded = self.df.copy()
+        print(f"CSV updated: {self.csv_path}")
+
+    def apply_and_save(
+        self,
+        updates: Dict[str, Dict[str, Any]],
+        fournisseur_mapping: Dict[str, str] = None,
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Applique les mises à jour et sauvegarde via le coordinateur d'écriture.
+
+        Contrairement à load_csv/apply_updates/save_csv, les mises à jour sont
+        appliquées au contenu actuel du fichier (sous verrou), ce qui évite
+        d'écraser les modifications faites entre-temps par d'autres écrivains.
 
-            if os.path.exists(self.csv_path):
-                shutil.copy2(self.csv_path, backup_path)
-                print(f"Backup created: {backup_path}")
+        Args:
+            updates: Dictionnaire des mises à jour depuis le parser
+            fournisseur_mapping: Mapping optionnel nom_fournisseur -> id_fournisseur
 
-        self.df.to_csv(self.csv_path, index=False)
+        Returns:
+            Tuple (successes, failures) avec les messages de succès et d'échec
+        """
+
+        def mutation(df: pd.DataFrame) -> Tuple[List[str], List[str]]:
+            self.df = df
+            return self.apply_updates(updates, fournisseur_mapping)
+
+        result = get_write_coordinator(self.csv_path).mutate(mutation)
+        self._loaded = self.df.copy()
         print(f"CSV updated: {self.csv_path}")
+        return result
 
     def apply_updates(
         self,
@@ -79,6 +116,8 @@ class OrderUpdater:
 
         successes = []
         failures = []
+        # Noms comparés sous forme normalisée (casse, accents, espaces)
+        names = normalize_names(self.df["product_name"])
 
         for product_supplier_key, changes in updates.items():
             try:
@@ -100,16 +139,16 @@ class OrderUpdater:
                 product_name = parts[0]
                 supplier_name = parts[1]
 
+                same_product = names == normalize_name(product_name)
+
                 # Trouver le fournisseur_id si un mapping est fourni
                 if fournisseur_mapping and supplier_name in fournisseur_mapping:
                     supplier_id = fournisseur_mapping[supplier_name]
                     # Chercher par produit ET fournisseur
-                    mask = (self.df["product_name"] == product_name) & (
-                        self.df["fournisseur_id"] == supplier_id
-                    )
+                    mask = same_product & (self.df["fournisseur_id"] == supplier_id)
                 else:
                     # Chercher par nom de produit uniquement
-                    mask = self.df["product_name"] == product_name
+                    mask = same_product
 
                 # Vérifier qu'on a trouvé des commandes
                 matching_orders = self.df[mask]
@@ -216,6 +255,7 @@ class OrderUpdater:
             self.load_csv()
 
         preview_data = []
+        names = normalize_names(self.df["product_name"])
 
         for product_supplier_key, changes in updates.items():
             if not product_supplier_key.startswith(
@@ -234,13 +274,12 @@ class OrderUpdater:
             supplier_name = parts[1]
 
             # Trouver les commandes correspondantes
+            same_product = names == normalize_name(product_name)
             if fournisseur_mapping and supplier_name in fournisseur_mapping:
                 supplier_id = fournisseur_mapping[supplier_name]
-                mask = (self.df["product_name"] == product_name) & (
-                    self.df["fournisseur_id"] == supplier_id
-                )
+                mask = same_product & (self.df["fournisseur_id"] == supplier_id)
             else:
-                mask = self.df["product_name"] == product_name
+                mask = same_product
 
             # Filtrer les commandes non livrées
             pending_mask = mask & (self.df["time_of_arrival"].isna())
@@ -0,0 +1,534 @@
+"""
+Append-only price / delivery-time history of supplier offers.
+
+Every price or delivery-time update of an available product is appended to the
+history instead of only overwriting the CSV, so past values are kept per
+(product id, supplier) series.
+
+Storage is columnar: each append writes a compressed segment (`.npz`) holding
+dictionary-encoded product/supplier columns, delta-encoded timestamps (seconds)
+and the price and delivery-time columns. Segments are merged once too many
+accumulate. Queries run on the in-memory columns, indexed per series.
+
+Writers in several processes share the directory: appends, compactions and
+reloads run under an advisory lock on `price_history.lock`, and segments are
+written to a temporary file then renamed, so readers never see a partial
+segment. Compaction removes its inputs only once the merged segment is in
+place; if interrupted in between, the duplicated points are dropped on read.
+
+Usage:
+    python -m backend.services.price_history_service seed [--data-dir DATA_DIR]
+    python -m backend.services.price_history_service compact [--data-dir DATA_DIR]
+"""
+
+import argparse
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from backend.services.write_coordinator import FileLock
+
+# Segments are merged into one when more than this many exist
+MAX_SEGMENTS = 32
+
+# Relative change per 30 days (in %) above which a price trend is not "stable"
+TREND_THRESHOLD_PERCENT = 2.0
+
+_NO_DELIVERY = -1
+
+
+def _to_epoch_seconds(timestamps) -> np.ndarray:
+    """Convert timestamps (strings or datetimes) to int64 epoch seconds."""
+    values = pd.to_datetime(pd.Series(timestamps), errors="coerce")
+    values = values.fillna(pd.Timestamp.now())
+    return (values.astype("int64") // 10**9).to_numpy()
+
+
+def _write_segment(
+    path: Path,
+    product_values: np.ndarray,
+    product_codes: np.ndarray,
+    supplier_values: np.ndarray,
+    supplier_codes: np.ndarray,
+    ts: np.ndarray,
+    price: np.ndarray,
+    delivery_time: np.ndarray,
+) -> None:
+    """Write a segment atomically (temporary file, then rename)."""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(
+            f,
+            product_values=product_values,
+            product_codes=product_codes.astype(np.int32),
+            supplier_values=supplier_values,
+            supplier_codes=supplier_codes.astype(np.int32),
+            ts_start=np.int64(ts[0]),
+            ts_delta=np.diff(ts, prepend=ts[0]).astype(np.int64),
+            price=price,
+            delivery_time=delivery_time,
+        )
+    os.replace(tmp_path, path)
+
+
+class PriceHistoryStore:
+    """Columnar, append-only history of offer prices and delivery times."""
+
+    def __init__(self, history_dir: Union[str, Path]):
+        """
+        Initialize the store.
+
+        Args:
+            history_dir: Directory holding the history segments
+        """
+        self.history_dir = Path(history_dir)
+        self._lock = threading.Lock()
+        # Shared with the other processes writing the directory
+        self._file_lock = FileLock(self.history_dir)
+        self._loaded_segments: Optional[List[str]] = None
+        self._columns: Optional[Dict[str, np.ndarray]] = None
+        self._series_index: Optional[Dict[Tuple[str, str], np.ndarray]] = None
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def _segment_paths(self) -> List[Path]:
+        if not self.history_dir.exists():
+            return []
+        return sorted(self.history_dir.glob("segment_*.npz"))
+
+    def _next_segment_path(self, existing: List[Path]) -> Path:
+        next_number = int(existing[-1].stem.split("_")[1]) + 1 if existing else 1
+        return self.history_dir / f"segment_{next_number:08d}.npz"
+
+    def append(
+        self,
+        product_ids: List[str],
+        suppliers: List[str],
+        timestamps: List,
+        prices: List[Optional[float]],
+        delivery_times: List[Optional[int]],
+    ) -> int:
+        """
+        Append points to the history.
+
+        Args:
+            product_ids: Product ID of each point
+            suppliers: Supplier ID of each point
+            timestamps: Time of each point (string "YYYY-mm-dd HH:MM:SS" or datetime)
+            prices: Price of each point (None if unknown)
+            delivery_times: Delivery time in days of each point (None if unknown)
+
+        Returns:
+            Number of points appended
+        """
+        if not product_ids:
+            return 0
+
+        ts = _to_epoch_seconds(timestamps)
+        order = np.argsort(ts, kind="stable")
+        ts = ts[order]
+
+        product_values, product_codes = np.unique(
+            np.asarray(product_ids, dtype=object).astype(str)[order],
+            return_inverse=True,
+        )
+        supplier_values, supplier_codes = np.unique(
+            np.asarray(suppliers, dtype=object).astype(str)[order],
+            return_inverse=True,
+        )
+        price = pd.to_numeric(pd.Series(prices), errors="coerce").to_numpy(float)[order]
+        delivery = (
+            pd.to_numeric(pd.Series(delivery_times), errors="coerce")
+            .fillna(_NO_DELIVERY)
+            .to_numpy()
+            .astype(np.int16)[order]
+        )
+
+        self.history_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock, self._file_lock:
+            existing = self._segment_paths()
+            _write_segment(
+                self._next_segment_path(existing),
+                product_values,
+                product_codes,
+                supplier_values,
+                supplier_codes,
+                ts,
+                price,
+                delivery,
+            )
+            if len(existing) + 1 > MAX_SEGMENTS:
+                self._compact_locked()
+        return len(ts)
+
+    def record_changes(
+        self, changes: List[Tuple[pd.DataFrame, pd.DataFrame, str]]
+    ) -> int:
+        """
+        Record the offers whose price or delivery time changed.
+
+        The previous value is recorded too (at its own last_information_update),
+        so the first update of an offer keeps the value it overwrote.
+
+        Args:
+            changes: List of (previous rows, current rows, update time) tuples, where
+                the rows have the available_product.csv columns and previous/current
+                share the same index (previous may lack rows for new offers)
+
+        Returns:
+            Number of points appended
+        """
+        befores, afters, timestamps = [], [], []
+        for previous, current, timestamp in changes:
+            if len(current) == 0:
+                continue
+            previous = previous.reindex(current.index)
+            changed = previous["price"].ne(current["price"]) | previous[
+                "delivery_time"
+            ].ne(current["delivery_time"])
+            befores.append(previous[changed & previous["price"].notna()])
+            afters.append(current[changed])
+            timestamps.extend([timestamp] * int(changed.sum()))
+        if not afters:
+            return 0
+
+        before = pd.concat(befores, ignore_index=True)
+        after = pd.concat(afters, ignore_index=True)
+        return self.append(
+            product_ids=list(before["id"]) + list(after["id"]),
+            suppliers=list(before["fournisseur"]) + list(after["fournisseur"]),
+            timestamps=list(before["last_information_update"]) + timestamps,
+            prices=list(before["price"]) + list(after["price"]),
+            delivery_times=list(before["delivery_time"]) + list(after["delivery_time"]),
+        )
+
+    def record_frame(self, df: pd.DataFrame) -> int:
+        """Record every offer of an available_product.csv table at its update time."""
+        return self.append(
+            product_ids=list(df["id"]),
+            suppliers=list(df["fournisseur"]),
+            timestamps=list(df["last_information_update"]),
+            prices=list(df["price"]),
+            delivery_times=list(df["delivery_time"]),
+        )
+
+    def compact(self) -> None:
+        """Merge all segments into a single one."""
+        if not self.history_dir.exists():
+            return
+        with self._lock, self._file_lock:
+            self._compact_locked()
+
+    def _compact_locked(self) -> None:
+        paths = self._segment_paths()
+        columns = self._read_segments(paths)
+        if columns is None:
+            return
+        order = np.lexsort((columns["ts"],))
+        products, product_codes = np.unique(
+            columns["product_id"][order], return_inverse=True
+        )
+        suppliers, supplier_codes = np.unique(
+            columns["supplier"][order], return_inverse=True
+        )
+        _write_segment(
+            self._next_segment_path(paths),
+            products,
+            product_codes,
+            suppliers,
+            supplier_codes,
+            columns["ts"][order],
+            columns["price"][order],
+            columns["delivery_time"][order],
+        )
+        # Inputs removed only once the merged segment replaced them
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _read_segments(paths: List[Path]) -> Optional[Dict[str, np.ndarray]]:
+        if not paths:
+            return None
+        parts = {k: [] for k in ["product_id", "supplier", "ts", "price", "delivery_time"]}
+        for path in paths:
+            with np.load(path, allow_pickle=False) as segment:
+                parts["product_id"].append(
+                    segment["product_values"][segment["product_codes"]]
+                )
+                parts["supplier"].append(
+                    segment["supplier_values"][segment["supplier_codes"]]
+                )
+                parts["ts"].append(segment["ts_start"] + np.cumsum(segment["ts_delta"]))
+                parts["price"].append(segment["price"])
+                parts["delivery_time"].append(segment["delivery_time"])
+        return {k: np.concatenate(v) for k, v in parts.items()}
+
+    def _ensure_loaded(self) -> Optional[Dict[str, np.ndarray]]:
+        """Load (or reload after appends) the columns and the per-series index."""
+        with self._lock:
+            paths = self._segment_paths()
+            names = [p.name for p in paths]
+            if names == self._loaded_segments:
+                return self._columns
+
+            if paths:
+                # Segments can't be compacted away while they are read
+                with self._file_lock:
+                    paths = self._segment_paths()
+                    names = [p.name for p in paths]
+                    columns = self._read_segments(paths)
+            else:
+                columns = None
+            self._loaded_segments = names
+            if columns is None:
+                self._columns = None
+                self._series_index = None
+                return None
+
+            # Sort by series then time; keep the last point of duplicated timestamps
+            order = np.lexsort((columns["ts"], columns["supplier"], columns["product_id"]))
+            columns = {k: v[order] for k, v in columns.items()}
+            keep = np.ones(len(order), dtype=bool)
+            keep[:-1] = ~(
+                (columns["product_id"][:-1] == columns["product_id"][1:])
+                & (columns["supplier"][:-1] == columns["supplier"][1:])
+                & (columns["ts"][:-1] == columns["ts"][1:])
+            )
+            columns = {k: v[keep] for k, v in columns.items()}
+
+            boundaries = np.flatnonzero(
+                (columns["product_id"][1:] != columns["product_id"][:-1])
+                | (columns["supplier"][1:] != columns["supplier"][:-1])
+            ) + 1
+            starts = np.concatenate([[0], boundaries])
+            ends = np.concatenate([boundaries, [len(columns["ts"])]])
+            self._series_index = {
+                (columns["product_id"][s], columns["supplier"][s]): np.arange(s, e)
+                for s, e in zip(starts, ends)
+            }
+            self._columns = columns
+            return columns
+
+    def query(
+        self,
+        product_id: str,
+        supplier: str,
+        start: Optional[Union[str, pd.Timestamp]] = None,
+        end: Optional[Union[str, pd.Timestamp]] = None,
+    ) -> pd.DataFrame:
+        """
+        Get the history of one offer within a time range.
+
+        Args:
+            product_id: Product ID
+            supplier: Supplier ID
+            start: Inclusive start of the range (default: beginning)
+            end: Inclusive end of the range (default: now)
+
+        Returns:
+            DataFrame with 'timestamp', 'price' and 'delivery_time' columns
+        """
+        columns = self._ensure_loaded()
+        rows = (self._series_index or {}).get((product_id, supplier))
+        if columns is None or rows is None:
+            return pd.DataFrame(columns=["timestamp", "price", "delivery_time"])
+
+        ts = columns["ts"][rows]
+        lo = 0 if start is None else np.searchsorted(ts, _to_epoch_seconds([start])[0])
+        hi = (
+            len(ts)
+            if end is None
+            else np.searchsorted(ts, _to_epoch_seconds([end])[0], side="right")
+        )
+        rows = rows[lo:hi]
+        delivery = columns["delivery_time"][rows].astype(float)
+        delivery[delivery == _NO_DELIVERY] = np.nan
+        return pd.DataFrame(
+            {
+                "timestamp": pd.to_datetime(columns["ts"][rows], unit="s"),
+                "price": columns["price"][rows],
+                "delivery_time": delivery,
+            }
+        )
+
+    def downsample(
+        self,
+        product_id: str,
+        supplier: str,
+        freq: str = "1D",
+        start: Optional[Union[str, pd.Timestamp]] = None,
+        end: Optional[Union[str, pd.Timestamp]] = None,
+    ) -> pd.DataFrame:
+        """
+        Get the history of one offer resampled to a fixed frequency.
+
+        Each bucket holds the last known value (carried forward over empty buckets),
+        plus the min and max price seen in the bucket.
+
+        Args:
+            product_id: Product ID
+            supplier: Supplier ID
+            freq: Pandas frequency string (e.g. "1D", "1W")
+            start: Inclusive start of the range
+            end: Inclusive end of the range
+
+        Returns:
+            DataFrame indexed by bucket start
+        """
+        history = self.query(product_id, supplier, start, end).set_index("timestamp")
+        if history.empty:
+            return pd.DataFrame(columns=["price", "price_min", "price_max", "delivery_time"])
+        resampled = history.resample(freq)
+        result = pd.DataFrame(
+            {
+                "price": resampled["price"].last().ffill(),
+                "price_min": resampled["price"].min(),
+                "price_max": resampled["price"].max(),
+                "delivery_time": resampled["delivery_time"].last().ffill(),
+            }
+        )
+        return result
+
+    def supplier_metrics(
+        self, window_days: int = 90, now: Optional[pd.Timestamp] = None
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Compute price trend and volatility per supplier over a time window.
+
+        The trend of a series is the least-squares slope of log(price) over time,
+        expressed as a relative change per 30 days; volatility is the standard
+        deviation of the log returns between consecutive points. Both are
+        averaged over the supplier's series having at least two points.
+
+        Args:
+            window_days: Only points newer than this many days are used
+            now: Reference time (default: now)
+
+        Returns:
+            Mapping supplier_id -> {'trend_percent', 'volatility', 'series_count'}
+        """
+        columns = self._ensure_loaded()
+        if columns is None:
+            return {}
+
+        now = now or pd.Timestamp.now()
+        cutoff = _to_epoch_seconds([now - pd.Timedelta(days=window_days)])[0]
+        mask = (columns["ts"] >= cutoff) & np.isfinite(columns["price"]) & (
+            columns["price"] > 0
+        )
+        if not mask.any():
+            return {}
+
+        product = columns["product_id"][mask]
+        supplier = columns["supplier"][mask]
+        days = (columns["ts"][mask] - cutoff) / 86400.0
+        log_price = np.log(columns["price"][mask])
+
+        # Series ids (rows are sorted by series then time)
+        new_series = np.ones(len(product), dtype=bool)
+        new_series[1:] = (product[1:] != product[:-1]) | (supplier[1:] != supplier[:-1])
+        series = np.cumsum(new_series) - 1
+        n_series = series[-1] + 1
+
+        # Grouped least squares slope: cov(t, y) / var(t)
+        count = np.bincount(series, minlength=n_series)
+        sum_t = np.bincount(series, days, n_series)
+        sum_y = np.bincount(series, log_price, n_series)
+        sum_tt = np.bincount(series, days * days, n_series)
+        sum_ty = np.bincount(series, days * log_price, n_series)
+        var_t = sum_tt - sum_t * sum_t / np.maximum(count, 1)
+        cov_ty = sum_ty - sum_t * sum_y / np.maximum(count, 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = np.where(var_t > 1e-9, cov_ty / var_t, 0.0)
+
+        # Log returns between consecutive points of the same series
+        same_series = ~new_series[1:]
+        returns = np.diff(log_price)[same_series]
+        return_series = series[1:][same_series]
+        n_returns = np.bincount(return_series, minlength=n_series)
+        sum_r = np.bincount(return_series, returns, n_series)
+        sum_rr = np.bincount(return_series, returns * returns, n_series)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_r = sum_r / np.maximum(n_returns, 1)
+            volatility = np.sqrt(
+                np.maximum(sum_rr / np.maximum(n_returns, 1) - mean_r * mean_r, 0.0)
+            )
+
+        series_supplier = supplier[new_series]
+        valid = count >= 2
+        frame = pd.DataFrame(
+            {
+                "supplier": series_supplier[valid],
+                "trend_percent": (np.exp(slope[valid] * 30) - 1) * 100,
+                "volatility": volatility[valid],
+            }
+        )
+        grouped = frame.groupby("supplier")
+        summary = grouped.mean()
+        summary["series_count"] = grouped.size()
+        return summary.to_dict("index")
+
+
+def price_trend(trend_percent: float) -> str:
+    """
+    Map a supplier price trend to the SupplierROI trend.
+
+    Falling prices are good for us ("up"), rising prices are "down".
+    """
+    if trend_percent <= -TREND_THRESHOLD_PERCENT:
+        return "up"
+    if trend_percent >= TREND_THRESHOLD_PERCENT:
+        return "down"
+    return "stable"
+
+
+# Global stores, one per history directory
+_stores: Dict[Path, PriceHistoryStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_price_history(data_dir: Optional[Union[str, Path]] = None) -> PriceHistoryStore:
+    """Get or create the price history store of a data directory."""
+    if data_dir is None:
+        data_dir = Path(__file__).parent.parent.parent / "data"
+    history_dir = (Path(data_dir) / "price_history").resolve()
+    with _stores_lock:
+        if history_dir not in _stores:
+            _stores[history_dir] = PriceHistoryStore(history_dir)
+        return _stores[history_dir]
+
+
+def main():
+    """Command line entry point for seeding and compacting the history."""
+    parser = argparse.ArgumentParser(description="Manage the offer price history")
+    parser.add_argument("command", choices=["seed", "compact"])
+    parser.add_argument(
+        "--data-dir",
+        type=str,
+        default=None,
+        help="Path to the data directory (default: ../data relative to backend)",
+    )
+    args = parser.parse_args()
+
+    store = get_price_history(args.data_dir)
+    if args.command == "seed":
+        csv_path = Path(store.history_dir).parent / "available_product.csv"
+        count = store.record_frame(pd.read_csv(csv_path))
+        print(f"Recorded {count} offer(s) from {csv_path}")
+    else:
+        store.compact()
+        print(f"Compacted history in {store.history_dir}")
+
+
+if __name__ == "__main__":
+    main()
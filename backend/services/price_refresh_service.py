@@ -0,0 +1,390 @@
+"""
+Service scheduling supplier calls to refresh stale offer prices.
+
+Every offer gets a priority of staleness (days since last_information_update)
+times spend impact: the weekly consumption of the product times the gap
+between the offer price and the price currently paid, plus a floor so that
+offers of products we do not buy still age. The most urgent offers are
+grouped per supplier into calls, within a daily call budget.
+
+Priorities grow with time at a different rate for every offer, so no
+ordering stays valid for long and a maintained sorted index would need a
+full resort on every read. Instead, the offers are kept in flat arrays built
+once per data version, and the queue is read with a top-k selection
+(np.argpartition): linear in the number of offers, with only the k selected
+offers sorted. Offers handed out for a call are masked until they are
+refreshed or the cooldown expires, without touching the arrays' order.
+"""
+
+import os
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.services.data_loader import Vocabulary, get_data_loader
+from backend.services.demand_forecast_service import DemandForecastService
+from backend.services.product_identity import normalize_name, normalize_names
+from backend.services.models import (
+    CampaignTarget,
+    PlannedRefreshCall,
+    PriceRefreshQueueResponse,
+    RefreshQueueItem,
+)
+from backend.services.timing import timed
+
+# Supplier calls the scheduler may hand out per day
+DAILY_CALL_BUDGET = int(os.getenv("PRICE_REFRESH_DAILY_CALLS", "20"))
+# Weekly spend impact (EUR) given to every offer, so unbought products still age
+MIN_IMPACT = 1.0
+# Staleness is capped so offers without a valid date do not dominate forever
+MAX_STALENESS_DAYS = 365.0
+# Seconds before an offer handed out for a call can be handed out again
+REQUEST_COOLDOWN = 24 * 3600.0
+
+_SECONDS_PER_DAY = 24 * 3600.0
+
+
+def _seconds(moment: datetime) -> float:
+    """Naive datetime as seconds since the epoch, consistent with the CSV dates."""
+    return float(np.datetime64(moment.replace(tzinfo=None), "s").astype(np.int64))
+
+
+class RefreshIndex:
+    """Offers as flat arrays, ready for top-k selection by refresh priority."""
+
+    def __init__(
+        self,
+        available: pd.DataFrame,
+        in_store: pd.DataFrame,
+        fournisseurs: pd.DataFrame,
+        weekly_rates: Dict[str, float],
+        vocabularies: Optional[Dict[str, Vocabulary]] = None,
+    ):
+        """
+        Build the index.
+
+        Args:
+            available: Supplier offers (available_product.csv)
+            in_store: In-store products with the price currently paid
+            fournisseurs: Suppliers, for names
+            weekly_rates: Forecast weekly consumption per product name (any spelling)
+            vocabularies: Dictionaries of the product_id, product_name and
+                supplier_id domains (default: built from the offers)
+        """
+        if vocabularies is None:
+            vocabularies = {
+                "product_id": Vocabulary(available["id"]),
+                "product_name": Vocabulary(available["name"]),
+                "supplier_id": Vocabulary(available["fournisseur"]),
+            }
+        self.products = vocabularies["product_id"]
+        self.names = vocabularies["product_name"]
+        self.suppliers = vocabularies["supplier_id"]
+        updated = pd.to_datetime(available["last_information_update"], errors="coerce")
+
+        # IDs and names as int32 dictionary codes; strings are decoded per result
+        self.product_id = self.products.encode(available["id"])
+        self.product_name = self.names.encode(available["name"])
+        self.supplier_id = self.suppliers.encode(available["fournisseur"])
+        self.price = available["price"].to_numpy(dtype=np.float64)
+
+        # Price currently paid, scattered by product code
+        paid = np.full(len(self.products) + 1, np.nan)
+        in_store = in_store.drop_duplicates("id")
+        codes = self.products.encode(in_store["id"])
+        known = codes >= 0
+        paid[codes[known]] = in_store["price"].to_numpy(dtype=np.float64)[known]
+        self.current_price = paid[self.product_id]
+
+        # Weekly rate per distinct name, gathered by code
+        rates = {normalize_name(name): rate for name, rate in weekly_rates.items()}
+        name_rates = (
+            pd.Series(normalize_names(self.names.strings), dtype=object)
+            .map(rates)
+            .fillna(0.0)
+            .to_numpy(dtype=np.float64)
+        )
+        self.weekly_units = np.append(name_rates, 0.0)[self.product_name]
+        # Seconds since the epoch, NaN when the date is missing or invalid
+        self.updated = (
+            updated.to_numpy().astype("datetime64[s]").astype(np.int64).astype(np.float64)
+        )
+        self.updated[updated.isna().to_numpy()] = np.nan
+        gap = np.nan_to_num(np.abs(self.current_price - self.price), nan=0.0)
+        self.impact = MIN_IMPACT + self.weekly_units * gap
+        self.last_information_update = available["last_information_update"].to_numpy()
+        self.supplier_names = dict(
+            zip(fournisseurs["id"].astype(str), fournisseurs["name"].astype(str))
+        )
+        # Offers sorted by (product code, supplier code), for row lookups
+        self._offer_keys = self._offer_key(self.product_id, self.supplier_id)
+        self._offer_order = np.argsort(self._offer_keys, kind="stable")
+        self._sorted_keys = self._offer_keys[self._offer_order]
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    def _offer_key(self, product: np.ndarray, supplier: np.ndarray) -> np.ndarray:
+        """Combined int64 key of (product code, supplier code) pairs."""
+        return product.astype(np.int64) * (len(self.suppliers) + 1) + supplier
+
+    def row(self, product_id: str, supplier_id: str) -> Optional[int]:
+        """Get the row of an offer, None if unknown."""
+        product = self.products.encode([product_id])
+        supplier = self.suppliers.encode([supplier_id])
+        if product[0] < 0 or supplier[0] < 0:
+            return None
+        key = self._offer_key(product, supplier)[0]
+        pos = int(np.searchsorted(self._sorted_keys, key))
+        if pos == len(self._sorted_keys) or self._sorted_keys[pos] != key:
+            return None
+        return int(self._offer_order[pos])
+
+    def ids(self, row: int) -> Tuple[str, str]:
+        """Get the (product_id, supplier_id) strings of a row."""
+        return (
+            str(self.products.strings[self.product_id[row]]),
+            str(self.suppliers.strings[self.supplier_id[row]]),
+        )
+
+    def name(self, row: int) -> str:
+        """Get the product name of a row."""
+        return str(self.names.strings[self.product_name[row]])
+
+    def staleness_days(self, now: datetime) -> np.ndarray:
+        """Days since each offer was last updated, capped at MAX_STALENESS_DAYS."""
+        days = (_seconds(now) - self.updated) / _SECONDS_PER_DAY
+        return np.clip(np.nan_to_num(days, nan=MAX_STALENESS_DAYS), 0.0, MAX_STALENESS_DAYS)
+
+    def top(
+        self, k: int, now: datetime, masked: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Select the k offers with the highest refresh priority.
+
+        Args:
+            k: Number of offers to select
+            now: Reference time
+            masked: Rows to skip (e.g. already handed out for a call)
+
+        Returns:
+            (rows, staleness_days, priorities) of the selected offers, most
+            urgent first
+        """
+        staleness = self.staleness_days(now)
+        priority = staleness * self.impact
+        if masked is not None and len(masked):
+            priority[masked] = -np.inf
+        k = min(k, int(np.isfinite(priority).sum()))
+        if k <= 0:
+            empty = np.array([], dtype=np.int64)
+            return empty, np.array([]), np.array([])
+        rows = np.argpartition(-priority, k - 1)[:k]
+        rows = rows[np.lexsort((rows, -priority[rows]))]
+        return rows, staleness[rows], priority[rows]
+
+
+class PriceRefreshService:
+    """Ranks stale offers and hands out refresh calls within a daily budget."""
+
+    def __init__(
+        self,
+        data_dir: Optional[Path] = None,
+        daily_call_budget: int = DAILY_CALL_BUDGET,
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            data_dir: Path to data directory
+            daily_call_budget: Supplier calls that may be handed out per day
+        """
+        self.data_loader = get_data_loader(data_dir)
+        self.demand_forecast = DemandForecastService(data_dir)
+        self.daily_call_budget = daily_call_budget
+        self._calls_by_day: Dict[date, int] = {}
+        # (product_id, supplier_id) -> time the offer was handed out for a call
+        self._requested: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+    def get_index(self) -> RefreshIndex:
+        """Get the refresh index for the current data version."""
+        self.data_loader.refresh_if_changed()
+        return self.data_loader.get_derived(
+            "refresh_index",
+            lambda: RefreshIndex(
+                self.data_loader.load_available_products(),
+                self.data_loader.load_in_store_products(),
+                self.data_loader.load_fournisseurs(),
+                self.demand_forecast.get_forecast().weekly_rates,
+                self.data_loader.get_vocabularies(),
+            ),
+        )
+
+    def calls_remaining(self, now: Optional[datetime] = None) -> int:
+        """Calls left in today's budget."""
+        today = (now or datetime.now()).date()
+        return max(0, self.daily_call_budget - self._calls_by_day.get(today, 0))
+
+    def _masked_rows(self, index: RefreshIndex, now: datetime) -> np.ndarray:
+        """Rows handed out for a call that are neither refreshed nor expired."""
+        rows = []
+        for key, requested_at in list(self._requested.items()):
+            row = index.row(*key)
+            expired = _seconds(now) - requested_at > REQUEST_COOLDOWN
+            refreshed = row is not None and index.updated[row] >= requested_at
+            if row is None or expired or refreshed:
+                del self._requested[key]
+            else:
+                rows.append(row)
+        return np.array(rows, dtype=np.int64)
+
+    def _plan(
+        self,
+        index: RefreshIndex,
+        now: datetime,
+        max_calls: int,
+        max_products_per_call: int,
+    ) -> Tuple[List[PlannedRefreshCall], List[List[int]]]:
+        """Group the most urgent offers into at most max_calls supplier calls."""
+        if max_calls <= 0:
+            return [], []
+        rows, _, priorities = index.top(
+            max_calls * max_products_per_call, now, self._masked_rows(index, now)
+        )
+        groups: Dict[str, dict] = {}
+        for row, priority in zip(rows.tolist(), priorities.tolist()):
+            _, supplier_id = index.ids(row)
+            group = groups.get(supplier_id)
+            if group is None:
+                if len(groups) == max_calls:
+                    continue
+                group = groups[supplier_id] = {"rows": [], "priority": 0.0}
+            if len(group["rows"]) < max_products_per_call:
+                group["rows"].append(row)
+                group["priority"] += priority
+
+        calls = [
+            PlannedRefreshCall(
+                supplier_id=supplier_id,
+                supplier_name=index.supplier_names.get(supplier_id, supplier_id),
+                product_names=[index.name(row) for row in group["rows"]],
+                priority=round(group["priority"], 2),
+            )
+            for supplier_id, group in groups.items()
+        ]
+        return calls, [group["rows"] for group in groups.values()]
+
+    @timed("refresh.queue")
+    def get_queue(
+        self,
+        limit: int = 50,
+        max_products_per_call: int = 10,
+        now: Optional[datetime] = None,
+    ) -> PriceRefreshQueueResponse:
+        """
+        Get the most urgent offers and the calls that would be made next.
+
+        Args:
+            limit: Number of offers to return
+            max_products_per_call: Maximum number of offers discussed in one call
+            now: Reference time (default: now)
+
+        Returns:
+            PriceRefreshQueueResponse with ranked offers and planned calls
+        """
+        now = now or datetime.now()
+        index = self.get_index()
+        with self._lock:
+            masked = self._masked_rows(index, now)
+            rows, staleness, priorities = index.top(limit, now, masked)
+            remaining = self.calls_remaining(now)
+            planned, _ = self._plan(index, now, remaining, max_products_per_call)
+
+        # Strings are decoded for the returned offers only
+        product_ids = index.products.decode(index.product_id[rows])
+        supplier_ids = index.suppliers.decode(index.supplier_id[rows])
+        product_names = index.names.decode(index.product_name[rows])
+        items = [
+            RefreshQueueItem(
+                product_id=product_id,
+                product_name=product_name,
+                supplier_id=supplier_id,
+                supplier_name=index.supplier_names.get(supplier_id, supplier_id),
+                price=float(index.price[row]),
+                current_price=None
+                if np.isnan(index.current_price[row])
+                else float(index.current_price[row]),
+                weekly_units=round(float(index.weekly_units[row]), 2),
+                last_information_update=str(index.last_information_update[row]),
+                staleness_days=round(float(days), 2),
+                impact=round(float(index.impact[row]), 2),
+                priority=round(float(priority), 2),
+            )
+            for row, product_id, product_name, supplier_id, days, priority in zip(
+                rows.tolist(), product_ids, product_names, supplier_ids, staleness, priorities
+            )
+        ]
+        return PriceRefreshQueueResponse(
+            items=items,
+            total_offers=len(index),
+            pending_offers=len(masked),
+            daily_call_budget=self.daily_call_budget,
+            calls_remaining=remaining,
+            planned_calls=planned,
+        )
+
+    def take_calls(
+        self, max_products_per_call: int = 10, now: Optional[datetime] = None
+    ) -> List[CampaignTarget]:
+        """
+        Hand out the next refresh calls, consuming today's budget.
+
+        The offers of the returned calls are skipped by the queue until they
+        are refreshed or REQUEST_COOLDOWN expires.
+
+        Args:
+            max_products_per_call: Maximum number of offers discussed in one call
+            now: Reference time (default: now)
+
+        Returns:
+            One "products" target per offer; grouped, they form at most the
+            remaining number of calls
+        """
+        now = now or datetime.now()
+        index = self.get_index()
+        with self._lock:
+            calls, call_rows = self._plan(
+                index, now, self.calls_remaining(now), max_products_per_call
+            )
+            today = now.date()
+            self._calls_by_day[today] = self._calls_by_day.get(today, 0) + len(calls)
+            for rows in call_rows:
+                for row in rows:
+                    self._requested[index.ids(row)] = _seconds(now)
+
+        return [
+            CampaignTarget(
+                supplier_name=call.supplier_name,
+                product_name=product_name,
+                agent_name="products",
+            )
+            for call in calls
+            for product_name in call.product_names
+        ]
+
+
+# Global instance
+_price_refresh_service: Optional[PriceRefreshService] = None
+
+
+def get_price_refresh_service() -> PriceRefreshService:
+    """Get or create the global price refresh service."""
+    global _price_refresh_service
+    if _price_refresh_service is None:
+        _price_refresh_service = PriceRefreshService()
+    return _price_refresh_service
@@ -5,6 +5,8 @@ from typing import List, Optional
 
 from backend.services.data_loader import get_data_loader
 from backend.services.models import InnovativeProduct, SupplierInfo
+from backend.services.product_identity import get_product_identity
+from backend.services.timing import timed
 
 
 class ProductDiscoveryService:
@@ -19,6 +21,7 @@ class ProductDiscoveryService:
         """
         self.data_loader = get_data_loader(data_dir)
 
+    @timed("discovery.innovative")
     def find_innovative_products(
         self, min_suppliers: int = 1, sort_by: str = "suppliers"
     ) -> List[InnovativeProduct]:
@@ -36,21 +39,18 @@ class ProductDiscoveryService:
         available_models = self.data_loader.load_available_products_models()
         fournisseurs_models = self.data_loader.load_fournisseurs_models()
 
-        # Get unique product names from in-store products
-        in_store_names = {p.name for p in in_store_models}
+        # Products are matched on their canonical key, so spelling variants of
+        # a stocked product are not reported as new
+        identity = get_product_identity(self.data_loader)
+        in_store_keys = set(identity.keys(p.name for p in in_store_models).tolist())
 
-        # Get unique product names from available products
-        available_names = {p.name for p in available_models}
-
-        # Find products in available but not in store
-        innovative_names = available_names - in_store_names
-
-        # Group available products by name
-        available_by_name = {}
-        for avail in available_models:
-            if avail.name not in available_by_name:
-                available_by_name[avail.name] = []
-            available_by_name[avail.name].append(avail)
+        # Group available products by key, keeping those not in store
+        available_by_key = {}
+        for avail, key in zip(
+            available_models, identity.keys(a.name for a in available_models).tolist()
+        ):
+            if key not in in_store_keys:
+                available_by_key.setdefault(key, []).append(avail)
 
         # Create supplier lookup
         fournisseurs_dict = {f.id: f for f in fournisseurs_models}
@@ -58,8 +58,8 @@ class ProductDiscoveryService:
         results = []
 
         # For each innovative product, aggregate supplier information
-        for product_name in innovative_names:
-            product_entries = available_by_name.get(product_name, [])
+        for key, product_entries in available_by_key.items():
+            product_name = identity.display_name[key]
 
             # Filter by minimum suppliers
             if len(product_entries) < min_suppliers:
@@ -0,0 +1,127 @@
+"""
+Canonical product identity shared by all services.
+
+Product names come from several sources (store catalog, supplier offers,
+orders, parsed call transcripts) with inconsistent case, accents and
+spacing. Two names denote the same product when their normalized forms are
+equal: Unicode-decomposed, accents dropped, case-folded, whitespace
+collapsed.
+
+ProductIdentity is built once per data version. It gives every product an
+integer key and maps every raw name and product ID of the data to it, so
+services join on integer arrays instead of comparing strings.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from backend.services.data_loader import DataLoader
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=100_000)
+def normalize_name(name: str) -> str:
+    """
+    Normalized form of a product name.
+
+    Example: "  Paracétamol   500MG " -> "paracetamol 500mg"
+    """
+    decomposed = unicodedata.normalize("NFKD", str(name))
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _WHITESPACE.sub(" ", stripped.casefold()).strip()
+
+
+def normalize_names(names: Iterable[str]) -> np.ndarray:
+    """Normalize many names, each distinct raw name once."""
+    codes, uniques = pd.factorize(
+        pd.Series(list(names), dtype=object), use_na_sentinel=False
+    )
+    normalized = np.array([normalize_name(name) for name in uniques], dtype=object)
+    if len(codes) == 0:
+        return np.array([], dtype=object)
+    return normalized[codes]
+
+
+class ProductIdentity:
+    """Integer product keys for every product name and ID of the data."""
+
+    def __init__(
+        self,
+        in_store: pd.DataFrame,
+        available: pd.DataFrame,
+        order_names: Optional[Iterable[str]] = None,
+    ):
+        """
+        Build the identity table.
+
+        Args:
+            in_store: In-store products (id and name columns)
+            available: Supplier offers (id and name columns)
+            order_names: Product names of the orders
+        """
+        order_names = list(order_names) if order_names is not None else []
+        raw = pd.concat(
+            [in_store["name"], available["name"], pd.Series(order_names, dtype=object)],
+            ignore_index=True,
+        ).astype(str)
+        codes, normalized = pd.factorize(normalize_names(raw))
+        n_in_store, n_available = len(in_store), len(available)
+
+        self.in_store_key = codes[:n_in_store].astype(np.int64)
+        self.available_key = codes[n_in_store : n_in_store + n_available].astype(np.int64)
+        self.order_key = codes[n_in_store + n_available :].astype(np.int64)
+        self.normalized: List[str] = list(normalized)
+
+        # Display name: first spelling seen, store catalog first
+        first_row = np.full(len(normalized), len(raw), dtype=np.int64)
+        np.minimum.at(first_row, codes, np.arange(len(raw)))
+        self.display_name: List[str] = raw.to_numpy(dtype=object)[first_row].tolist()
+
+        self.in_store = np.zeros(len(normalized), dtype=bool)
+        self.in_store[self.in_store_key] = True
+
+        self._index = pd.Index(self.normalized)
+        # IDs of store products win over offer IDs
+        self._by_id: Dict[str, int] = dict(
+            zip(available["id"].astype(str), self.available_key.tolist())
+        )
+        self._by_id.update(zip(in_store["id"].astype(str), self.in_store_key.tolist()))
+
+    def __len__(self) -> int:
+        return len(self.normalized)
+
+    def key(self, name: str) -> Optional[int]:
+        """Key of a product name, None if no product of the data has this name."""
+        key = self._index.get_indexer([normalize_name(name)])[0]
+        return None if key < 0 else int(key)
+
+    def keys(self, names: Iterable[str]) -> np.ndarray:
+        """Keys of many product names, -1 for unknown names."""
+        return self._index.get_indexer(normalize_names(names)).astype(np.int64)
+
+    def key_for_id(self, product_id: str) -> Optional[int]:
+        """Key of a product ID, None if unknown."""
+        return self._by_id.get(product_id)
+
+
+def get_product_identity(data_loader: DataLoader) -> ProductIdentity:
+    """
+    Get the product identity of a loader's current data version.
+
+    Args:
+        data_loader: DataLoader providing the data and the derived cache
+    """
+    return data_loader.get_derived(
+        "product_identity",
+        lambda: ProductIdentity(
+            data_loader.load_in_store_products(),
+            data_loader.load_available_products(),
+            data_loader.load_orders()["product_name"],
+        ),
+    )
@@ -7,6 +7,10 @@ from datetime import datetime
 from typing import Dict, List, Tuple
 import os
 
+from backend.services.price_history_service import get_price_history
+from backend.services.product_identity import normalize_name, normalize_names
+from backend.services.write_coordinator import changes_mutation, get_write_coordinator
+
 
 class ProductUpdater:
     """
@@ -30,30 +34,80 @@ class ProductUpdater:
         
         self.csv_path = csv_path
         self.df = None
+        # Contenu du fichier au chargement, pour ne sauvegarder que les changements
+        self._loaded = None
+        self.price_history = get_price_history(os.path.dirname(os.path.abspath(csv_path)))
+        # Changements de prix/délai en attente d'enregistrement dans l'historique
+        self._pending_history = []
     
     def load_csv(self) -> pd.DataFrame:
         """Charge le CSV des produits disponibles."""
         self.df = pd.read_csv(self.csv_path)
+        self._loaded = self.df.copy()
         return self.df
     
     def save_csv(self, backup: bool = True) -> None:
         """
         Sauvegarde le CSV mis à jour.
         
+        Seuls les changements faits sur self.df depuis le chargement (cellules
+        modifiées, lignes ajoutées ou supprimées) sont réappliqués au contenu
+        actuel du fichier via le coordinateur d'écriture : les modifications
+        sauvegardées entre-temps par d'autres écrivains sont conservées.
+        
         Args:
-            backup: Si True, crée une copie de sauvegarde avant d'écraser
+            backup: Si True, enregistre un delta (lignes modifiées et anciennes
+                    valeurs) permettant de restaurer la version précédente
         """
         if self.df is None:
             raise ValueError("No data to save. Call load_csv() first.")
         
-        if backup:
-            backup_path = f"{self.csv_path}.backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            self.df.to_csv(backup_path, index=False)
-            print(f"Backup created: {backup_path}")
+        changes = changes_mutation(self._loaded, self.df, ["id", "fournisseur"])
+        
+        def mutation(df: pd.DataFrame) -> pd.DataFrame:
+            self.df = changes(df)
+            return self.df
         
-        self.df.to_csv(self.csv_path, index=False)
+        get_write_coordinator(self.csv_path).mutate(mutation, backup=backup)
+        self._loaded = self.df.copy()
+        self._flush_history()
         print(f"CSV updated: {self.csv_path}")
     
+    def _flush_history(self) -> None:
+        """Enregistre dans l'historique des prix les changements sauvegardés."""
+        if self._pending_history:
+            self.price_history.record_changes(self._pending_history)
+        self._pending_history = []
+    
+    def apply_and_save(
+        self,
+        updates: Dict[str, Dict[str, float]],
+        fournisseur_mapping: Dict[str, str] = None
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Applique les mises à jour et sauvegarde via le coordinateur d'écriture.
+        
+        Contrairement à load_csv/apply_updates/save_csv, les mises à jour sont
+        appliquées au contenu actuel du fichier (sous verrou), ce qui évite
+        d'écraser les modifications faites entre-temps par d'autres écrivains.
+        
+        Args:
+            updates: Dictionnaire des mises à jour depuis le parser
+            fournisseur_mapping: Mapping optionnel nom_fournisseur -> id_fournisseur
+                    
+        Returns:
+            Tuple (successes, failures) avec les messages de succès et d'échec
+        """
+        def mutation(df: pd.DataFrame) -> Tuple[List[str], List[str]]:
+            self.df = df
+            return self.apply_updates(updates, fournisseur_mapping)
+        
+        result = get_write_coordinator(self.csv_path).mutate(mutation)
+        self._loaded = self.df.copy()
+        self._flush_history()
+        print(f"CSV updated: {self.csv_path}")
+        return result
+    
     def apply_updates(
         self, 
         updates: Dict[str, Dict[str, float]],
@@ -76,6 +130,10 @@ class ProductUpdater:
         successes = []
         failures = []
         current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        history_before = []
+        history_after = []
+        # Noms comparés sous forme normalisée (casse, accents, espaces)
+        names = normalize_names(self.df['name'])
         
         for product_supplier_key, changes in updates.items():
             try:
@@ -95,14 +153,16 @@ class ProductUpdater:
                 product_name = parts[0]
                 supplier_name = parts[1]
                 
+                same_product = names == normalize_name(product_name)
+
                 # Trouver le fournisseur_id si un mapping est fourni
                 if fournisseur_mapping and supplier_name in fournisseur_mapping:
                     supplier_id = fournisseur_mapping[supplier_name]
                     # Chercher par ID
-                    mask = (self.df['name'] == product_name) & (self.df['fournisseur'] == supplier_id)
+                    mask = same_product & (self.df['fournisseur'] == supplier_id)
                 else:
                     # Chercher par nom (peut être ambigu)
-                    mask = (self.df['name'] == product_name)
+                    mask = same_product
                 
                 # Vérifier qu'on a trouvé des lignes
                 matching_rows = self.df[mask]
@@ -120,6 +180,10 @@ class ProductUpdater:
                     self.df.loc[mask, 'delivery_time'] = changes['delivery_time']
                     updated_fields.append(f"delivery_time={changes['delivery_time']}")
                 
+                # Garder les anciennes valeurs pour l'historique des prix
+                history_before.append(matching_rows)
+                history_after.append(self.df[mask].copy())
+                
                 # Mettre à jour la date de dernière modification
                 self.df.loc[mask, 'last_information_update'] = current_time
                 
@@ -130,6 +194,13 @@ class ProductUpdater:
             except Exception as e:
                 failures.append(f"Error updating {product_supplier_key}: {str(e)}")
         
+        if history_before:
+            self._pending_history.append((
+                pd.concat(history_before, ignore_index=True),
+                pd.concat(history_after, ignore_index=True),
+                current_time,
+            ))
+        
         return successes, failures
     
     def preview_updates(
@@ -151,6 +222,7 @@ class ProductUpdater:
             self.load_csv()
         
         preview_data = []
+        names = normalize_names(self.df['name'])
         
         for product_supplier_key, changes in updates.items():
             if not product_supplier_key.startswith('[') or not product_supplier_key.endswith(']'):
@@ -167,11 +239,12 @@ class ProductUpdater:
             supplier_name = parts[1]
             
             # Trouver les lignes correspondantes
+            same_product = names == normalize_name(product_name)
             if fournisseur_mapping and supplier_name in fournisseur_mapping:
                 supplier_id = fournisseur_mapping[supplier_name]
-                mask = (self.df['name'] == product_name) & (self.df['fournisseur'] == supplier_id)
+                mask = same_product & (self.df['fournisseur'] == supplier_id)
             else:
-                mask = (self.df['name'] == product_name)
+                mask = same_product
             
             matching_rows = self.df[mask]
             
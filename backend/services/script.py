@@ -11,16 +11,15 @@ import os
 import sys
 from pathlib import Path
 
-from dotenv import load_dotenv
-
 # Add project root to Python path for imports
 # Script is in backend/services/, so we need to go up two levels to get to project root
 script_dir = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(script_dir))
 
+from backend.config import load_config
 from backend.services.transcript_parser_service import TranscriptParserService
 
-load_dotenv()
+load_config()
 
 
 def main():
@@ -0,0 +1,472 @@
+"""
+Data tables shared between API worker processes.
+
+Each uvicorn worker otherwise parses the CSV files and holds its own copy
+of every table, and repeats the parse on every reload. With shared data,
+one publisher process parses the files and writes each version of the
+tables, column by column, to a shared memory segment; the workers map the
+segments instead of reading the files:
+
+- numeric, boolean and datetime columns are stored as their raw buffers;
+- string (object) columns are dictionary-encoded: int32 codes, plus the
+  distinct values, which each worker decodes once per version.
+
+A small head segment, "<name>-head", holds the current version and the
+name of its segment. Workers check it where they would check the files'
+modification times (DataLoader.refresh_if_changed): a new version is
+mapped and swapped in like a rebuilt snapshot. The publisher keeps the
+previous segment for workers still serving it; an unlinked segment stays
+mapped by the workers using it.
+
+Tables are copied out of the shared buffers when a DataFrame is requested,
+so the buffers are never written. Models and derived values (indexes,
+identity, forecasts) are Python objects: each worker still builds the ones
+it uses.
+
+Usage (next to `uvicorn backend.api.main:app --workers N`, with
+SHARED_DATA=<name> set for the workers):
+    python -m backend.services.shared_data --name <name> [--data DIR] [--interval S]
+
+Workers started before the publisher read the files themselves, and switch
+to the shared tables once they are published.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import pickle
+import signal
+import struct
+import threading
+import time
+from collections import deque
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.services.data_loader import DEFAULT_DATA_DIR, Signature, files_signature, read_tables
+
+try:
+    import _posixshmem
+except ImportError:  # Windows: segments are not tracked, SharedMemory maps them as is
+    _posixshmem = None
+
+# Head segment: sequence number (odd while written), version, segment name
+HEAD_SIZE = 256
+_HEAD = struct.Struct("<qqq")
+# Buffers are aligned for any numeric dtype
+_ALIGN = 64
+# Column kinds stored as raw buffers
+_RAW_KINDS = "biufcmM"
+
+
+def shared_data_name() -> Optional[str]:
+    """Name of the shared data the workers map (SHARED_DATA), None if unset."""
+    return os.getenv("SHARED_DATA") or None
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+class _Mapping:
+    """Read-only mapping of a segment; unmapped once no longer referenced."""
+
+    def __init__(self, name: str):
+        if _posixshmem is None:
+            self._memory = shared_memory.SharedMemory(name=name)
+            self.buf = self._memory.buf
+            self.size = self._memory.size
+            return
+        # Not through SharedMemory: before Python 3.13 it registers the
+        # segment with the resource tracker, which would unlink it when a
+        # worker exits
+        fd = _posixshmem.shm_open("/" + name, os.O_RDONLY, mode=0)
+        try:
+            self.size = os.fstat(fd).st_size
+            self.buf = memoryview(mmap.mmap(fd, self.size, prot=mmap.PROT_READ))
+        finally:
+            os.close(fd)
+
+
+def _attach(name: str) -> _Mapping:
+    """Map an existing segment read-only (FileNotFoundError if unlinked)."""
+    return _Mapping(name)
+
+
+def _signature_of(meta_signature: List) -> Signature:
+    """Files signature read back from JSON."""
+    return tuple(None if item is None else tuple(item) for item in meta_signature)
+
+
+def encode_tables(
+    tables: Dict[str, Optional[pd.DataFrame]]
+) -> Tuple[Dict[str, Any], List[Tuple[int, Any]], int]:
+    """
+    Lay out tables as column buffers.
+
+    Returns:
+        (layout of every table and column, [(offset, bytes or array)] to
+        write after the metadata, total size of the buffers)
+    """
+    layout: Dict[str, Any] = {}
+    chunks: List[Tuple[int, Any]] = []
+    offset = 0
+
+    def add(data) -> Tuple[int, int]:
+        nonlocal offset
+        offset = _aligned(offset)
+        start = offset
+        chunks.append((start, data))
+        offset += len(data) if isinstance(data, bytes) else data.nbytes
+        return start, offset - start
+
+    for file_name, df in tables.items():
+        if df is None:
+            layout[file_name] = None
+            continue
+        columns = []
+        for name in df.columns:
+            values = df[name].to_numpy()
+            if values.dtype.kind in _RAW_KINDS:
+                values = np.ascontiguousarray(values)
+                start, _ = add(values)
+                columns.append(
+                    {"name": name, "kind": "raw", "dtype": values.dtype.str, "offset": start}
+                )
+            else:
+                codes, uniques = pd.factorize(values)
+                codes_start, _ = add(codes.astype(np.int32))
+                uniques_start, uniques_size = add(pickle.dumps(np.asarray(uniques, dtype=object)))
+                columns.append(
+                    {
+                        "name": name,
+                        "kind": "dict",
+                        "dtype": values.dtype.str,
+                        "offset": codes_start,
+                        "uniques_offset": uniques_start,
+                        "uniques_size": uniques_size,
+                    }
+                )
+        layout[file_name] = {"rows": len(df), "columns": columns}
+    return layout, chunks, offset
+
+
+class SharedSegment:
+    """A mapped data segment: its metadata and read access to its buffers."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._memory = _attach(name)
+        (meta_size,) = struct.unpack_from("<q", self._memory.buf, 0)
+        self.meta = json.loads(bytes(self._memory.buf[8 : 8 + meta_size]))
+        self._data_offset = _aligned(8 + meta_size)
+
+    @property
+    def signature(self) -> Signature:
+        """Files signature of the published tables."""
+        return _signature_of(self.meta["signature"])
+
+    @property
+    def size(self) -> int:
+        return self._memory.size
+
+    def read(self, offset: int, dtype: np.dtype, count: int) -> np.ndarray:
+        """Copy of an array stored in the segment."""
+        return np.frombuffer(
+            self._memory.buf, dtype=dtype, count=count, offset=self._data_offset + offset
+        ).copy()
+
+    def read_bytes(self, offset: int, size: int) -> bytes:
+        start = self._data_offset + offset
+        return bytes(self._memory.buf[start : start + size])
+
+    def tables(self) -> Dict[str, Optional["SharedTable"]]:
+        """The tables of the segment."""
+        return {
+            file_name: None if layout is None else SharedTable(self, layout)
+            for file_name, layout in self.meta["tables"].items()
+        }
+
+
+class SharedTable:
+    """A table stored in a shared segment; `to_frame()` gives private DataFrames."""
+
+    def __init__(self, segment: SharedSegment, layout: Dict[str, Any]):
+        self.segment = segment
+        self.rows: int = layout["rows"]
+        self.columns: List[Dict[str, Any]] = layout["columns"]
+        # Distinct values of the string columns, decoded on first use
+        self._uniques: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def _values(self, column: Dict[str, Any]) -> np.ndarray:
+        if column["kind"] == "raw":
+            return self.segment.read(column["offset"], np.dtype(column["dtype"]), self.rows)
+        name = column["name"]
+        with self._lock:
+            if name not in self._uniques:
+                uniques = pickle.loads(
+                    self.segment.read_bytes(column["uniques_offset"], column["uniques_size"])
+                )
+                # Code -1 (missing value) picks the trailing NaN
+                self._uniques[name] = np.append(uniques, np.nan).astype(object)
+        codes = self.segment.read(column["offset"], np.dtype(np.int32), self.rows)
+        return self._uniques[name].take(codes)
+
+    def to_frame(self) -> pd.DataFrame:
+        """The table as a new DataFrame (free to modify)."""
+        return pd.DataFrame(
+            {column["name"]: self._values(column) for column in self.columns},
+            index=pd.RangeIndex(self.rows),
+        )
+
+
+class SharedDataReader:
+    """Worker side: follows the head segment and maps the published tables."""
+
+    def __init__(self, name: str):
+        """
+        Initialize the reader.
+
+        Args:
+            name: Name of the shared data (the publisher's --name)
+        """
+        self.name = name
+        self._head: Optional[_Mapping] = None
+        self._segments: Dict[str, SharedSegment] = {}
+        self._lock = threading.Lock()
+
+    def head(self) -> Optional[Tuple[int, str]]:
+        """(version, segment name) currently published, None without a publisher."""
+        if self._head is None:
+            try:
+                self._head = _attach(f"{self.name}-head")
+            except FileNotFoundError:
+                return None
+        buf = self._head.buf
+        segment = ""
+        for _ in range(1000):
+            sequence, version, size = _HEAD.unpack_from(buf, 0)
+            if sequence % 2 == 0:
+                segment = bytes(buf[_HEAD.size : _HEAD.size + size]).decode()
+                if _HEAD.unpack_from(buf, 0)[0] == sequence:
+                    break
+            time.sleep(0)
+        else:
+            segment = ""  # Publisher died while writing
+        if not segment:
+            # Publisher stopped: a new one creates a new head
+            self._head = None
+            return None
+        return version, segment
+
+    def signature(self, data_dir: Path) -> Signature:
+        """
+        What a snapshot of the data depends on.
+
+        The published segment, or the files themselves while nothing is published.
+        """
+        head = self.head()
+        if head is None:
+            return ("files",) + files_signature(data_dir)
+        return ("shared", head[1])
+
+    def _segment(self, name: str) -> SharedSegment:
+        with self._lock:
+            segment = self._segments.get(name)
+            if segment is None:
+                segment = SharedSegment(name)
+                # Keep the latest ones only: snapshots hold the segments they serve
+                self._segments = {**dict(list(self._segments.items())[-1:]), name: segment}
+            return segment
+
+    def read(self, data_dir: Path) -> Tuple[Signature, Dict[str, Any]]:
+        """
+        Tables of the current version: (signature, tables by file name).
+
+        Without a publisher, the files are read in this process.
+        """
+        for _ in range(3):
+            head = self.head()
+            if head is None:
+                break
+            try:
+                return ("shared", head[1]), self._segment(head[1]).tables()
+            except FileNotFoundError:
+                # Replaced and unlinked meanwhile, or the publisher is gone:
+                # map the head again
+                self._head = None
+        return ("files",) + files_signature(data_dir), read_tables(data_dir)
+
+    def wait_for_files(self, data_dir: Path, timeout: float = 5.0) -> bool:
+        """
+        Wait until the published tables are those of the files on disk.
+
+        A worker writing a file waits for the publisher to publish it before
+        rebuilding. False on timeout (or without a publisher).
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            head = self.head()
+            if head is None:
+                return False
+            try:
+                if self._segment(head[1]).signature == files_signature(data_dir):
+                    return True
+            except FileNotFoundError:
+                self._head = None
+            time.sleep(0.02)
+        return False
+
+
+class SharedDataPublisher:
+    """Publisher side: writes each version of the tables to a new segment."""
+
+    def __init__(self, name: str, data_dir: Optional[Path] = None, keep: int = 2):
+        """
+        Initialize the publisher.
+
+        Args:
+            name: Name of the shared data (workers' SHARED_DATA)
+            data_dir: Data directory to publish (default: the DataLoader's)
+            keep: Segments kept linked: the current one and the previous ones
+                workers may be attaching
+        """
+        self.name = name
+        self.data_dir = Path(data_dir) if data_dir is not None else DEFAULT_DATA_DIR
+        self.keep = keep
+        self.version = 0
+        self.signature: Optional[Signature] = None
+        self._segments: Deque[shared_memory.SharedMemory] = deque()
+        head = f"{name}-head"
+        try:
+            self._head = shared_memory.SharedMemory(head, create=True, size=HEAD_SIZE)
+        except FileExistsError:
+            # Left over by a publisher that did not exit cleanly
+            self._head = shared_memory.SharedMemory(head)
+
+    @property
+    def size(self) -> int:
+        """Bytes of the current segment (0 before the first version)."""
+        return self._segments[-1].size if self._segments else 0
+
+    def _write_head(self, version: int, segment: str) -> None:
+        buf = self._head.buf
+        encoded = segment.encode()
+        sequence = _HEAD.unpack_from(buf, 0)[0]
+        sequence += 1 if sequence % 2 == 0 else 0
+        _HEAD.pack_into(buf, 0, sequence, version, 0)
+        buf[_HEAD.size : _HEAD.size + len(encoded)] = encoded
+        _HEAD.pack_into(buf, 0, sequence + 1, version, len(encoded))
+
+    def publish(self, tables: Dict[str, Optional[pd.DataFrame]], signature: Signature) -> str:
+        """
+        Write tables to a new segment and make it the current version.
+
+        Returns:
+            Name of the segment
+        """
+        layout, chunks, size = encode_tables(tables)
+        self.version += 1
+        meta = json.dumps(
+            {
+                "version": self.version,
+                "data_dir": str(self.data_dir),
+                "signature": signature,
+                "tables": layout,
+            }
+        ).encode()
+        data_offset = _aligned(8 + len(meta))
+        name = f"{self.name}-{os.getpid()}-{self.version}"
+        segment = shared_memory.SharedMemory(name, create=True, size=data_offset + size + 1)
+        struct.pack_into("<q", segment.buf, 0, len(meta))
+        segment.buf[8 : 8 + len(meta)] = meta
+        for start, data in chunks:
+            raw = data if isinstance(data, bytes) else data.view(np.uint8).reshape(-1)
+            segment.buf[data_offset + start : data_offset + start + len(raw)] = raw
+        self._write_head(self.version, name)
+        self.signature = signature
+
+        self._segments.append(segment)
+        while len(self._segments) > self.keep:
+            self._unlink(self._segments.popleft())
+        return name
+
+    def refresh(self) -> bool:
+        """Publish the files if they changed since the last version; True if published."""
+        signature = files_signature(self.data_dir)
+        if signature == self.signature:
+            return False
+        self.publish(read_tables(self.data_dir), signature)
+        return True
+
+    def run(self, interval: float = 0.5, stop: Optional[threading.Event] = None) -> None:
+        """Publish the files, then every change to them, until stopped."""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            try:
+                if self.refresh():
+                    print(f"✓ Published data version {self.version} ({self.size / 1e6:.1f} MB)")
+            except Exception as e:
+                print(f"⚠ Could not publish the data, workers keep the previous version: {e}")
+            stop.wait(interval)
+
+    def close(self) -> None:
+        """Unlink the segments (workers keep the ones they have mapped)."""
+        self._write_head(self.version, "")
+        while self._segments:
+            self._unlink(self._segments.popleft())
+        self._unlink(self._head)
+
+    @staticmethod
+    def _unlink(segment: shared_memory.SharedMemory) -> None:
+        segment.close()
+        segment.unlink()
+
+
+# Global instance
+_shared_data_reader: Optional[SharedDataReader] = None
+
+
+def get_shared_data_reader() -> Optional[SharedDataReader]:
+    """Get or create the reader of SHARED_DATA (None when unset)."""
+    global _shared_data_reader
+    name = shared_data_name()
+    if name is None:
+        return None
+    if _shared_data_reader is None or _shared_data_reader.name != name:
+        _shared_data_reader = SharedDataReader(name)
+    return _shared_data_reader
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Publish the data tables to shared memory")
+    parser.add_argument("--name", default=shared_data_name(), help="Shared data name (SHARED_DATA)")
+    parser.add_argument("--data", type=Path, default=None, help="Data directory")
+    parser.add_argument("--interval", type=float, default=0.5, help="Seconds between file checks")
+    args = parser.parse_args()
+    if not args.name:
+        parser.error("--name or SHARED_DATA is required")
+
+    publisher = SharedDataPublisher(args.name, args.data)
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    print(f"Publishing {publisher.data_dir} as shared data '{args.name}' (Ctrl+C to stop)")
+    try:
+        publisher.run(args.interval, stop)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        publisher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,209 @@
 """Service for analyzing supplier alternatives and finding cheaper options."""
 
+import base64
+import json
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
-from backend.services.data_loader import get_data_loader
+from backend.services.data_loader import Vocabulary, get_data_loader
 from backend.services.models import (
+    AvailableProduct,
     CheaperAlternative,
+    CheaperAlternativesResponse,
+    InStoreProduct,
     PerformanceBreakdown,
     SupplierROI,
     SupplierROIResponse,
 )
+from backend.services.price_history_service import (
+    PriceHistoryStore,
+    get_price_history,
+    price_trend,
+)
+from backend.services.product_identity import ProductIdentity, get_product_identity
+from backend.services.timing import timed
+
+# Sort key of an alternative: (savings_percent, product_id, alternative_supplier_id)
+AlternativeKey = Tuple[float, str, str]
+
+
+def encode_cursor(key: AlternativeKey) -> str:
+    """Encode the key of the last returned alternative as an opaque cursor."""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> AlternativeKey:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        savings_percent, product_id, supplier_id = json.loads(
+            base64.urlsafe_b64decode(cursor.encode())
+        )
+        return float(savings_percent), str(product_id), str(supplier_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+class AlternativesIndex:
+    """
+    Every (in-store product, offer from another supplier) pair, as arrays.
+
+    Rows are sorted in result order (savings percentage descending, then
+    product and supplier ID), so a row's position is its rank. IDs and names
+    are stored as int32 dictionary codes, which sort like the strings they
+    encode; strings are only decoded for the rows returned.
+    """
+
+    def __init__(
+        self,
+        in_store_products: Union[pd.DataFrame, List[InStoreProduct]],
+        available_products: Union[pd.DataFrame, List[AvailableProduct]],
+        identity: Optional[ProductIdentity] = None,
+        vocabularies: Optional[Dict[str, Vocabulary]] = None,
+    ):
+        """
+        Build the index.
+
+        Args:
+            in_store_products: Products currently stocked (models or in_store_product.csv rows)
+            available_products: All offers of the catalog (models or available_product.csv rows)
+            identity: Canonical product keys (default: built from the two tables)
+            vocabularies: Dictionaries of the product_id, product_name and
+                supplier_id domains (default: built from the two tables)
+        """
+        in_store = _as_frame(in_store_products, InStoreProduct)
+        available = _as_frame(available_products, AvailableProduct)
+        if identity is None:
+            identity = ProductIdentity(in_store, available)
+        if vocabularies is None:
+            vocabularies = {
+                "product_id": Vocabulary(pd.concat([in_store["id"], available["id"]])),
+                "product_name": Vocabulary(in_store["name"]),
+                "supplier_id": Vocabulary(
+                    pd.concat([in_store["fournisseur_id"], available["fournisseur"]])
+                ),
+            }
+        self.products = vocabularies["product_id"]
+        self.names = vocabularies["product_name"]
+        self.suppliers = vocabularies["supplier_id"]
+
+        # Canonical keys are computed once per distinct name, then gathered by code
+        name_codes = self.names.encode(in_store["name"])
+        name_keys = identity.keys(self.names.strings)
+        left = pd.DataFrame(
+            {
+                "product_id": self.products.encode(in_store["id"]),
+                "name": name_codes,
+                "current_price": in_store["price"].to_numpy(dtype=np.float64),
+                "current_supplier_id": self.suppliers.encode(in_store["fournisseur_id"]),
+                "current_stock": in_store["stock"].to_numpy(dtype=np.int64),
+                "key": name_keys[name_codes],
+            }
+        )
+        right = pd.DataFrame(
+            {
+                "key": identity.keys(available["name"]),
+                "alternative_supplier_id": self.suppliers.encode(available["fournisseur"]),
+                "alternative_price": available["price"].to_numpy(dtype=np.float64),
+                "delivery_time": available["delivery_time"].to_numpy(dtype=np.int64),
+                "last_information_update": available["last_information_update"].to_numpy(
+                    dtype=object
+                ),
+            }
+        )
+        pairs = left.merge(right, on="key")
+        pairs = pairs[pairs["alternative_supplier_id"] != pairs["current_supplier_id"]]
+        pairs = pairs.assign(savings=pairs["current_price"] - pairs["alternative_price"])
+        pairs = pairs.assign(
+            savings_percent=pairs["savings"] / pairs["current_price"] * 100
+        )
+        pairs = pairs.sort_values(
+            ["savings_percent", "product_id", "alternative_supplier_id"],
+            ascending=[False, True, True],
+            kind="stable",
+        ).reset_index(drop=True)
+
+        self.product_id = pairs["product_id"].to_numpy(dtype=np.int32)
+        self.product_name = pairs["name"].to_numpy(dtype=np.int32)
+        self.current_price = pairs["current_price"].to_numpy(dtype=np.float64)
+        self.current_supplier_id = pairs["current_supplier_id"].to_numpy(dtype=np.int32)
+        self.current_stock = pairs["current_stock"].to_numpy(dtype=np.int64)
+        self.alternative_supplier_id = pairs["alternative_supplier_id"].to_numpy(
+            dtype=np.int32
+        )
+        self.alternative_price = pairs["alternative_price"].to_numpy(dtype=np.float64)
+        self.delivery_time = pairs["delivery_time"].to_numpy(dtype=np.int64)
+        self.last_information_update = pairs["last_information_update"].to_numpy(
+            dtype=object
+        )
+        self.savings = pairs["savings"].to_numpy(dtype=np.float64)
+        self.savings_percent = pairs["savings_percent"].to_numpy(dtype=np.float64)
+        self._all_rows = np.arange(len(pairs))
+        self._rows_by_product: Dict[int, np.ndarray] = {
+            int(code): np.asarray(rows)
+            for code, rows in pairs.groupby("product_id").indices.items()
+        }
+
+    def rows(self, product_id: Optional[str] = None) -> np.ndarray:
+        """Get the rows of a product (all rows if None), in result order."""
+        if product_id is None:
+            return self._all_rows
+        code = int(self.products.encode([product_id])[0])
+        return self._rows_by_product.get(code, self._all_rows[:0])
+
+    def supplier_mask(self, rows: np.ndarray, supplier_id: str) -> np.ndarray:
+        """Mask of the rows whose alternative supplier is supplier_id."""
+        code = self.suppliers.encode([supplier_id])[0]
+        return self.alternative_supplier_id[rows] == code
+
+    def key(self, row: int) -> AlternativeKey:
+        """Get the sort key of a row."""
+        return (
+            float(self.savings_percent[row]),
+            str(self.products.strings[self.product_id[row]]),
+            str(self.suppliers.strings[self.alternative_supplier_id[row]]),
+        )
+
+    def after(self, rows: np.ndarray, key: AlternativeKey) -> np.ndarray:
+        """
+        Mask of the rows that come after a key in result order.
+
+        Works on keys rather than positions, so cursors stay valid across
+        data reloads: the key's IDs are located in the dictionaries, and the
+        comparison runs on the codes.
+        """
+        savings_percent, product_id, supplier_id = key
+        product = self.products.position(product_id)
+        supplier = self.suppliers.position(supplier_id)
+        row_percent = self.savings_percent[rows]
+        row_product = self.product_id[rows]
+        return (row_percent < savings_percent) | (
+            (row_percent == savings_percent)
+            & (
+                (row_product > product)
+                | (
+                    (row_product == product)
+                    & (self.alternative_supplier_id[rows] > supplier)
+                )
+            )
+        )
+
+
+def _as_frame(items: Union[pd.DataFrame, list], model: type) -> pd.DataFrame:
+    """Rows of a data file, from a DataFrame or a list of models."""
+    if isinstance(items, pd.DataFrame):
+        return items
+    return pd.DataFrame(
+        [item.model_dump() for item in items], columns=list(model.model_fields)
+    )
 
 
 class SupplierAnalysisService:
@@ -27,91 +218,129 @@ class SupplierAnalysisService:
         """
         self.data_loader = get_data_loader(data_dir)
 
+    @property
+    def price_history(self) -> PriceHistoryStore:
+        """Price history of the data directory served (the request's tenant's)."""
+        return get_price_history(self.data_loader.data_dir)
+
+    def get_alternatives_index(self) -> "AlternativesIndex":
+        """Get the in-store product / alternative offer pairs of the current data version."""
+        return self.data_loader.get_derived(
+            "alternatives_index",
+            lambda: AlternativesIndex(
+                self.data_loader.load_encoded("in_store_product.csv"),
+                self.data_loader.load_encoded("available_product.csv"),
+                get_product_identity(self.data_loader),
+                self.data_loader.get_vocabularies(),
+            ),
+        )
+
+    @timed("supplier.cheaper_alternatives")
     def find_cheaper_alternatives(
-        self, min_savings_percent: float = 5.0, product_id: Optional[str] = None
-    ) -> List[CheaperAlternative]:
+        self,
+        min_savings_percent: float = 5.0,
+        product_id: Optional[str] = None,
+        supplier_id: Optional[str] = None,
+        min_savings_amount: Optional[float] = None,
+        max_delivery_time: Optional[int] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> CheaperAlternativesResponse:
         """
         Find cheaper supplier alternatives for in-store products.
 
+        Results are ordered by savings percentage (descending), then product and
+        supplier ID. Filters are applied on the index arrays, and only the
+        returned page is turned into models.
+
         Args:
             min_savings_percent: Minimum savings percentage to flag (default: 5.0)
             product_id: Optional product ID to filter by
+            supplier_id: Optional alternative supplier ID to filter by
+            min_savings_amount: Optional minimum savings per unit
+            max_delivery_time: Optional maximum delivery time of the alternative in days
+            limit: Maximum number of results (None: all)
+            cursor: Cursor returned with the previous page
 
         Returns:
-            List of CheaperAlternative models
-        """
-        in_store_models = self.data_loader.load_in_store_products_models()
-        available_models = self.data_loader.load_available_products_models()
-        fournisseurs_models = self.data_loader.load_fournisseurs_models()
-
-        # Create lookup dictionaries for faster access
-        fournisseurs_dict = {f.id: f for f in fournisseurs_models}
-        available_by_name = {}
-        for avail in available_models:
-            if avail.name not in available_by_name:
-                available_by_name[avail.name] = []
-            available_by_name[avail.name].append(avail)
-
-        # Filter by product_id if provided
-        if product_id:
-            in_store_models = [p for p in in_store_models if p.id == product_id]
+            CheaperAlternativesResponse with the page of alternatives, the total
+            number of matches and the cursor of the next page (None on the last)
 
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        index = self.get_alternatives_index()
+        rows = index.rows(product_id)
+
+        mask = index.savings_percent[rows] >= min_savings_percent
+        if supplier_id:
+            mask &= index.supplier_mask(rows, supplier_id)
+        if min_savings_amount is not None:
+            mask &= index.savings[rows] >= min_savings_amount
+        if max_delivery_time is not None:
+            mask &= index.delivery_time[rows] <= max_delivery_time
+        matches = rows[mask]
+
+        candidates = matches
+        if cursor:
+            candidates = matches[index.after(matches, decode_cursor(cursor))]
+
+        # Rows are stored in result order: top-k is a partial partition of
+        # their positions, and only the page gets sorted
+        page = candidates
+        if limit is not None and len(candidates) > limit:
+            page = np.partition(candidates, limit - 1)[:limit]
+        page = np.sort(page)
+
+        fournisseurs_dict = {
+            f.id: f for f in self.data_loader.load_fournisseurs_models()
+        }
+        # Strings are decoded for the page only
+        product_ids = index.products.decode(index.product_id[page])
+        product_names = index.names.decode(index.product_name[page])
+        current_ids = index.suppliers.decode(index.current_supplier_id[page])
+        alternative_ids = index.suppliers.decode(index.alternative_supplier_id[page])
         results = []
+        for i, row in enumerate(page):
+            current_supplier = fournisseurs_dict.get(current_ids[i])
+            alternative_supplier = fournisseurs_dict.get(alternative_ids[i])
+            results.append(
+                CheaperAlternative(
+                    product_id=product_ids[i],
+                    product_name=product_names[i],
+                    current_price=float(index.current_price[row]),
+                    current_supplier_id=current_ids[i],
+                    current_supplier_name=current_supplier.name
+                    if current_supplier
+                    else "Unknown",
+                    current_stock=int(index.current_stock[row]),
+                    alternative_supplier_id=alternative_ids[i],
+                    alternative_supplier_name=alternative_supplier.name
+                    if alternative_supplier
+                    else "Unknown",
+                    alternative_supplier_phone=alternative_supplier.phone_number
+                    if alternative_supplier
+                    else "N/A",
+                    alternative_price=float(index.alternative_price[row]),
+                    savings_amount=float(index.savings[row]),
+                    savings_percent=float(index.savings_percent[row]),
+                    delivery_time=int(index.delivery_time[row]),
+                    last_information_update=index.last_information_update[row],
+                )
+            )
 
-        # For each in-store product, find cheaper alternatives
-        for product in in_store_models:
-            # Find all available products with the same name
-            matching_available = available_by_name.get(product.name, [])
-
-            # Filter out current supplier and find cheaper alternatives
-            for alt in matching_available:
-                if alt.fournisseur == product.fournisseur_id:
-                    continue
-
-                savings = product.price - alt.price
-                savings_percent = (savings / product.price) * 100
-
-                if savings_percent >= min_savings_percent:
-                    # Get supplier information
-                    current_supplier = fournisseurs_dict.get(
-                        product.fournisseur_id,
-                        None,
-                    )
-                    alternative_supplier = fournisseurs_dict.get(
-                        alt.fournisseur,
-                        None,
-                    )
-
-                    results.append(
-                        CheaperAlternative(
-                            product_id=product.id,
-                            product_name=product.name,
-                            current_price=product.price,
-                            current_supplier_id=product.fournisseur_id,
-                            current_supplier_name=current_supplier.name
-                            if current_supplier
-                            else "Unknown",
-                            current_stock=product.stock,
-                            alternative_supplier_id=alt.fournisseur,
-                            alternative_supplier_name=alternative_supplier.name
-                            if alternative_supplier
-                            else "Unknown",
-                            alternative_supplier_phone=alternative_supplier.phone_number
-                            if alternative_supplier
-                            else "N/A",
-                            alternative_price=alt.price,
-                            savings_amount=savings,
-                            savings_percent=savings_percent,
-                            delivery_time=alt.delivery_time,
-                            last_information_update=alt.last_information_update,
-                        )
-                    )
-
-        # Sort by savings percentage (descending)
-        results.sort(key=lambda x: x.savings_percent, reverse=True)
+        next_cursor = None
+        if len(page) < len(candidates):
+            next_cursor = encode_cursor(index.key(page[-1]))
 
-        return results
+        return CheaperAlternativesResponse(
+            alternatives=results,
+            total_count=len(matches),
+            min_savings_percent=min_savings_percent,
+            next_cursor=next_cursor,
+        )
 
+    @timed("supplier.roi")
     def get_supplier_roi(self) -> SupplierROIResponse:
         """
         Calculate supplier ROI and performance metrics.
@@ -124,6 +353,7 @@ class SupplierAnalysisService:
         in_store_models = self.data_loader.load_in_store_products_models()
         available_models = self.data_loader.load_available_products_models()
         orders_df = self.data_loader.load_orders()
+        price_metrics = self.price_history.supplier_metrics()
 
         # Calculate monthly spend from orders (estimate from last 30 days or average)
         orders_df["order_date"] = pd.to_datetime(orders_df["order_date"])
@@ -135,8 +365,10 @@ class SupplierAnalysisService:
         thirty_days_ago = datetime.now() - timedelta(days=30)
         recent_orders = orders_df[orders_df["order_date"] >= thirty_days_ago]
 
-        # Calculate spend per supplier (quantity * price from in-store products)
-        in_store_by_name = {p.name: p for p in in_store_models}
+        # Calculate spend per supplier (quantity * price from in-store products),
+        # matching order lines to products on their canonical key
+        identity = get_product_identity(self.data_loader)
+        in_store_by_key = {identity.key(p.name): p for p in in_store_models}
 
         supplier_spend = {}
         supplier_order_counts = {}
@@ -149,7 +381,7 @@ class SupplierAnalysisService:
             quantity = order["quantity"]
 
             # Find product price
-            product = in_store_by_name.get(product_name)
+            product = in_store_by_key.get(identity.key(product_name))
             if product and product.fournisseur_id == supplier_id:
                 price = product.price
                 spend = quantity * price
@@ -178,7 +410,7 @@ class SupplierAnalysisService:
                 product_name = order["product_name"]
                 quantity = order["quantity"]
 
-                product = in_store_by_name.get(product_name)
+                product = in_store_by_key.get(identity.key(product_name))
                 if product and product.fournisseur_id == supplier_id:
                     price = product.price
                     spend = quantity * price
@@ -186,6 +418,13 @@ class SupplierAnalysisService:
                         supplier_spend.get(supplier_id, 0) + spend
                     )
 
+        # Offers grouped by canonical product key
+        available_by_key: Dict[int, List[AvailableProduct]] = {}
+        for available, key in zip(
+            available_models, identity.keys(a.name for a in available_models)
+        ):
+            available_by_key.setdefault(int(key), []).append(available)
+
         # Calculate performance metrics for each supplier
         supplier_roi_list = []
 
@@ -204,8 +443,8 @@ class SupplierAnalysisService:
             for product in supplier_products:
                 matching_available = [
                     a
-                    for a in available_models
-                    if a.name == product.name and a.fournisseur != supplier_id
+                    for a in available_by_key.get(identity.key(product.name), [])
+                    if a.fournisseur != supplier_id
                 ]
                 cheaper = [a for a in matching_available if a.price < product.price]
                 cheaper_alternatives_count += len(cheaper)
@@ -250,8 +489,12 @@ class SupplierAnalysisService:
             else:
                 status = "warning"
 
-            # Determine trend (simplified - could be improved with historical data)
-            if monthly_spend > 5000:
+            # Determine trend from the supplier's offer price history
+            supplier_prices = price_metrics.get(supplier_id)
+            if supplier_prices is not None:
+                trend = price_trend(supplier_prices["trend_percent"])
+            # No price history yet: fall back to the spend-based estimate
+            elif monthly_spend > 5000:
                 trend = "up"
             elif monthly_spend > 1000:
                 trend = "stable"
@@ -299,6 +542,12 @@ class SupplierAnalysisService:
                     monthly_spend=round(monthly_spend, 2),
                     status=status,
                     trend=trend,
+                    price_trend_percent=round(supplier_prices["trend_percent"], 2)
+                    if supplier_prices is not None
+                    else None,
+                    price_volatility=round(supplier_prices["volatility"], 4)
+                    if supplier_prices is not None
+                    else None,
                     issues=issues,
                     phone_number=supplier.phone_number,
                     performance_breakdown=performance_breakdown,
@@ -0,0 +1,190 @@
+"""
+Tenant data directories, with a memory-bounded LRU of their loaders.
+
+Each tenant (pharmacy) has its own data directory, DATA_TENANTS_DIR/<id>,
+with the same CSV files as the default data directory. Its DataLoader is
+created on the tenant's first request (cold tenants cost nothing) and
+holds the tenant's snapshots, models and derived values (indexes,
+identity, response-cache versions). The services are tenant-agnostic: the
+API selects the tenant's loader for the request (see backend.api.tenants).
+
+Loaded tenants are kept in least-recently-used order. When their estimated
+memory exceeds TENANT_CACHE_MB, the least recently used ones are dropped;
+their next request loads them again. Snapshots count their size as values
+are added, so checking the budget on each request is cheap. Loaders of
+other data directories (get_data_loader(path)) share the same LRU and budget.
+"""
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+from backend.services.data_loader import DataLoader
+
+# Tenant ids: directory names, no path separators or dots
+TENANT_ID = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+
+
+def tenants_dir() -> Optional[Path]:
+    """Root of the tenant data directories (DATA_TENANTS_DIR), None if unset."""
+    root = os.getenv("DATA_TENANTS_DIR")
+    return Path(root) if root else None
+
+
+def tenant_cache_bytes() -> int:
+    """Memory budget of the loaded tenants (TENANT_CACHE_MB, default 1024)."""
+    return int(float(os.getenv("TENANT_CACHE_MB", "1024")) * 1024 * 1024)
+
+
+class TenantRegistry:
+    """Loads tenant data on demand and keeps the recently used tenants in memory."""
+
+    def __init__(self, root: Optional[Union[str, Path]] = None, max_bytes: Optional[int] = None):
+        """
+        Initialize the registry.
+
+        Args:
+            root: Directory holding one data directory per tenant
+                (default: DATA_TENANTS_DIR; None disables tenants)
+            max_bytes: Memory budget of the loaded tenants (default: TENANT_CACHE_MB)
+        """
+        root = tenants_dir() if root is None else root
+        self.root = Path(root) if root is not None else None
+        self.max_bytes = tenant_cache_bytes() if max_bytes is None else max_bytes
+        # Keyed by tenant id, or by resolved path for other data directories
+        self._loaders: "OrderedDict[Union[str, Path], DataLoader]" = OrderedDict()
+        self._last_used: Dict[Union[str, Path], float] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.root is not None
+
+    def exists(self, tenant_id: str) -> bool:
+        """Whether a tenant id is valid and has a data directory."""
+        return (
+            self.root is not None
+            and TENANT_ID.match(tenant_id) is not None
+            and (self.root / tenant_id).is_dir()
+        )
+
+    def get(self, tenant_id: str) -> DataLoader:
+        """
+        Get the loader of a tenant, creating it on first use.
+
+        Marks the tenant as most recently used and evicts the least recently
+        used ones beyond the memory budget.
+
+        Args:
+            tenant_id: Tenant id (name of its data directory)
+
+        Returns:
+            The tenant's DataLoader
+
+        Raises:
+            ValueError: Unknown tenant, or tenants disabled
+        """
+        if tenant_id not in self._loaders and not self.exists(tenant_id):
+            raise ValueError(f"Unknown tenant: {tenant_id}")
+        return self._get(tenant_id, lambda: self.root / tenant_id)
+
+    def get_directory(self, data_dir: Union[str, Path]) -> DataLoader:
+        """
+        Get the loader of any data directory, kept in the same LRU and budget.
+
+        A tenant's data directory gives the tenant's loader.
+
+        Args:
+            data_dir: Data directory
+
+        Returns:
+            The directory's DataLoader
+        """
+        path = Path(data_dir).resolve()
+        if (
+            self.root is not None
+            and path.parent == self.root.resolve()
+            and self.exists(path.name)
+        ):
+            return self.get(path.name)
+        return self._get(path, lambda: path)
+
+    def _get(self, key: Union[str, Path], data_dir: Callable[[], Path]) -> DataLoader:
+        """Get or create a loader, mark it most recently used and enforce the budget."""
+        with self._lock:
+            loader = self._loaders.get(key)
+            if loader is None:
+                loader = DataLoader(data_dir())
+                self._loaders[key] = loader
+                self.loads += 1
+            self._loaders.move_to_end(key)
+            self._last_used[key] = time.time()
+            self._evict(keep=key)
+        return loader
+
+    def _evict(self, keep: Union[str, Path]) -> None:
+        """Drop least recently used tenants while over budget (call with the lock held)."""
+        sizes = {key: loader.memory_usage() for key, loader in self._loaders.items()}
+        total = sum(sizes.values())
+        for key in list(self._loaders):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            del self._loaders[key]
+            self._last_used.pop(key, None)
+            total -= sizes[key]
+            self.evictions += 1
+
+    def memory_usage(self) -> int:
+        """Estimated bytes held by the loaded tenants."""
+        with self._lock:
+            loaders = list(self._loaders.values())
+        return sum(loader.memory_usage() for loader in loaders)
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Loaded tenants (least recently used first) with their size, and the counters.
+
+        Other data directories are listed with a None tenant_id.
+        """
+        with self._lock:
+            loaded = list(self._loaders.items())
+            last_used = dict(self._last_used)
+        tenants = [
+            {
+                "tenant_id": key if isinstance(key, str) else None,
+                "data_dir": str(loader.data_dir),
+                "bytes": loader.memory_usage(),
+                "data_version": loader.data_version if loader.loaded else None,
+                "last_used": last_used.get(key),
+            }
+            for key, loader in loaded
+        ]
+        return {
+            "enabled": self.enabled,
+            "root": str(self.root) if self.root is not None else None,
+            "max_bytes": self.max_bytes,
+            "bytes": sum(tenant["bytes"] for tenant in tenants),
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "tenants": tenants,
+        }
+
+
+# Global instance
+_tenant_registry: Optional[TenantRegistry] = None
+
+
+def get_tenant_registry() -> TenantRegistry:
+    """Get or create the global tenant registry."""
+    global _tenant_registry
+    if _tenant_registry is None:
+        _tenant_registry = TenantRegistry()
+    return _tenant_registry
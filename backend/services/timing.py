@@ -0,0 +1,93 @@
+"""
+Per-request stage timing.
+
+Code measures a stage with `span(name)` (or the `timed(name)` decorator).
+Durations are added to the collector of the current request, which the API
+middleware installs in a context variable; outside a request (scripts,
+background calls) spans are no-ops. Worker threads see the request's
+collector when the work is submitted with the context copied, as
+`run_cpu` / `run_io` do.
+
+Spans nest and are inclusive: a stage's time includes the stages run inside
+it (e.g. "data.csv_load" inside "inventory.enrich"). A stage run several
+times in one request is summed.
+
+Stage names are dotted: "<area>.<stage>", e.g. "data.csv_load",
+"response.serialize".
+"""
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class RequestTimings:
+    """Stage durations (seconds) of one request."""
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add time to a stage (stages may run on several threads)."""
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def snapshot(self) -> Dict[str, float]:
+        """Copy of the stage durations."""
+        with self._lock:
+            return dict(self.stages)
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """Collector of the current request, None outside a request."""
+    return _current.get()
+
+
+@contextmanager
+def collect_timings() -> Iterator[RequestTimings]:
+    """Collect the spans run in this context (and contexts copied from it)."""
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a stage of the current request."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - start)
+
+
+def timed(name: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Decorator timing every call of a function as a stage."""
+
+    def decorator(fn: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs) -> T:
+            with span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
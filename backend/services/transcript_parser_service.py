@@ -8,14 +8,15 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Union
 
-from mistralai import Mistral
 import pandas as pd
-from dotenv import load_dotenv
 
+from backend.config import load_config
 from backend.services.data_loader import get_data_loader
 from backend.services.models import ModifiedProductInformation
-
-load_dotenv()
+from backend.services.price_history_service import get_price_history
+from backend.services.product_identity import normalize_name, normalize_names
+from backend.services.timing import span
+from backend.services.write_coordinator import changes_mutation, get_write_coordinator
 
 
 class TranscriptParserService:
@@ -40,12 +41,16 @@ class TranscriptParserService:
             api_key: Mistral API key. If not provided, will use MISTRAL_API_KEY env variable.
             data_dir: Path to the data directory. If None, uses ../data relative to this file.
         """
+        load_config()
         self.api_key = api_key or os.getenv("MISTRAL_API_KEY")
         if not self.api_key:
             raise ValueError(
                 "API key must be provided either as parameter or MISTRAL_API_KEY environment variable"
             )
 
+        # Imported here: the SDK is slow to import and only needed once parsing
+        from mistralai import Mistral
+
         self.client = Mistral(api_key=self.api_key)
 
         # Initialize data directory and loader for CSV operations
@@ -57,8 +62,13 @@ class TranscriptParserService:
 
         # Store dataframes for CSV operations (will be loaded when needed)
         self._available_products = None
+        self._loaded_products = None
         self._fournisseurs = None
 
+        # Price/delivery changes waiting to be recorded in the price history on save
+        self.price_history = get_price_history(self.data_dir)
+        self._pending_history = []
+
     def _parse_json_transcript(self, json_input: Union[str, Path, Dict]) -> Dict:
         """
         Parse JSON transcript from file path, JSON string, or dict.
@@ -205,10 +215,11 @@ class TranscriptParserService:
         print(prompt)
 
         try:
-            response = self.client.chat.complete(
-                model="mistral-large-latest",
-                messages=[{"role": "user", "content": prompt}],
-            )
+            with span("parser.mistral"):
+                response = self.client.chat.complete(
+                    model="mistral-large-latest",
+                    messages=[{"role": "user", "content": prompt}],
+                )
 
             # Extract the response text
             response_text = response.choices[0].message.content
@@ -371,6 +382,7 @@ Réponds UNIQUEMENT avec le JSON, sans texte additionnel."""
         """Load and cache dataframes for CSV operations."""
         if self._available_products is None:
             self._available_products = self.data_loader.load_available_products()
+            self._loaded_products = self._available_products.copy()
         if self._fournisseurs is None:
             self._fournisseurs = self.data_loader.load_fournisseurs()
 
@@ -385,11 +397,12 @@ Réponds UNIQUEMENT avec le JSON, sans texte additionnel."""
             modified_products: List of ModifiedProductInformation objects to prepare
         """
         self._load_dataframes()
+        names = normalize_names(self._available_products.name)
 
         for product in modified_products:
             # Match product ID
             product_match = self._available_products[
-                self._available_products.name == product.product_name
+                names == normalize_name(product.product_name)
             ]
             if len(product_match) > 0:
                 product.product_id = product_match.iloc[0]["id"]
@@ -423,6 +436,7 @@ Réponds UNIQUEMENT avec le JSON, sans texte additionnel."""
 
                 # Check if row exists
                 if mask.any():
+                    before = self._available_products[mask].copy()
                     # Update existing row
                     if product.new_price is not None:
                         self._available_products.loc[mask, "price"] = product.new_price
@@ -435,6 +449,13 @@ Réponds UNIQUEMENT avec le JSON, sans texte additionnel."""
                     self._available_products.loc[mask, "last_information_update"] = (
                         product.new_last_information_update
                     )
+                    self._pending_history.append(
+                        (
+                            before,
+                            self._available_products[mask].copy(),
+                            product.new_last_information_update,
+                        )
+                    )
                 else:
                     # Product exists but not with this supplier - add new row
                     new_row = {
@@ -449,11 +470,13 @@ Réponds UNIQUEMENT avec le JSON, sans texte additionnel."""
                         [self._available_products, pd.DataFrame([new_row])],
                         ignore_index=True,
                     )
+                    self._record_new_offer(new_row)
             elif product.fournisseur_id:
                 # New product - need to generate product ID
                 # Check if product name already exists to reuse ID
                 existing_product = self._available_products[
-                    self._available_products.name == product.product_name
+                    normalize_names(self._available_products.name)
+                    == normalize_name(product.product_name)
                 ]
                 if len(existing_product) > 0:
                     product_id = existing_product.iloc[0]["id"]
@@ -476,14 +499,41 @@ Réponds UNIQUEMENT avec le JSON, sans texte additionnel."""
                     [self._available_products, pd.DataFrame([new_row])],
                     ignore_index=True,
                 )
+                self._record_new_offer(new_row)
+
+    def _record_new_offer(self, new_row: dict) -> None:
+        """Queue a newly added offer for the price history."""
+        after = pd.DataFrame([new_row])
+        self._pending_history.append(
+            (after.iloc[0:0], after, new_row["last_information_update"])
+        )
+
+    def _flush_history(self) -> None:
+        """Record the saved price/delivery changes in the price history."""
+        if self._pending_history:
+            self.price_history.record_changes(self._pending_history)
+        self._pending_history = []
 
     def save_to_csv(self) -> None:
-        """Save modified product information to CSV."""
+        """
+        Save modified product information to CSV.
+
+        Only the changes made since the products were loaded are applied to
+        the current file content, so writes saved meanwhile are kept.
+        """
         self._load_dataframes()
-        self._available_products.to_csv(
-            self.data_dir / "available_product.csv", index=False
+        changes = changes_mutation(
+            self._loaded_products, self._available_products, ["id", "fournisseur"]
         )
 
+        def apply(df: pd.DataFrame) -> pd.DataFrame:
+            self._available_products = changes(df)
+            return self._available_products
+
+        get_write_coordinator(self.data_dir / "available_product.csv").mutate(apply)
+        self._loaded_products = self._available_products.copy()
+        self._flush_history()
+
     def parse_and_update_csv(
         self,
         transcript: Union[str, Path, Dict],
@@ -511,12 +561,23 @@ Réponds UNIQUEMENT avec le JSON, sans texte additionnel."""
         parsed_updates = self.parse_conversation(transcript, supplier_name)
         # Convert to ModifiedProductInformation format
         modified_products = self.parse_to_modified_products(parsed_updates)
-        # Prepare product information (match IDs)
-        self.prepare_product_information(modified_products)
-        # Update product information
-        self.update_product_information(modified_products)
-        # Save to CSV if requested
+
+        def apply(df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+            if df is not None:
+                self._available_products = df
+            # Prepare product information (match IDs)
+            self.prepare_product_information(modified_products)
+            # Update product information
+            self.update_product_information(modified_products)
+            return self._available_products
+
         if save:
-            self.save_to_csv()
+            # Apply to the current file content through the write coordinator so
+            # concurrent writers don't overwrite each other's changes
+            get_write_coordinator(self.data_dir / "available_product.csv").mutate(apply)
+            self._loaded_products = self._available_products.copy()
+            self._flush_history()
+        else:
+            apply()
 
         return modified_products
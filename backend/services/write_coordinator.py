@@ -0,0 +1,280 @@
+"""
+Write coordinator for the data CSV files.
+
+Several writers (background call threads, the parse endpoint, the CLI script)
+load, modify and save the same CSV. Each worked on its own in-memory copy, so
+the last writer silently discarded the others' changes. The coordinator fixes
+that at two levels:
+
+- within a process, every mutation of a table goes through a single writer
+  thread that applies queued mutations in order and coalesces them into one
+  read-modify-write cycle;
+- across processes, that cycle runs under an advisory lock on `<csv>.lock`,
+  and always starts from the file content on disk.
+"""
+
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+from backend.services.backup_service import DeltaBackupManager
+from backend.services.timing import span
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+# A mutation receives the current table and either modifies it in place
+# (returning None) or returns the new table.
+Mutation = Callable[[pd.DataFrame], Optional[pd.DataFrame]]
+
+# Maximum number of queued mutations coalesced into a single write
+DEFAULT_MAX_BATCH = 256
+
+
+class FileLock:
+    """Advisory inter-process lock on `<path>.lock`."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.lock_path = Path(f"{path}.lock")
+        self._file = None
+        self._thread_lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until the lock is held."""
+        self._thread_lock.acquire()
+        try:
+            self._file = open(self.lock_path, "a+")
+            if os.name == "nt":
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+            else:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        except BaseException:
+            # Not held: leave the lock free for the next writer
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._thread_lock.release()
+            raise
+
+    def release(self) -> None:
+        """Release the lock."""
+        try:
+            if os.name == "nt":
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+        finally:
+            self._file = None
+            self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class TableWriteCoordinator:
+    """Serializes and batches mutations of one CSV table."""
+
+    def __init__(
+        self,
+        csv_path: Union[str, Path],
+        backup: bool = True,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ):
+        """
+        Initialize the coordinator.
+
+        Args:
+            csv_path: Path to the CSV file
+            backup: If True, each write records a delta backup
+            max_batch: Maximum number of mutations coalesced into one write
+        """
+        self.csv_path = Path(csv_path)
+        self.backup = backup
+        self.max_batch = max_batch
+        self.file_lock = FileLock(self.csv_path)
+        self.backup_manager = DeltaBackupManager(self.csv_path)
+        self._queue: "queue.Queue[Tuple[Mutation, Future, Optional[bool]]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self._commit_listeners: List[Callable[[Path], None]] = []
+        self.writes = 0
+        self.mutations = 0
+
+    def add_commit_listener(self, listener: Callable[[Path], None]) -> None:
+        """Register a callback invoked after each successful write."""
+        self._commit_listeners.append(listener)
+
+    def submit(self, mutation: Mutation, backup: Optional[bool] = None) -> Future:
+        """
+        Queue a mutation of the table.
+
+        Args:
+            mutation: Function applied to the current table
+            backup: Whether the write records a delta backup (default: the
+                coordinator's setting). A batch is backed up if any of its
+                mutations asks for it.
+
+        Returns:
+            Future resolved with the mutation's return value once the table is saved
+        """
+        future: Future = Future()
+        self._queue.put((mutation, future, backup))
+        self._ensure_worker()
+        return future
+
+    def mutate(
+        self,
+        mutation: Mutation,
+        timeout: Optional[float] = None,
+        backup: Optional[bool] = None,
+    ):
+        """Queue a mutation and wait until it is saved."""
+        with span("data.write"):
+            return self.submit(mutation, backup=backup).result(timeout=timeout)
+
+    def _ensure_worker(self) -> None:
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run,
+                    name=f"writer-{self.csv_path.name}",
+                    daemon=True,
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: List[Tuple[Mutation, Future, Optional[bool]]]) -> None:
+        """Apply a batch of mutations in one locked read-modify-write cycle."""
+        applied = []
+        backup = False
+        try:
+            with self.file_lock:
+                df = pd.read_csv(self.csv_path)
+                for mutation, future, wants_backup in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    # Work on a copy so a failing mutation leaves no partial changes
+                    candidate = df.copy()
+                    try:
+                        result = mutation(candidate)
+                    except Exception as e:
+                        future.set_exception(e)
+                        continue
+                    df = result if isinstance(result, pd.DataFrame) else candidate
+                    applied.append((future, result))
+                    backup |= self.backup if wants_backup is None else wants_backup
+
+                if applied:
+                    if backup:
+                        self.backup_manager.save(df)
+                    else:
+                        tmp_path = self.csv_path.with_name(f".{self.csv_path.name}.tmp")
+                        df.to_csv(tmp_path, index=False)
+                        os.replace(tmp_path, self.csv_path)
+                    self.writes += 1
+                    self.mutations += len(applied)
+        except Exception as e:
+            for future, _ in applied:
+                future.set_exception(e)
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for listener in self._commit_listeners:
+            try:
+                listener(self.csv_path)
+            except Exception as e:
+                print(f"Error in commit listener for {self.csv_path}: {e}")
+
+        for future, result in applied:
+            future.set_result(None if isinstance(result, pd.DataFrame) else result)
+
+
+def _row_keys(df: pd.DataFrame, key_columns: Sequence[str]) -> pd.MultiIndex:
+    """Row keys: the key columns plus the occurrence number of duplicated keys."""
+    keys = df[list(key_columns)].astype(str)
+    occurrence = keys.groupby(list(key_columns), sort=False, dropna=False).cumcount()
+    return pd.MultiIndex.from_frame(keys.assign(_occurrence=occurrence))
+
+
+def changes_mutation(
+    base: pd.DataFrame, edited: pd.DataFrame, key_columns: Sequence[str]
+) -> Mutation:
+    """
+    Mutation re-applying the changes made to a copy of the table.
+
+    For writers that edit a copy loaded earlier: only the cells changed from
+    `base` to `edited`, and the rows removed or added, are applied to the
+    table read under the lock, so changes other writers saved since the copy
+    was loaded are kept. Rows are matched on `key_columns`.
+    """
+    base_rows = base.set_axis(_row_keys(base, key_columns))
+    edited_rows = edited.set_axis(_row_keys(edited, key_columns))
+    kept = edited_rows.index.isin(base_rows.index)
+    removed = base_rows.index[~base_rows.index.isin(edited_rows.index)]
+    added = edited_rows[~kept]
+
+    changes = {}
+    after_rows = edited_rows[kept]
+    before_rows = base_rows.reindex(after_rows.index)
+    for column in edited.columns:
+        after = after_rows[column]
+        if column in base.columns:
+            before = before_rows[column]
+            differs = (before.astype(object) != after.astype(object)) & ~(
+                before.isna() & after.isna()
+            )
+            after = after[differs]
+        if len(after):
+            changes[column] = after
+
+    def mutation(df: pd.DataFrame) -> pd.DataFrame:
+        current = df.set_axis(_row_keys(df, key_columns))
+        for column, values in changes.items():
+            values = values[values.index.isin(current.index)]
+            if len(values):
+                current.loc[values.index, column] = values
+        current = current[~current.index.isin(removed)]
+        if len(added):
+            current = pd.concat([current, added])
+        return current.reset_index(drop=True)
+
+    return mutation
+
+
+# Global coordinators, one per table
+_coordinators: Dict[Path, TableWriteCoordinator] = {}
+_coordinators_lock = threading.Lock()
+
+
+def get_write_coordinator(csv_path: Union[str, Path]) -> TableWriteCoordinator:
+    """Get or create the coordinator for a CSV file."""
+    path = Path(csv_path).resolve()
+    with _coordinators_lock:
+        if path not in _coordinators:
+            _coordinators[path] = TableWriteCoordinator(path)
+        return _coordinators[path]
@@ -8,14 +8,15 @@ une conversation téléphonique et mettre à jour les dates de livraison dans or
 import os
 import sys
 import json
-from dotenv import load_dotenv
-load_dotenv()
 
 # Ajouter le répertoire parent au path pour les imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+from backend.config import load_config
 from backend.services.order_delivery_parser_service import OrderDeliveryParser
 
+load_config()
+
 
 def test_order_delivery_parser():
     """Test du parser avec un exemple de conversation sur les livraisons."""
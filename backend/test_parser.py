@@ -9,17 +9,16 @@ import json
 import os
 import sys
 
-from dotenv import load_dotenv
-
-load_dotenv()
-
-api_key = os.getenv("MISTRAL_API_KEY")
-
 # Ajouter le répertoire parent au path pour les imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+from backend.config import load_config
 from backend.services.transcript_parser_service import TranscriptParserService
 
+load_config()
+
+api_key = os.getenv("MISTRAL_API_KEY")
+
 
 def test_conversation_parser():
     """Test du parser avec un exemple de conversation."""
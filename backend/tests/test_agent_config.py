@@ -0,0 +1,59 @@
+"""Tests for the agent configuration cache: updates are pushed only on change."""
+
+from types import SimpleNamespace
+
+from backend.controllers import update_agent as agent_config_module
+from backend.controllers.update_agent import AgentConfigCache, dynamic_variables
+
+
+class StubAgents:
+    """Records agents.update calls instead of calling ElevenLabs."""
+
+    def __init__(self):
+        self.calls = []
+
+    def update(self, agent_id, conversation_config):
+        self.calls.append((agent_id, conversation_config))
+
+
+def make_cache():
+    agents = StubAgents()
+    client = SimpleNamespace(conversational_ai=SimpleNamespace(agents=agents))
+    return AgentConfigCache(client=client), agents
+
+
+def test_config_pushed_once_until_changed(monkeypatch):
+    monkeypatch.setenv("AGENT_AVAILABILITY_ID", "agent_123")
+    cache, agents = make_cache()
+
+    assert cache.ensure("availability") is True
+    assert cache.ensure("availability") is False
+    assert len(agents.calls) == 1
+    agent_id, config = agents.calls[0]
+    assert agent_id == "agent_123"
+    assert "{{product_name}}" in config["agent"]["prompt"]["prompt"]
+    assert "{{supplier_name}}" in config["agent"]["prompt"]["prompt"]
+
+    cache.invalidate("availability")
+    assert cache.ensure("availability") is True
+
+    monkeypatch.setattr(
+        agent_config_module, "SYSTEM_PROMPT_AVAILABILITY", "Changed {{product_name}}"
+    )
+    assert cache.ensure("availability") is True
+    assert cache.ensure("availability") is False
+    assert len(agents.calls) == 3
+    assert cache.updates == 3
+
+
+def test_unmanaged_or_unconfigured_agents_are_skipped(monkeypatch):
+    monkeypatch.delenv("AGENT_AVAILABILITY_ID", raising=False)
+    cache, agents = make_cache()
+
+    assert cache.ensure("availability") is False
+    assert cache.ensure("products") is False
+    assert agents.calls == []
+    assert dynamic_variables("Pommes", "Acme") == {
+        "product_name": "Pommes",
+        "supplier_name": "Acme",
+    }
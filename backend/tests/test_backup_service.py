@@ -0,0 +1,112 @@
+"""Tests for delta backups: save, rebuild past versions, restore and retention."""
+
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from backend.services.backup_service import DeltaBackupManager
+from backend.services.product_updater_service import ProductUpdater
+from backend.services.write_coordinator import get_write_coordinator
+
+
+@pytest.fixture
+def products_csv():
+    """Create a temporary available_product.csv."""
+    temp_dir = Path(tempfile.mkdtemp())
+    csv_path = temp_dir / "available_product.csv"
+    pd.DataFrame(
+        {
+            "id": ["prod_1", "prod_1", "prod_2"],
+            "name": ["Paracétamol 500mg", "Paracétamol 500mg", "Ibuprofène 400mg"],
+            "fournisseur": ["supp_1", "supp_2", "supp_1"],
+            "price": [10.0, 11.0, 5.0],
+            "delivery_time": [5, 3, 7],
+            "last_information_update": ["2025-01-01 10:00:00"] * 3,
+        }
+    ).to_csv(csv_path, index=False)
+    return csv_path
+
+
+def test_updater_records_delta_and_restores(products_csv):
+    """Each save stores a delta only, and every past version can be rebuilt."""
+    original = products_csv.read_text()
+
+    updater = ProductUpdater(csv_path=str(products_csv))
+    updater.apply_updates(
+        {"[Paracétamol 500mg, Supplier A]": {"price": 9.5}},
+        fournisseur_mapping={"Supplier A": "supp_1"},
+    )
+    updater.save_csv(backup=True)
+
+    updater.df = pd.concat(
+        [
+            updater.df[updater.df["id"] != "prod_2"],
+            pd.DataFrame([{**updater.df.iloc[0].to_dict(), "fournisseur": "supp_3"}]),
+        ],
+        ignore_index=True,
+    )
+    updater.save_csv(backup=True)
+
+    manager = get_write_coordinator(products_csv).backup_manager
+    assert [v["version"] for v in manager.list_versions()] == [0, 1, 2]
+    # No full copies besides the base
+    assert not list(products_csv.parent.glob("*.backup_*"))
+
+    delta = manager._read_delta(1)
+    assert len(delta["rows"]) == 1
+    assert delta["rows"][0]["before"]["price"] == "10.0"
+    assert delta["rows"][0]["after"]["price"] == "9.5"
+
+    assert manager.rebuild(0).to_csv(index=False) == original
+    version_1 = manager.rebuild(1)
+    assert len(version_1) == 3
+    assert manager.rebuild(2).equals(
+        pd.read_csv(products_csv, dtype=str, keep_default_na=False)
+    )
+
+    manager.restore(0)
+    assert products_csv.read_text() == original
+    assert manager.latest_version() == 3
+
+
+def test_prune_folds_old_deltas_into_base(products_csv):
+    """Retention keeps the newest deltas and moves the base forward."""
+    manager = DeltaBackupManager(products_csv, max_versions=2, max_age_days=None)
+    df = pd.read_csv(products_csv)
+    for price in [1.0, 2.0, 3.0, 4.0]:
+        df.loc[0, "price"] = price
+        manager.save(df)
+
+    versions = manager.list_versions()
+    assert [v["version"] for v in versions] == [2, 3, 4]
+    assert manager.rebuild(2).loc[0, "price"] == "2.0"
+    assert manager.rebuild(4).loc[0, "price"] == "4.0"
+    with pytest.raises(ValueError):
+        manager.rebuild(1)
+
+
+def test_restore_keeps_row_order_and_survives_writes_without_backup(products_csv):
+    """Inserted rows keep their position; a write outside the manager is recorded."""
+    manager = DeltaBackupManager(products_csv)
+    df = pd.read_csv(products_csv)
+    inserted = pd.concat(
+        [df.iloc[:1], pd.DataFrame([{**df.iloc[2].to_dict(), "id": "prod_0"}]), df.iloc[1:]],
+        ignore_index=True,
+    )
+    assert manager.save(inserted) == 1
+    saved = products_csv.read_text()
+
+    # Written without the manager (save_csv(backup=False), another process)
+    edited = inserted.drop(index=3)
+    edited.loc[0, "price"] = 99.0
+    edited.to_csv(products_csv, index=False)
+    outside = products_csv.read_text()
+    edited.loc[1, "price"] = 1.0
+    assert manager.save(edited) == 3
+
+    assert manager.list_versions()[2]["external"] is True
+    assert manager.rebuild(1).to_csv(index=False) == saved
+    assert manager.rebuild(2).to_csv(index=False) == outside
+    assert manager.rebuild(3).equals(pd.read_csv(products_csv, dtype=str, keep_default_na=False))
@@ -0,0 +1,63 @@
+"""Tests for the basket optimizer solver."""
+
+from itertools import combinations
+
+import numpy as np
+
+from backend.services.basket_optimizer_service import BasketSolver
+
+
+def brute_force(costs, min_amounts, max_suppliers):
+    """Cheapest assignment over all supplier sets (cheapest supplier per line)."""
+    best = np.inf
+    n_lines, n_suppliers = costs.shape
+    for size in range(1, max_suppliers + 1):
+        for suppliers in combinations(range(n_suppliers), size):
+            line_cost = costs[:, suppliers].min(axis=1)
+            if not np.isfinite(line_cost).all():
+                continue
+            choice = np.array(suppliers)[costs[:, suppliers].argmin(axis=1)]
+            totals = np.bincount(choice, weights=line_cost, minlength=n_suppliers)
+            if ((totals > 0) & (totals < min_amounts)).any():
+                continue
+            best = min(best, line_cost.sum())
+    return best
+
+
+def test_max_suppliers_matches_brute_force():
+    """Branch and bound finds the optimal supplier set."""
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        costs = rng.uniform(10, 100, size=(12, 7))
+        costs[rng.random(costs.shape) < 0.3] = np.inf
+        costs[:, 0] = np.where(np.isfinite(costs[:, 0]), costs[:, 0], 150.0)
+        solver = BasketSolver(costs, np.zeros(7), max_suppliers=2).solve()
+
+        assert solver.optimal
+        assert solver.best_cost == brute_force(costs, np.zeros(7), 2)
+        assert len(np.unique(solver.best_assignment)) <= 2
+
+
+def test_minimum_order_pulls_lines():
+    """An under-minimum supplier receives the lines cheapest to move."""
+    costs = np.array(
+        [
+            [10.0, 11.0],
+            [20.0, 21.0],
+            [30.0, 25.0],
+        ]
+    )
+    solver = BasketSolver(costs, np.array([0.0, 35.0])).solve()
+
+    # Supplier 1 alone would get 25: moving line 0 (+1) reaches the minimum
+    assert solver.best_assignment.tolist() == [1, 0, 1]
+    assert solver.best_cost == 56.0
+    assert solver.lower_bound == 55.0
+
+
+def test_infeasible_basket():
+    """No supplier set can cover every line."""
+    costs = np.array([[10.0, np.inf], [np.inf, 10.0]])
+    solver = BasketSolver(costs, np.zeros(2), max_suppliers=1).solve()
+
+    assert solver.best_assignment is None
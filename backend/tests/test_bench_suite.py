@@ -0,0 +1,44 @@
+"""Tests for the benchmark suite: every case runs, regressions are flagged."""
+
+import copy
+
+from backend.benchmarks import bench_suite
+from backend.services import data_loader as data_loader_module
+
+
+def test_suite_runs_every_case(tmp_path, monkeypatch):
+    monkeypatch.setitem(
+        bench_suite.SCALES,
+        "tiny",
+        dict(n_suppliers=10, n_offers=300, n_in_store=50, n_orders=300, transcripts=5),
+    )
+    previous_loader = data_loader_module._data_loader
+    results = bench_suite.run_suite(["tiny"], repeat=1, data_dir=tmp_path)
+
+    cases = results["results"]["tiny"]
+    assert {"data_loader.cold", "supplier.roi", "activity.recap"} <= set(cases)
+    assert all(timing["best"] >= 0 for timing in cases.values())
+    # The global loader is restored after the run
+    assert data_loader_module._data_loader is previous_loader
+
+
+def test_compare_flags_slowdowns_beyond_threshold():
+    baseline = {
+        "results": {
+            "small": {
+                "supplier.roi": {"best": 0.100, "median": 0.110},
+                "inventory.active_orders": {"best": 0.050, "median": 0.060},
+                "activity.recap": {"best": 0.0001, "median": 0.0001},
+            }
+        }
+    }
+    current = copy.deepcopy(baseline)
+    current["results"]["small"]["supplier.roi"]["best"] = 0.130
+    current["results"]["small"]["inventory.active_orders"]["best"] = 0.055
+    # Tripled, but by less than MIN_REGRESSION_SECONDS: noise
+    current["results"]["small"]["activity.recap"]["best"] = 0.0003
+    current["results"]["medium"] = {"supplier.roi": {"best": 1.0, "median": 1.0}}
+
+    regressions = bench_suite.compare(baseline, current, threshold=0.2)
+    assert [(scale, name) for scale, name, *_ in regressions] == [("small", "supplier.roi")]
+    assert bench_suite.compare(baseline, baseline) == []
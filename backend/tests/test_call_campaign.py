@@ -0,0 +1,72 @@
+"""Tests for call campaigns: grouping, concurrency limit and aggregated results."""
+
+import threading
+import time
+
+from backend.services.call_campaign_service import CallCampaignService, group_targets
+from backend.services.conversation_manager import ConversationManager, ConversationStatus
+from backend.services.models import CallCampaignRequest, CampaignTarget
+
+
+def test_group_targets_dedupes_and_chunks():
+    targets = [
+        CampaignTarget(supplier_name="Acme", product_name="Pommes"),
+        CampaignTarget(supplier_name="acme ", product_name="pommes"),
+        CampaignTarget(supplier_name="Acme", product_name="Poires"),
+        CampaignTarget(supplier_name="Acme", product_name="Kiwis"),
+        CampaignTarget(supplier_name="Acme", product_name="Pommes", agent_name="delivery"),
+        CampaignTarget(supplier_name="Beta"),
+    ]
+    assert group_targets(targets, max_products_per_call=2) == [
+        ("Acme", "products", ["Pommes", "Poires"]),
+        ("Acme", "products", ["Kiwis"]),
+        ("Acme", "delivery", ["Pommes"]),
+        ("Beta", "products", []),
+    ]
+
+
+def test_campaign_respects_concurrency_and_aggregates_results():
+    manager = ConversationManager()
+    lock = threading.Lock()
+    active = {"now": 0, "max": 0}
+    calls = []
+
+    def runner(task_id, agent_name, api_key, supplier_name, product_name):
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+            calls.append((supplier_name, product_name))
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        if supplier_name == "S3":
+            raise RuntimeError("line busy")
+        manager.update_task_status(task_id, ConversationStatus.COMPLETED)
+        manager.set_parse_result(task_id, {"products_updated": 2})
+
+    service = CallCampaignService(
+        call_runner=runner, manager=manager, max_concurrent_calls=2
+    )
+    request = CallCampaignRequest(
+        targets=[
+            CampaignTarget(supplier_name=f"S{i % 5}", product_name=f"P{i}")
+            for i in range(10)
+        ],
+        max_concurrent_calls=5,
+    )
+    started = service.start_campaign(request)
+    assert started.total_targets == 10
+    assert started.total_calls == 5
+
+    deadline = time.monotonic() + 5
+    while service.get_campaign(started.campaign_id).status != "completed":
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    campaign = service.get_campaign(started.campaign_id)
+    assert active["max"] == 2
+    assert sorted(calls)[0] == ("S0", "P0, P5")
+    assert (campaign.completed, campaign.failed) == (4, 1)
+    assert campaign.results == {"products_updated": 8}
+    failed = [call for call in campaign.calls if call.status == "failed"]
+    assert failed[0].supplier_name == "S3" and failed[0].error == "line busy"
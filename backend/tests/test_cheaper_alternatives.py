@@ -0,0 +1,101 @@
+"""Tests for cheaper alternatives: filters, top-k and cursor pagination."""
+
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.services.data_loader import default_data_loader
+from backend.services.models import AvailableProduct, InStoreProduct
+from backend.services.supplier_analysis_service import (
+    AlternativesIndex,
+    SupplierAnalysisService,
+)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """Service over a random catalog with many ties in savings."""
+    rng = np.random.default_rng(0)
+    in_store = [
+        InStoreProduct(
+            id=f"prod_{i}", name=f"Product {i}", price=10.0, fournisseur_id="supp_0", stock=5
+        )
+        for i in range(30)
+    ]
+    available = [
+        AvailableProduct(
+            id=f"prod_{i}",
+            name=f"Product {i}",
+            fournisseur=f"supp_{s}",
+            price=float(rng.integers(5, 12)),
+            delivery_time=int(rng.integers(1, 15)),
+            last_information_update="2025-11-01 10:00:00",
+        )
+        for i in range(30)
+        for s in range(5)
+    ]
+    service = SupplierAnalysisService()
+    index = AlternativesIndex(in_store, available)
+    monkeypatch.setattr(service, "get_alternatives_index", lambda: index)
+    return service
+
+
+def key(alternative):
+    return (-alternative.savings_percent, alternative.product_id, alternative.alternative_supplier_id)
+
+
+def test_pages_cover_sorted_results_once(service):
+    """Walking the cursor returns every match once, in result order."""
+    full = service.find_cheaper_alternatives(min_savings_percent=0, max_delivery_time=10)
+    assert full.next_cursor is None
+    assert all(a.delivery_time <= 10 and a.alternative_supplier_id != "supp_0" for a in full.alternatives)
+    assert [key(a) for a in full.alternatives] == sorted(key(a) for a in full.alternatives)
+
+    pages, cursor = [], None
+    while True:
+        page = service.find_cheaper_alternatives(
+            min_savings_percent=0, max_delivery_time=10, limit=7, cursor=cursor
+        )
+        assert page.total_count == full.total_count
+        pages.extend(page.alternatives)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert [key(a) for a in pages] == [key(a) for a in full.alternatives]
+
+
+def test_product_and_supplier_filters(service):
+    """Filters select the same rows as filtering the full list."""
+    full = service.find_cheaper_alternatives(min_savings_percent=10).alternatives
+    page = service.find_cheaper_alternatives(
+        min_savings_percent=10, product_id="prod_3", supplier_id="supp_2", min_savings_amount=2
+    )
+    expected = [
+        a
+        for a in full
+        if a.product_id == "prod_3" and a.alternative_supplier_id == "supp_2" and a.savings_amount >= 2
+    ]
+    assert page.alternatives == expected
+    assert service.find_cheaper_alternatives(product_id="unknown").total_count == 0
+
+    with pytest.raises(ValueError):
+        service.find_cheaper_alternatives(cursor="not-a-cursor")
+
+
+def test_blank_delivery_times_default_to_a_week(tmp_path):
+    """Offers without a delivery time are cleaned as in the models, not read as INT64_MIN."""
+    data_dir = default_data_loader().data_dir
+    for file_name in ("in_store_product.csv", "fournisseur.csv", "orders.csv"):
+        shutil.copy(data_dir / file_name, tmp_path / file_name)
+    available = pd.read_csv(data_dir / "available_product.csv")
+    available["delivery_time"] = None
+    available.to_csv(tmp_path / "available_product.csv", index=False)
+
+    service = SupplierAnalysisService(data_dir=tmp_path)
+    assert service.find_cheaper_alternatives(min_savings_percent=0, max_delivery_time=1).total_count == 0
+    alternatives = service.find_cheaper_alternatives(min_savings_percent=0, max_delivery_time=7)
+    assert alternatives.total_count > 0
+    assert {a.delivery_time for a in alternatives.alternatives} == {7}
@@ -0,0 +1,62 @@
+"""Tests for versioned data snapshots: background rebuild, atomic swap, pinning."""
+
+import time
+
+from backend.services.data_loader import DataLoader, pin_snapshots
+
+
+def write_suppliers(data_dir, count):
+    rows = "".join(f"supp_{i},Supplier {i},+33 {i}\n" for i in range(count))
+    (data_dir / "fournisseur.csv").write_text("id,name,phone_number\n" + rows)
+
+
+def test_rebuild_runs_in_background_with_derived_values_prebuilt(tmp_path):
+    write_suppliers(tmp_path, 1)
+    loader = DataLoader(tmp_path)
+    v0 = loader.data_version
+    builds = []
+
+    def count_suppliers():
+        builds.append(loader.data_version)
+        if loader.data_version != v0:
+            time.sleep(0.3)
+        return len(loader.load_fournisseurs())
+
+    assert loader.get_derived("count", count_suppliers) == 1
+    assert len(loader.load_fournisseurs_models()) == 1
+
+    write_suppliers(tmp_path, 2)
+    start = time.perf_counter()
+    assert loader.refresh_if_changed() == v0
+    # Served from the current snapshot while the next one builds
+    assert loader.get_derived("count", count_suppliers) == 1
+    assert time.perf_counter() - start < 0.2
+
+    assert loader.wait_for_rebuild(timeout=10)
+    snapshot = loader.snapshot()
+    assert snapshot.version > v0
+    # Built before the swap: no request builds them
+    assert snapshot.derived["count"] == 2 and len(snapshot.models["fournisseur"]) == 2
+    assert builds == [v0, snapshot.version]
+    assert loader.get_derived("count", count_suppliers) == 2
+
+
+def test_pinned_context_keeps_its_snapshot(tmp_path):
+    write_suppliers(tmp_path, 1)
+    loader = DataLoader(tmp_path)
+    v0 = loader.data_version
+
+    with pin_snapshots():
+        assert len(loader.load_fournisseurs()) == 1
+        write_suppliers(tmp_path, 3)
+        loader.refresh_if_changed(wait=True)
+        # Swapped meanwhile, but this context keeps reading the first version
+        assert loader.data_version == v0
+        assert len(loader.load_fournisseurs()) == 1
+        assert len(loader.current_snapshot().table("fournisseur.csv")) == 3
+
+    v1 = loader.data_version
+    assert v1 > v0
+    assert len(loader.load_fournisseurs()) == 3
+    assert loader.refresh_if_changed() == v1  # Unchanged files: no rebuild
+    assert loader.swaps == 1
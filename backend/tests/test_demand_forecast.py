@@ -0,0 +1,106 @@
+"""Tests for the demand forecast: smoothing, completed weeks, incremental updates."""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.services.data_loader import DataLoader, use_data_loader
+from backend.services.demand_forecast_service import DemandForecastService
+
+NOW = datetime(2025, 11, 17, 0, 0, 0)  # Start of a Monday-based week
+
+
+def make_orders(rows):
+    return pd.DataFrame(
+        [
+            {"order_id": f"order_{i}", "product_name": name, "quantity": qty, "order_date": date}
+            for i, (name, qty, date) in enumerate(rows)
+        ]
+    )
+
+
+def test_forecast_smooths_weekly_quantities():
+    """Weeks without orders count as zero once a product was first ordered."""
+    service = DemandForecastService(alpha=0.5)
+    orders = make_orders(
+        [
+            ("Doliprane", 100, "2025-10-27 10:00:00"),
+            ("Doliprane", 40, "2025-11-04 10:00:00"),
+            ("Doliprane", 60, "2025-11-05 10:00:00"),
+            ("Spasfon", 10, "2025-11-12 10:00:00"),
+        ]
+    )
+    forecast = service.build(orders, NOW)
+
+    # Weeks: 100, 100, 0 -> 100, 100, 50
+    assert forecast.weekly_rate("Doliprane") == pytest.approx(50, rel=1e-4)
+    assert forecast.weekly_rate("Spasfon") == pytest.approx(10, rel=1e-4)
+    assert forecast.weekly_rate("Unknown") is None
+
+
+def test_incremental_update_matches_rebuild():
+    """Folding new orders into a forecast gives the same rates as a rebuild."""
+    service = DemandForecastService(alpha=0.3)
+    orders = make_orders(
+        [
+            ("Doliprane", 100, "2025-09-01 10:00:00"),
+            ("Doliprane", 20, "2025-10-01 10:00:00"),
+            ("Spasfon", 10, "2025-10-15 10:00:00"),
+        ]
+    )
+    later = datetime(2025, 11, 30, 12, 0, 0)
+    new_orders = make_orders(
+        [
+            ("Spasfon", 30, "2025-11-20 10:00:00"),
+            ("Smecta", 5, "2025-11-28 10:00:00"),
+        ]
+    )
+    new_orders["order_id"] = "new_" + new_orders["order_id"]
+
+    updated = service._update(service.build(orders, NOW), new_orders, later)
+    rebuilt = service.build(pd.concat([orders, new_orders], ignore_index=True), later)
+
+    assert updated.weekly_rates.keys() == rebuilt.weekly_rates.keys()
+    for name, rate in rebuilt.weekly_rates.items():
+        assert updated.weekly_rate(name) == pytest.approx(rate)
+    assert np.array_equal(updated.order_ids, rebuilt.order_ids)
+
+
+def test_forecast_does_not_depend_on_the_day_of_the_week():
+    """Steady weekly orders give the same rate every day, before and after the order."""
+    service = DemandForecastService(alpha=0.3)
+    fridays = [datetime(2025, 10, 3, 10) + timedelta(weeks=i) for i in range(7)]
+    orders = make_orders([("Doliprane", 10, friday) for friday in fridays])
+
+    rates = []
+    for day in range(7):
+        now = NOW + timedelta(weeks=-1, days=day, hours=12)  # Week of the last order
+        known = orders[pd.to_datetime(orders["order_date"]) <= now]
+        rates.append(service.build(known, now).weekly_rate("Doliprane"))
+
+    assert rates == pytest.approx([10.0] * 7)
+    # Ordered in the running week only: no completed week to forecast from yet
+    assert service.build(orders.tail(1), fridays[-1]).weekly_rate("Doliprane") is None
+
+
+def test_forecast_is_kept_per_data_directory(tmp_path):
+    """Tenants with overlapping order ids neither share nor fold each other's forecast."""
+    loaders = {}
+    for name, quantities in {"north": [10, 10], "south": [10, 10, 500]}.items():
+        (tmp_path / name).mkdir()
+        rows = [("Doliprane", qty, "2025-11-12 10:00:00") for qty in quantities]
+        make_orders(rows).to_csv(tmp_path / name / "orders.csv", index=False)
+        loaders[name] = DataLoader(tmp_path / name)
+    service = DemandForecastService(alpha=0.3)
+
+    with use_data_loader(loaders["north"]):
+        north = service.get_forecast(NOW)
+    with use_data_loader(loaders["south"]):
+        south = service.get_forecast(NOW)
+    with use_data_loader(loaders["north"]):
+        assert service.get_forecast(NOW) is north
+
+    assert north.weekly_rate("Doliprane") == pytest.approx(20)
+    assert south.weekly_rate("Doliprane") == pytest.approx(520)
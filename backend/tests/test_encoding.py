@@ -0,0 +1,36 @@
+"""Tests for the dictionary encoding of IDs and names."""
+
+import numpy as np
+
+from backend.services.data_loader import Vocabulary, get_data_loader
+
+
+def test_vocabulary_codes_sort_like_strings():
+    vocabulary = Vocabulary(["supp_2", "supp_10", "supp_2", None, "supp_1"])
+    assert vocabulary.strings.tolist() == ["supp_1", "supp_10", "supp_2"]
+
+    codes = vocabulary.encode(["supp_2", "supp_1", "unknown"])
+    assert codes.dtype == np.int32
+    assert codes.tolist() == [2, 0, -1]
+    assert vocabulary.decode(codes[:2]).tolist() == ["supp_2", "supp_1"]
+
+    assert vocabulary.position("supp_10") == 1.0
+    # Unknown strings fall between the codes around them
+    assert vocabulary.position("supp_15") == 1.5
+    assert vocabulary.position("a") == -0.5
+
+
+def test_encoded_tables_share_codes():
+    loader = get_data_loader()
+    vocabularies = loader.get_vocabularies()
+    in_store = loader.load_encoded("in_store_product.csv")
+    available = loader.load_encoded("available_product.csv")
+    raw = loader.load_in_store_products()
+
+    assert in_store["id"].dtype == available["id"].dtype == vocabularies["product_id"].dtype
+    assert in_store["id"].astype(str).tolist() == raw["id"].astype(str).tolist()
+
+    # A join on codes matches the join on strings
+    on_codes = in_store["id"].cat.codes.isin(available["id"].cat.codes)
+    on_strings = raw["id"].isin(loader.load_available_products()["id"])
+    assert on_codes.tolist() == on_strings.tolist()
@@ -0,0 +1,77 @@
+"""Regression test: slow endpoints must not block the event loop."""
+
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api.concurrency import LoopLagMonitor, loop_lag_monitor
+from backend.api.main import app
+from backend.controllers import parser_controller, product_controller
+
+SLOW = 0.3
+
+
+def max_lag_during(client, method, path, **kwargs):
+    """Max event-loop lag (seconds) observed while serving a request."""
+    loop_lag_monitor.reset()
+    response = getattr(client, method)(path, **kwargs)
+    time.sleep(4 * loop_lag_monitor.interval)
+    return response, loop_lag_monitor.max_lag
+
+
+def test_monitor_detects_blocking_call():
+    """Sanity check: a blocking call in an async route shows up as lag."""
+    monitor = LoopLagMonitor(interval=0.02)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        monitor.start()
+        yield
+        await monitor.stop()
+
+    blocking_app = FastAPI(lifespan=lifespan)
+
+    @blocking_app.get("/block")
+    async def block():
+        time.sleep(SLOW)
+        return {}
+
+    with TestClient(blocking_app) as client:
+        time.sleep(0.1)
+        client.get("/block")
+        time.sleep(0.1)
+    assert monitor.max_lag > SLOW / 2
+
+
+def test_slow_work_is_offloaded(monkeypatch):
+    """CPU-heavy and Mistral-bound endpoints leave the loop responsive."""
+
+    def slow_products():
+        time.sleep(SLOW)
+        return []
+
+    class SlowParser:
+        def parse_conversation(self, transcript, supplier_name):
+            time.sleep(SLOW)
+            return {}
+
+    monkeypatch.setattr(
+        product_controller.inventory_service, "get_in_store_products_enriched", slow_products
+    )
+    monkeypatch.setattr(parser_controller, "TranscriptParserService", SlowParser)
+    product_controller.response_cache.clear()
+
+    with TestClient(app) as client:
+        response, lag = max_lag_during(client, "get", "/api/products/in-store")
+        assert response.status_code == 200
+        assert lag < SLOW / 2
+
+        response, lag = max_lag_during(
+            client, "post", "/parser/parse-conversation", json={"transcript": "Bonjour"}
+        )
+        assert response.status_code == 200
+        assert lag < SLOW / 2
+
+    product_controller.response_cache.clear()
@@ -0,0 +1,88 @@
+"""Tests for the fake data generator: reproducibility and consistency."""
+
+import importlib.util
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from backend.services.data_loader import DataLoader
+
+_SCRIPT = Path(__file__).resolve().parents[2] / "data" / "generate_fake_data.py"
+_spec = importlib.util.spec_from_file_location("generate_fake_data", _SCRIPT)
+generate_fake_data = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(generate_fake_data)
+
+NOW = datetime(2025, 11, 12, 12, 0, 0)
+
+
+def test_same_seed_same_files(tmp_path):
+    kwargs = dict(
+        seed=7, n_suppliers=30, n_offers=3000, n_in_store=200, n_orders=2000, now=NOW
+    )
+    counts = generate_fake_data.generate(tmp_path / "a", chunk_size=500, **kwargs)
+    generate_fake_data.generate(tmp_path / "b", chunk_size=500, **kwargs)
+
+    assert counts == {
+        "fournisseur": 30,
+        "in_store_product": 200,
+        "available_product": 3000,
+        "orders": 2000,
+    }
+    for name in counts:
+        assert (tmp_path / "a" / f"{name}.csv").read_bytes() == (
+            tmp_path / "b" / f"{name}.csv"
+        ).read_bytes()
+
+
+def test_tables_are_consistent(tmp_path):
+    generate_fake_data.generate(
+        tmp_path, seed=1, n_suppliers=20, n_offers=1000, n_in_store=100, n_orders=500,
+        chunk_size=300, now=NOW,
+    )
+    loader = DataLoader(tmp_path)
+    offers = loader.load_available_products()
+    in_store = loader.load_in_store_products()
+    orders = loader.load_orders()
+
+    # Every model validates (delivery times within 1..14 days)
+    assert len(loader.load_available_products_models()) == 1000
+    assert not offers.duplicated(["id", "fournisseur"]).any()
+    assert offers.groupby("id")["name"].nunique().max() == 1
+
+    # The store buys each product from one of its offers, at the offer price
+    bought = in_store.merge(
+        offers, left_on=["id", "fournisseur_id"], right_on=["id", "fournisseur"]
+    )
+    assert len(bought) == len(in_store)
+    assert (bought["price_x"] == bought["price_y"]).all()
+
+    assert set(orders["product_name"]) <= set(in_store["name"])
+    delivered = orders.dropna(subset=["time_of_arrival"])
+    assert (pd.to_datetime(delivered["time_of_arrival"]) <= NOW).all()
+    assert (pd.to_datetime(orders["order_date"]) < NOW).all()
+
+
+def test_values_spread_within_a_supplier_profile(tmp_path):
+    """Offers and orders of one profile draw their own delivery time, quantity and delay."""
+    generate_fake_data.generate(
+        tmp_path, seed=3, n_suppliers=20, n_offers=2000, n_in_store=200, n_orders=1000,
+        now=NOW,
+    )
+    # Suppliers are the first draws of the seed
+    fournisseurs = generate_fake_data.generate_fournisseurs(np.random.default_rng(3), 20)
+    profile = dict(zip(fournisseurs["id"], fournisseurs["profile"]))
+    offers = pd.read_csv(tmp_path / "available_product.csv")
+    orders = pd.read_csv(tmp_path / "orders.csv")
+    offers["profile"] = offers["fournisseur"].map(profile)
+    orders["profile"] = orders["fournisseur_id"].map(profile)
+    delivered = orders.dropna(subset=["time_of_arrival"])
+    delay_days = (
+        pd.to_datetime(delivered["time_of_arrival"])
+        - pd.to_datetime(delivered["estimated_time_arrival"])
+    ).dt.days
+
+    assert (offers.groupby("profile")["delivery_time"].nunique() >= 3).all()
+    assert (orders.groupby("profile")["quantity"].nunique() >= 5).all()
+    assert (delay_days.groupby(delivered["profile"]).nunique() >= 3).all()
@@ -0,0 +1,121 @@
+"""Tests for server-side filtering, sorting and paging of in-store products."""
+
+import shutil
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from backend.services.data_loader import default_data_loader
+from backend.services.inventory_service import InventoryService, InventoryTable
+
+
+@pytest.fixture
+def table():
+    """Random products with many ties and missing delivery times."""
+    rng = np.random.default_rng(0)
+    records = []
+    for i in range(300):
+        in_house = i % 3 != 0
+        records.append(
+            {
+                "id": f"prod_{rng.integers(0, 10**6):06d}_{i}",
+                "sku": f"PROD{i:04d}",
+                "name": f"{['Aspirine', 'ibuprofène', 'Gants'][i % 3]} {i % 20}",
+                "category": "General",
+                "supplier": f"Supplier {i % 7}",
+                "supplier_id": f"supp_{i % 7}",
+                "type": "in-house" if in_house else "external",
+                "currentPrice": float(rng.integers(1, 10)) if in_house else 0,
+                "currentPriceSupplier": f"Supplier {i % 7}",
+                "bestPrice": float(rng.integers(1, 10)),
+                "bestPriceSupplier": "Supplier 1",
+                "bestPriceSupplierId": "supp_1",
+                "sellPrice": 15.0,
+                "currentMargin": 10.0,
+                "bestMargin": float(rng.integers(0, 5)),
+                "currentDeliveryTime": int(rng.integers(1, 5)) if in_house else None,
+                "currentDeliverySupplier": f"Supplier {i % 7}",
+                "bestDeliveryTime": 2,
+                "bestDeliverySupplier": "Supplier 2",
+                "bestDeliverySupplierId": "supp_2",
+                "marginImprovementPossible": bool(i % 2),
+                "deliveryImprovementPossible": False,
+                "dualImprovementSameSupplier": False,
+                "stock": int(rng.integers(0, 50)),
+                "weeklyUse": 5,
+                "stockoutDate": "N/A",
+                "status": ["healthy", "low", "critical"][i % 3],
+            }
+        )
+    return InventoryTable(records)
+
+
+def numeric_sort_key(field, descending):
+    """Expected order of a numeric field: missing values last, ties by ID."""
+
+    def key(product):
+        value = product[field]
+        value = float("inf") if value is None else value
+        return (-value if descending else value), product["id"]
+
+    return key
+
+
+@pytest.mark.parametrize("sort", ["bestMargin", "-bestMargin", "currentDeliveryTime", "name", None])
+def test_cursor_pages_match_full_sort(table, sort):
+    filters = {"status": ["healthy", "low"], "margin_improvement_possible": True}
+    full = table.query(sort=sort, **filters)
+    assert full["total_count"] == len(full["products"])
+    assert all(
+        p["status"] in ("healthy", "low") and p["marginImprovementPossible"]
+        for p in full["products"]
+    )
+    if sort in ("bestMargin", "-bestMargin", "currentDeliveryTime"):
+        key = numeric_sort_key(sort.lstrip("-"), sort.startswith("-"))
+        assert full["products"] == sorted(full["products"], key=key)
+    if sort == "name":
+        names = [p["name"].lower() for p in full["products"]]
+        assert names == sorted(names)
+
+    pages, cursor = [], None
+    while True:
+        page = table.query(sort=sort, limit=9, cursor=cursor, **filters)
+        assert page["total_count"] == full["total_count"]
+        pages.extend(page["products"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert pages == full["products"]
+
+
+def test_search_supplier_and_projection(table):
+    result = table.query(
+        search="IBUPRO", supplier="supplier 3", product_type=["in-house"], fields=["name", "stock"]
+    )
+    assert result["total_count"] > 0
+    assert all(set(p) == {"id", "name", "stock"} for p in result["products"])
+    assert all("ibuprofène" in p["name"] for p in result["products"])
+
+    with pytest.raises(ValueError):
+        table.query(sort="category")
+    with pytest.raises(ValueError):
+        table.query(fields=["nope"])
+    cursor = table.query(sort="name", limit=1)["next_cursor"]
+    with pytest.raises(ValueError):
+        table.query(sort="stock", cursor=cursor)
+
+
+def test_previous_day_table_is_served_while_the_new_day_prebuilds(tmp_path):
+    """On a new day, requests keep the cached table until the reload publishes."""
+    for csv_path in default_data_loader().data_dir.glob("*.csv"):
+        shutil.copy(csv_path, tmp_path / csv_path.name)
+    service = InventoryService(data_dir=tmp_path)
+    yesterday = service.get_inventory_table()
+    yesterday.day = date.today() - timedelta(days=1)
+
+    assert service.get_inventory_table() is yesterday
+    assert service.data_loader.wait_for_rebuild(timeout=30)
+    today = service.get_inventory_table()
+    assert today is not yesterday and today.day == date.today()
+    assert service.data_loader.swaps == 1
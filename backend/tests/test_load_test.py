@@ -0,0 +1,69 @@
+"""Tests for the load test harness: fakes stand in for the SDKs, stats report."""
+
+import os
+
+import mistralai
+
+from backend.benchmarks.load_test import FAKE_ENV, FakeServices, LoadStats
+from backend.services.order_delivery_parser_service import OrderDeliveryParser
+from backend.services.transcript_parser_service import TranscriptParserService
+
+
+def test_fakes_answer_the_parsers_and_are_removed(monkeypatch):
+    monkeypatch.delenv("MISTRAL_API_KEY", raising=False)
+    real_mistral = mistralai.Mistral
+    fakes = FakeServices(mistral_latency=0, elevenlabs_latency=0, twilio_latency=0)
+
+    with fakes.installed():
+        assert os.environ["MISTRAL_API_KEY"] == FAKE_ENV["MISTRAL_API_KEY"]
+        client = fakes.elevenlabs_client(api_key="unused")
+        call = client.conversational_ai.twilio.outbound_call(
+            agent_id="agent",
+            agent_phone_number_id="phone",
+            to_number="+33100000000",
+            conversation_initiation_client_data={
+                "dynamic_variables": {"product_name": "Doliprane 1000mg"}
+            },
+        )
+        twilio_call = fakes.twilio_client("sid", "token").calls(call.call_sid)
+        assert twilio_call.fetch().status == "completed"
+        conversation = client.conversational_ai.conversations.get(
+            conversation_id=call.conversation_id
+        )
+        messages = [
+            {"role": turn.role, "text": turn.message} for turn in conversation.transcript
+        ]
+
+        products = TranscriptParserService().parse_conversation(
+            {"messages": messages}, "Pharma Depot"
+        )
+        update = products["[Doliprane 1000mg, Pharma Depot]"]
+        assert update["price"] > 0 and 1 <= update["delivery_time"] <= 14
+
+        text = "\n".join(f"User: {turn.message}" for turn in conversation.transcript)
+        deliveries = OrderDeliveryParser().parse_conversation(text, "Pharma Depot")
+        assert "delay_days" in deliveries["[Doliprane 1000mg, Pharma Depot]"]
+
+    assert fakes.api_calls == {"mistral": 2, "elevenlabs": 2, "twilio": 1}
+    assert mistralai.Mistral is real_mistral
+    assert "MISTRAL_API_KEY" not in os.environ
+
+
+def test_stats_report_percentiles_and_error_rates():
+    stats = LoadStats()
+    for i in range(100):
+        stats.record("GET /a", (i + 1) / 1000, "200", True)
+    stats.record("GET /b", 0.5, "500", False)
+    stats.record("GET /b", 0.1, "200", True)
+    stats.record("call products (end to end)", 9.0, "completed", True)
+
+    report = stats.report(elapsed=2.0)
+    assert report["GET /a"]["count"] == 100
+    assert report["GET /a"]["throughput"] == 50.0
+    assert 50 <= report["GET /a"]["p50_ms"] <= 51
+    assert 99 <= report["GET /a"]["p99_ms"] <= 100
+    assert report["GET /b"]["error_rate"] == 0.5
+    assert report["GET /b"]["statuses"] == {"500": 1, "200": 1}
+    # Whole calls are reported apart, not counted as requests
+    assert report["total"]["count"] == 102
+    assert report["total"]["errors"] == 1
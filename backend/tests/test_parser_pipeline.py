@@ -6,11 +6,11 @@ from pathlib import Path
 
 import pandas as pd
 import pytest
-from dotenv import load_dotenv
 
+from backend.config import load_config
 from backend.services.transcript_parser_service import TranscriptParserService
 
-load_dotenv()
+load_config()
 
 api_key = os.getenv("MISTRAL_API_KEY")
 
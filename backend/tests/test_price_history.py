@@ -0,0 +1,97 @@
+"""Tests for the offer price history store."""
+
+import tempfile
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from backend.services.price_history_service import PriceHistoryStore, price_trend
+from backend.services.product_updater_service import ProductUpdater
+
+
+@pytest.fixture
+def products_csv():
+    """Create a temporary available_product.csv."""
+    csv_path = Path(tempfile.mkdtemp()) / "available_product.csv"
+    pd.DataFrame(
+        {
+            "id": ["prod_1", "prod_2"],
+            "name": ["Paracétamol 500mg", "Ibuprofène 400mg"],
+            "fournisseur": ["supp_1", "supp_1"],
+            "price": [10.0, 5.0],
+            "delivery_time": [5, 7],
+            "last_information_update": ["2025-01-01 10:00:00"] * 2,
+        }
+    ).to_csv(csv_path, index=False)
+    return csv_path
+
+
+def test_updates_keep_previous_values(products_csv):
+    """Saving an update records both the overwritten and the new value."""
+    updater = ProductUpdater(csv_path=str(products_csv))
+    updater.apply_updates(
+        {"[Paracétamol 500mg, Supplier A]": {"price": 12.0}},
+        fournisseur_mapping={"Supplier A": "supp_1"},
+    )
+    updater.save_csv(backup=False)
+
+    history = updater.price_history.query("prod_1", "supp_1")
+    assert history["price"].tolist() == [10.0, 12.0]
+    assert history["delivery_time"].tolist() == [5, 5]
+    assert history["timestamp"].iloc[0] == pd.Timestamp("2025-01-01 10:00:00")
+    assert updater.price_history.query("prod_2", "supp_1").empty
+
+
+def test_range_queries_downsampling_and_trend():
+    """Range queries, daily downsampling and supplier trend on rising prices."""
+    store = PriceHistoryStore(Path(tempfile.mkdtemp()) / "price_history")
+    now = pd.Timestamp("2025-03-01")
+    days = list(range(0, 60, 10))
+    store.append(
+        product_ids=["prod_1"] * len(days),
+        suppliers=["supp_1"] * len(days),
+        timestamps=[now - pd.Timedelta(days=59 - d) for d in days],
+        prices=[10.0 * 1.01**d for d in days],
+        delivery_times=[5] * len(days),
+    )
+    # Second segment, out of order and with a duplicated timestamp
+    store.append(["prod_2", "prod_2"], ["supp_2"] * 2, [now, now], [3.0, 3.0], [2, 2])
+
+    in_range = store.query("prod_1", "supp_1", start=now - pd.Timedelta(days=30), end=now)
+    assert len(in_range) == 3
+    assert len(store.query("prod_2", "supp_2")) == 1
+
+    daily = store.downsample("prod_1", "supp_1", freq="1D")
+    assert len(daily) == 51
+    assert daily["price"].notna().all()
+
+    metrics = store.supplier_metrics(window_days=90, now=now)
+    assert metrics["supp_1"]["trend_percent"] == pytest.approx(1.01**30 * 100 - 100, rel=1e-6)
+    assert metrics["supp_1"]["volatility"] == pytest.approx(0, abs=1e-6)
+    assert "supp_2" not in metrics  # a single point has no trend
+    assert price_trend(metrics["supp_1"]["trend_percent"]) == "down"
+
+
+def test_concurrent_writers_lose_no_points():
+    """Stores sharing a directory (as processes do) append and compact safely."""
+    history_dir = Path(tempfile.mkdtemp()) / "price_history"
+    start = pd.Timestamp("2025-01-01")
+
+    def writer(supplier):
+        store = PriceHistoryStore(history_dir)
+        for day in range(20):
+            store.append(["prod_1"], [supplier], [start + pd.Timedelta(days=day)], [1.0], [2])
+
+    threads = [threading.Thread(target=writer, args=(f"supp_{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    store = PriceHistoryStore(history_dir)
+    assert all(len(store.query("prod_1", f"supp_{i}")) == 20 for i in range(4))
+    # Compacted past MAX_SEGMENTS, no temporary file left behind
+    assert len(list(history_dir.glob("segment_*.npz"))) < 80
+    assert not list(history_dir.glob(".*"))
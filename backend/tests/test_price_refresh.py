@@ -0,0 +1,86 @@
+"""Tests for the price refresh scheduler: ranking, budget and masking."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.services.price_refresh_service import PriceRefreshService, RefreshIndex
+
+NOW = datetime(2026, 1, 31, 12, 0, 0)
+
+
+@pytest.fixture
+def index():
+    """Random catalog: 200 products, 6 suppliers each."""
+    rng = np.random.default_rng(0)
+    n_products, n_suppliers = 200, 6
+    available = pd.DataFrame(
+        {
+            "id": [f"prod_{p}" for p in range(n_products) for _ in range(n_suppliers)],
+            "name": [f"Product {p}" for p in range(n_products) for _ in range(n_suppliers)],
+            "fournisseur": [f"supp_{s}" for _ in range(n_products) for s in range(n_suppliers)],
+            "price": rng.uniform(5, 15, n_products * n_suppliers).round(2),
+            "delivery_time": 3,
+            "last_information_update": [
+                f"2026-01-{day:02d} 08:00:00"
+                for day in rng.integers(1, 31, n_products * n_suppliers)
+            ],
+        }
+    )
+    available.loc[7, "last_information_update"] = "not a date"
+    in_store = pd.DataFrame(
+        {
+            "id": [f"prod_{p}" for p in range(0, n_products, 2)],
+            "name": [f"Product {p}" for p in range(0, n_products, 2)],
+            "price": 10.0,
+            "fournisseur_id": "supp_0",
+            "stock": 5,
+        }
+    )
+    fournisseurs = pd.DataFrame(
+        {"id": [f"supp_{s}" for s in range(n_suppliers)], "name": [f"Supplier {s}" for s in range(n_suppliers)]}
+    )
+    rates = {f"Product {p}": float(p % 7) for p in range(n_products)}
+    return RefreshIndex(available, in_store, fournisseurs, rates)
+
+
+def test_top_matches_full_sort(index):
+    """Top-k selection returns the same offers as sorting every priority."""
+    rows, staleness, priority = index.top(25, NOW)
+    expected = index.staleness_days(NOW) * index.impact
+    order = np.lexsort((np.arange(len(index)), -expected))[:25]
+    assert rows.tolist() == order.tolist()
+    assert np.allclose(priority, expected[order])
+    # Offers without a valid date count as maximally stale
+    assert index.staleness_days(NOW)[7] == 365.0
+
+
+def test_take_calls_respects_budget_and_masks_offers(index, monkeypatch):
+    service = PriceRefreshService(daily_call_budget=3)
+    monkeypatch.setattr(service, "get_index", lambda: index)
+
+    queue = service.get_queue(limit=10, max_products_per_call=4, now=NOW)
+    assert len(queue.planned_calls) == 3
+    assert all(len(call.product_names) <= 4 for call in queue.planned_calls)
+
+    targets = service.take_calls(max_products_per_call=4, now=NOW)
+    planned = [
+        (call.supplier_name, name) for call in queue.planned_calls for name in call.product_names
+    ]
+    assert [(t.supplier_name, t.product_name) for t in targets] == planned
+    assert service.calls_remaining(NOW) == 0
+    assert service.take_calls(now=NOW) == []
+
+    after = service.get_queue(limit=10, now=NOW)
+    assert after.pending_offers == len(targets)
+    taken = {(t.supplier_name, t.product_name) for t in targets}
+    assert not taken & {(item.supplier_name, item.product_name) for item in after.items}
+
+    # A refreshed offer leaves the pending set
+    first = targets[0]
+    product_id = "prod_" + first.product_name.split()[-1]
+    supplier_id = "supp_" + first.supplier_name.split()[-1]
+    index.updated[index.row(product_id, supplier_id)] = NOW.timestamp() + 10**6
+    assert service.get_queue(limit=1, now=NOW).pending_offers == len(targets) - 1
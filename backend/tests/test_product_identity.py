@@ -0,0 +1,49 @@
+"""Tests for name normalization and canonical product keys."""
+
+import pandas as pd
+
+from backend.services.models import AvailableProduct, InStoreProduct
+from backend.services.product_identity import ProductIdentity, normalize_name
+from backend.services.supplier_analysis_service import AlternativesIndex
+
+
+def test_normalize_name():
+    assert normalize_name("  Paracétamol   500MG ") == "paracetamol 500mg"
+    assert normalize_name("CRÈME solaire\tSPF50") == normalize_name("Creme Solaire SPF50")
+
+
+def test_identity_maps_spellings_and_ids_to_one_key():
+    in_store = pd.DataFrame({"id": ["p1", "p2"], "name": ["Paracétamol 500mg", "Gants"]})
+    available = pd.DataFrame(
+        {"id": ["p1", "x9", "p3"], "name": ["paracetamol 500MG", "Gants ", "Smecta"]}
+    )
+    identity = ProductIdentity(in_store, available, ["PARACETAMOL 500mg", "Inconnu"])
+
+    key = identity.key("Paracetamol 500mg")
+    assert identity.in_store_key.tolist()[0] == key
+    assert identity.available_key.tolist() == [key, identity.key("gants"), identity.key("smecta")]
+    assert identity.order_key[0] == key
+    assert identity.key_for_id("x9") == identity.key("Gants")
+    assert identity.display_name[key] == "Paracétamol 500mg"
+    assert identity.in_store.tolist() == [True, True, False, False]
+    assert identity.key("Doliprane") is None
+    assert identity.keys(["smecta", "nope"]).tolist() == [identity.key("Smecta"), -1]
+
+
+def test_alternatives_match_spelling_variants():
+    in_store = [
+        InStoreProduct(id="p1", name="Paracétamol 500mg", price=10.0, fournisseur_id="s0", stock=1)
+    ]
+    available = [
+        AvailableProduct(
+            id="p1",
+            name="PARACETAMOL  500mg",
+            fournisseur="s1",
+            price=8.0,
+            delivery_time=3,
+            last_information_update="2025-11-01 10:00:00",
+        )
+    ]
+    index = AlternativesIndex(in_store, available)
+    assert index.names.decode(index.product_name).tolist() == ["Paracétamol 500mg"]
+    assert index.suppliers.decode(index.alternative_supplier_id).tolist() == ["s1"]
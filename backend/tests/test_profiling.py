@@ -0,0 +1,134 @@
+"""Tests for on-demand request profiling."""
+
+import asyncio
+import cProfile
+import sys
+import time
+
+import pytest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api.concurrency import run_cpu
+from backend.api.profiling import Profiler, ProfilingMiddleware, ProfilingSession
+from backend.controllers.admin_controller import router as admin_router
+
+
+def busy_work(seconds: float) -> int:
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(200))
+    return total
+
+
+def make_client(profiler: Profiler) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: str):
+        return {"total": await run_cpu(busy_work, 0.05)}
+
+    @app.get("/pair")
+    async def pair():
+        totals = await asyncio.gather(run_cpu(busy_work, 0.02), run_cpu(busy_work, 0.02))
+        return {"total": sum(totals)}
+
+    @app.get("/blobs")
+    async def blobs():
+        blobs.kept = [bytearray(1024) for _ in range(2000)]
+        return {"count": len(blobs.kept)}
+
+    return TestClient(app)
+
+
+def test_cprofile_covers_pool_threads_and_disarms_after_n_requests():
+    profiler = Profiler()
+    client = make_client(profiler)
+    session = profiler.arm(ProfilingSession("GET", "/items/{item_id}", "cprofile", 2))
+
+    client.get("/blobs")  # other route: not profiled
+    for item_id in ["a", "b", "c"]:
+        assert client.get(f"/items/{item_id}").status_code == 200
+
+    assert [result["path"] for result in session.results] == ["/items/a", "/items/b"]
+    assert profiler.session is None and profiler.last is session
+    functions = [row["function"] for row in session.results[0]["functions"]]
+    assert any("(busy_work)" in function for function in functions)
+
+
+def test_cprofile_of_concurrent_pool_calls_uses_one_profiler():
+    """Pool calls running together are profiled in turn (one active profiler on 3.12+)."""
+    profiler = Profiler()
+    client = make_client(profiler)
+    session = profiler.arm(ProfilingSession("GET", "/pair", "cprofile", 1))
+    assert client.get("/pair").status_code == 200
+
+    report = session.results[0]
+    assert "error" not in report
+    calls = {row["function"]: row["calls"] for row in report["functions"]}
+    assert [count for function, count in calls.items() if "(busy_work)" in function] == [2]
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="one profiler per process on 3.12+")
+def test_cprofile_with_another_profiler_active_still_serves_the_request():
+    profiler = Profiler()
+    client = make_client(profiler)
+    session = profiler.arm(ProfilingSession("GET", "/items/{item_id}", "cprofile", 1))
+    other = cProfile.Profile()
+    other.enable()
+    try:
+        assert client.get("/items/a").status_code == 200
+    finally:
+        other.disable()
+    assert "already active" in session.results[0]["error"]
+
+
+def test_sample_mode_returns_collapsed_stacks():
+    profiler = Profiler()
+    client = make_client(profiler)
+    session = profiler.arm(
+        ProfilingSession("GET", "/items/{item_id}", "sample", 1, sample_interval=0.001)
+    )
+    client.get("/items/a")
+
+    assert session.results[0]["sample_count"] > 0
+    collapsed = session.collapsed()
+    assert "test_profiling:busy_work" in collapsed
+    stack, count = collapsed.splitlines()[0].rsplit(" ", 1)
+    assert int(count) > 0 and ";" in stack
+
+
+def test_tracemalloc_reports_allocation_sites():
+    profiler = Profiler()
+    client = make_client(profiler)
+    session = profiler.arm(ProfilingSession("GET", "/blobs", "tracemalloc", 1))
+    client.get("/blobs")
+
+    report = session.results[0]
+    assert report["peak_kb"] >= 2000
+    assert any("test_profiling.py" in row["site"] for row in report["allocations"])
+
+
+def test_admin_endpoints_require_the_token(monkeypatch):
+    app = FastAPI()
+    app.include_router(admin_router)
+    client = TestClient(app)
+    body = {"route": "/api/suppliers/roi", "mode": "cprofile", "requests": 3}
+
+    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+    assert client.post("/api/admin/profiling", json=body).status_code == 403
+
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    assert client.post("/api/admin/profiling", json=body).status_code == 401
+    headers = {"X-Admin-Token": "secret"}
+    response = client.post("/api/admin/profiling", json=body, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["requests"] == 3
+    response = client.post(
+        "/api/admin/profiling", json={**body, "mode": "perf"}, headers=headers
+    )
+    assert response.status_code == 422
+    assert client.delete("/api/admin/profiling", headers=headers).json() == {"armed": False}
@@ -0,0 +1,93 @@
+"""Tests for the ETag response cache."""
+
+import json
+import tempfile
+from pathlib import Path
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from backend.api.response_cache import ResponseCache
+from backend.services.data_loader import DataLoader
+from backend.services.models import PurchaseOrdersResponse, SupplierOptionsResponse
+
+
+def supplier_count(loader):
+    return SupplierOptionsResponse(
+        suppliers=[], current_supplier_id=str(len(loader.load_fournisseurs()))
+    )
+
+
+def make_client(payload=supplier_count):
+    """App serving a payload computed from a temporary fournisseur.csv."""
+    data_dir = Path(tempfile.mkdtemp())
+    csv_path = data_dir / "fournisseur.csv"
+    csv_path.write_text("id,name,phone_number\nsupp_1,Supplier 1,+33 1\n")
+    loader = DataLoader(data_dir)
+    cache = ResponseCache(loader)
+    builds = []
+
+    app = FastAPI()
+
+    @app.get("/suppliers")
+    async def suppliers(request: Request):
+        def build():
+            builds.append(1)
+            return payload(loader)
+
+        return cache.respond(request, build)
+
+    return TestClient(app), csv_path, builds, loader
+
+
+def test_etag_and_invalidation_on_data_change():
+    """Cached bytes are served, 304 on a matching ETag, rebuilt when data changes."""
+    client, csv_path, builds, loader = make_client()
+
+    first = client.get("/suppliers")
+    assert first.status_code == 200
+    assert first.json()["current_supplier_id"] == "1"
+    etag = first.headers["etag"]
+
+    assert client.get("/suppliers").content == first.content
+    assert client.get("/suppliers", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/suppliers?x=1").status_code == 200
+    assert len(builds) == 2
+
+    csv_path.write_text(csv_path.read_text() + "supp_2,Supplier 2,+33 2\n")
+    # The change is seen on the next request; the new snapshot is built in the background
+    client.get("/suppliers")
+    loader.wait_for_rebuild()
+    changed = client.get("/suppliers", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["current_supplier_id"] == "2"
+    assert changed.headers["etag"] != etag
+
+
+def test_fast_mode_and_compression(monkeypatch):
+    """Fast encoding gives the same document; large bodies are served compressed."""
+    products = {
+        "orders": [
+            {
+                "order_id": f"order_{i}",
+                "product_name": "Doliprane",
+                "quantity": i + 1,
+                "supplier_name": "Supplier 1",
+                "estimated_delivery": "2025-11-20",
+                "actual_delivery": None,
+                "status": "on_track",
+                "order_date": "2025-11-10",
+            }
+            for i in range(50)
+        ],
+        "total_count": 50,
+    }
+    validated = ResponseCache.serialize(products, PurchaseOrdersResponse)
+    monkeypatch.setenv("API_FAST_RESPONSES", "1")
+    fast = ResponseCache.serialize(products, PurchaseOrdersResponse)
+    assert json.loads(fast) == json.loads(validated)
+
+    client, _, _, _ = make_client(lambda loader: products)
+    response = client.get("/suppliers", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json() == products
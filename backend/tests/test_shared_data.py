@@ -0,0 +1,87 @@
+"""Tests for data tables shared between worker processes."""
+
+import subprocess
+import sys
+import uuid
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.services.data_loader import DataLoader, read_tables
+from backend.services.shared_data import SharedDataPublisher, SharedDataReader
+from backend.tests.test_startup import PROJECT_ROOT
+
+
+def write_suppliers(data_dir, count):
+    rows = "".join(f"supp_{i},Supplier {i},+33 {i}\n" for i in range(count))
+    (data_dir / "fournisseur.csv").write_text("id,name,phone_number\n" + rows)
+
+
+@pytest.fixture
+def publisher(tmp_path):
+    write_suppliers(tmp_path, 2)
+    pd.DataFrame(
+        {
+            "id": ["p1", "p2", "p3"],
+            "name": ["Aspirin", None, "Aspirin"],
+            "price": [1.5, np.nan, 3.0],
+            "delivery_time": [2, 3, 4],
+            "fournisseur": ["supp_0", "supp_1", "supp_0"],
+            "in_stock": [True, False, True],
+        }
+    ).to_csv(tmp_path / "available_product.csv", index=False)
+    publisher = SharedDataPublisher(f"test-{uuid.uuid4().hex[:8]}", tmp_path)
+    yield publisher
+    publisher.close()
+
+
+def test_tables_round_trip_through_shared_memory(publisher):
+    publisher.refresh()
+    _, tables = SharedDataReader(publisher.name).read(publisher.data_dir)
+
+    for file_name, expected in read_tables(publisher.data_dir).items():
+        if expected is None:
+            assert tables[file_name] is None
+            continue
+        frame = tables[file_name].to_frame()
+        pd.testing.assert_frame_equal(frame, expected)
+        # Copies: changing one leaves the shared table intact
+        frame.iloc[0, 0] = "changed"
+        pd.testing.assert_frame_equal(tables[file_name].to_frame(), expected)
+
+
+def test_loader_swaps_on_published_versions(publisher):
+    reader = SharedDataReader(publisher.name)
+    loader = DataLoader(publisher.data_dir, shared=reader)
+    # Nothing published yet: read from the files
+    assert len(loader.load_fournisseurs()) == 2
+    publisher.refresh()
+    assert loader.refresh_if_changed(wait=True) > 0
+    assert loader.snapshot().signature == ("shared", reader.head()[1])
+    assert len(loader.load_fournisseurs_models()) == 2
+
+    write_suppliers(publisher.data_dir, 5)
+    # Mapped once the publisher has the write, with the models prebuilt
+    loader.reload_all()
+    publisher.refresh()
+    assert loader.wait_for_rebuild(timeout=10)
+    assert len(loader.snapshot().models["fournisseur"]) == 5
+    assert loader.refresh_if_changed() == loader.data_version  # No new version: no rebuild
+
+
+def test_segments_outlive_the_workers_mapping_them(publisher):
+    publisher.refresh()
+    code = (
+        "from backend.services.shared_data import SharedDataReader;"
+        f"_, tables = SharedDataReader({publisher.name!r}).read(None);"
+        "print(len(tables['fournisseur.csv'].to_frame()))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+    assert result.stdout.strip() == "2", result.stderr
+    assert result.stderr == ""
+    # Still published after the worker exited
+    _, tables = SharedDataReader(publisher.name).read(publisher.data_dir)
+    assert len(tables["fournisseur.csv"]) == 2
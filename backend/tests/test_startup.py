@@ -0,0 +1,39 @@
+"""Import-time budget of the API app: worker boot and test collection stay fast."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+# Cumulative import time of backend.api.main (about 1 s on a laptop, 2 s with the SDKs)
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "1.5"))
+# Imported on first use only
+LAZY_MODULES = ("mistralai", "elevenlabs", "twilio")
+
+
+def import_times(module: str) -> tuple:
+    """Run `python -X importtime -c "import module"`: (stdout, {module: cumulative s})."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative) / 1e6
+    return result.stdout, times
+
+
+def test_app_import_is_quiet_fast_and_skips_the_sdks():
+    stdout, times = import_times("backend.api.main")
+
+    assert stdout == ""
+    loaded = {name.split(".")[0] for name in times}
+    assert loaded.isdisjoint(LAZY_MODULES)
+    assert times["backend.api.main"] < STARTUP_BUDGET_SECONDS
@@ -0,0 +1,135 @@
+"""Tests for tenant data directories: per-request selection, lazy loading, LRU eviction."""
+
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+
+from backend.api.response_cache import ResponseCache
+from backend.api.snapshots import SnapshotMiddleware
+from backend.api.tenants import TenantMiddleware, require_default_tenant
+from backend.services import tenants
+from backend.services.data_loader import default_data_loader, get_data_loader, use_data_loader
+from backend.services.models import SupplierOptionsResponse
+from backend.services.supplier_analysis_service import SupplierAnalysisService
+from backend.services.tenants import TenantRegistry
+
+
+def write_suppliers(data_dir, count):
+    data_dir.mkdir(parents=True, exist_ok=True)
+    rows = "".join(f"supp_{i},Supplier {i},+33 {i}\n" for i in range(count))
+    (data_dir / "fournisseur.csv").write_text("id,name,phone_number\n" + rows)
+
+
+def make_client(registry: TenantRegistry) -> TestClient:
+    """App counting the suppliers of the request's tenant, as the services do."""
+    loader = get_data_loader()
+    cache = ResponseCache()
+    app = FastAPI()
+
+    @app.get("/suppliers")
+    async def suppliers(request: Request):
+        return cache.respond(
+            request,
+            lambda: SupplierOptionsResponse(
+                suppliers=[], current_supplier_id=str(len(loader.load_fournisseurs()))
+            ),
+        )
+
+    app.add_middleware(SnapshotMiddleware)
+    app.add_middleware(TenantMiddleware, registry=registry)
+    return TestClient(app)
+
+
+def test_requests_are_served_from_their_tenant(tmp_path):
+    write_suppliers(tmp_path / "north", 2)
+    write_suppliers(tmp_path / "south", 5)
+    registry = TenantRegistry(tmp_path, max_bytes=1 << 30)
+    client = make_client(registry)
+
+    def count(response):
+        assert response.status_code == 200
+        return int(response.json()["current_supplier_id"])
+
+    assert registry.status()["tenants"] == []  # Loaded on first request only
+    assert count(client.get("/suppliers", headers={"X-Tenant-ID": "north"})) == 2
+    assert count(client.get("/tenants/south/suppliers")) == 5
+    # Cached per tenant
+    assert count(client.get("/suppliers", headers={"X-Tenant-ID": "north"})) == 2
+    default = len(default_data_loader().load_fournisseurs())
+    assert count(client.get("/suppliers")) == default
+
+    assert client.get("/tenants/west/suppliers").status_code == 404
+    assert client.get("/suppliers", headers={"X-Tenant-ID": "../north"}).status_code == 404
+    status = registry.status()
+    assert [tenant["tenant_id"] for tenant in status["tenants"]] == ["south", "north"]
+    assert all(tenant["bytes"] > 0 for tenant in status["tenants"])
+    assert status["loads"] == 2
+
+
+def test_least_recently_used_tenants_are_evicted_over_budget(tmp_path):
+    for tenant_id in ("a", "b", "c"):
+        write_suppliers(tmp_path / tenant_id, 200)
+    probe = TenantRegistry(tmp_path)
+    probe.get("a").load_fournisseurs()
+    size = probe.memory_usage()
+    registry = TenantRegistry(tmp_path, max_bytes=int(size * 2.5))
+
+    for tenant_id in ("a", "b", "a", "c"):
+        registry.get(tenant_id).load_fournisseurs()
+    registry.get("c")  # Budget checked on access
+
+    assert [tenant["tenant_id"] for tenant in registry.status()["tenants"]] == ["a", "c"]
+    assert registry.evictions == 1
+    # Loaded again on its next request
+    assert len(registry.get("b").load_fournisseurs()) == 200
+    assert registry.loads == 4
+
+
+def test_get_data_loader_is_per_directory(tmp_path):
+    write_suppliers(tmp_path / "x", 1)
+    loader = get_data_loader(tmp_path / "x")
+    assert get_data_loader(tmp_path / "x") is loader
+    assert loader is not default_data_loader()
+    assert len(loader.load_fournisseurs()) == 1
+    assert get_data_loader(default_data_loader().data_dir) is default_data_loader()
+
+
+def test_directory_loaders_share_the_tenant_budget(tmp_path, monkeypatch):
+    write_suppliers(tmp_path / "tenants" / "x", 200)
+    write_suppliers(tmp_path / "plain", 200)
+    registry = TenantRegistry(tmp_path / "tenants", max_bytes=1)
+    monkeypatch.setattr(tenants, "_tenant_registry", registry)
+
+    # A tenant's directory gives the tenant's loader
+    assert get_data_loader(tmp_path / "tenants" / "x") is registry.get("x")
+    registry.get("x").load_fournisseurs()
+    plain = get_data_loader(tmp_path / "plain")
+    plain.load_fournisseurs()
+    assert get_data_loader(tmp_path / "tenants" / ".." / "plain") is plain
+
+    # Over budget: the least recently used loader was dropped
+    status = registry.status()
+    assert [(t["tenant_id"], t["data_dir"]) for t in status["tenants"]] == [
+        (None, str((tmp_path / "plain").resolve()))
+    ]
+    assert registry.evictions == 1
+
+
+def test_price_history_and_default_only_endpoints_follow_the_tenant(tmp_path):
+    write_suppliers(tmp_path / "north", 1)
+    registry = TenantRegistry(tmp_path)
+    service = SupplierAnalysisService()
+    with use_data_loader(registry.get("north")):
+        assert service.price_history.history_dir == (tmp_path / "north" / "price_history").resolve()
+    assert service.price_history.history_dir.parent == default_data_loader().data_dir.resolve()
+
+    app = FastAPI()
+
+    @app.post("/calls", dependencies=[Depends(require_default_tenant)])
+    async def calls():
+        return {"started": True}
+
+    app.add_middleware(TenantMiddleware, registry=registry)
+    client = TestClient(app)
+    assert client.post("/calls").status_code == 200
+    assert client.post("/tenants/north/calls").status_code == 400
+    assert client.post("/calls", headers={"X-Tenant-ID": "north"}).status_code == 400
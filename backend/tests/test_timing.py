@@ -0,0 +1,93 @@
+"""Tests for request stage timing: spans, Server-Timing header, metrics."""
+
+import time
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api.concurrency import run_cpu
+from backend.api.metrics import (
+    SLICE_SECONDS,
+    WINDOW_SLICES,
+    ServerTimingMiddleware,
+    StageHistogram,
+    StageMetrics,
+)
+from backend.services.timing import collect_timings, span, timed
+
+
+def test_spans_are_summed_and_noops_outside_a_request():
+    @timed("work")
+    def work():
+        time.sleep(0.01)
+
+    work()  # no collector: nothing recorded, no error
+    with collect_timings() as timings:
+        work()
+        work()
+        with span("outer"):
+            with span("inner"):
+                pass
+    assert timings.stages["work"] >= 0.02
+    assert set(timings.stages) == {"work", "outer", "inner"}
+
+
+def test_stages_from_worker_threads_reach_the_header_and_metrics():
+    metrics = StageMetrics()
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware, metrics=metrics)
+
+    def compute():
+        with span("data.csv_load"):
+            time.sleep(0.02)
+        return {"ok": True}
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: str):
+        return await run_cpu(compute)
+
+    client = TestClient(app)
+    for item_id in ["a", "b"]:
+        response = client.get(f"/items/{item_id}")
+    assert response.status_code == 200
+
+    entries = dict(
+        entry.strip().split(";dur=")
+        for entry in response.headers["server-timing"].split(",")
+    )
+    assert set(entries) == {"data.csv_load", "total"}
+    assert float(entries["total"]) >= float(entries["data.csv_load"]) >= 20
+
+    # Recorded under the route template, not the raw path
+    histogram = metrics.get("GET", "/items/{item_id}", "data.csv_load")
+    assert histogram.count == 2
+    text = metrics.render()
+    assert (
+        'http_request_stage_seconds_count{method="GET",route="/items/{item_id}",'
+        'stage="total"} 2'
+    ) in text
+    assert 'quantile="0.95"' in text
+
+    client.get("/missing")
+    assert metrics.get("GET", "unmatched", "total").count == 1
+
+
+def test_recent_window_forgets_old_observations():
+    histogram = StageHistogram()
+    for _ in range(90):
+        histogram.observe(0.004, now=0.0)
+    for _ in range(10):
+        histogram.observe(0.4, now=0.0)
+
+    counts, _ = histogram.recent(now=1.0)
+    assert 0.0025 < StageHistogram.quantile(counts, 0.5) <= 0.005
+    assert 0.25 < StageHistogram.quantile(counts, 0.95) <= 0.5
+
+    later = SLICE_SECONDS * WINDOW_SLICES + 1
+    histogram.observe(1.5, now=later)
+    counts, total = histogram.recent(now=later)
+    assert counts.sum() == 1 and total == 1.5
+    # The cumulative histogram keeps everything
+    assert histogram.count == 101
+    assert np.isnan(StageHistogram.quantile(np.zeros(3, dtype=np.int64), 0.5))
@@ -0,0 +1,78 @@
+"""Tests for the startup warmup and the readiness report."""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from backend.api.metrics import ServerTimingMiddleware, StageMetrics
+from backend.api.warmup import Warmup
+from backend.services.data_loader import DataLoader
+
+
+def make_app(warmup: Warmup, metrics: StageMetrics, calls: list) -> FastAPI:
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        warmup.start(app)
+        yield
+        await warmup.stop()
+
+    app = FastAPI(lifespan=lifespan)
+    app.add_middleware(ServerTimingMiddleware, metrics=metrics)
+
+    @app.get("/dashboard")
+    async def dashboard():
+        await asyncio.sleep(0.05)
+        calls.append(1)
+        return {"ok": True}
+
+    @app.get("/ready")
+    async def ready():
+        return JSONResponse(warmup.status(), status_code=200 if warmup.ready else 503)
+
+    return app
+
+
+def test_ready_after_data_and_requests_are_warm(monkeypatch):
+    monkeypatch.delenv("API_WARMUP", raising=False)
+    loader = DataLoader()
+    warmup = Warmup(loader, requests=[("/dashboard", ""), ("/missing", "")])
+    metrics = StageMetrics()
+    calls = []
+
+    with TestClient(make_app(warmup, metrics, calls)) as client:
+        assert client.get("/ready").status_code == 503
+        deadline = time.monotonic() + 30
+        while client.get("/ready").status_code != 200:
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+        report = client.get("/ready").json()
+
+    steps = {step["name"]: step for step in report["steps"]}
+    assert report["state"] == "warm"
+    assert steps["tables"]["ok"] and steps["alternatives_index"]["ok"]
+    assert "vocabularies" in loader.snapshot().derived
+    # A failing step is reported without holding readiness back
+    assert steps["GET /dashboard"]["ok"] and steps["GET /dashboard"]["duration_ms"] >= 50
+    assert steps["GET /missing"] == {
+        "name": "GET /missing",
+        "ok": False,
+        "error": "RuntimeError: status 404",
+        "duration_ms": steps["GET /missing"]["duration_ms"],
+    }
+    assert calls == [1]
+    # Warmup requests stay out of the request metrics
+    assert metrics.get("GET", "/dashboard", "total") is None
+
+
+def test_disabled_warmup_is_ready_immediately(monkeypatch):
+    monkeypatch.setenv("API_WARMUP", "0")
+    warmup = Warmup(DataLoader(), requests=[])
+
+    with TestClient(make_app(warmup, StageMetrics(), [])) as client:
+        response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["state"] == "disabled"
@@ -0,0 +1,116 @@
+"""Tests for the write coordinator: no lost updates under concurrent writers."""
+
+import tempfile
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from backend.services.product_updater_service import ProductUpdater
+from backend.services.write_coordinator import (
+    FileLock,
+    TableWriteCoordinator,
+    get_write_coordinator,
+)
+
+
+@pytest.fixture
+def counters_csv():
+    """Create a temporary CSV with one counter per row."""
+    csv_path = Path(tempfile.mkdtemp()) / "counters.csv"
+    pd.DataFrame({"id": ["a", "b", "c"], "counter": [0, 0, 0]}).to_csv(
+        csv_path, index=False
+    )
+    return csv_path
+
+
+def test_concurrent_mutations_are_all_applied(counters_csv):
+    """Mutations from many threads are serialized, batched and none is lost."""
+    coordinator = TableWriteCoordinator(counters_csv, backup=False)
+
+    def increment(df):
+        df["counter"] += 1
+
+    def writer():
+        futures = [coordinator.submit(increment) for _ in range(20)]
+        for future in futures:
+            future.result(timeout=30)
+
+    threads = [threading.Thread(target=writer) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    df = pd.read_csv(counters_csv)
+    assert df["counter"].tolist() == [100, 100, 100]
+    assert coordinator.mutations == 100
+    assert coordinator.writes <= coordinator.mutations
+
+
+def test_failing_mutation_leaves_no_partial_changes(counters_csv):
+    """A mutation raising an error is rolled back; the others still apply."""
+    coordinator = TableWriteCoordinator(counters_csv, backup=False)
+
+    def broken(df):
+        df.loc[0, "counter"] = 999
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        coordinator.mutate(broken, timeout=30)
+    assert coordinator.mutate(lambda df: df["counter"].sum(), timeout=30) == 0
+
+    def set_b(df):
+        df.loc[1, "counter"] = 7
+
+    coordinator.mutate(set_b, timeout=30)
+    assert pd.read_csv(counters_csv)["counter"].tolist() == [0, 7, 0]
+
+
+def test_save_from_a_stale_copy_keeps_other_writes():
+    """Saving an updater's copy applies its changes only, not its stale rows."""
+    csv_path = Path(tempfile.mkdtemp()) / "available_product.csv"
+    pd.DataFrame(
+        {
+            "id": ["prod_1", "prod_2"],
+            "name": ["Paracétamol 500mg", "Ibuprofène 400mg"],
+            "fournisseur": ["supp_1", "supp_1"],
+            "price": [10.0, 5.0],
+            "delivery_time": [5, 7],
+            "last_information_update": ["2025-01-01 10:00:00"] * 2,
+        }
+    ).to_csv(csv_path, index=False)
+    updater = ProductUpdater(csv_path=str(csv_path))
+    updater.load_csv()
+
+    def other_writer(df):
+        df.loc[df["id"] == "prod_2", "price"] = 6.0
+        df.loc[len(df)] = ["prod_3", "Doliprane", "supp_2", 2.0, 1, "2025-01-02 10:00:00"]
+
+    get_write_coordinator(csv_path).mutate(other_writer)
+    updater.apply_updates({"[Paracétamol 500mg, Supplier]": {"price": 9.5}})
+    updater.save_csv(backup=False)
+
+    saved = pd.read_csv(csv_path)
+    assert saved["id"].tolist() == ["prod_1", "prod_2", "prod_3"]
+    assert saved["price"].tolist() == [9.5, 6.0, 2.0]
+    assert updater.df.equals(saved)
+
+
+def test_file_lock_is_free_after_a_failed_acquire(tmp_path):
+    """A lock file that cannot be opened does not keep the lock held."""
+    lock = FileLock(tmp_path / "missing" / "counters.csv")
+    with pytest.raises(FileNotFoundError):
+        lock.acquire()
+
+    (tmp_path / "missing").mkdir()
+    acquired = threading.Event()
+
+    def writer():
+        with lock:
+            acquired.set()
+
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+    assert acquired.wait(timeout=5)
@@ -5,692 +5,794 @@ Generates:
 - In store products
 - Available products (can have multiple suppliers per product)
 - Orders (Customer orders to suppliers)
+
+Generation is vectorized on a seeded NumPy Generator: the same seed, scale,
+chunk size and reference time give the same files. The defaults produce the
+small demo dataset; scale parameters go up to 10M offers, 100k suppliers and
+50M orders. Offers and orders are generated and written chunk by chunk, so
+memory stays bounded. Every supplier gets a profile (excellent, good, fair,
+warning) that drives its prices, lead times, delivery delays and order
+volume.
+
+Usage:
+    python generate_fake_data.py [--seed 42] [--suppliers 50] [--products N]
+        [--offers N] [--in-store 200] [--orders 200] [--chunk-size 1000000]
+        [--format csv|parquet] [--out DIR] [--now "YYYY-MM-DD HH:MM:SS"]
+
+The backend reads the CSV files; Parquet output (requires pyarrow) is meant
+for load tests and benchmarks.
 """
 
-import random
-import uuid
-from datetime import datetime, timedelta
+import argparse
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
 
+import numpy as np
 import pandas as pd
 
-# Set random seed for reproducibility
-random.seed(42)
+MAX_OFFERS = 10_000_000
+MAX_SUPPLIERS = 100_000
+MAX_ORDERS = 50_000_000
+
+# Recent orders every supplier of the store gets, so all have a monthly spend
+MIN_ORDERS_PER_SUPPLIER = 2
+
+_DAY = 24 * 3600
+
+COMPANY_NAMES = [
+    "PharmaDistrib",
+    "MedSupply Co.",
+    "Health Products Inc.",
+    "Pharmaceutical Express",
+    "MediCare Distributors",
+    "Pharma Solutions",
+    "Medical Supply Pro",
+    "Health Warehouse",
+    "Pharma Direct",
+    "MediSupply Network",
+    "Pharmaceutical Hub",
+    "Health Distributors",
+    "MedSupply Express",
+    "Pharma Central",
+    "Medical Products Ltd",
+    "Health Supply Chain",
+    "Pharma Depot",
+    "MediCare Solutions",
+    "Pharmaceutical Network",
+    "Health Express Pro",
+    "MedSupply Direct",
+    "Pharma Warehouse",
+    "Medical Distributors",
+    "Health Products Pro",
+    "Pharma Solutions Plus",
+    "MediCare Express",
+    "Pharmaceutical Depot",
+    "Health Supply Network",
+    "MedSupply Central",
+    "Pharma Network Pro",
+    "Medical Express",
+    "Health Distributors Plus",
+    "Pharma Direct Pro",
+    "MediCare Warehouse",
+    "Pharmaceutical Solutions",
+    "Health Supply Express",
+    "MedSupply Network Pro",
+    "Pharma Central Plus",
+    "Medical Products Express",
+    "Health Distributors Pro",
+    "Pharma Depot Plus",
+    "MediCare Direct",
+    "Pharmaceutical Network Pro",
+    "Health Express Network",
+    "MedSupply Solutions",
+    "Pharma Warehouse Pro",
+    "Medical Distributors Plus",
+    "Health Products Express",
+    "Pharma Solutions Network",
+    "MediCare Supply Pro",
+    "Pharmaceutical Direct",
+]
+
+PRODUCT_NAMES = [
+    "Paracétamol 500mg",
+    "Ibuprofène 400mg",
+    "Aspirine 500mg",
+    "Doliprane 1000mg",
+    "Spasfon 80mg",
+    "Smecta Sachets",
+    "Strepsils Pastilles",
+    "Vicks Vaporub 50g",
+    "Biafine Crème",
+    "Bétadine Solution",
+    "Pansements Adhésifs",
+    "Compresses Stériles",
+    "Seringues 5ml",
+    "Thermomètre Digital",
+    "Tensiomètre Électronique",
+    "Gants Nitrile Boîte",
+    "Masque Chirurgical",
+    "Alcool à 70°",
+    "Sérum Physiologique",
+    "Vitamine D3 1000UI",
+    "Vitamine C 1000mg",
+    "Magnésium 300mg",
+    "Fer 14mg",
+    "Oméga 3 Capsules",
+    "Probiotiques Gélules",
+    "Mélatonine 1mg",
+    "Ginkgo Biloba",
+    "Ginseng Extrait",
+    "Echinacée Gélules",
+    "Millepertuis",
+    "Valériane Comprimés",
+    "Passiflore Gélules",
+    "Aubépine Tisane",
+    "Camomille Sachets",
+    "Tilleul Infusion",
+    "Sirop Toux Sèche",
+    "Sirop Toux Grasse",
+    "Pastilles Miel Citron",
+    "Spray Nasal Salin",
+    "Collyre Larmes Artificielles",
+    "Bain de Bouche",
+    "Dentifrice Fluoré",
+    "Brosse à Dents",
+    "Fil Dentaire",
+    "Bain de Bouche Antiseptique",
+    "Crème Solaire SPF50",
+    "Crème Hydratante Visage",
+    "Shampoing Antipelliculaire",
+    "Savon Dermatologique",
+    "Crème Réparatrice Mains",
+]
+
+# Products typically offered by suppliers but not stocked
+ADDITIONAL_PRODUCT_NAMES = [
+    "Amoxicilline 500mg",
+    "Ciprofloxacine 500mg",
+    "Azithromycine 250mg",
+    "Doxycycline 100mg",
+    "Métronidazole 500mg",
+    "Insuline Glulisine",
+    "Métformine 500mg",
+    "Atorvastatine 20mg",
+    "Amlodipine 5mg",
+    "Lisinopril 10mg",
+    "Oméprazole 20mg",
+    "Lansoprazole 30mg",
+    "Montélukast 10mg",
+    "Salbutamol Spray",
+    "Fluticasone Nasal",
+]
+
+REGIONS = ["North", "South", "East", "West", "International", "Global"]
+
+# Supplier profiles: share of suppliers, offer price relative to the
+# product's base price (factor and log-normal spread), lead time range in
+# days, delivery reliability and delays, order volume and recency.
+PROFILES = pd.DataFrame(
+    {
+        "share": [0.25, 0.35, 0.30, 0.10],
+        "price_factor": [0.95, 1.00, 1.05, 1.12],
+        "price_spread": [0.08, 0.12, 0.18, 0.30],
+        "lead_time_min": [1, 2, 3, 5],
+        "lead_time_max": [5, 8, 11, 14],
+        "on_time_rate": [0.95, 0.85, 0.70, 0.50],
+        "delay_min": [-3, -2, -1, 0],
+        "delay_max": [1, 2, 4, 8],
+        "order_frequency": [0.25, 0.30, 0.30, 0.15],
+        "quantity_min": [100, 50, 30, 10],
+        "quantity_max": [500, 400, 300, 200],
+        "recent_order_rate": [0.6, 0.5, 0.3, 0.1],
+    },
+    index=["excellent", "good", "fair", "warning"],
+)
+
+
+def _uniform_int(rng: np.random.Generator, low, high, size: int) -> np.ndarray:
+    """
+    Integers uniform in [low, high] (inclusive, array bounds allowed).
 
+    `size` is required: bounds given per row with a single draw would give
+    every row of a profile the same value.
+    """
+    low = np.asarray(low)
+    span = np.asarray(high) - low + 1
+    return low + np.floor(rng.random(size) * span).astype(np.int64)
 
-# Generate Fournisseur (Suppliers)
-def generate_fournisseurs(n=50):
-    """Generate fake supplier data"""
-    suppliers = []
-    company_names = [
-        "PharmaDistrib",
-        "MedSupply Co.",
-        "Health Products Inc.",
-        "Pharmaceutical Express",
-        "MediCare Distributors",
-        "Pharma Solutions",
-        "Medical Supply Pro",
-        "Health Warehouse",
-        "Pharma Direct",
-        "MediSupply Network",
-        "Pharmaceutical Hub",
-        "Health Distributors",
-        "MedSupply Express",
-        "Pharma Central",
-        "Medical Products Ltd",
-        "Health Supply Chain",
-        "Pharma Depot",
-        "MediCare Solutions",
-        "Pharmaceutical Network",
-        "Health Express Pro",
-        "MedSupply Direct",
-        "Pharma Warehouse",
-        "Medical Distributors",
-        "Health Products Pro",
-        "Pharma Solutions Plus",
-        "MediCare Express",
-        "Pharmaceutical Depot",
-        "Health Supply Network",
-        "MedSupply Central",
-        "Pharma Network Pro",
-        "Medical Express",
-        "Health Distributors Plus",
-        "Pharma Direct Pro",
-        "MediCare Warehouse",
-        "Pharmaceutical Solutions",
-        "Health Supply Express",
-        "MedSupply Network Pro",
-        "Pharma Central Plus",
-        "Medical Products Express",
-        "Health Distributors Pro",
-        "Pharma Depot Plus",
-        "MediCare Direct",
-        "Pharmaceutical Network Pro",
-        "Health Express Network",
-        "MedSupply Solutions",
-        "Pharma Warehouse Pro",
-        "Medical Distributors Plus",
-        "Health Products Express",
-        "Pharma Solutions Network",
-        "MediCare Supply Pro",
-        "Pharmaceutical Direct",
-    ]
-
-    for _ in range(1, n + 1):
-        # Generate UUID with supp_ prefix
-        supplier_id = f"supp_{uuid.uuid4()}"
-        name = (
-            random.choice(company_names)
-            + f" {random.choice(['North', 'South', 'East', 'West', 'International', 'Global'])}"
-        )
-        # Generate French phone numbers
-        phone = f"+33 {random.randint(1, 9)}{random.randint(10, 99)} {random.randint(10, 99)} {random.randint(10, 99)} {random.randint(10, 99)}"
-        suppliers.append({"id": supplier_id, "name": name, "phone_number": phone})
 
-    return pd.DataFrame(suppliers)
+def _put_digits(chars: np.ndarray, col: int, values: np.ndarray, width: int):
+    """Write zero-padded decimal values into columns [col, col + width) of chars."""
+    for k in range(width):
+        chars[:, col + width - 1 - k] = 48 + (values // 10**k) % 10
 
 
-# Generate In Store Products from Available Products
-def generate_in_store_products(available_products_df, n=200):
-    """Generate in-store products as a subset of available products.
-    Each product name appears only once with one supplier, and price matches available_products.
-    """
-    products = []
+def _to_strings(chars: np.ndarray) -> np.ndarray:
+    """Rows of an ASCII character matrix as an object array of str."""
+    width = chars.shape[1]
+    rows = np.ascontiguousarray(chars).view(f"S{width}").ravel()
+    return rows.astype(str).astype(object)
 
-    # Get unique product names from available products
-    unique_product_names = available_products_df["name"].unique().tolist()
 
-    # Randomly select which products will be in-store (up to n products)
-    products_to_include = random.sample(
-        unique_product_names, min(n, len(unique_product_names))
-    )
-
-    for product_name in products_to_include:
-        # Get all available entries for this product (with different suppliers)
-        product_entries = available_products_df[
-            available_products_df["name"] == product_name
-        ]
-
-        # Randomly select one supplier for this product
-        selected_entry = product_entries.sample(1).iloc[0]
-
-        # Stock between 0 and 500
-        stock = random.randint(0, 500)
-
-        products.append(
-            {
-                "id": selected_entry["id"],
-                "name": selected_entry["name"],
-                "price": selected_entry["price"],  # Use price from available_products
-                "fournisseur_id": selected_entry[
-                    "fournisseur"
-                ],  # Use supplier from available_products
-                "stock": stock,
-            }
-        )
-
-    return pd.DataFrame(products)
+def format_times(
+    seconds: np.ndarray, missing: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Format epoch seconds as "YYYY-MM-DD HH:MM:SS" strings.
 
+    Args:
+        seconds: Seconds since the epoch (int64)
+        missing: Mask of values to output as None
 
-# Generate Available Products (can have multiple suppliers per product)
-def generate_available_products(
-    product_names_list, fournisseur_df, product_id_map=None
-):
-    """Generate fake available product data with multiple suppliers per product"""
-    available_products = []
-
-    # Use provided product_id_map or create a new one
-    if product_id_map is None:
-        product_id_map = {}
-
-    # Generate entries where each product can have multiple suppliers
-    for product_name in product_names_list:
-        # Generate a unique ID for this product name (if not already created)
-        if product_name not in product_id_map:
-            product_id_map[product_name] = f"prod_{uuid.uuid4()}"
-
-        # Use the same ID for all entries with this product name
-        product_id = product_id_map[product_name]
-
-        # Each product can be available from 1 to 4 suppliers
-        num_suppliers = random.randint(1, 4)
-        selected_suppliers = random.sample(
-            fournisseur_df["id"].tolist(), min(num_suppliers, len(fournisseur_df))
-        )
+    Returns:
+        Object array of strings (None where missing)
+    """
+    moments = np.asarray(seconds, dtype=np.int64).astype("datetime64[s]")
+    days = moments.astype("datetime64[D]")
+    months = days.astype("datetime64[M]")
+    years = days.astype("datetime64[Y]")
+    second_of_day = (moments - days).astype(np.int64)
+
+    chars = np.full((len(moments), 19), ord(" "), dtype=np.uint8)
+    _put_digits(chars, 0, years.astype(np.int64) + 1970, 4)
+    _put_digits(chars, 5, (months - years).astype(np.int64) + 1, 2)
+    _put_digits(chars, 8, (days - months).astype(np.int64) + 1, 2)
+    _put_digits(chars, 11, second_of_day // 3600, 2)
+    _put_digits(chars, 14, second_of_day // 60 % 60, 2)
+    _put_digits(chars, 17, second_of_day % 60, 2)
+    chars[:, [4, 7]] = ord("-")
+    chars[:, [13, 16]] = ord(":")
+
+    formatted = _to_strings(chars)
+    if missing is not None:
+        formatted[missing] = None
+    return formatted
+
+
+def random_ids(rng: np.random.Generator, prefix: str, n: int) -> np.ndarray:
+    """Generate n random version-4 UUIDs with a prefix, e.g. "prod_<uuid>"."""
+    hex_digits = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+    digits = hex_digits[rng.integers(0, 16, size=(n, 32))]
+    digits[:, 12] = ord("4")
+    digits[:, 16] = hex_digits[rng.integers(8, 12, size=n)]
+
+    chars = np.full((n, len(prefix) + 36), ord("-"), dtype=np.uint8)
+    chars[:, : len(prefix)] = np.frombuffer(prefix.encode(), dtype=np.uint8)
+    # 8-4-4-4-12 digit groups, separated by dashes
+    groups = [(0, 8, 0), (8, 12, 9), (12, 16, 14), (16, 20, 19), (20, 32, 24)]
+    for group_start, group_end, column in groups:
+        column += len(prefix)
+        width = group_end - group_start
+        chars[:, column : column + width] = digits[:, group_start:group_end]
+    return _to_strings(chars)
+
+
+def product_names(start: int, stop: int) -> np.ndarray:
+    """
+    Names of the products start..stop-1.
 
-        for supplier_id in selected_suppliers:
-            # Price can vary by supplier (wholesale vs retail)
-            base_price = random.uniform(2, 150)
-            # Supplier price might be 10-30% different from store price
-            price = round(base_price * random.uniform(0.7, 1.3), 2)
+    The first products use the real names; beyond, names cycle over them
+    with a reference number, e.g. "Smecta Sachets Réf 12".
+    """
+    base = np.array(PRODUCT_NAMES + ADDITIONAL_PRODUCT_NAMES, dtype=object)
+    index = np.arange(start, stop)
+    names = base[index % len(base)]
+    cycle = index // len(base)
+    suffixed = cycle > 0
+    references = cycle[suffixed].astype(str).astype(object)
+    names[suffixed] = names[suffixed] + " Réf " + references
+    return names
 
-            # Delivery time between 1 and 14 days
-            delivery_time = random.randint(1, 14)
 
-            # Last information update between 1 and 90 days ago
-            days_ago = random.randint(1, 90)
-            last_update = (datetime.now() - timedelta(days=days_ago)).strftime(
-                "%Y-%m-%d %H:%M:%S"
-            )
+# Generate Fournisseur (Suppliers)
+def generate_fournisseurs(rng: np.random.Generator, n: int = 50) -> pd.DataFrame:
+    """
+    Generate fake supplier data.
 
-            available_products.append(
-                {
-                    "id": product_id,
-                    "name": product_name,
-                    "fournisseur": supplier_id,
-                    "price": price,
-                    "delivery_time": delivery_time,
-                    "last_information_update": last_update,
-                }
-            )
+    Args:
+        rng: Random generator
+        n: Number of suppliers
 
-    # Add some additional products that might not be in store
-    additional_products = [
-        "Amoxicilline 500mg",
-        "Ciprofloxacine 500mg",
-        "Azithromycine 250mg",
-        "Doxycycline 100mg",
-        "Métronidazole 500mg",
-        "Insuline Glulisine",
-        "Métformine 500mg",
-        "Atorvastatine 20mg",
-        "Amlodipine 5mg",
-        "Lisinopril 10mg",
-        "Oméprazole 20mg",
-        "Lansoprazole 30mg",
-        "Montélukast 10mg",
-        "Salbutamol Spray",
-        "Fluticasone Nasal",
-    ]
-
-    for product_name in additional_products:
-        # Generate a unique ID for this product name (if not already created)
-        if product_name not in product_id_map:
-            product_id_map[product_name] = f"prod_{uuid.uuid4()}"
-
-        # Use the same ID for all entries with this product name
-        product_id = product_id_map[product_name]
-
-        num_suppliers = random.randint(1, 3)
-        selected_suppliers = random.sample(
-            fournisseur_df["id"].tolist(), min(num_suppliers, len(fournisseur_df))
-        )
+    Returns:
+        DataFrame with columns id, name, phone_number, plus profile (index
+        into PROFILES) and size (relative share of the catalog), which are
+        not written out
+    """
+    names = (
+        np.array(COMPANY_NAMES, dtype=object)[rng.integers(0, len(COMPANY_NAMES), n)]
+        + " "
+        + np.array(REGIONS, dtype=object)[rng.integers(0, len(REGIONS), n)]
+    )
+    # French phone numbers: "+33 145 41 38 27"
+    phones = np.full((n, 16), ord(" "), dtype=np.uint8)
+    phones[:, :3] = np.frombuffer(b"+33", dtype=np.uint8)
+    _put_digits(phones, 4, rng.integers(1, 10, n), 1)
+    for col in (5, 8, 11, 14):
+        _put_digits(phones, col, rng.integers(10, 100, n), 2)
+
+    # Catalog share follows a power law: few large distributors, many small ones
+    size = 1.0 / (rng.permutation(n) + 1.0) ** 0.8
+    return pd.DataFrame(
+        {
+            "id": random_ids(rng, "supp_", n),
+            "name": names,
+            "phone_number": _to_strings(phones),
+            "profile": rng.choice(
+                len(PROFILES), size=n, p=PROFILES["share"].to_numpy()
+            ),
+            "size": size / size.sum(),
+        }
+    )
 
-        for supplier_id in selected_suppliers:
-            base_price = random.uniform(5, 100)
-            price = round(base_price * random.uniform(0.7, 1.3), 2)
-            delivery_time = random.randint(1, 14)
-            days_ago = random.randint(1, 90)
-            last_update = (datetime.now() - timedelta(days=days_ago)).strftime(
-                "%Y-%m-%d %H:%M:%S"
-            )
 
-            available_products.append(
-                {
-                    "id": product_id,
-                    "name": product_name,
-                    "fournisseur": supplier_id,
-                    "price": price,
-                    "delivery_time": delivery_time,
-                    "last_information_update": last_update,
-                }
-            )
+def plan_catalog(
+    rng: np.random.Generator,
+    fournisseurs: pd.DataFrame,
+    n_products: int,
+    n_offers: Optional[int],
+    n_in_store: int,
+) -> Dict[str, np.ndarray]:
+    """
+    Draw the per-product parameters of the catalog.
 
-    return pd.DataFrame(available_products)
+    Args:
+        rng: Random generator
+        fournisseurs: Suppliers from generate_fournisseurs
+        n_products: Number of distinct products
+        n_offers: Total number of offers (None: 1 to 4 suppliers per product)
+        n_in_store: Number of products stocked in store
 
+    Returns:
+        Per-product arrays: offer_count, first_offer (offset of the
+        product's first offer), first_supplier, base_price, in_store and
+        store_pick (which of the product's offers the store buys)
+    """
+    n_suppliers = len(fournisseurs)
+    if n_offers is None:
+        counts = rng.integers(1, 5, n_products)
+    else:
+        uniform = np.full(n_products, 1.0 / n_products)
+        counts = 1 + rng.multinomial(n_offers - n_products, uniform)
+    counts = np.minimum(counts, n_suppliers)
+
+    # A product's offers come from consecutive suppliers starting at a
+    # supplier drawn by size, so they are distinct and large suppliers carry
+    # more of the catalog
+    in_store = np.zeros(n_products, dtype=bool)
+    stocked = rng.choice(n_products, size=min(n_in_store, n_products), replace=False)
+    in_store[stocked] = True
+    return {
+        "offer_count": counts,
+        "first_offer": np.concatenate([[0], np.cumsum(counts)[:-1]]),
+        "first_supplier": rng.choice(
+            n_suppliers, size=n_products, p=fournisseurs["size"].to_numpy()
+        ),
+        "base_price": np.clip(rng.lognormal(np.log(15.0), 0.9, n_products), 2.0, 150.0),
+        "in_store": in_store,
+        "store_pick": np.floor(rng.random(n_products) * counts).astype(np.int64),
+    }
 
-# Generate Orders
-def generate_orders(available_products_df, fournisseur_df, in_store_products_df, n=200):
-    """Generate fake order data with diverse supplier performance.
 
-    Creates good and bad suppliers based on:
-    - Delivery performance (on-time vs late)
-    - Order volume (number and size of orders)
-    - Order recency (more recent orders for good suppliers)
+# Generate Available Products (can have multiple suppliers per product)
+def generate_available_products(
+    rng: np.random.Generator,
+    fournisseurs: pd.DataFrame,
+    catalog: Dict[str, np.ndarray],
+    start: int,
+    stop: int,
+    now: int,
+):
+    """
+    Generate the offers of products start..stop-1.
 
     Args:
-        available_products_df: DataFrame of available products
-        fournisseur_df: DataFrame of suppliers
-        in_store_products_df: DataFrame of in-store products
-        n: Number of orders to generate
+        rng: Random generator
+        fournisseurs: Suppliers from generate_fournisseurs
+        catalog: Per-product parameters from plan_catalog
+        start: First product
+        stop: Product after the last
+        now: Reference time (epoch seconds)
 
     Returns:
-        DataFrame with columns: order_id, product_name, quantity, fournisseur_id,
-                               estimated_time_arrival, time_of_arrival, order_date
+        (offers, in_store): the offers as an available_product.csv chunk,
+        and the in-store products of the range with their offer's supplier
+        index and delivery time, for orders
     """
-    orders = []
-
-    # Categorize suppliers into performance tiers
-    # Get suppliers that are actually used in in_store_products
-    used_suppliers = set(in_store_products_df["fournisseur_id"].unique())
-    supplier_list = fournisseur_df[fournisseur_df["id"].isin(used_suppliers)][
-        "id"
-    ].tolist()
-
-    if not supplier_list:
-        # Fallback: use all suppliers
-        supplier_list = fournisseur_df["id"].tolist()
-
-    # Divide suppliers into tiers
-    # Exactly 5 very bad suppliers, rest distributed among excellent, good, fair
-    random.shuffle(supplier_list)
-    n_suppliers = len(supplier_list)
-
-    # Select exactly 5 very bad suppliers
-    num_warning = min(5, n_suppliers)
-    warning_suppliers = set(supplier_list[:num_warning])
-    remaining_suppliers = supplier_list[num_warning:]
-
-    # Distribute remaining suppliers: 25% excellent, 35% good, 40% fair
-    n_remaining = len(remaining_suppliers)
-    excellent_suppliers = set(remaining_suppliers[: int(n_remaining * 0.25)])
-    good_suppliers = set(
-        remaining_suppliers[int(n_remaining * 0.25) : int(n_remaining * 0.60)]
+    counts = catalog["offer_count"][start:stop]
+    product = np.repeat(np.arange(start, stop), counts)
+    local = product - start
+    rank = np.arange(len(product)) - np.repeat(np.cumsum(counts) - counts, counts)
+    supplier = (catalog["first_supplier"][product] + rank) % len(fournisseurs)
+    profile = fournisseurs["profile"].to_numpy()[supplier]
+
+    factor = PROFILES["price_factor"].to_numpy()[profile]
+    spread = PROFILES["price_spread"].to_numpy()[profile]
+    noise = np.exp(rng.normal(0.0, 1.0, len(product)) * spread)
+    price = catalog["base_price"][product] * factor * noise
+    delivery_time = _uniform_int(
+        rng,
+        PROFILES["lead_time_min"].to_numpy()[profile],
+        PROFILES["lead_time_max"].to_numpy()[profile],
+        len(product),
     )
-    fair_suppliers = set(remaining_suppliers[int(n_remaining * 0.60) :])
-
-    # Create supplier performance profiles
-    supplier_profiles = {}
-    for supp_id in excellent_suppliers:
-        supplier_profiles[supp_id] = {
-            "on_time_rate": 0.95,  # 95% on-time
-            "avg_delay_days": -1,  # Often early or on-time
-            "delay_range": (-3, 1),  # Early to slightly late
-            "order_frequency": 0.25,  # 25% of orders
-            "quantity_range": (100, 500),  # Larger orders
-            "recent_order_rate": 0.6,  # 60% of orders in last 30 days
-        }
-    for supp_id in good_suppliers:
-        supplier_profiles[supp_id] = {
-            "on_time_rate": 0.85,  # 85% on-time
-            "avg_delay_days": 0,  # Usually on-time
-            "delay_range": (-2, 2),
-            "order_frequency": 0.30,  # 30% of orders
-            "quantity_range": (50, 400),
-            "recent_order_rate": 0.5,  # 50% of orders in last 30 days
-        }
-    for supp_id in fair_suppliers:
-        supplier_profiles[supp_id] = {
-            "on_time_rate": 0.70,  # 70% on-time
-            "avg_delay_days": 2,  # Often slightly late
-            "delay_range": (-1, 4),
-            "order_frequency": 0.30,  # 30% of orders
-            "quantity_range": (30, 300),
-            "recent_order_rate": 0.3,  # 30% of orders in last 30 days
-        }
-    for supp_id in warning_suppliers:
-        supplier_profiles[supp_id] = {
-            "on_time_rate": 0.50,  # 50% on-time (many late deliveries)
-            "avg_delay_days": 4,  # Often late
-            "delay_range": (0, 8),  # Often late, rarely early
-            "order_frequency": 0.15,  # 15% of orders (fewer orders)
-            "quantity_range": (10, 200),  # Smaller orders
-            "recent_order_rate": 0.1,  # 10% of orders in last 30 days (inactive)
+    # Last information update between 1 and 90 days ago
+    updated = now - _uniform_int(rng, _DAY, 90 * _DAY, len(product))
+
+    ids = random_ids(rng, "prod_", stop - start)
+    names = product_names(start, stop)
+    supplier_ids = fournisseurs["id"].to_numpy()
+    offers = pd.DataFrame(
+        {
+            "id": ids[local],
+            "name": names[local],
+            "fournisseur": supplier_ids[supplier],
+            "price": np.round(np.maximum(price, 0.5), 2),
+            "delivery_time": delivery_time,
+            "last_information_update": format_times(updated),
         }
+    )
 
-    # Generate orders weighted by supplier performance
-    supplier_weights = []
-    supplier_ids = []
-    for supp_id, profile in supplier_profiles.items():
-        # Get products available from this supplier
-        supplier_products = available_products_df[
-            available_products_df["fournisseur"] == supp_id
-        ]
-        if len(supplier_products) > 0:
-            supplier_ids.append(supp_id)
-            # Weight by order_frequency
-            supplier_weights.append(profile["order_frequency"] * len(supplier_products))
-
-    # Normalize weights
-    total_weight = sum(supplier_weights)
-    if total_weight > 0:
-        supplier_weights = [w / total_weight for w in supplier_weights]
-
-    # Ensure minimum monthly spend for all suppliers
-    min_orders_per_supplier = (
-        2  # Minimum orders per supplier (at least 2 recent orders)
+    # Each stocked product is bought from one of its offers, at the offer price
+    stocked = np.flatnonzero(catalog["in_store"][start:stop])
+    rows = catalog["first_offer"][start + stocked] - catalog["first_offer"][start]
+    rows += catalog["store_pick"][start + stocked]
+    in_store = pd.DataFrame(
+        {
+            "id": ids[stocked],
+            "name": names[stocked],
+            "price": offers["price"].to_numpy()[rows],
+            "fournisseur_id": supplier_ids[supplier[rows]],
+            "stock": rng.integers(0, 501, len(stocked)),
+            "supplier": supplier[rows],
+            "delivery_time": delivery_time[rows],
+        }
     )
+    return offers, in_store
 
-    # Create a mapping of products in in_store_products by supplier
-    # This ensures orders match what the analysis service expects
-    in_store_by_supplier = {}
-    for _, row in in_store_products_df.iterrows():
-        supp_id = row["fournisseur_id"]
-        if supp_id not in in_store_by_supplier:
-            in_store_by_supplier[supp_id] = []
-        in_store_by_supplier[supp_id].append(row)
-
-    # First, generate minimum orders for each supplier to ensure monthly spend
-    for supp_id in supplier_ids:
-        profile = supplier_profiles.get(
-            supp_id,
-            {
-                "on_time_rate": 0.7,
-                "avg_delay_days": 1,
-                "delay_range": (-2, 5),
-                "order_frequency": 0.2,
-                "quantity_range": (50, 300),  # Reasonable minimum quantity
-                "recent_order_rate": 1.0,  # All minimum orders should be recent
-            },
-        )
 
-        # Get products from in_store_products for this supplier (to ensure spend is calculated)
-        supplier_in_store_products = in_store_by_supplier.get(supp_id, [])
-
-        if len(supplier_in_store_products) == 0:
-            # Fallback: try to find products from available_products
-            supplier_products = available_products_df[
-                available_products_df["fournisseur"] == supp_id
-            ]
-            if len(supplier_products) == 0:
-                continue
-            # Use available products as fallback
-            product_list = supplier_products.to_dict("records")
-        else:
-            # Use in_store products (preferred for spend calculation)
-            product_list = supplier_in_store_products
-
-        for _ in range(min_orders_per_supplier):
-            # Select a random product from the list
-            product_entry = random.choice(product_list)
-            order_id = f"order_{uuid.uuid4()}"
-            # Use profile quantity range, but ensure minimum quantity for monthly spend
-            qty_min, qty_max = profile["quantity_range"]
-            quantity = random.randint(max(50, qty_min), qty_max)  # At least 50 units
-
-            # Recent order (last 30 days) to ensure monthly spend
-            days_ago = random.randint(1, 30)
-            order_date = datetime.now() - timedelta(days=days_ago)
-
-            # Get delivery time from available_products or use default
-            # Handle both dict and Series/DataFrame row formats
-            if isinstance(product_entry, dict):
-                product_name = product_entry["name"]
-            else:
-                product_name = (
-                    product_entry.get("name", "")
-                    if hasattr(product_entry, "get")
-                    else product_entry["name"]
-                )
+# Generate Orders
+def generate_orders(
+    rng: np.random.Generator,
+    fournisseurs: pd.DataFrame,
+    in_store: pd.DataFrame,
+    products: np.ndarray,
+    now: int,
+    recent: bool = False,
+) -> pd.DataFrame:
+    """
+    Generate orders of in-store products, following their supplier's profile.
 
-            available_product = available_products_df[
-                (available_products_df["name"] == product_name)
-                & (available_products_df["fournisseur"] == supp_id)
-            ]
-            if len(available_product) > 0:
-                estimated_delivery_days = int(
-                    available_product.iloc[0]["delivery_time"]
-                )
-            else:
-                estimated_delivery_days = random.randint(1, 14)  # Default
-            estimated_time_arrival = order_date + timedelta(
-                days=estimated_delivery_days
-            )
+    Good suppliers get larger and more recent orders and deliver on time;
+    warning suppliers order less and deliver late.
 
-            # Most minimum orders should be delivered (on-time or late based on supplier)
-            should_have_arrived = order_date < datetime.now() - timedelta(
-                days=estimated_delivery_days
-            )
+    Args:
+        rng: Random generator
+        fournisseurs: Suppliers from generate_fournisseurs
+        in_store: In-store products from generate_available_products
+        products: Row of in_store ordered by each order
+        now: Reference time (epoch seconds)
+        recent: Place every order in the last 30 days, with at least 50 units
 
-            if should_have_arrived and random.random() < profile["on_time_rate"]:
-                delay = random.randint(*profile["delay_range"])
-                time_of_arrival = estimated_time_arrival + timedelta(days=delay)
-                if time_of_arrival > datetime.now():
-                    time_of_arrival = datetime.now() - timedelta(
-                        days=random.randint(1, 3)
-                    )
-            elif should_have_arrived:
-                delay = random.randint(
-                    profile["delay_range"][0] + 1, profile["delay_range"][1] + 3
-                )
-                time_of_arrival = estimated_time_arrival + timedelta(days=delay)
-                if time_of_arrival > datetime.now():
-                    time_of_arrival = datetime.now() - timedelta(
-                        days=random.randint(1, 2)
-                    )
-            else:
-                time_of_arrival = None
-
-            orders.append(
-                {
-                    "order_id": order_id,
-                    "product_name": product_name,
-                    "quantity": quantity,
-                    "fournisseur_id": supp_id,
-                    "estimated_time_arrival": estimated_time_arrival.strftime(
-                        "%Y-%m-%d %H:%M:%S"
-                    ),
-                    "time_of_arrival": time_of_arrival.strftime("%Y-%m-%d %H:%M:%S")
-                    if time_of_arrival
-                    else None,
-                    "order_date": order_date.strftime("%Y-%m-%d %H:%M:%S"),
-                }
-            )
+    Returns:
+        DataFrame with columns: order_id, product_name, quantity, fournisseur_id,
+                               estimated_time_arrival, time_of_arrival, order_date
+    """
+    n = len(products)
+    supplier = in_store["supplier"].to_numpy()[products]
+    profile = fournisseurs["profile"].to_numpy()[supplier]
 
-    # Now generate the remaining orders weighted by supplier performance
-    remaining_orders = n - len(orders)
-    for _ in range(remaining_orders):
-        # Select supplier based on weights
-        if supplier_ids and supplier_weights:
-            selected_supplier_id = random.choices(
-                supplier_ids, weights=supplier_weights
-            )[0]
-        else:
-            # Fallback: random selection
-            product_entry = available_products_df.sample(1).iloc[0]
-            selected_supplier_id = product_entry["fournisseur"]
-
-        profile = supplier_profiles.get(
-            selected_supplier_id,
-            {
-                "on_time_rate": 0.7,
-                "avg_delay_days": 1,
-                "delay_range": (-2, 5),
-                "order_frequency": 0.2,
-                "quantity_range": (10, 500),
-                "recent_order_rate": 0.4,
-            },
-        )
+    def param(name: str) -> np.ndarray:
+        return PROFILES[name].to_numpy()[profile]
 
-        # Get products from in_store_products for this supplier (to ensure spend is calculated)
-        supplier_in_store_products = in_store_by_supplier.get(selected_supplier_id, [])
-
-        if len(supplier_in_store_products) == 0:
-            # Fallback: try available_products
-            supplier_products = available_products_df[
-                available_products_df["fournisseur"] == selected_supplier_id
-            ]
-            if len(supplier_products) == 0:
-                # Last resort: any product
-                product_entry = available_products_df.sample(1).iloc[0]
-            else:
-                product_entry = supplier_products.sample(1).iloc[0]
-        else:
-            # Use in_store products (preferred for spend calculation)
-            product_entry = random.choice(supplier_in_store_products)
+    if recent:
+        quantity = _uniform_int(
+            rng, np.maximum(50, param("quantity_min")), param("quantity_max"), n
+        )
+        days_ago = _uniform_int(rng, 1, 30, n)
+    else:
+        quantity = _uniform_int(rng, param("quantity_min"), param("quantity_max"), n)
+        is_recent = rng.random(n) < param("recent_order_rate")
+        days_ago = np.where(
+            is_recent, _uniform_int(rng, 1, 30, n), _uniform_int(rng, 31, 180, n)
+        )
+    order_date = now - days_ago * _DAY
+    eta = order_date + in_store["delivery_time"].to_numpy()[products] * _DAY
+
+    # Delivered orders: on time within the profile's delay range, or late
+    arrived = eta < now
+    on_time = rng.random(n) < param("on_time_rate")
+    delay = np.where(
+        on_time,
+        _uniform_int(rng, param("delay_min"), param("delay_max"), n),
+        _uniform_int(rng, param("delay_min") + 1, param("delay_max") + 3, n),
+    )
+    arrival = eta + delay * _DAY
+    # A delivered order cannot arrive in the future
+    days_back = np.where(
+        on_time, _uniform_int(rng, 1, 3, n), _uniform_int(rng, 1, 2, n)
+    )
+    arrival = np.where(arrived & (arrival > now), now - days_back * _DAY, arrival)
+    # Orders not due yet: 30% pending, others delivered up to 2 days early
+    early = eta + _uniform_int(rng, -2, 0, n) * _DAY
+    pending = ~arrived & ((rng.random(n) < 0.3) | (early > now))
+    arrival = np.where(arrived, arrival, early)
+
+    return pd.DataFrame(
+        {
+            "order_id": random_ids(rng, "order_", n),
+            "product_name": in_store["name"].to_numpy()[products],
+            "quantity": quantity,
+            "fournisseur_id": in_store["fournisseur_id"].to_numpy()[products],
+            "estimated_time_arrival": format_times(eta),
+            "time_of_arrival": format_times(arrival, missing=pending),
+            "order_date": format_times(order_date),
+        }
+    )
 
-        # Generate order ID
-        order_id = f"order_{uuid.uuid4()}"
 
-        # Quantity based on supplier tier
-        quantity = random.randint(*profile["quantity_range"])
+def _csv_strings(column: pd.Series) -> np.ndarray:
+    """
+    CSV fields of a column, as pandas would write them.
 
-        # Order date: more recent orders for better suppliers
-        if random.random() < profile["recent_order_rate"]:
-            # Recent order (last 30 days)
-            days_ago = random.randint(1, 30)
+    Integers and cent-rounded floats of a small range are formatted once
+    per distinct value through a lookup table, which is much faster than
+    formatting every row.
+    """
+    values = column.to_numpy()
+    if values.dtype == object:
+        return np.where(pd.isna(values), "", values)
+    if len(values) == 0:
+        return values.astype(str).astype(object)
+    if np.issubdtype(values.dtype, np.integer):
+        low, high = int(values.min()), int(values.max())
+        if high - low < 1_000_000:
+            table = np.array([str(i) for i in range(low, high + 1)], dtype=object)
+            return table[values - low]
+    elif np.issubdtype(values.dtype, np.floating) and np.isfinite(values).all():
+        cents = np.round(values * 100).astype(np.int64)
+        low, high = int(cents.min()), int(cents.max())
+        if high - low < 1_000_000 and (cents / 100 == values).all():
+            table = np.array([str(c / 100) for c in range(low, high + 1)], dtype=object)
+            return table[cents - low]
+    return column.astype(str).to_numpy(dtype=object)
+
+
+class TableWriter:
+    """Writes a table chunk by chunk to CSV or Parquet."""
+
+    def __init__(self, path: Path, file_format: str):
+        """
+        Open the output.
+
+        Args:
+            path: Output file, without extension
+            file_format: "csv" or "parquet"
+        """
+        self.path = path.with_suffix(f".{file_format}")
+        self.file_format = file_format
+        self.rows = 0
+        self._writer = None
+        self._schema = None
+
+    def write(self, df: pd.DataFrame):
+        """Append a chunk."""
+        if self.file_format == "csv":
+            self._write_csv(df)
         else:
-            # Older order (31-180 days ago)
-            days_ago = random.randint(31, 180)
-
-        order_date = datetime.now() - timedelta(days=days_ago)
-
-        # Estimated delivery time from available_products or use default
-        product_name = (
-            product_entry["name"]
-            if isinstance(product_entry, dict)
-            else product_entry.get("name", "")
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise SystemExit(
+                    "Parquet output requires pyarrow: pip install pyarrow"
+                ) from e
+            if self._writer is None:
+                self._schema = pa.schema(
+                    [
+                        pa.field(
+                            column,
+                            pa.string()
+                            if df[column].dtype == object
+                            else pa.from_numpy_dtype(df[column].dtype),
+                        )
+                        for column in df.columns
+                    ]
+                )
+                self._writer = pq.ParquetWriter(self.path, self._schema)
+            self._writer.write_table(
+                pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+            )
+        self.rows += len(df)
+
+    def _write_csv(self, df: pd.DataFrame):
+        """Append a chunk as CSV, formatting whole columns at once."""
+        columns = [_csv_strings(df[column]) for column in df.columns]
+        text_fields = "".join(
+            "".join(column)
+            for column, dtype in zip(columns, df.dtypes)
+            if dtype == object
         )
-        available_product = available_products_df[
-            (available_products_df["name"] == product_name)
-            & (available_products_df["fournisseur"] == selected_supplier_id)
-        ]
-        if len(available_product) > 0:
-            estimated_delivery_days = int(available_product.iloc[0]["delivery_time"])
-        else:
-            estimated_delivery_days = random.randint(1, 14)  # Default
+        if any(char in text_fields for char in ',"\n'):
+            # Fields needing quotes: let pandas handle the escaping
+            mode = "a" if self.rows else "w"
+            df.to_csv(self.path, mode=mode, header=not self.rows, index=False)
+            return
+        with open(self.path, "a" if self.rows else "w", encoding="utf-8") as f:
+            if not self.rows:
+                f.write(",".join(df.columns) + "\n")
+            if len(df):
+                f.write("\n".join(map(",".join, zip(*columns))) + "\n")
+
+    def close(self):
+        """Finish the file."""
+        if self._writer is not None:
+            self._writer.close()
+
+
+def generate(
+    out_dir: Path,
+    seed: int = 42,
+    n_suppliers: int = 50,
+    n_products: Optional[int] = None,
+    n_offers: Optional[int] = None,
+    n_in_store: int = 200,
+    n_orders: int = 200,
+    chunk_size: int = 1_000_000,
+    file_format: str = "csv",
+    now: Optional[datetime] = None,
+) -> Dict[str, int]:
+    """
+    Generate the four datasets and write them to out_dir.
 
-        estimated_time_arrival = order_date + timedelta(days=estimated_delivery_days)
+    Args:
+        out_dir: Output directory
+        seed: Seed of the random generator
+        n_suppliers: Number of suppliers
+        n_products: Number of distinct products (default: the named products,
+            or offers / 2.5 when n_offers is given)
+        n_offers: Number of offers (default: 1 to 4 suppliers per product)
+        n_in_store: Number of products stocked in store
+        n_orders: Number of orders
+        chunk_size: Rows generated and written at a time
+        file_format: "csv" or "parquet"
+        now: Reference time of the dates (default: now)
 
-        # Time of arrival based on supplier performance
-        # Check if order should have arrived by now
-        should_have_arrived = order_date < datetime.now() - timedelta(
-            days=estimated_delivery_days
+    Returns:
+        Number of rows written per table
+    """
+    rng = np.random.default_rng(seed)
+    now = (now or datetime.now()).replace(microsecond=0)
+    now_seconds = int(np.datetime64(now, "s").astype(np.int64))
+    if n_products is None:
+        n_products = (
+            len(PRODUCT_NAMES) + len(ADDITIONAL_PRODUCT_NAMES)
+            if n_offers is None
+            else max(1, int(n_offers / 2.5))
         )
-
-        if should_have_arrived and random.random() < profile["on_time_rate"]:
-            # Order has been delivered (on-time or early)
-            delay = random.randint(*profile["delay_range"])
-            time_of_arrival = estimated_time_arrival + timedelta(days=delay)
-            # Make sure arrival is not in the future
-            if time_of_arrival > datetime.now():
-                time_of_arrival = datetime.now() - timedelta(days=random.randint(1, 3))
-        elif should_have_arrived:
-            # Order is late (delivered but late)
-            delay = random.randint(
-                profile["delay_range"][0] + 1, profile["delay_range"][1] + 3
+    if n_offers is not None and not n_products <= n_offers <= n_products * n_suppliers:
+        raise ValueError(
+            f"offers must be between products ({n_products}) and products x suppliers"
+        )
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    fournisseurs = generate_fournisseurs(rng, n_suppliers)
+    writer = TableWriter(out_dir / "fournisseur", file_format)
+    writer.write(fournisseurs[["id", "name", "phone_number"]])
+    writer.close()
+
+    # Offers, by ranges of products of about chunk_size offers
+    catalog = plan_catalog(rng, fournisseurs, n_products, n_offers, n_in_store)
+    offers_per_product = max(catalog["offer_count"].mean(), 1.0)
+    products_per_chunk = max(1, int(chunk_size / offers_per_product))
+    offer_writer = TableWriter(out_dir / "available_product", file_format)
+    in_store_chunks = []
+    for start in range(0, n_products, products_per_chunk):
+        stop = min(start + products_per_chunk, n_products)
+        offers, in_store_chunk = generate_available_products(
+            rng, fournisseurs, catalog, start, stop, now_seconds
+        )
+        offer_writer.write(offers)
+        in_store_chunks.append(in_store_chunk)
+    offer_writer.close()
+
+    in_store = pd.concat(in_store_chunks, ignore_index=True)
+    writer = TableWriter(out_dir / "in_store_product", file_format)
+    writer.write(in_store[["id", "name", "price", "fournisseur_id", "stock"]])
+    writer.close()
+
+    # Orders: a few recent ones for every supplier of the store, then orders
+    # weighted by the supplier's order frequency
+    order_writer = TableWriter(out_dir / "orders", file_format)
+    if len(in_store):
+        firsts = []
+        for _ in range(MIN_ORDERS_PER_SUPPLIER):
+            shuffled = rng.permutation(len(in_store))
+            suppliers = in_store["supplier"].to_numpy()[shuffled]
+            _, first = np.unique(suppliers, return_index=True)
+            firsts.append(shuffled[first])
+        minimum = np.concatenate(firsts)[:n_orders]
+        order_writer.write(
+            generate_orders(
+                rng, fournisseurs, in_store, minimum, now_seconds, recent=True
             )
-            time_of_arrival = estimated_time_arrival + timedelta(days=delay)
-            if time_of_arrival > datetime.now():
-                time_of_arrival = datetime.now() - timedelta(days=random.randint(1, 2))
-        else:
-            # Order is still pending (not yet due)
-            if random.random() < 0.3:  # 30% chance of pending orders
-                time_of_arrival = None
-            else:
-                # Some pending orders might actually be delivered early
-                delay = random.randint(-2, 0)
-                time_of_arrival = estimated_time_arrival + timedelta(days=delay)
-                if time_of_arrival > datetime.now():
-                    time_of_arrival = None
-
-        # Get product name (handle both dict and Series)
-        if isinstance(product_entry, dict):
-            product_name = product_entry["name"]
-        else:
-            product_name = (
-                product_entry.get("name", "")
-                if hasattr(product_entry, "get")
-                else product_entry["name"]
+        )
+
+        profile = fournisseurs["profile"].to_numpy()[in_store["supplier"].to_numpy()]
+        weights = PROFILES["order_frequency"].to_numpy()[profile]
+        weights = weights / weights.sum()
+        remaining = n_orders - len(minimum)
+        for start in range(0, remaining, chunk_size):
+            size = min(chunk_size, remaining - start)
+            products = rng.choice(len(in_store), size=size, p=weights)
+            order_writer.write(
+                generate_orders(rng, fournisseurs, in_store, products, now_seconds)
             )
+    order_writer.close()
+
+    return {
+        "fournisseur": len(fournisseurs),
+        "in_store_product": len(in_store),
+        "available_product": offer_writer.rows,
+        "orders": order_writer.rows,
+    }
+
+
+def main():
+    """Parse the command line and generate the datasets."""
+    parser = argparse.ArgumentParser(description="Generate fake datasets")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--suppliers", type=int, default=50)
+    parser.add_argument("--products", type=int, default=None)
+    parser.add_argument("--offers", type=int, default=None)
+    parser.add_argument("--in-store", type=int, default=200)
+    parser.add_argument("--orders", type=int, default=200)
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--out", type=Path, default=Path("."))
+    parser.add_argument(
+        "--now",
+        type=datetime.fromisoformat,
+        default=None,
+        help='Reference time, e.g. "2025-11-12 12:00:00" (default: now)',
+    )
+    args = parser.parse_args()
 
-        orders.append(
-            {
-                "order_id": order_id,
-                "product_name": product_name,
-                "quantity": quantity,
-                "fournisseur_id": selected_supplier_id,
-                "estimated_time_arrival": estimated_time_arrival.strftime(
-                    "%Y-%m-%d %H:%M:%S"
-                ),
-                "time_of_arrival": time_of_arrival.strftime("%Y-%m-%d %H:%M:%S")
-                if time_of_arrival
-                else None,
-                "order_date": order_date.strftime("%Y-%m-%d %H:%M:%S"),
-            }
+    if not 1 <= args.suppliers <= MAX_SUPPLIERS:
+        parser.error(f"--suppliers must be between 1 and {MAX_SUPPLIERS}")
+    if args.offers is not None and not 1 <= args.offers <= MAX_OFFERS:
+        parser.error(f"--offers must be between 1 and {MAX_OFFERS}")
+    if not 0 <= args.orders <= MAX_ORDERS:
+        parser.error(f"--orders must be between 0 and {MAX_ORDERS}")
+
+    print("Generating fake datasets...")
+    start = time.perf_counter()
+    try:
+        counts = generate(
+            args.out,
+            seed=args.seed,
+            n_suppliers=args.suppliers,
+            n_products=args.products,
+            n_offers=args.offers,
+            n_in_store=args.in_store,
+            n_orders=args.orders,
+            chunk_size=args.chunk_size,
+            file_format=args.format,
+            now=args.now,
         )
+    except ValueError as e:
+        parser.error(str(e))
 
-    return pd.DataFrame(orders)
+    print(f"✓ Generated {counts['fournisseur']} suppliers")
+    print(f"✓ Generated {counts['in_store_product']} in-store products")
+    print(f"✓ Generated {counts['available_product']} available product entries")
+    print(f"✓ Generated {counts['orders']} orders")
+    print(f"\nFiles created in {args.out} ({time.perf_counter() - start:.1f}s):")
+    for table in counts:
+        print(f"  - {table}.{args.format}")
 
 
 # Main execution
 if __name__ == "__main__":
-    print("Generating fake datasets...")
-
-    # Define product names list
-    product_names = [
-        "Paracétamol 500mg",
-        "Ibuprofène 400mg",
-        "Aspirine 500mg",
-        "Doliprane 1000mg",
-        "Spasfon 80mg",
-        "Smecta Sachets",
-        "Strepsils Pastilles",
-        "Vicks Vaporub 50g",
-        "Biafine Crème",
-        "Bétadine Solution",
-        "Pansements Adhésifs",
-        "Compresses Stériles",
-        "Seringues 5ml",
-        "Thermomètre Digital",
-        "Tensiomètre Électronique",
-        "Gants Nitrile Boîte",
-        "Masque Chirurgical",
-        "Alcool à 70°",
-        "Sérum Physiologique",
-        "Vitamine D3 1000UI",
-        "Vitamine C 1000mg",
-        "Magnésium 300mg",
-        "Fer 14mg",
-        "Oméga 3 Capsules",
-        "Probiotiques Gélules",
-        "Mélatonine 1mg",
-        "Ginkgo Biloba",
-        "Ginseng Extrait",
-        "Echinacée Gélules",
-        "Millepertuis",
-        "Valériane Comprimés",
-        "Passiflore Gélules",
-        "Aubépine Tisane",
-        "Camomille Sachets",
-        "Tilleul Infusion",
-        "Sirop Toux Sèche",
-        "Sirop Toux Grasse",
-        "Pastilles Miel Citron",
-        "Spray Nasal Salin",
-        "Collyre Larmes Artificielles",
-        "Bain de Bouche",
-        "Dentifrice Fluoré",
-        "Brosse à Dents",
-        "Fil Dentaire",
-        "Bain de Bouche Antiseptique",
-        "Crème Solaire SPF50",
-        "Crème Hydratante Visage",
-        "Shampoing Antipelliculaire",
-        "Savon Dermatologique",
-        "Crème Réparatrice Mains",
-    ]
-
-    # Generate datasets
-    fournisseurs = generate_fournisseurs(50)
-
-    # Create a shared product ID mapping so products with the same name
-    # have the same ID in both in_store_product and available_product
-    product_id_map = {}
-
-    # Generate available_products first (with all products and multiple suppliers)
-    available_products = generate_available_products(
-        product_names, fournisseurs, product_id_map
-    )
-
-    # Generate in_store_products as a subset of available_products
-    # Each product name appears only once with one supplier, price matches available_products
-    in_store_products = generate_in_store_products(available_products, 200)
-
-    # Generate orders based on available products with diverse supplier performance
-    orders = generate_orders(available_products, fournisseurs, in_store_products, 200)
-
-    # Save to CSV files
-    fournisseurs.to_csv("fournisseur.csv", index=False)
-    in_store_products.to_csv("in_store_product.csv", index=False)
-    available_products.to_csv("available_product.csv", index=False)
-    orders.to_csv("orders.csv", index=False)
-
-    print(f"✓ Generated {len(fournisseurs)} suppliers")
-    print(f"✓ Generated {len(in_store_products)} in-store products")
-    print(f"✓ Generated {len(available_products)} available product entries")
-    print(f"✓ Generated {len(orders)} orders")
-    print("\nFiles created:")
-    print("  - fournisseur.csv")
-    print("  - in_store_product.csv")
-    print("  - available_product.csv")
-    print("  - orders.csv")
+    main()
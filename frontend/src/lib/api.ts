@@ -294,7 +294,14 @@ export const suppliersApi = {
    */
   getCheaperAlternatives: async (
     minSavingsPercent: number = 5.0,
-    productId?: string
+    productId?: string,
+    options: {
+      supplierId?: string;
+      minSavingsAmount?: number;
+      maxDeliveryTime?: number;
+      limit?: number;
+      cursor?: string;
+    } = {}
   ) => {
     const params = new URLSearchParams({
       min_savings_percent: minSavingsPercent.toString(),
@@ -302,6 +309,21 @@ export const suppliersApi = {
     if (productId) {
       params.append('product_id', productId);
     }
+    if (options.supplierId) {
+      params.append('supplier_id', options.supplierId);
+    }
+    if (options.minSavingsAmount !== undefined) {
+      params.append('min_savings_amount', options.minSavingsAmount.toString());
+    }
+    if (options.maxDeliveryTime !== undefined) {
+      params.append('max_delivery_time', options.maxDeliveryTime.toString());
+    }
+    if (options.limit !== undefined) {
+      params.append('limit', options.limit.toString());
+    }
+    if (options.cursor) {
+      params.append('cursor', options.cursor);
+    }
     return apiClient.get(`/api/suppliers/cheaper-alternatives?${params}`);
   },
 